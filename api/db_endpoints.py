@@ -5,7 +5,7 @@ Endpoints API pour la gestion de la base de données
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database.db import get_db
+from database.db import get_db, get_pool_stats
 from database import schemas
 from database.repository import (
     ProjectRepository,
@@ -18,6 +18,16 @@ from database.repository import (
 router = APIRouter(prefix="/db", tags=["database"])
 
 
+# ============================================================================
+# Endpoint pour le pool de connexions
+# ============================================================================
+
+@router.get("/pool-stats")
+def read_pool_stats():
+    """Statistiques du pool de connexions du processus (checkout, overflow, attente)"""
+    return get_pool_stats()
+
+
 # ============================================================================
 # Endpoints pour Project
 # ============================================================================
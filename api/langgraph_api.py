@@ -4,11 +4,14 @@ Architecture propre : Streamlit = UI, API = Logique métier.
 """
 
 from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from typing import List, Optional, Dict, Any
 import uvicorn
 import uuid
 import os
+import json
+import asyncio
 from pathlib import Path
 import tempfile
 from pydantic import BaseModel
@@ -20,15 +23,28 @@ load_dotenv()
 # Importer les workflows
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from workflow.need_analysis_workflow import NeedAnalysisWorkflow
-from workflow.rappel_mission_workflow import RappelMissionWorkflow
-from workflow.atouts_workflow import AtoutsWorkflow
-from workflow.value_chain_workflow import ValueChainWorkflow
-from executive_summary.executive_summary_workflow import ExecutiveSummaryWorkflow
-from prerequis_evaluation.prerequis_evaluation_workflow import PrerequisEvaluationWorkflow
-from langgraph.checkpoint.memory import MemorySaver
+from database.checkpointer import get_checkpointer, rollback_point
+from api.workflow_registry import (
+    WorkflowRegistry,
+    WORKFLOW_PREWARM,
+    NEED_ANALYSIS,
+    EXECUTIVE_SUMMARY,
+    RAPPEL_MISSION,
+    ATOUTS,
+    VALUE_CHAIN,
+    PREREQUIS_EVALUATION,
+)
+from api.run_executor import RunExecutor, RunQueueFullError, TERMINAL_STATUSES
+from database.db import get_db_context
+from database.repository import WorkflowEventRepository
+from utils.progress_events import ProgressRecorder, progress_recording, run_cancellation
+from utils.llm_gateway import get_llm_stats
+from utils.concurrency_governor import PRIORITY_BATCH, PRIORITY_INTERACTIVE, llm_priority
+from utils.speculation import speculative_executor
 from process_transcript.pdf_parser import PDFParser
 from process_transcript.json_parser import JSONParser
+from process_transcript.parse_cache import parse_cache
+from utils.upload_store import store_upload, UploadTooLargeError
 from process_transcript.speaker_classifier import SpeakerClassifier
 
 # Importer les endpoints de base de données
@@ -87,15 +103,126 @@ async def startup_event():
     for route in sorted(routes):
         logger.info(f"   {route}")
     logger.info("=" * 80)
+    
+    # Nettoyage périodique des threads expirés dans le checkpointer
+    if hasattr(checkpointer, "reclaim_expired"):
+        asyncio.create_task(_reclaim_expired_checkpoints())
+
+    # Compilation des workflows partagés hors de la boucle d'événements
+    if WORKFLOW_PREWARM:
+        asyncio.create_task(asyncio.to_thread(workflow_registry.warm_up))
+
+
+CHECKPOINT_RECLAIM_INTERVAL_SECONDS = int(os.getenv("CHECKPOINT_RECLAIM_INTERVAL_SECONDS", "3600"))
+# Durée de conservation des événements de progression
+WORKFLOW_EVENTS_TTL_HOURS = float(os.getenv("WORKFLOW_EVENTS_TTL_HOURS", "24"))
+# Intervalle de lecture des nouveaux événements et de keep-alive du flux SSE
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("EVENT_STREAM_POLL_SECONDS", "0.5"))
+EVENT_STREAM_KEEPALIVE_SECONDS = float(os.getenv("EVENT_STREAM_KEEPALIVE_SECONDS", "15"))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Annule les runs encore en attente d'exécution"""
+    run_executor.shutdown()
+
+
+def _reclaim_expired_events() -> int:
+    with get_db_context() as db:
+        return WorkflowEventRepository.delete_older_than(db, WORKFLOW_EVENTS_TTL_HOURS)
+
+
+async def _reclaim_expired_checkpoints():
+    """Supprime régulièrement les threads inactifs depuis plus de CHECKPOINT_TTL_HOURS"""
+    while True:
+        try:
+            await asyncio.to_thread(checkpointer.reclaim_expired)
+            await asyncio.to_thread(_reclaim_expired_events)
+        except Exception as e:
+            logger.warning(f"⚠️ Nettoyage des checkpoints impossible: {e}")
+        await asyncio.sleep(CHECKPOINT_RECLAIM_INTERVAL_SECONDS)
+
+# Checkpointer persistant partagé (PostgreSQL) : les runs en pause ne sont plus gardés en RAM
+checkpointer = get_checkpointer()
+# Registre des workflows : type + paramètres stockés en base, un workflow compilé partagé
+# par type (l'API peut tourner avec plusieurs workers uvicorn)
+workflow_registry = WorkflowRegistry(checkpointer)
+# Pool borné d'exécution des workflows : les endpoints de lancement retournent un run_id
+# immédiatement au lieu de bloquer la boucle d'événements pendant les appels LLM
+run_executor = RunExecutor()
+
+
+def _pending_nodes(workflow_data) -> List[str]:
+    """Nœuds sur lesquels le workflow est interrompu (vide s'il est terminé)"""
+    try:
+        config = {"configurable": {"thread_id": workflow_data.thread_id}}
+        snapshot = workflow_data.workflow.graph.get_state(config)
+        return list(snapshot.next) if snapshot and snapshot.next else []
+    except Exception:
+        return []
 
-# Stockage en mémoire des workflows (en production, utiliser Redis ou DB)
-workflows: Dict[str, Any] = {}
-executive_workflows: Dict[str, Any] = {}  # Workflows Executive Summary
-rappel_workflows: Dict[str, Any] = {}  # Workflows Rappel de la mission
-atouts_workflows: Dict[str, Any] = {}  # Workflows Atouts de l'entreprise
-value_chain_workflows: Dict[str, Any] = {}  # Workflows Chaîne de valeur
-prerequis_evaluation_workflows: Dict[str, Any] = {}  # Workflows Évaluation des prérequis
-checkpointer = MemorySaver()
+
+def _submit_workflow_run(workflow_data, run_type: str, job, priority: int = PRIORITY_BATCH) -> str:
+    """
+    Soumet l'exécution d'un workflow au pool (le thread passe en 'running' au démarrage du job).
+    La progression (nœuds, durées, tokens, interrupts) est publiée sur le flux
+    d'événements du thread. Un run annulé s'arrête entre deux nœuds et le thread
+    retrouve le statut, l'état et le checkpoint LangGraph qu'il avait avant le run.
+
+    Args:
+        priority: Priorité des appels LLM du run face au gouverneur de concurrence
+    """
+    thread_id = workflow_data.thread_id
+    run_id = str(uuid.uuid4())
+    previous_status, previous_state = workflow_data.status, workflow_data.state
+
+    def publish(event: str, data: Dict[str, Any]) -> None:
+        with get_db_context() as db:
+            WorkflowEventRepository.create(db, thread_id, event, jsonable_encoder(data), run_id=run_id)
+
+    def run(is_cancelled):
+        workflow_data.status = "running"
+        workflow_registry.save(workflow_data)
+
+        recorder = ProgressRecorder(publish)
+        recorder.emit("run_start", {"run_type": run_type})
+        start = time.perf_counter()
+        # Point de retour : checkpoint du thread au démarrage du run
+        with rollback_point(checkpointer, thread_id) as rollback:
+            try:
+                with progress_recording(recorder), run_cancellation(is_cancelled), llm_priority(priority):
+                    result = job(is_cancelled)
+            except Exception as e:
+                workflow_data.status = "error"
+                workflow_registry.save(workflow_data)
+                recorder.emit("run_end", {
+                    "status": "failed",
+                    "error": str(e),
+                    "duration_ms": round((time.perf_counter() - start) * 1000),
+                    **recorder.tokens()
+                })
+                raise
+
+            cancelled = is_cancelled()
+            if cancelled:
+                # Le job n'a pas enregistré son résultat : le thread revient à son état d'avant le run,
+                # checkpoints compris (une reprise repart de l'interrupt d'origine)
+                rollback()
+                workflow_data.status, workflow_data.state = previous_status, previous_state
+                workflow_registry.save(workflow_data)
+
+        next_nodes = _pending_nodes(workflow_data)
+        if next_nodes and not cancelled:
+            recorder.emit("interrupt", {"next": next_nodes, "workflow_status": workflow_data.status})
+        recorder.emit("run_end", {
+            "status": "cancelled" if cancelled else "completed",
+            "workflow_status": workflow_data.status,
+            "duration_ms": round((time.perf_counter() - start) * 1000),
+            **recorder.tokens()
+        })
+        return result
+
+    return run_executor.submit(thread_id, run_type, run, run_id=run_id)
 
 # Dossier temporaire pour les fichiers uploadés
 UPLOAD_DIR = Path("/tmp/aiko_uploads")
@@ -222,6 +349,7 @@ class ClassifySpeakersInput(BaseModel):
     file_path: str
     interviewer_names: Optional[List[str]] = None
     known_speakers: Optional[Dict[str, str]] = None  # speaker_name -> role pour réutilisation
+    project_id: Optional[int] = None  # Projet courant : ses speakers déjà validés ne sont pas reclassifiés
 
 
 class WordExtractInput(BaseModel):
@@ -299,10 +427,15 @@ async def upload_files(files: List[UploadFile] = File(...)):
     """
     Upload des fichiers et retourne les chemins locaux.
     
+    Les fichiers sont stockés par contenu : des octets identiques ne sont stockés
+    qu'une fois, et le chemin retourné contient leur SHA-256.
+    
     Returns:
         {
-            "file_paths": ["/tmp/aiko_uploads/uuid_filename.xlsx", ...],
-            "file_types": {"workshop": [...], "transcript": [...]}
+            "file_paths": ["/tmp/aiko_uploads/<sha256>/filename.xlsx", ...],
+            "file_types": {"workshop": [...], "transcript": [...]},
+            "content_hashes": {"<file_path>": "<sha256>", ...},
+            "files": [{"file_path", "file_name", "sha256", "size", "deduplicated"}, ...]
         }
     """
     try:
@@ -320,39 +453,22 @@ async def upload_files(files: List[UploadFile] = File(...)):
         file_paths = []
         workshop_files = []
         transcript_files = []
+        stored_files = []
         
         for file in files:
-            # Générer un nom unique
-            file_id = str(uuid.uuid4())
-            file_extension = Path(file.filename).suffix
-            file_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
-            
-            # Sauvegarder le fichier
-            content = await file.read()
-            content_size = len(content)
-            
-            # Écrire le fichier
-            with open(file_path, "wb") as f:
-                f.write(content)
+            # Écriture par blocs hors de la boucle d'événements, hachage et déduplication par contenu
+            try:
+                stored = await store_upload(file, UPLOAD_DIR)
+            except UploadTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            file_path = stored.file_path
+            file_extension = file_path.suffix
             
-            # Vérifier que le fichier a bien été écrit
-            if not file_path.exists():
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Le fichier n'a pas pu être sauvegardé: {file_path}"
-                )
-            
-            # Vérifier la taille du fichier écrit
-            written_size = file_path.stat().st_size
-            if written_size != content_size:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Taille du fichier incorrecte: attendu {content_size} octets, obtenu {written_size} octets"
-                )
-            
-            print(f"✅ Fichier sauvegardé: {file_path} ({written_size} octets)")
+            status = "déjà présent, non dupliqué" if stored.deduplicated else f"{stored.size} octets"
+            print(f"✅ Fichier sauvegardé: {file_path} ({status})")
             
             file_paths.append(str(file_path))
+            stored_files.append(stored.to_dict())
             
             # Classifier par type
             if file_extension == ".xlsx":
@@ -371,7 +487,10 @@ async def upload_files(files: List[UploadFile] = File(...)):
                 "workshop": workshop_files,
                 "transcript": transcript_files
             },
-            "count": len(file_paths)
+            "count": len(file_paths),
+            # Empreintes SHA-256 du contenu (clés des caches en aval)
+            "content_hashes": {f["file_path"]: f["sha256"] for f in stored_files},
+            "files": stored_files
         }
     
     except HTTPException:
@@ -384,12 +503,17 @@ async def upload_files(files: List[UploadFile] = File(...)):
 
 
 @app.post("/transcripts/classify-speakers")
-async def classify_speakers(input_data: ClassifySpeakersInput):
+def classify_speakers(input_data: ClassifySpeakersInput):
     """
     Classe les speakers d'un transcript et extrait leurs rôles
     
     Args:
-        input_data: Contient file_path, interviewer_names (optionnel), et known_speakers (optionnel)
+        input_data: Contient file_path, interviewer_names (optionnel), known_speakers (optionnel)
+            et project_id (optionnel)
+    
+    Les speakers déjà connus (registre : mémoire puis table speakers, interviewers globaux
+    et speakers du projet) sont repris tels quels ; seuls les autres sont envoyés au LLM,
+    en un seul appel. Si tous sont connus, aucun appel LLM n'est fait.
     
     Returns:
         {
@@ -439,10 +563,11 @@ async def classify_speakers(input_data: ClassifySpeakersInput):
         
         # Parser le transcript selon son type
         file_extension = Path(file_path).suffix.lower()
+        # (résultat mis en cache par contenu : /documents/parse-transcript le réutilise)
         if file_extension == '.json':
-            interventions = json_parser.parse_transcript(file_path)
+            interventions = parse_cache.get_or_parse(file_path, json_parser)
         elif file_extension == '.pdf':
-            interventions = pdf_parser.parse_transcript(file_path)
+            interventions = parse_cache.get_or_parse(file_path, pdf_parser)
         else:
             raise HTTPException(status_code=400, detail=f"Format de fichier non supporté: {file_extension}")
         
@@ -455,43 +580,65 @@ async def classify_speakers(input_data: ClassifySpeakersInput):
         # Construire le dictionnaire de rôles connus
         known_roles = input_data.known_speakers or {}
         
-        # Pour JSON : extraire directement les speaker_name uniques et utiliser extract_roles_for_json_speakers
-        # Pour PDF : utiliser identify_and_extract_speakers_with_roles (identification + extraction rôles)
-        if file_extension == '.json':
-            # Extraire directement les speaker_name uniques du JSON
-            json_speakers = list(set(
-                interv.get("speaker", "") 
-                for interv in interventions 
-                if interv.get("speaker")
-            ))
-            
-            logger.info(f"🔍 [classify-speakers] Extraction rôles pour {len(json_speakers)} speakers JSON")
-            
-            # Utiliser la nouvelle fonction qui n'identifie pas les speakers (déjà fait par le JSON)
-            speakers_list = speaker_classifier.extract_roles_for_json_speakers(
-                json_speakers=json_speakers,
+        # Speakers uniques, dans l'ordre d'apparition
+        all_speakers = list(dict.fromkeys(
+            interv.get("speaker", "") 
+            for interv in interventions 
+            if interv.get("speaker")
+        ))
+        
+        # Résoudre les speakers connus en une fois (LRU puis une requête en base)
+        from database.speaker_registry import speaker_registry
+        resolved, unresolved = speaker_registry.resolve_many(all_speakers, project_id=input_data.project_id)
+        for name, info in resolved.items():
+            if info["speaker_type"] == "interviewer":
+                interviewer_names_set.add(name)
+        
+        known_speakers_list = [
+            {
+                "name": name,
+                "role": known_roles.get(name) or info["role"],
+                "level": info["level"] or "inconnu",
+                "is_interviewer": False
+            }
+            for name, info in resolved.items()
+            if name not in interviewer_names_set
+        ]
+        unresolved = [name for name in unresolved if name not in interviewer_names_set]
+        
+        if not unresolved:
+            logger.info(f"✅ [classify-speakers] {len(known_speakers_list)} speakers déjà connus, aucun appel LLM")
+            classified_list = []
+        elif file_extension == '.json':
+            # JSON : speakers déjà identifiés, extraire uniquement les rôles des speakers inconnus
+            logger.info(f"🔍 [classify-speakers] Extraction rôles pour {len(unresolved)}/{len(all_speakers)} speakers JSON")
+            classified_list = speaker_classifier.extract_roles_for_json_speakers(
+                json_speakers=unresolved,
                 interventions=interventions,
                 interviewer_names_set=interviewer_names_set,
                 known_roles=known_roles
             )
         else:
-            # Pour PDF : extraire TOUS les speakers uniques et identifier les vrais speakers
-            all_speakers = list(set(
-                interv.get("speaker", "") 
-                for interv in interventions 
-                if interv.get("speaker")
-            ))
-            
-            logger.info(f"🔍 [classify-speakers] Classification de {len(all_speakers)} speakers uniques (PDF)")
-            
-            # Utiliser la fonction qui identifie ET extrait les rôles
-            speakers_list = speaker_classifier.identify_and_extract_speakers_with_roles(
-                all_speakers=all_speakers,
+            # PDF : identifier les vrais speakers parmi les inconnus ET extraire leurs rôles
+            logger.info(f"🔍 [classify-speakers] Classification de {len(unresolved)}/{len(all_speakers)} speakers uniques (PDF)")
+            classified_list = speaker_classifier.identify_and_extract_speakers_with_roles(
+                all_speakers=unresolved,
                 interventions=interventions,
                 interviewer_names_set=interviewer_names_set,
                 known_roles=known_roles
             )
         
+        new_speakers_list = [speaker for speaker in classified_list if not speaker.get("is_interviewer")]
+        for speaker in new_speakers_list:
+            speaker_registry.remember_classification(
+                speaker["name"], speaker.get("role"), speaker.get("level"), input_data.project_id
+            )
+        
+        speakers_list = [
+            {"name": name, "role": "", "level": None, "is_interviewer": True}
+            for name in interviewer_names_set
+        ] + known_speakers_list + new_speakers_list
+        
         logger.info(f"✅ [classify-speakers] Classification terminée - {len(speakers_list)} speakers identifiés")
         return {"speakers": speakers_list}
     
@@ -551,7 +698,7 @@ async def extract_word_data(input_data: WordExtractInput):
 
 
 @app.post("/documents/parse-transcript")
-async def parse_and_save_transcript(input_data: ParseTranscriptInput):
+def parse_and_save_transcript(input_data: ParseTranscriptInput):
     """
     Parse et sauvegarde un transcript dans la base de données.
     
@@ -663,7 +810,7 @@ async def parse_and_save_word_report(input_data: ParseWordReportInput):
 
 
 @app.post("/threads/{thread_id}/runs")
-async def create_run(thread_id: str, workflow_input: WorkflowInput):
+def create_run(thread_id: str, workflow_input: WorkflowInput):
     """
     Démarre ou reprend un workflow.
     
@@ -680,23 +827,8 @@ async def create_run(thread_id: str, workflow_input: WorkflowInput):
     """
     try:
         # Créer ou récupérer le workflow
-        if thread_id not in workflows:
-            # Nouveau workflow
-            api_key = os.getenv("OPENAI_API_KEY")
-            # Vérifier si DEV_MODE est activé
-            dev_mode = os.getenv("DEV_MODE", "0") == "1"
-            workflow = NeedAnalysisWorkflow(
-                api_key=api_key,
-                dev_mode=dev_mode  # Activer dev_mode si DEV_MODE=1
-            )
-            workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created"
-            }
-        
-        workflow_data = workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(thread_id, NEED_ANALYSIS)
+        workflow = workflow_data.workflow
         
         # Lancer le workflow
         print(f"\n🚀 [API] Démarrage du workflow pour thread {thread_id}")
@@ -726,37 +858,45 @@ async def create_run(thread_id: str, workflow_input: WorkflowInput):
             if workflow_input.company_description:
                 company_info["company_description"] = workflow_input.company_description
         
-        # Exécuter le workflow (mode asynchrone géré par LangGraph)
-        result = workflow.run(
-            workshop_document_ids=workflow_input.workshop_document_ids,
-            transcript_document_ids=workflow_input.transcript_document_ids,
-            company_info=company_info,
-            interviewer_names=workflow_input.interviewer_names,
-            thread_id=thread_id,
-            additional_context=workflow_input.additional_context or "",
-            num_needs=workflow_input.num_needs,
-            num_quotes_per_need=workflow_input.num_quotes_per_need
-        )
-        
-        # Mettre à jour l'état
-        workflow_data["state"] = result
-        workflow_data["status"] = "completed" if result.get("success") else "paused"
+        def job(is_cancelled):
+            # Exécuter le workflow (mode asynchrone géré par LangGraph)
+            result = workflow.run(
+                workshop_document_ids=workflow_input.workshop_document_ids,
+                transcript_document_ids=workflow_input.transcript_document_ids,
+                company_info=company_info,
+                thread_id=thread_id,
+                additional_context=workflow_input.additional_context or "",
+                num_needs=workflow_input.num_needs,
+                num_quotes_per_need=workflow_input.num_quotes_per_need
+            )
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+            
+            # Mettre à jour l'état
+            workflow_data.state = result
+            workflow_data.status = "completed" if result.get("success") else "paused"
+            workflow_registry.save(workflow_data)
+            return {"status": workflow_data.status}
         
-        run_id = str(uuid.uuid4())
+        run_id = _submit_workflow_run(workflow_data, NEED_ANALYSIS, job)
         
         return {
             "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"]
+            "status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur workflow: {str(e)}")
 
 
 @app.get("/threads/{thread_id}/state")
-async def get_state(thread_id: str):
+def get_state(thread_id: str):
     """
     Récupère l'état actuel du workflow.
     Utilise le snapshot LangGraph pour déterminer le vrai prochain nœud.
@@ -769,11 +909,11 @@ async def get_state(thread_id: str):
             "next": ["node_name"] | []  # Prochain nœud ou vide si terminé
         }
     """
-    if thread_id not in workflows:
+    workflow_data = workflow_registry.get(thread_id, NEED_ANALYSIS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = workflows[thread_id]
-    workflow = workflow_data["workflow"]
+    workflow = workflow_data.workflow
     
     # Récupérer l'état actuel depuis le checkpointer LangGraph
     config = {"configurable": {"thread_id": thread_id}}
@@ -781,7 +921,7 @@ async def get_state(thread_id: str):
     
     if snapshot and snapshot.values:
         state = snapshot.values
-        workflow_data["state"] = state
+        workflow_data.state = state
         
         # Déterminer le prochain nœud depuis le snapshot LangGraph
         next_nodes = []
@@ -793,37 +933,38 @@ async def get_state(thread_id: str):
         
         # Mettre à jour le statut en fonction du prochain nœud
         if "human_validation" in next_nodes:
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif "pre_use_case_interrupt" in next_nodes:
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif "validate_use_cases" in next_nodes:
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif len(next_nodes) == 0:
-            workflow_data["status"] = "completed"
+            workflow_data.status = "completed"
         else:
-            workflow_data["status"] = "running"
+            workflow_data.status = "running"
         
         return {
             "thread_id": thread_id,
-            "status": workflow_data["status"],
+            "status": workflow_data.status,
             "values": state,
             "next": tuple(next_nodes) if next_nodes else []
         }
     else:
         # Fallback si pas de snapshot
-        state = workflow_data.get("state", {})
+        state = (workflow_data.state or {})
         return {
             "thread_id": thread_id,
-            "status": workflow_data.get("status", "paused"),
+            "status": (workflow_data.status or "paused"),
             "values": state,
             "next": []
         }
 
 
 @app.post("/threads/{thread_id}/validation")
-async def send_validation(thread_id: str, feedback: ValidationFeedback):
+def send_validation(thread_id: str, feedback: ValidationFeedback):
     """
-    Envoie le feedback de validation des besoins et reprend le workflow.
+    Envoie le feedback de validation des besoins et reprend le workflow en arrière-plan
+    (résultat via GET /runs/{run_id}/result).
     
     Args:
         thread_id: ID du thread
@@ -832,71 +973,86 @@ async def send_validation(thread_id: str, feedback: ValidationFeedback):
     Returns:
         {
             "status": "resumed",
+            "run_id": "uuid",
             "thread_id": "uuid"
         }
     """
-    if thread_id not in workflows:
+    workflow_data = workflow_registry.get(thread_id, NEED_ANALYSIS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du feedback de validation pour thread {thread_id}")
         print(f"✅ Validés: {len(feedback.validated_needs)}")
         print(f"❌ Rejetés: {len(feedback.rejected_needs)}")
         print(f"🎯 Action utilisateur: {feedback.user_action}")
         
-        # Reprendre le workflow avec le feedback
-        result = workflow.resume_workflow_with_feedback(
-            validated_needs=feedback.validated_needs,
-            rejected_needs=feedback.rejected_needs,
-            user_feedback=feedback.user_feedback,
-            user_action=feedback.user_action,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le feedback
+            result = workflow.resume_workflow_with_feedback(
+                validated_needs=feedback.validated_needs,
+                rejected_needs=feedback.rejected_needs,
+                user_feedback=feedback.user_feedback,
+                user_action=feedback.user_action,
+                thread_id=thread_id
+            )
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Récupérer le snapshot LangGraph pour déterminer le vrai statut
-        config = {"configurable": {"thread_id": thread_id}}
-        snapshot = workflow.graph.get_state(config)
+            # Mettre à jour l'état
+            workflow_data.state = result
+        
+            # Récupérer le snapshot LangGraph pour déterminer le vrai statut
+            config = {"configurable": {"thread_id": thread_id}}
+            snapshot = workflow.graph.get_state(config)
         
-        if snapshot and snapshot.next:
-            next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
+            if snapshot and snapshot.next:
+                next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
             
-            # Mettre à jour le statut en fonction du prochain nœud réel
-            if "pre_use_case_interrupt" in next_nodes:
-                workflow_data["status"] = "paused"  # Va s'arrêter à pre_use_case_interrupt
-            elif "human_validation" in next_nodes:
-                workflow_data["status"] = "paused"  # Va s'arrêter à human_validation
-            elif len(next_nodes) == 0:
-                workflow_data["status"] = "completed"
-            else:
-                workflow_data["status"] = "running"
-        else:
-            # Fallback : déterminer le statut selon l'action utilisateur
-            if feedback.user_action == "continue_to_use_cases":
-                workflow_data["status"] = "paused"  # Va s'arrêter à pre_use_case_interrupt
+                # Mettre à jour le statut en fonction du prochain nœud réel
+                if "pre_use_case_interrupt" in next_nodes:
+                    workflow_data.status = "paused"  # Va s'arrêter à pre_use_case_interrupt
+                elif "human_validation" in next_nodes:
+                    workflow_data.status = "paused"  # Va s'arrêter à human_validation
+                elif len(next_nodes) == 0:
+                    workflow_data.status = "completed"
+                else:
+                    workflow_data.status = "running"
             else:
-                workflow_data["status"] = "paused"  # Va continuer avec analyze_needs
+                # Fallback : déterminer le statut selon l'action utilisateur
+                if feedback.user_action == "continue_to_use_cases":
+                    workflow_data.status = "paused"  # Va s'arrêter à pre_use_case_interrupt
+                else:
+                    workflow_data.status = "paused"  # Va continuer avec analyze_needs
         
+            workflow_registry.save(workflow_data)
+            return {"workflow_status": workflow_data.status}
+        
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "need_analysis_validation", job, priority=PRIORITY_INTERACTIVE)
         return {
             "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "workflow_status": workflow_data["status"]
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur reprise workflow: {str(e)}")
 
 
 @app.post("/threads/{thread_id}/pre-use-case-context")
-async def send_pre_use_case_context(thread_id: str, context_input: PreUseCaseContextInput):
+def send_pre_use_case_context(thread_id: str, context_input: PreUseCaseContextInput):
     """
-    Envoie le contexte additionnel avant la génération des use cases et reprend le workflow.
+    Envoie le contexte additionnel avant la génération des use cases et reprend le workflow
+    en arrière-plan (résultat via GET /runs/{run_id}/result).
     
     Args:
         thread_id: ID du thread
@@ -905,46 +1061,61 @@ async def send_pre_use_case_context(thread_id: str, context_input: PreUseCaseCon
     Returns:
         {
             "status": "resumed",
+            "run_id": "uuid",
             "thread_id": "uuid"
         }
     """
-    if thread_id not in workflows:
+    workflow_data = workflow_registry.get(thread_id, NEED_ANALYSIS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du contexte additionnel pour thread {thread_id}")
         print(f"💡 Contexte: {len(context_input.use_case_additional_context)} caractères")
         print(f"🏷️ Famille: {context_input.use_case_famille or 'Non spécifiée'}")
         
-        # Reprendre le workflow avec le contexte
-        result = workflow.resume_pre_use_case_interrupt_with_context(
-            use_case_additional_context=context_input.use_case_additional_context,
-            use_case_famille=context_input.use_case_famille,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le contexte
+            result = workflow.resume_pre_use_case_interrupt_with_context(
+                use_case_additional_context=context_input.use_case_additional_context,
+                use_case_famille=context_input.use_case_famille,
+                thread_id=thread_id
+            )
+        
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+        
+            # Mettre à jour l'état
+            workflow_data.state = result
+            workflow_data.status = "running"  # Le workflow va générer les use cases
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
-        workflow_data["status"] = "running"  # Le workflow va générer les use cases
+            workflow_registry.save(workflow_data)
+            return {"workflow_status": workflow_data.status}
         
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "need_analysis_pre_use_case", job, priority=PRIORITY_INTERACTIVE)
         return {
             "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "workflow_status": workflow_data["status"]
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur reprise workflow: {str(e)}")
 
 
 @app.post("/threads/{thread_id}/use-case-validation")
-async def send_use_case_validation(thread_id: str, feedback: UseCaseValidationFeedback):
+def send_use_case_validation(thread_id: str, feedback: UseCaseValidationFeedback):
     """
-    Envoie le feedback de validation des use cases et reprend le workflow.
+    Envoie le feedback de validation des use cases et reprend le workflow en arrière-plan
+    (résultat final via GET /runs/{run_id}/result).
     
     Args:
         thread_id: ID du thread
@@ -952,67 +1123,77 @@ async def send_use_case_validation(thread_id: str, feedback: UseCaseValidationFe
     
     Returns:
         {
-            "status": "completed",
+            "status": "resumed",
+            "run_id": "uuid",
             "thread_id": "uuid"
         }
     """
-    if thread_id not in workflows:
+    workflow_data = workflow_registry.get(thread_id, NEED_ANALYSIS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du feedback use cases pour thread {thread_id}")
         print(f"✅ Cas d'usage validés: {len(feedback.validated_use_cases)}")
         print(f"🎯 Action: {feedback.use_case_user_action}")
         
-        # Reprendre le workflow avec le feedback
-        result = workflow.resume_use_case_workflow_with_feedback(
-            validated_use_cases=feedback.validated_use_cases,
-            rejected_use_cases=feedback.rejected_use_cases,
-            user_feedback=feedback.user_feedback,
-            use_case_user_action=feedback.use_case_user_action,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le feedback
+            result = workflow.resume_use_case_workflow_with_feedback(
+                validated_use_cases=feedback.validated_use_cases,
+                rejected_use_cases=feedback.rejected_use_cases,
+                user_feedback=feedback.user_feedback,
+                use_case_user_action=feedback.use_case_user_action,
+                thread_id=thread_id
+            )
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Déterminer le statut selon l'action utilisateur
-        if feedback.use_case_user_action == "finalize_use_cases":
-            workflow_data["status"] = "completed"
-        else:
-            workflow_data["status"] = "paused"  # Va continuer avec analyze_use_cases
+            # Mettre à jour l'état
+            workflow_data.state = result
         
+            # Déterminer le statut selon l'action utilisateur
+            if feedback.use_case_user_action == "finalize_use_cases":
+                workflow_data.status = "completed"
+            else:
+                workflow_data.status = "paused"  # Va continuer avec analyze_use_cases
+        
+            workflow_registry.save(workflow_data)
+            return {
+                "status": workflow_data.status,
+                "thread_id": thread_id,
+                "final_results": result,
+                "success": result.get("success", False),
+                "workflow_status": workflow_data.status
+            }
+        
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "need_analysis_use_case_validation", job, priority=PRIORITY_INTERACTIVE)
         return {
-            "status": workflow_data["status"],
+            "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "final_results": result,
-            "success": result.get("success", False),
-            "workflow_status": workflow_data["status"]
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur reprise workflow: {str(e)}")
 
 
 @app.post("/rappel-mission/threads/{thread_id}/runs")
-async def create_rappel_mission_run(thread_id: str, mission_input: RappelMissionInput):
+def create_rappel_mission_run(thread_id: str, mission_input: RappelMissionInput):
     """Démarre un workflow dédié au rappel de la mission."""
 
     try:
-        if thread_id not in rappel_workflows:
-            workflow = RappelMissionWorkflow()
-            rappel_workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created",
-            }
-
-        workflow_data = rappel_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(thread_id, RAPPEL_MISSION)
+        workflow = workflow_data.workflow
 
         result = workflow.run(
             company_name=mission_input.company_name,
@@ -1020,12 +1201,13 @@ async def create_rappel_mission_run(thread_id: str, mission_input: RappelMission
             thread_id=thread_id
         )
 
-        workflow_data["state"] = result
-        workflow_data["status"] = "completed" if result.get("success") else "error"
+        workflow_data.state = result
+        workflow_data.status = "completed" if result.get("success") else "error"
 
+        workflow_registry.save(workflow_data)
         return {
             "thread_id": thread_id,
-            "status": workflow_data["status"],
+            "status": workflow_data.status,
             "result": result,
         }
 
@@ -1034,76 +1216,81 @@ async def create_rappel_mission_run(thread_id: str, mission_input: RappelMission
 
 
 @app.get("/rappel-mission/threads/{thread_id}/state")
-async def get_rappel_mission_state(thread_id: str):
+def get_rappel_mission_state(thread_id: str):
     """Récupère l'état courant du workflow rappel de mission."""
 
-    if thread_id not in rappel_workflows:
+    workflow_data = workflow_registry.get(thread_id, RAPPEL_MISSION)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
 
     return {
         "thread_id": thread_id,
-        "status": rappel_workflows[thread_id]["status"],
-        "state": rappel_workflows[thread_id]["state"],
+        "status": workflow_data.status,
+        "state": workflow_data.state,
     }
 
 
 @app.post("/atouts-entreprise/threads/{thread_id}/runs")
-async def create_atouts_run(thread_id: str, atouts_input: AtoutsEntrepriseInput):
+def create_atouts_run(thread_id: str, atouts_input: AtoutsEntrepriseInput):
     """Démarre un workflow d'extraction des atouts de l'entreprise"""
     try:
-        if thread_id not in atouts_workflows:
-            workflow = AtoutsWorkflow(
-                interviewer_names=atouts_input.interviewer_names,
-                checkpointer=checkpointer
-            )
-            atouts_workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created"
-            }
-        
-        workflow_data = atouts_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(
+            thread_id,
+            ATOUTS,
+            params={"interviewer_names": atouts_input.interviewer_names}
+        )
+        workflow = workflow_data.workflow
         
         print(f"\n🚀 [API] Démarrage workflow Atouts pour thread {thread_id}")
         print(f"📁 Documents: {len(atouts_input.transcript_document_ids)}")
         print(f"🏢 Entreprise: {atouts_input.company_info.get('nom', 'N/A')}")
         print(f"📝 Contexte additionnel: {len(atouts_input.atouts_additional_context)} caractères")
         
-        # Exécuter le workflow avec le contexte additionnel
-        result = workflow.run(
-            transcript_document_ids=atouts_input.transcript_document_ids,
-            company_info=atouts_input.company_info,
-            thread_id=thread_id,
-            atouts_additional_context=atouts_input.atouts_additional_context,
-            validated_speakers=atouts_input.validated_speakers
-        )
+        def job(is_cancelled):
+            # Exécuter le workflow avec le contexte additionnel
+            result = workflow.run(
+                transcript_document_ids=atouts_input.transcript_document_ids,
+                company_info=atouts_input.company_info,
+                thread_id=thread_id,
+                atouts_additional_context=atouts_input.atouts_additional_context,
+                validated_speakers=atouts_input.validated_speakers
+            )
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+            
+            workflow_data.state = result
+            workflow_data.status = "paused" if result.get("atouts_workflow_paused") else ("completed" if result.get("success") else "error")
+            workflow_registry.save(workflow_data)
+            return result
         
-        workflow_data["state"] = result
-        workflow_data["status"] = "paused" if result.get("atouts_workflow_paused") else ("completed" if result.get("success") else "error")
+        run_id = _submit_workflow_run(workflow_data, ATOUTS, job)
         
         return {
+            "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"],
-            "result": result
+            "status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur Atouts: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur workflow atouts: {str(e)}")
 
 
 @app.get("/atouts-entreprise/threads/{thread_id}/state")
-async def get_atouts_state(thread_id: str):
+def get_atouts_state(thread_id: str):
     """
     Récupère l'état actuel du workflow Atouts.
     Utilise le snapshot LangGraph pour déterminer le vrai prochain nœud.
     """
-    if thread_id not in atouts_workflows:
+    workflow_data = workflow_registry.get(thread_id, ATOUTS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = atouts_workflows[thread_id]
-    workflow = workflow_data["workflow"]
+    workflow = workflow_data.workflow
     
     # Récupérer l'état actuel depuis le checkpointer LangGraph
     config = {"configurable": {"thread_id": thread_id}}
@@ -1111,7 +1298,7 @@ async def get_atouts_state(thread_id: str):
     
     if snapshot and snapshot.values:
         state = snapshot.values
-        workflow_data["state"] = state
+        workflow_data.state = state
         
         # Déterminer le prochain nœud depuis le snapshot LangGraph
         next_nodes = []
@@ -1123,85 +1310,99 @@ async def get_atouts_state(thread_id: str):
         
         # Mettre à jour le statut en fonction du prochain nœud
         if "pre_atout_interrupt" in next_nodes:
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif "validate_atouts" in next_nodes:
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif len(next_nodes) == 0:
-            workflow_data["status"] = "completed"
+            workflow_data.status = "completed"
         else:
-            workflow_data["status"] = "running"
+            workflow_data.status = "running"
         
         return {
             "thread_id": thread_id,
-            "status": workflow_data["status"],
+            "status": workflow_data.status,
             "values": state,
             "next": tuple(next_nodes) if next_nodes else []
         }
     else:
         # Fallback si pas de snapshot
-        state = workflow_data.get("state", {})
+        state = (workflow_data.state or {})
         return {
             "thread_id": thread_id,
-            "status": workflow_data.get("status", "paused"),
+            "status": (workflow_data.status or "paused"),
             "values": state,
             "next": []
         }
 
 
 @app.post("/atouts-entreprise/threads/{thread_id}/validate")
-async def send_atouts_validation(thread_id: str, feedback: AtoutsValidationFeedback):
+def send_atouts_validation(thread_id: str, feedback: AtoutsValidationFeedback):
     """
-    Envoie le feedback de validation des atouts et reprend le workflow.
+    Envoie le feedback de validation des atouts et reprend le workflow en arrière-plan
+    (résultat via GET /runs/{run_id}/result).
     """
-    if thread_id not in atouts_workflows:
+    workflow_data = workflow_registry.get(thread_id, ATOUTS)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = atouts_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du feedback de validation atouts pour thread {thread_id}")
         print(f"✅ Validés: {len(feedback.validated_atouts)}")
         print(f"❌ Rejetés: {len(feedback.rejected_atouts)}")
         print(f"🎯 Action utilisateur: {feedback.atouts_user_action}")
         
-        # Reprendre le workflow avec le feedback
-        result = workflow.resume_workflow_with_validation(
-            validated_atouts=feedback.validated_atouts,
-            rejected_atouts=feedback.rejected_atouts,
-            user_feedback=feedback.user_feedback,
-            atouts_user_action=feedback.atouts_user_action,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le feedback
+            result = workflow.resume_workflow_with_validation(
+                validated_atouts=feedback.validated_atouts,
+                rejected_atouts=feedback.rejected_atouts,
+                user_feedback=feedback.user_feedback,
+                atouts_user_action=feedback.atouts_user_action,
+                thread_id=thread_id
+            )
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Récupérer le snapshot LangGraph pour déterminer le vrai statut
-        config = {"configurable": {"thread_id": thread_id}}
-        snapshot = workflow.graph.get_state(config)
+            # Mettre à jour l'état
+            workflow_data.state = result
         
-        if snapshot and snapshot.next:
-            next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
+            # Récupérer le snapshot LangGraph pour déterminer le vrai statut
+            config = {"configurable": {"thread_id": thread_id}}
+            snapshot = workflow.graph.get_state(config)
+        
+            if snapshot and snapshot.next:
+                next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
             
-            if "validate_atouts" in next_nodes:
-                workflow_data["status"] = "paused"
-            elif len(next_nodes) == 0:
-                workflow_data["status"] = "completed"
-            else:
-                workflow_data["status"] = "running"
-        else:
-            if result.get("success"):
-                workflow_data["status"] = "completed"
+                if "validate_atouts" in next_nodes:
+                    workflow_data.status = "paused"
+                elif len(next_nodes) == 0:
+                    workflow_data.status = "completed"
+                else:
+                    workflow_data.status = "running"
             else:
-                workflow_data["status"] = "paused"
+                if result.get("success"):
+                    workflow_data.status = "completed"
+                else:
+                    workflow_data.status = "paused"
         
+            workflow_registry.save(workflow_data)
+            return {"workflow_status": workflow_data.status}
+        
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "atouts_validation", job, priority=PRIORITY_INTERACTIVE)
         return {
             "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "workflow_status": workflow_data["status"]
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur reprise workflow: {str(e)}")
@@ -1210,79 +1411,60 @@ async def send_atouts_validation(thread_id: str, feedback: AtoutsValidationFeedb
 # ==================== ENDPOINTS CHAÎNE DE VALEUR ====================
 
 @app.post("/value-chain/threads/{thread_id}/runs")
-async def create_value_chain_run(thread_id: str, value_chain_input: ValueChainInput):
+def create_value_chain_run(thread_id: str, value_chain_input: ValueChainInput):
     """Démarre un workflow d'extraction de la chaîne de valeur"""
     try:
-        if thread_id not in value_chain_workflows:
-            workflow = ValueChainWorkflow(checkpointer=checkpointer)
-            value_chain_workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created"
-            }
-        
-        workflow_data = value_chain_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(thread_id, VALUE_CHAIN)
+        workflow = workflow_data.workflow
         
         print(f"\n🚀 [API] Démarrage workflow Chaîne de valeur pour thread {thread_id}")
         print(f"📁 Documents: {len(value_chain_input.transcript_document_ids)}")
         print(f"🏢 Entreprise: {value_chain_input.company_info.get('nom', 'N/A')}")
         
-        # Exécuter le workflow
-        result = workflow.run(
-            transcript_document_ids=value_chain_input.transcript_document_ids,
-            company_info=value_chain_input.company_info,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Exécuter le workflow
+            result = workflow.run(
+                transcript_document_ids=value_chain_input.transcript_document_ids,
+                company_info=value_chain_input.company_info,
+                thread_id=thread_id
+            )
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+            
+            workflow_data.state = result
+            workflow_data.status = "paused" if result.get("workflow_paused") else ("completed" if result.get("success") else "error")
+            workflow_registry.save(workflow_data)
+            return result
         
-        workflow_data["state"] = result
-        workflow_data["status"] = "paused" if result.get("workflow_paused") else ("completed" if result.get("success") else "error")
+        run_id = _submit_workflow_run(workflow_data, VALUE_CHAIN, job)
         
         return {
+            "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"],
-            "result": result
+            "status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur Chaîne de valeur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur workflow chaîne de valeur: {str(e)}")
 
 
 @app.get("/value-chain/threads/{thread_id}/state")
-async def get_value_chain_state(thread_id: str):
+def get_value_chain_state(thread_id: str):
     """
     Récupère l'état actuel du workflow Chaîne de valeur.
     Utilise le snapshot LangGraph pour déterminer le vrai prochain nœud.
     """
-    # Si le thread n'existe pas encore dans le dictionnaire, vérifier s'il existe dans le checkpointer
-    if thread_id not in value_chain_workflows:
-        # Vérifier si le thread existe dans le checkpointer LangGraph
-        try:
-            # Créer un workflow temporaire pour vérifier
-            temp_workflow = ValueChainWorkflow(checkpointer=checkpointer)
-            config = {"configurable": {"thread_id": thread_id}}
-            snapshot = temp_workflow.graph.get_state(config)
-            
-            if snapshot and snapshot.values:
-                # Le thread existe dans le checkpointer, initialiser le workflow
-                workflow = ValueChainWorkflow(checkpointer=checkpointer)
-                value_chain_workflows[thread_id] = {
-                    "workflow": workflow,
-                    "state": snapshot.values,
-                    "status": "paused" if snapshot.next else "completed"
-                }
-            else:
-                # Le thread n'existe nulle part
-                raise HTTPException(status_code=404, detail="Thread non trouvé")
-        except HTTPException:
-            raise
-        except Exception as e:
-            # Si erreur lors de la vérification, retourner 404
-            raise HTTPException(status_code=404, detail=f"Thread non trouvé: {str(e)}")
+    # Le registre reconstruit aussi les threads présents uniquement dans le checkpointer
+    workflow_data = workflow_registry.get(thread_id, VALUE_CHAIN)
+    if workflow_data is None:
+        raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = value_chain_workflows[thread_id]
-    workflow = workflow_data["workflow"]
+    workflow = workflow_data.workflow
     
     # Récupérer l'état actuel depuis le checkpointer LangGraph
     config = {"configurable": {"thread_id": thread_id}}
@@ -1290,7 +1472,7 @@ async def get_value_chain_state(thread_id: str):
     
     if snapshot and snapshot.values:
         state = snapshot.values
-        workflow_data["state"] = state
+        workflow_data.state = state
         
         # Déterminer le prochain nœud depuis le snapshot LangGraph
         next_nodes = []
@@ -1302,40 +1484,41 @@ async def get_value_chain_state(thread_id: str):
         
         # Mettre à jour le statut en fonction du prochain nœud
         if any(node in next_nodes for node in ["validate_teams", "validate_missions", "validate_friction_points"]):
-            workflow_data["status"] = "paused"
+            workflow_data.status = "paused"
         elif len(next_nodes) == 0:
-            workflow_data["status"] = "completed"
+            workflow_data.status = "completed"
         else:
-            workflow_data["status"] = "running"
+            workflow_data.status = "running"
         
         return {
             "thread_id": thread_id,
-            "status": workflow_data["status"],
+            "status": workflow_data.status,
             "values": state,
             "next": tuple(next_nodes) if next_nodes else []
         }
     else:
         # Fallback si pas de snapshot
-        state = workflow_data.get("state", {})
+        state = (workflow_data.state or {})
         return {
             "thread_id": thread_id,
-            "status": workflow_data.get("status", "paused"),
+            "status": (workflow_data.status or "paused"),
             "values": state,
             "next": []
         }
 
 
 @app.post("/value-chain/threads/{thread_id}/validate")
-async def send_value_chain_validation(thread_id: str, feedback: ValueChainValidationFeedback):
+def send_value_chain_validation(thread_id: str, feedback: ValueChainValidationFeedback):
     """
-    Envoie le feedback de validation de la chaîne de valeur et reprend le workflow.
+    Envoie le feedback de validation de la chaîne de valeur et reprend le workflow en arrière-plan
+    (résultat via GET /runs/{run_id}/result).
     """
-    if thread_id not in value_chain_workflows:
+    workflow_data = workflow_registry.get(thread_id, VALUE_CHAIN)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = value_chain_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du feedback de validation chaîne de valeur pour thread {thread_id}")
         print(f"📋 Type de validation: {feedback.validation_type}")
@@ -1343,51 +1526,63 @@ async def send_value_chain_validation(thread_id: str, feedback: ValueChainValida
         print(f"❌ Rejetés: {len(feedback.rejected_items)}")
         print(f"🎯 Action utilisateur: {feedback.user_action}")
         
-        # Reprendre le workflow avec le feedback
-        result = workflow.resume_workflow_with_validation(
-            validation_type=feedback.validation_type,
-            validated_items=feedback.validated_items,
-            rejected_items=feedback.rejected_items,
-            user_action=feedback.user_action,
-            thread_id=thread_id
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le feedback
+            result = workflow.resume_workflow_with_validation(
+                validation_type=feedback.validation_type,
+                validated_items=feedback.validated_items,
+                rejected_items=feedback.rejected_items,
+                user_action=feedback.user_action,
+                thread_id=thread_id
+            )
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Récupérer le snapshot LangGraph pour déterminer le vrai statut
-        config = {"configurable": {"thread_id": thread_id}}
-        snapshot = workflow.graph.get_state(config)
+            # Mettre à jour l'état
+            workflow_data.state = result
         
-        if snapshot and snapshot.next:
-            next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
+            # Récupérer le snapshot LangGraph pour déterminer le vrai statut
+            config = {"configurable": {"thread_id": thread_id}}
+            snapshot = workflow.graph.get_state(config)
+        
+            if snapshot and snapshot.next:
+                next_nodes = list(snapshot.next) if isinstance(snapshot.next, (list, tuple)) else [snapshot.next]
             
-            if any(node in next_nodes for node in ["validate_teams", "validate_missions", "validate_friction_points"]):
-                workflow_data["status"] = "paused"
-            elif len(next_nodes) == 0:
-                workflow_data["status"] = "completed"
-            else:
-                workflow_data["status"] = "running"
-        else:
-            if result.get("success"):
-                workflow_data["status"] = "completed"
+                if any(node in next_nodes for node in ["validate_teams", "validate_missions", "validate_friction_points"]):
+                    workflow_data.status = "paused"
+                elif len(next_nodes) == 0:
+                    workflow_data.status = "completed"
+                else:
+                    workflow_data.status = "running"
             else:
-                workflow_data["status"] = "paused"
+                if result.get("success"):
+                    workflow_data.status = "completed"
+                else:
+                    workflow_data.status = "paused"
+        
+            workflow_registry.save(workflow_data)
+            return {"workflow_status": workflow_data.status, "result": result}
         
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "value_chain_validation", job, priority=PRIORITY_INTERACTIVE)
         return {
             "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "workflow_status": workflow_data["status"],
-            "result": result
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur reprise workflow: {str(e)}")
 
 
 @app.delete("/threads/{thread_id}")
-async def delete_thread(thread_id: str):
+def delete_thread(thread_id: str):
     """
     Supprime un thread et nettoie les ressources.
     
@@ -1396,89 +1591,231 @@ async def delete_thread(thread_id: str):
     """
     deleted = False
 
-    if thread_id in workflows:
-        del workflows[thread_id]
+    # Supprimer les checkpoints persistés du thread
+    thread_config = {"configurable": {"thread_id": thread_id}}
+    if checkpointer.get_tuple(thread_config) is not None:
+        checkpointer.delete_thread(thread_id)
         deleted = True
 
-    if thread_id in executive_workflows:
-        del executive_workflows[thread_id]
+    # Supprimer le thread du registre des workflows et ses événements de progression
+    if workflow_registry.delete(thread_id):
         deleted = True
+    with get_db_context() as db:
+        WorkflowEventRepository.delete_by_thread(db, thread_id)
 
-    if thread_id in rappel_workflows:
-        del rappel_workflows[thread_id]
-        deleted = True
+    if deleted:
+        return {"status": "deleted", "thread_id": thread_id}
 
-    if thread_id in atouts_workflows:
-        del atouts_workflows[thread_id]
-        deleted = True
+    raise HTTPException(status_code=404, detail="Thread non trouvé")
 
-    if thread_id in value_chain_workflows:
-        del value_chain_workflows[thread_id]
-        deleted = True
 
-    if thread_id in prerequis_evaluation_workflows:
-        del prerequis_evaluation_workflows[thread_id]
-        deleted = True
+# ==================== FLUX D'ÉVÉNEMENTS (SSE) ====================
 
-    if deleted:
-        return {"status": "deleted", "thread_id": thread_id}
+def _fetch_events(thread_id: str, after_id: int) -> List[Dict[str, Any]]:
+    with get_db_context() as db:
+        return [
+            {"id": e.id, "event": e.event, "run_id": e.run_id, "data": e.data}
+            for e in WorkflowEventRepository.get_after(db, thread_id, after_id)
+        ]
 
-    raise HTTPException(status_code=404, detail="Thread non trouvé")
+
+@app.get("/threads/{thread_id}/events")
+async def stream_thread_events(thread_id: str, request: Request, after: int = 0):
+    """
+    Flux SSE de la progression des runs d'un thread (tous types de workflow).
+    
+    Événements : run_start, node_start, node_end (durée, tokens), node_error,
+    partial_item (besoin / cas d'usage généré en streaming), interrupt (nœuds
+    en attente de validation), run_end.
+    Reprise possible via l'en-tête Last-Event-ID ou le paramètre `after`.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    cursor = int(last_event_id) if last_event_id.isdigit() else after
+
+    async def event_stream():
+        nonlocal cursor
+        idle = 0.0
+        # Délai de reconnexion conseillé au client
+        yield "retry: 2000\n\n"
+        while not await request.is_disconnected():
+            events = await asyncio.to_thread(_fetch_events, thread_id, cursor)
+            for event in events:
+                cursor = event["id"]
+                payload = json.dumps({"run_id": event["run_id"], **event["data"]}, ensure_ascii=False)
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+            if events:
+                idle = 0.0
+                continue
+            idle += EVENT_STREAM_POLL_SECONDS
+            if idle >= EVENT_STREAM_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(EVENT_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/threads/{thread_id}/partial-items")
+def get_partial_items(thread_id: str, kind: Optional[str] = None, run_id: Optional[str] = None):
+    """
+    Éléments (besoins, cas d'usage) déjà générés en streaming par un run, pour
+    remplir l'interface de validation avant la fin de la génération.
+    
+    Args:
+        kind: "need" ou "use_case" (défaut: tous)
+        run_id: Run concerné (défaut: dernier run ayant publié des éléments)
+    
+    Returns:
+        {"run_id": "uuid" | null, "items": [{"kind": "need", "index": 0, "item": {...}}, ...]}
+    """
+    with get_db_context() as db:
+        events = WorkflowEventRepository.get_by_event(db, thread_id, "partial_item", run_id=run_id)
+        events = [(e.run_id, e.data) for e in events if kind is None or e.data.get("kind") == kind]
+    
+    if not events:
+        return {"run_id": run_id, "items": []}
+    
+    run_id = run_id or events[-1][0]
+    # Une nouvelle génération du même type repart de l'index 0 : ne garder que la dernière
+    items_by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for event_run_id, data in events:
+        if event_run_id != run_id:
+            continue
+        if data.get("index") == 0:
+            items_by_kind[data.get("kind")] = []
+        items_by_kind.setdefault(data.get("kind"), []).append(data)
+    return {"run_id": run_id, "items": [item for items in items_by_kind.values() for item in items]}
+
+
+# ==================== ENDPOINTS RUNS ====================
+
+@app.get("/runs/stats")
+def get_runs_stats():
+    """Runs en cours ou en attente dans ce worker, précalculs spéculatifs, cache de parsing et workflows compilés"""
+    return {
+        **run_executor.get_stats(),
+        "speculation": speculative_executor.get_stats(),
+        "parse_cache": parse_cache.get_stats(),
+        "workflows": workflow_registry.get_stats(),
+    }
+
+
+@app.get("/llm/stats")
+def get_llm_gateway_stats():
+    """Appels LLM de ce worker par modèle (latence, tokens, retries, attente de throttling)"""
+    return get_llm_stats()
+
+
+@app.get("/runs/{run_id}")
+def get_run(run_id: str):
+    """
+    Récupère le statut d'un run lancé en arrière-plan.
+    
+    Returns:
+        {
+            "run_id": "uuid",
+            "thread_id": "uuid",
+            "status": "pending" | "running" | "cancelling" | "completed" | "failed" | "cancelled",
+            ...
+        }
+    """
+    run = run_executor.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run non trouvé")
+    run.pop("result")
+    return run
+
+
+@app.get("/runs/{run_id}/result")
+def get_run_result(run_id: str):
+    """Récupère le résultat d'un run terminé (409 si le run n'est pas terminé)"""
+    run = run_executor.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run non trouvé")
+    if run["status"] not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Run non terminé (statut: {run['status']})")
+    return {
+        "run_id": run_id,
+        "status": run["status"],
+        "result": run["result"],
+        "error": run["error"]
+    }
+
+
+@app.post("/runs/{run_id}/cancel")
+def cancel_run(run_id: str):
+    """
+    Annule un run : immédiat s'il est en attente, au prochain nœud s'il est en cours.
+    
+    Returns:
+        {"run_id": "uuid", "status": "cancelled" | "cancelling" | ...}
+    """
+    status = run_executor.cancel(run_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Run non trouvé")
+    return {"run_id": run_id, "status": status}
 
 
 # ==================== ENDPOINTS ÉVALUATION PRÉREQUIS ====================
 
 @app.post("/prerequis-evaluation/threads/{thread_id}/runs")
-async def create_prerequis_evaluation_run(thread_id: str, prerequis_input: PrerequisEvaluationInput):
+def create_prerequis_evaluation_run(thread_id: str, prerequis_input: PrerequisEvaluationInput):
     """Démarre un workflow d'évaluation des prérequis"""
     try:
-        if thread_id not in prerequis_evaluation_workflows:
-            workflow = PrerequisEvaluationWorkflow(checkpointer=checkpointer)
-            prerequis_evaluation_workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created"
-            }
-        
-        workflow_data = prerequis_evaluation_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(thread_id, PREREQUIS_EVALUATION)
+        workflow = workflow_data.workflow
         
         print(f"\n🚀 [API] Démarrage workflow Évaluation prérequis pour thread {thread_id}")
         print(f"📁 Documents: {len(prerequis_input.transcript_document_ids)}")
         print(f"🏢 Entreprise: {prerequis_input.company_info.get('nom', 'N/A')}")
         print(f"📋 Cas d'usage validés: {len(prerequis_input.validated_use_cases)}")
         
-        # Exécuter le workflow
-        result = workflow.run(
-            transcript_document_ids=prerequis_input.transcript_document_ids,
-            company_info=prerequis_input.company_info,
-            validated_use_cases=prerequis_input.validated_use_cases,
-            thread_id=thread_id,
-            comments=prerequis_input.comments
-        )
-        
-        workflow_data["state"] = result
+        def job(is_cancelled):
+            # Exécuter le workflow
+            result = workflow.run(
+                transcript_document_ids=prerequis_input.transcript_document_ids,
+                company_info=prerequis_input.company_info,
+                validated_use_cases=prerequis_input.validated_use_cases,
+                thread_id=thread_id,
+                comments=prerequis_input.comments
+            )
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+            
+            workflow_data.state = result
+            
+            # Vérifier si on est en attente de validation
+            if result.get("validation_pending", False):
+                workflow_data.status = "validation_pending"
+            else:
+                workflow_data.status = "completed" if result.get("success") else "error"
+            workflow_registry.save(workflow_data)
+            return result
         
-        # Vérifier si on est en attente de validation
-        if result.get("validation_pending", False):
-            workflow_data["status"] = "validation_pending"
-        else:
-            workflow_data["status"] = "completed" if result.get("success") else "error"
+        run_id = _submit_workflow_run(workflow_data, PREREQUIS_EVALUATION, job)
         
         return {
+            "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"],
-            "result": result,
-            "validation_pending": result.get("validation_pending", False)
+            "status": "running",
+            "validation_pending": False
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur Évaluation prérequis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur workflow évaluation prérequis: {str(e)}")
 
 
 @app.get("/prerequis-evaluation/threads/{thread_id}/state")
-async def get_prerequis_evaluation_state(thread_id: str):
+def get_prerequis_evaluation_state(thread_id: str):
     """
     Récupère l'état actuel du workflow d'évaluation des prérequis
     
@@ -1488,24 +1825,25 @@ async def get_prerequis_evaluation_state(thread_id: str):
     Returns:
         État du workflow
     """
-    if thread_id not in prerequis_evaluation_workflows:
+    workflow_data = workflow_registry.get(thread_id, PREREQUIS_EVALUATION)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = prerequis_evaluation_workflows[thread_id]
     
     return {
         "thread_id": thread_id,
-        "status": workflow_data["status"],
-        "state": workflow_data["state"],
-        "result": workflow_data["state"],  # Alias pour compatibilité avec Streamlit
-        "validation_pending": workflow_data["state"].get("validation_pending", False) if workflow_data["state"] else False
+        "status": workflow_data.status,
+        "state": workflow_data.state,
+        "result": workflow_data.state,  # Alias pour compatibilité avec Streamlit
+        "validation_pending": workflow_data.state.get("validation_pending", False) if workflow_data.state else False
     }
 
 
 @app.post("/prerequis-evaluation/threads/{thread_id}/validate")
-async def send_prerequis_validation(thread_id: str, feedback: PrerequisValidationFeedback):
+def send_prerequis_validation(thread_id: str, feedback: PrerequisValidationFeedback):
     """
-    Envoie le feedback de validation des prérequis et reprend le workflow.
+    Envoie le feedback de validation des prérequis et reprend le workflow en arrière-plan
+    (résultat via GET /runs/{run_id}/result).
     
     Args:
         thread_id: ID du thread
@@ -1514,45 +1852,62 @@ async def send_prerequis_validation(thread_id: str, feedback: PrerequisValidatio
     Returns:
         {
             "status": "resumed",
-            "thread_id": "uuid",
-            "result": {...}
+            "run_id": "uuid",
+            "thread_id": "uuid"
         }
     """
-    if thread_id not in prerequis_evaluation_workflows:
+    workflow_data = workflow_registry.get(thread_id, PREREQUIS_EVALUATION)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = prerequis_evaluation_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         
         print(f"\n📝 [API] Réception du feedback de validation pour thread {thread_id}")
         print(f"✅ Validés: {feedback.validated_prerequis}")
         print(f"💬 Commentaire régénération: {feedback.regeneration_comment[:50]}..." if feedback.regeneration_comment else "💬 Pas de commentaire")
         
-        # Reprendre le workflow avec le feedback
-        result = workflow.resume_workflow_with_validation(
-            validated_prerequis=feedback.validated_prerequis,
-            regeneration_comment=feedback.regeneration_comment,
-            thread_id=thread_id,
-            modified_evaluations=feedback.modified_evaluations
-        )
+        def job(is_cancelled):
+            # Reprendre le workflow avec le feedback
+            result = workflow.resume_workflow_with_validation(
+                validated_prerequis=feedback.validated_prerequis,
+                regeneration_comment=feedback.regeneration_comment,
+                thread_id=thread_id,
+                modified_evaluations=feedback.modified_evaluations
+            )
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Vérifier si on est encore en attente de validation (nouvelle boucle)
-        if result.get("validation_pending", False):
-            workflow_data["status"] = "validation_pending"
-        else:
-            workflow_data["status"] = "completed" if result.get("success") else "error"
+            # Mettre à jour l'état
+            workflow_data.state = result
         
+            # Vérifier si on est encore en attente de validation (nouvelle boucle)
+            if result.get("validation_pending", False):
+                workflow_data.status = "validation_pending"
+            else:
+                workflow_data.status = "completed" if result.get("success") else "error"
+        
+            workflow_registry.save(workflow_data)
+            return {
+                "thread_id": thread_id,
+                "status": workflow_data.status,
+                "result": result,
+                "validation_pending": result.get("validation_pending", False)
+            }
+        
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "prerequis_evaluation_validation", job, priority=PRIORITY_INTERACTIVE)
         return {
+            "status": "resumed",
+            "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"],
-            "result": result,
-            "validation_pending": result.get("validation_pending", False)
+            "workflow_status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur validation prérequis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur validation prérequis: {str(e)}")
@@ -1569,74 +1924,74 @@ if __name__ == "__main__":
 # ==================== ENDPOINTS EXECUTIVE SUMMARY ====================
 
 @app.post("/executive-summary/threads/{thread_id}/runs")
-async def create_executive_run(thread_id: str, workflow_input: ExecutiveSummaryInput):
+def create_executive_run(thread_id: str, workflow_input: ExecutiveSummaryInput):
     """Démarre un workflow Executive Summary"""
     try:
         # Créer ou récupérer le workflow
-        if thread_id not in executive_workflows:
-            api_key = os.getenv("OPENAI_API_KEY")
-            workflow = ExecutiveSummaryWorkflow(
-                api_key=api_key,
-                dev_mode=False
-            )
-            executive_workflows[thread_id] = {
-                "workflow": workflow,
-                "state": None,
-                "status": "created"
-            }
-        
-        workflow_data = executive_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow_data = workflow_registry.get_or_create(thread_id, EXECUTIVE_SUMMARY)
+        workflow = workflow_data.workflow
         
         print(f"\n🚀 [API] Démarrage workflow Executive Summary pour thread {thread_id}")
         
-        # Exécuter le workflow
-        result = workflow.run(
-            transcript_document_ids=workflow_input.transcript_document_ids,
-            workshop_document_ids=workflow_input.workshop_document_ids,
-            company_name=workflow_input.company_name,
-            interviewer_note=workflow_input.interviewer_note,
-            thread_id=thread_id,
-            validated_needs=workflow_input.validated_needs,
-            validated_use_cases=workflow_input.validated_use_cases
-        )
+        def job(is_cancelled):
+            # Exécuter le workflow
+            result = workflow.run(
+                transcript_document_ids=workflow_input.transcript_document_ids,
+                workshop_document_ids=workflow_input.workshop_document_ids,
+                company_name=workflow_input.company_name,
+                interviewer_note=workflow_input.interviewer_note,
+                thread_id=thread_id,
+                validated_needs=workflow_input.validated_needs,
+                validated_use_cases=workflow_input.validated_use_cases
+            )
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
         
-        # Mettre à jour l'état
-        workflow_data["state"] = result
+            # Mettre à jour l'état
+            workflow_data.state = result
         
-        # Déterminer le statut
-        if result.get("workflow_paused"):
-            validation_type = result.get("validation_type", "")
-            if validation_type == "challenges":
-                workflow_data["status"] = "waiting_validation_challenges"
-            elif validation_type == "recommendations":
-                workflow_data["status"] = "waiting_validation_recommendations"
+            # Déterminer le statut
+            if result.get("workflow_paused"):
+                validation_type = result.get("validation_type", "")
+                if validation_type == "challenges":
+                    workflow_data.status = "waiting_validation_challenges"
+                elif validation_type == "recommendations":
+                    workflow_data.status = "waiting_validation_recommendations"
+                else:
+                    workflow_data.status = "paused"
             else:
-                workflow_data["status"] = "paused"
-        else:
-            # Par défaut, le workflow est en cours d'exécution
-            # (le statut sera mis à jour par get_executive_status en fonction de snapshot.next)
-            workflow_data["status"] = "running"
+                # Par défaut, le workflow est en cours d'exécution
+                # (le statut sera mis à jour par get_executive_status en fonction de snapshot.next)
+                workflow_data.status = "running"
+        
+            workflow_registry.save(workflow_data)
+            return {"status": workflow_data.status}
+        
+        run_id = _submit_workflow_run(workflow_data, EXECUTIVE_SUMMARY, job)
         
         return {
-            "run_id": str(uuid.uuid4()),
+            "run_id": run_id,
             "thread_id": thread_id,
-            "status": workflow_data["status"]
+            "status": "running"
         }
     
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     except Exception as e:
         print(f"❌ [API] Erreur Executive Summary: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur workflow: {str(e)}")
 
 
 @app.get("/executive-summary/threads/{thread_id}/status")
-async def get_executive_status(thread_id: str):
+def get_executive_status(thread_id: str):
     """Récupère le statut du workflow Executive Summary"""
-    if thread_id not in executive_workflows:
+    workflow_data = workflow_registry.get(thread_id, EXECUTIVE_SUMMARY)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = executive_workflows[thread_id]
-    workflow = workflow_data["workflow"]
+    workflow = workflow_data.workflow
     
     # Récupérer l'état actuel depuis le checkpointer
     config = {"configurable": {"thread_id": thread_id}}
@@ -1655,46 +2010,46 @@ async def get_executive_status(thread_id: str):
         
         # PRIORITÉ 1: Si pas de nœuds suivants, le workflow est terminé
         if not next_nodes or len(next_nodes) == 0:
-            workflow_data["status"] = "completed"
+            workflow_data.status = "completed"
             state["workflow_paused"] = False
             state["validation_type"] = ""
             workflow.graph.update_state(config, state)
-            workflow_data["state"] = state
+            workflow_data.state = state
         # PRIORITÉ 2: Si le prochain nœud est une validation ou un interrupt, mettre à jour les flags
         elif "human_validation_enjeux" in next_nodes:
             state["workflow_paused"] = True
             state["validation_type"] = "challenges"
             workflow.graph.update_state(config, state)
-            workflow_data["state"] = state
-            workflow_data["status"] = "waiting_validation_challenges"
+            workflow_data.state = state
+            workflow_data.status = "waiting_validation_challenges"
         elif "pre_recommendations_interrupt" in next_nodes:
             state["workflow_paused"] = True
             state["validation_type"] = "pre_recommendations"
             workflow.graph.update_state(config, state)
-            workflow_data["state"] = state
-            workflow_data["status"] = "waiting_pre_recommendations_context"
+            workflow_data.state = state
+            workflow_data.status = "waiting_pre_recommendations_context"
         elif "human_validation_recommendations" in next_nodes:
             state["workflow_paused"] = True
             state["validation_type"] = "recommendations"
             workflow.graph.update_state(config, state)
-            workflow_data["state"] = state
-            workflow_data["status"] = "waiting_validation_recommendations"
+            workflow_data.state = state
+            workflow_data.status = "waiting_validation_recommendations"
         # PRIORITÉ 3: Il y a des nœuds suivants, le workflow est en cours
         else:
-            workflow_data["status"] = "running"
-            workflow_data["state"] = state
+            workflow_data.status = "running"
+            workflow_data.state = state
     
-    return {"status": workflow_data["status"]}
+    return {"status": workflow_data.status}
 
 
 @app.get("/executive-summary/threads/{thread_id}/state")
-async def get_executive_state(thread_id: str):
+def get_executive_state(thread_id: str):
     """Récupère l'état du workflow Executive Summary"""
-    if thread_id not in executive_workflows:
+    workflow_data = workflow_registry.get(thread_id, EXECUTIVE_SUMMARY)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
-    workflow_data = executive_workflows[thread_id]
-    workflow = workflow_data["workflow"]
+    workflow = workflow_data.workflow
     
     # Récupérer l'état actuel depuis le checkpointer
     config = {"configurable": {"thread_id": thread_id}}
@@ -1705,7 +2060,7 @@ async def get_executive_state(thread_id: str):
     if snapshot and snapshot.values:
         state_from_checkpointer = snapshot.values
     
-    state_from_storage = workflow_data.get("state", {})
+    state_from_storage = (workflow_data.state or {})
     
     # Fusionner les deux états (priorité au checkpointer, mais compléter avec storage)
     if state_from_checkpointer:
@@ -1738,18 +2093,18 @@ async def get_executive_state(thread_id: str):
 
 
 @app.post("/executive-summary/threads/{thread_id}/continue")
-async def continue_executive(thread_id: str, context_data: dict):
+def continue_executive(thread_id: str, context_data: dict):
     """Continue le workflow après l'interrupt pre_recommendations"""
     import time
     api_start_time = time.time()
     print(f"⏱️ [TIMING] continue_executive - DÉBUT ({time.strftime('%H:%M:%S.%f', time.localtime(api_start_time))[:-3]})")
     
-    if thread_id not in executive_workflows:
+    workflow_data = workflow_registry.get(thread_id, EXECUTIVE_SUMMARY)
+    if workflow_data is None:
         raise HTTPException(status_code=404, detail="Thread non trouvé")
     
     try:
-        workflow_data = executive_workflows[thread_id]
-        workflow = workflow_data["workflow"]
+        workflow = workflow_data.workflow
         config = {"configurable": {"thread_id": thread_id}}
         
         # Récupérer le feedback depuis le body de la requête
@@ -1757,187 +2112,226 @@ async def continue_executive(thread_id: str, context_data: dict):
         
         print(f"📝 [API] Feedback reçu: {recommendations_feedback[:100]}...")
         
-        # Mettre à jour l'état avec le feedback
-        get_state_start = time.time()
-        snapshot = workflow.graph.get_state(config)
-        get_state_duration = time.time() - get_state_start
-        print(f"⏱️ [TIMING] get_state: {get_state_duration:.3f}s")
+        def job(is_cancelled):
+            # Mettre à jour l'état avec le feedback
+            get_state_start = time.time()
+            snapshot = workflow.graph.get_state(config)
+            get_state_duration = time.time() - get_state_start
+            print(f"⏱️ [TIMING] get_state: {get_state_duration:.3f}s")
         
-        if snapshot and snapshot.values:
-            state = snapshot.values
-            # Accumuler le feedback (ne pas écraser si déjà présent)
-            existing_feedback = state.get("recommendations_feedback", "")
-            if recommendations_feedback:
-                if existing_feedback:
-                    state["recommendations_feedback"] = f"{existing_feedback}\n\n{recommendations_feedback}"
+            if snapshot and snapshot.values:
+                state = snapshot.values
+                # Accumuler le feedback (ne pas écraser si déjà présent)
+                existing_feedback = state.get("recommendations_feedback", "")
+                if recommendations_feedback:
+                    if existing_feedback:
+                        state["recommendations_feedback"] = f"{existing_feedback}\n\n{recommendations_feedback}"
+                    else:
+                        state["recommendations_feedback"] = recommendations_feedback
+                state["workflow_paused"] = False
+                state["validation_type"] = ""
+            
+                update_state_start = time.time()
+                workflow.graph.update_state(config, state)
+                update_state_duration = time.time() - update_state_start
+                print(f"⏱️ [TIMING] update_state: {update_state_duration:.3f}s")
+            
+            # Reprendre le workflow
+            stream_start = time.time()
+            final_state = None
+            for chunk in workflow.graph.stream(None, config):
+                if is_cancelled():
+                    print("🛑 [EXECUTIVE] Run annulé, arrêt après le nœud courant")
+                    break
+                print(f"📊 [EXECUTIVE] Chunk reçu après continue: {list(chunk.keys())}")
+                for node_name, node_state in chunk.items():
+                    print(f"  • Nœud '{node_name}' exécuté")
+                    final_state = node_state
+        
+            stream_duration = time.time() - stream_start
+            print(f"⏱️ [TIMING] workflow.graph.stream: {stream_duration:.3f}s")
+
+            # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+            if is_cancelled():
+                return {"status": "cancelled"}
+        
+            # Récupérer l'état final
+            get_state_after_start = time.time()
+            snapshot = workflow.graph.get_state(config)
+            get_state_after_duration = time.time() - get_state_after_start
+            print(f"⏱️ [TIMING] get_state (après stream): {get_state_after_duration:.3f}s")
+        
+            if snapshot and snapshot.values:
+                state = snapshot.values
+                workflow_data.state = state
+            
+                # Vérifier si on est à un interrupt
+                is_at_interrupt = False
+                if snapshot.next:
+                    next_nodes = list(snapshot.next) if hasattr(snapshot.next, '__iter__') else [snapshot.next]
+                    if "human_validation_recommendations" in next_nodes:
+                        is_at_interrupt = True
+                        state["workflow_paused"] = True
+                        state["validation_type"] = "recommendations"
+                        workflow.graph.update_state(config, state)
+                        print(f"🛑 [API] Workflow arrêté à l'interrupt: {next_nodes}")
+            
+                # Mettre à jour le statut
+                if state.get("workflow_paused") or is_at_interrupt:
+                    validation_type = state.get("validation_type", "")
+                    if validation_type == "recommendations":
+                        workflow_data.status = "waiting_validation_recommendations"
+                    else:
+                        workflow_data.status = "paused"
+                elif not snapshot.next:
+                    workflow_data.status = "completed"
                 else:
-                    state["recommendations_feedback"] = recommendations_feedback
-            state["workflow_paused"] = False
-            state["validation_type"] = ""
+                    workflow_data.status = "running"
+            elif final_state:
+                workflow_data.state = final_state
+                workflow_data.status = "running"
+        
+            total_duration = time.time() - api_start_time
+            print(f"⏱️ [TIMING] continue_executive (total): {total_duration:.3f}s")
             
-            update_state_start = time.time()
-            workflow.graph.update_state(config, state)
-            update_state_duration = time.time() - update_state_start
-            print(f"⏱️ [TIMING] update_state: {update_state_duration:.3f}s")
+            workflow_registry.save(workflow_data)
+            return {"workflow_status": workflow_data.status}
+        
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "executive_summary_continue", job, priority=PRIORITY_INTERACTIVE)
+        
+        return {
+            "status": "success",
+            "run_id": run_id,
+            "workflow_status": "running",
+            "message": "Reprise du workflow lancée"
+        }
         
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
+    except Exception as e:
+        print(f"❌ [API] Erreur lors de la reprise: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la reprise: {str(e)}")
+
+@app.post("/executive-summary/threads/{thread_id}/validate")
+def validate_executive(thread_id: str, feedback: ExecutiveValidationFeedback):
+    """Valide les enjeux ou recommandations (reprise du workflow en arrière-plan, suivie via run_id)"""
+    workflow_data = workflow_registry.get(thread_id, EXECUTIVE_SUMMARY)
+    if workflow_data is None:
+        raise HTTPException(status_code=404, detail="Thread non trouvé")
+    
+    workflow = workflow_data.workflow
+    
+    import time
+    api_start_time = time.time()
+    print(f"⏱️ [TIMING] validate_executive - DÉBUT ({time.strftime('%H:%M:%S.%f', time.localtime(api_start_time))[:-3]})")
+    
+    config = {"configurable": {"thread_id": thread_id}}
+    
+    def job(is_cancelled):
+        # Injecter le feedback dans l'état
+        get_state_start = time.time()
+        current_state = workflow.graph.get_state(config)
+        get_state_duration = time.time() - get_state_start
+        print(f"⏱️ [TIMING] get_state: {get_state_duration:.3f}s")
+    
+        # Mettre à jour avec le feedback
+        update_start = time.time()
+        updated_state = current_state.values.copy()
+        updated_state["validation_result"] = feedback.validation_result
+        updated_state["validation_type"] = feedback.validation_type
+    
         # Reprendre le workflow
+        workflow.graph.update_state(config, updated_state)
+        update_duration = time.time() - update_start
+        print(f"⏱️ [TIMING] update_state: {update_duration:.3f}s")
+    
+        # Continuer l'exécution jusqu'au prochain interrupt
         stream_start = time.time()
         final_state = None
         for chunk in workflow.graph.stream(None, config):
-            print(f"📊 [EXECUTIVE] Chunk reçu après continue: {list(chunk.keys())}")
+            if is_cancelled():
+                print("🛑 [EXECUTIVE] Run annulé, arrêt après le nœud courant")
+                break
+            print(f"📊 [EXECUTIVE] Chunk reçu après validation: {list(chunk.keys())}")
             for node_name, node_state in chunk.items():
                 print(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
-        
+    
         stream_duration = time.time() - stream_start
         print(f"⏱️ [TIMING] workflow.graph.stream: {stream_duration:.3f}s")
-        
-        # Récupérer l'état final
+    
+        # Run annulé (arrêt entre deux nœuds) : le résultat partiel n'est pas enregistré
+        if is_cancelled():
+            return {"status": "cancelled"}
+    
+        # Récupérer l'état complet depuis le checkpointer après l'exécution
+        # IMPORTANT : Le workflow s'arrête à human_validation_enjeux grâce à interrupt_before
         get_state_after_start = time.time()
         snapshot = workflow.graph.get_state(config)
         get_state_after_duration = time.time() - get_state_after_start
         print(f"⏱️ [TIMING] get_state (après stream): {get_state_after_duration:.3f}s")
-        
+    
         if snapshot and snapshot.values:
             state = snapshot.values
-            workflow_data["state"] = state
-            
-            # Vérifier si on est à un interrupt
+            workflow_data.state = state
+        
+            # Vérifier si on est à un interrupt (workflow_paused ou next contient human_validation)
             is_at_interrupt = False
             if snapshot.next:
                 next_nodes = list(snapshot.next) if hasattr(snapshot.next, '__iter__') else [snapshot.next]
-                if "human_validation_recommendations" in next_nodes:
+                if "human_validation_enjeux" in next_nodes or "pre_recommendations_interrupt" in next_nodes or "human_validation_recommendations" in next_nodes:
                     is_at_interrupt = True
                     state["workflow_paused"] = True
-                    state["validation_type"] = "recommendations"
+                    if "human_validation_enjeux" in next_nodes:
+                        state["validation_type"] = "challenges"
+                    elif "pre_recommendations_interrupt" in next_nodes:
+                        state["validation_type"] = "pre_recommendations"
+                    elif "human_validation_recommendations" in next_nodes:
+                        state["validation_type"] = "recommendations"
+                    # Mettre à jour l'état dans le checkpointer
                     workflow.graph.update_state(config, state)
                     print(f"🛑 [API] Workflow arrêté à l'interrupt: {next_nodes}")
-            
+        
             # Mettre à jour le statut
-            if state.get("workflow_paused") or is_at_interrupt:
+            # PRIORITÉ 1: Si pas de nœuds suivants (snapshot.next est vide), le workflow est terminé
+            if not snapshot.next or (hasattr(snapshot.next, '__len__') and len(snapshot.next) == 0):
+                workflow_data.status = "completed"
+                state["workflow_paused"] = False
+                state["validation_type"] = ""
+                workflow.graph.update_state(config, state)
+            # PRIORITÉ 2: Vérifier si on est à l'interrupt ou en pause
+            elif state.get("workflow_paused") or is_at_interrupt:
                 validation_type = state.get("validation_type", "")
-                if validation_type == "recommendations":
-                    workflow_data["status"] = "waiting_validation_recommendations"
+                if validation_type == "challenges":
+                    workflow_data.status = "waiting_validation_challenges"
+                elif validation_type == "recommendations":
+                    workflow_data.status = "waiting_validation_recommendations"
                 else:
-                    workflow_data["status"] = "paused"
-            elif not snapshot.next:
-                workflow_data["status"] = "completed"
+                    workflow_data.status = "paused"
             else:
-                workflow_data["status"] = "running"
+                workflow_data.status = "running"
         elif final_state:
-            workflow_data["state"] = final_state
-            workflow_data["status"] = "running"
-        
-        total_duration = time.time() - api_start_time
-        print(f"⏱️ [TIMING] continue_executive (total): {total_duration:.3f}s")
-        
-        return {
-            "status": "success",
-            "workflow_status": workflow_data["status"],
-            "message": "Workflow repris avec succès"
-        }
-        
-    except Exception as e:
-        print(f"❌ [API] Erreur lors de la reprise: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Erreur lors de la reprise: {str(e)}")
-
-@app.post("/executive-summary/threads/{thread_id}/validate")
-async def validate_executive(thread_id: str, feedback: ExecutiveValidationFeedback):
-    """Valide les enjeux ou recommandations"""
-    if thread_id not in executive_workflows:
-        raise HTTPException(status_code=404, detail="Thread non trouvé")
-    
-    workflow_data = executive_workflows[thread_id]
-    workflow = workflow_data["workflow"]
-    
-    # Injecter le feedback dans l'état
-    import time
-    api_start_time = time.time()
-    print(f"⏱️ [TIMING] validate_executive - DÉBUT ({time.strftime('%H:%M:%S.%f', time.localtime(api_start_time))[:-3]})")
+            workflow_data.state = final_state
+            workflow_data.status = "running"
     
-    config = {"configurable": {"thread_id": thread_id}}
-    get_state_start = time.time()
-    current_state = workflow.graph.get_state(config)
-    get_state_duration = time.time() - get_state_start
-    print(f"⏱️ [TIMING] get_state: {get_state_duration:.3f}s")
-    
-    # Mettre à jour avec le feedback
-    update_start = time.time()
-    updated_state = current_state.values.copy()
-    updated_state["validation_result"] = feedback.validation_result
-    updated_state["validation_type"] = feedback.validation_type
-    
-    # Reprendre le workflow
-    workflow.graph.update_state(config, updated_state)
-    update_duration = time.time() - update_start
-    print(f"⏱️ [TIMING] update_state: {update_duration:.3f}s")
-    
-    # Continuer l'exécution jusqu'au prochain interrupt
-    stream_start = time.time()
-    final_state = None
-    for chunk in workflow.graph.stream(None, config):
-        print(f"📊 [EXECUTIVE] Chunk reçu après validation: {list(chunk.keys())}")
-        for node_name, node_state in chunk.items():
-            print(f"  • Nœud '{node_name}' exécuté")
-            final_state = node_state
-    
-    stream_duration = time.time() - stream_start
-    print(f"⏱️ [TIMING] workflow.graph.stream: {stream_duration:.3f}s")
-    
-    # Récupérer l'état complet depuis le checkpointer après l'exécution
-    # IMPORTANT : Le workflow s'arrête à human_validation_enjeux grâce à interrupt_before
-    get_state_after_start = time.time()
-    snapshot = workflow.graph.get_state(config)
-    get_state_after_duration = time.time() - get_state_after_start
-    print(f"⏱️ [TIMING] get_state (après stream): {get_state_after_duration:.3f}s")
+        total_duration = time.time() - api_start_time
+        print(f"⏱️ [TIMING] validate_executive (total): {total_duration:.3f}s")
     
-    if snapshot and snapshot.values:
-        state = snapshot.values
-        workflow_data["state"] = state
-        
-        # Vérifier si on est à un interrupt (workflow_paused ou next contient human_validation)
-        is_at_interrupt = False
-        if snapshot.next:
-            next_nodes = list(snapshot.next) if hasattr(snapshot.next, '__iter__') else [snapshot.next]
-            if "human_validation_enjeux" in next_nodes or "pre_recommendations_interrupt" in next_nodes or "human_validation_recommendations" in next_nodes:
-                is_at_interrupt = True
-                state["workflow_paused"] = True
-                if "human_validation_enjeux" in next_nodes:
-                    state["validation_type"] = "challenges"
-                elif "pre_recommendations_interrupt" in next_nodes:
-                    state["validation_type"] = "pre_recommendations"
-                elif "human_validation_recommendations" in next_nodes:
-                    state["validation_type"] = "recommendations"
-                # Mettre à jour l'état dans le checkpointer
-                workflow.graph.update_state(config, state)
-                print(f"🛑 [API] Workflow arrêté à l'interrupt: {next_nodes}")
-        
-        # Mettre à jour le statut
-        # PRIORITÉ 1: Si pas de nœuds suivants (snapshot.next est vide), le workflow est terminé
-        if not snapshot.next or (hasattr(snapshot.next, '__len__') and len(snapshot.next) == 0):
-            workflow_data["status"] = "completed"
-            state["workflow_paused"] = False
-            state["validation_type"] = ""
-            workflow.graph.update_state(config, state)
-        # PRIORITÉ 2: Vérifier si on est à l'interrupt ou en pause
-        elif state.get("workflow_paused") or is_at_interrupt:
-            validation_type = state.get("validation_type", "")
-            if validation_type == "challenges":
-                workflow_data["status"] = "waiting_validation_challenges"
-            elif validation_type == "recommendations":
-                workflow_data["status"] = "waiting_validation_recommendations"
-            else:
-                workflow_data["status"] = "paused"
-        else:
-            workflow_data["status"] = "running"
-    elif final_state:
-        workflow_data["state"] = final_state
-        workflow_data["status"] = "running"
+        workflow_registry.save(workflow_data)
+        return {"status": "success", "workflow_status": workflow_data.status}
     
-    total_duration = time.time() - api_start_time
-    print(f"⏱️ [TIMING] validate_executive (total): {total_duration:.3f}s")
+    try:
+        # Reprise après validation : l'utilisateur attend, appels LLM prioritaires
+        run_id = _submit_workflow_run(workflow_data, "executive_summary_validation", job, priority=PRIORITY_INTERACTIVE)
+    except RunQueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"API saturée, réessayer plus tard: {str(e)}")
     
-    return {"status": "success", "workflow_status": workflow_data["status"]}
+    return {
+        "status": "success",
+        "run_id": run_id,
+        "workflow_status": "running"
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+"""
+Exécution des workflows en arrière-plan.
+
+Les endpoints qui lancent un workflow (plusieurs minutes d'appels LLM) ne
+bloquent plus la boucle d'événements : l'exécution est soumise à un pool de
+threads borné, l'endpoint retourne immédiatement un run_id, et le statut, le
+résultat et l'annulation sont exposés par run (table `workflow_runs`, lisible
+depuis n'importe quel worker).
+"""
+
+import os
+import uuid
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+
+from database.db import get_db_context
+from database.repository import WorkflowRunRepository
+
+logger = logging.getLogger(__name__)
+
+# Nombre de workflows exécutés en parallèle par processus
+RUN_EXECUTOR_MAX_WORKERS = int(os.getenv("RUN_EXECUTOR_MAX_WORKERS", "4"))
+# Nombre de runs acceptés en file d'attente au-delà des workers actifs
+RUN_EXECUTOR_MAX_PENDING = int(os.getenv("RUN_EXECUTOR_MAX_PENDING", "16"))
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+class RunQueueFullError(RuntimeError):
+    """Levée quand le pool et sa file d'attente sont pleins"""
+
+
+class RunExecutor:
+    """
+    Pool borné d'exécution des workflows.
+
+    Un job reçoit une fonction `is_cancelled()` : l'annulation d'un run en
+    attente est immédiate, celle d'un run en cours est coopérative (le job
+    s'arrête au prochain point de contrôle, sinon son résultat est ignoré).
+    """
+
+    def __init__(self, max_workers: int = RUN_EXECUTOR_MAX_WORKERS, max_pending: int = RUN_EXECUTOR_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="workflow-run")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        thread_id: str,
+        run_type: str,
+        job: Callable[[Callable[[], bool]], Any],
+        run_id: Optional[str] = None
+    ) -> str:
+        """
+        Soumet un job au pool.
+
+        Args:
+            run_id: Identifiant à utiliser (généré si absent)
+
+        Returns:
+            L'identifiant du run
+
+        Raises:
+            RunQueueFullError: Si trop de runs sont déjà en cours ou en attente
+        """
+        run_id = run_id or str(uuid.uuid4())
+        with self._lock:
+            if len(self._futures) >= self.max_workers + self.max_pending:
+                raise RunQueueFullError(
+                    f"{len(self._futures)} runs en cours ou en attente (max {self.max_workers + self.max_pending})"
+                )
+            with get_db_context() as db:
+                WorkflowRunRepository.create(db, run_id, thread_id, run_type)
+            future = self._pool.submit(self._execute, run_id, job)
+            self._futures[run_id] = future
+        future.add_done_callback(lambda _future: self._forget(run_id))
+        logger.info(f"📥 Run {run_id} ({run_type}) soumis pour le thread {thread_id}")
+        return run_id
+
+    def _forget(self, run_id: str) -> None:
+        with self._lock:
+            self._futures.pop(run_id, None)
+
+    @staticmethod
+    def _set_status(run_id: str, status: str, from_statuses: Optional[list] = None, **fields: Any) -> bool:
+        with get_db_context() as db:
+            return WorkflowRunRepository.update_status(db, run_id, status, from_statuses=from_statuses, **fields)
+
+    def _execute(self, run_id: str, job: Callable[[Callable[[], bool]], Any]) -> None:
+        """Exécute un job dans un thread du pool et enregistre son issue"""
+        # Un run annulé avant son démarrage (éventuellement par un autre worker) n'est pas exécuté
+        if not self._set_status(run_id, "running", from_statuses=["pending"], started_at=func.now()):
+            logger.info(f"⏭️ Run {run_id} annulé avant son démarrage")
+            return
+
+        try:
+            result = job(lambda: self.is_cancel_requested(run_id))
+        except Exception as e:
+            logger.error(f"❌ Run {run_id} en échec: {e}")
+            self._set_status(run_id, "failed", error=str(e), finished_at=func.now())
+            return
+
+        if not self._set_status(
+            run_id,
+            "completed",
+            from_statuses=["running"],
+            result=jsonable_encoder(result) if result is not None else None,
+            finished_at=func.now()
+        ):
+            self._set_status(run_id, "cancelled", from_statuses=["cancelling"], finished_at=func.now())
+            logger.info(f"🛑 Run {run_id} annulé pendant son exécution")
+            return
+        logger.info(f"✅ Run {run_id} terminé")
+
+    def is_cancel_requested(self, run_id: str) -> bool:
+        """Indique si l'annulation d'un run en cours a été demandée"""
+        run = self.get(run_id)
+        return run is not None and run["status"] == "cancelling"
+
+    def cancel(self, run_id: str) -> Optional[str]:
+        """
+        Annule un run.
+
+        Returns:
+            Le statut du run après la demande, ou None si le run n'existe pas
+        """
+        with self._lock:
+            future = self._futures.get(run_id)
+        if future is not None and future.cancel():
+            self._set_status(run_id, "cancelled", from_statuses=["pending"], finished_at=func.now())
+            return "cancelled"
+
+        if self._set_status(run_id, "cancelled", from_statuses=["pending"], finished_at=func.now()):
+            return "cancelled"
+        if self._set_status(run_id, "cancelling", from_statuses=["running"]):
+            return "cancelling"
+
+        run = self.get(run_id)
+        return run["status"] if run else None
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère un run (statut, dates, résultat, erreur)"""
+        with get_db_context() as db:
+            run = WorkflowRunRepository.get_by_id(db, run_id)
+            if run is None:
+                return None
+            return {
+                "run_id": run.run_id,
+                "thread_id": run.thread_id,
+                "run_type": run.run_type,
+                "status": run.status,
+                "result": run.result,
+                "error": run.error,
+                "created_at": run.created_at,
+                "started_at": run.started_at,
+                "finished_at": run.finished_at,
+            }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Runs en cours ou en attente dans ce processus"""
+        with self._lock:
+            active = len(self._futures)
+        return {
+            "active": active,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+        }
+
+    def shutdown(self) -> None:
+        """Arrête le pool ; les runs encore en attente sont annulés"""
+        with self._lock:
+            futures = list(self._futures.items())
+        pending = [run_id for run_id, future in futures if future.cancel()]
+        for run_id in pending:
+            self._set_status(run_id, "cancelled", from_statuses=["pending"], finished_at=func.now())
+        self._pool.shutdown(wait=False)
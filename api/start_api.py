@@ -25,13 +25,20 @@ if __name__ == "__main__":
     print("🛑 Ctrl+C pour arrêter")
     print()
     
+    # Plusieurs workers possibles : l'état des workflows est stocké en base
+    # (le reload n'est pas compatible avec plusieurs workers)
+    workers = int(os.getenv("API_WORKERS", "1"))
+    if workers > 1:
+        print(f"👷 Workers: {workers} (reload désactivé)")
+    
     # Utiliser une string pour activer le reload
     uvicorn.run(
         "api.langgraph_api:app",
         host="0.0.0.0",
         port=2025,
-        reload=True,  # Auto-reload en développement
+        reload=workers == 1,  # Auto-reload en développement
+        workers=workers,
         log_level="info",
-        reload_dirs=[parent_dir]  # Spécifier le répertoire à surveiller
+        reload_dirs=[parent_dir] if workers == 1 else None  # Spécifier le répertoire à surveiller
     )
 
@@ -0,0 +1,222 @@
+"""
+Registre des workflows de l'API.
+
+Remplace les dictionnaires en mémoire (un par type de workflow) : le type et les
+paramètres de construction de chaque thread sont stockés dans la table
+`workflow_threads`, et l'état LangGraph dans le checkpointer persistant.
+N'importe quel worker uvicorn peut donc reprendre un thread à partir de son
+`thread_id`.
+
+Chaque type de workflow est compilé une seule fois par processus et partagé par
+tous les threads : le graphe LangGraph, les agents (services sans état) et le
+checkpointer sont communs, les données d'un run ne vivent que dans l'état et
+la config du thread (`{"configurable": {"thread_id": ...}}`).
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from database.db import get_db_context
+from database.repository import WorkflowThreadRepository
+from workflow.need_analysis_workflow import NeedAnalysisWorkflow
+from workflow.rappel_mission_workflow import RappelMissionWorkflow
+from workflow.atouts_workflow import AtoutsWorkflow
+from workflow.value_chain_workflow import ValueChainWorkflow
+from executive_summary.executive_summary_workflow import ExecutiveSummaryWorkflow
+from prerequis_evaluation.prerequis_evaluation_workflow import PrerequisEvaluationWorkflow
+
+logger = logging.getLogger(__name__)
+
+# Compilation de tous les workflows au démarrage du worker (0 = au premier run de chaque type)
+WORKFLOW_PREWARM = os.getenv("WORKFLOW_PREWARM", "1") != "0"
+
+# Types de workflow (valeur stockée dans workflow_threads.workflow_type)
+NEED_ANALYSIS = "need_analysis"
+EXECUTIVE_SUMMARY = "executive_summary"
+RAPPEL_MISSION = "rappel_mission"
+ATOUTS = "atouts"
+VALUE_CHAIN = "value_chain"
+PREREQUIS_EVALUATION = "prerequis_evaluation"
+
+
+def _build_need_analysis(checkpointer: BaseCheckpointSaver):
+    return NeedAnalysisWorkflow(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        dev_mode=os.getenv("DEV_MODE", "0") == "1",  # Activer dev_mode si DEV_MODE=1
+        checkpointer=checkpointer
+    )
+
+
+def _build_executive_summary(checkpointer: BaseCheckpointSaver):
+    return ExecutiveSummaryWorkflow(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        dev_mode=False,
+        checkpointer=checkpointer
+    )
+
+
+def _build_rappel_mission(checkpointer: BaseCheckpointSaver):
+    # Workflow sans interrupt : pas de checkpointer
+    return RappelMissionWorkflow()
+
+
+def _build_atouts(checkpointer: BaseCheckpointSaver):
+    # interviewer_names reste dans les paramètres du thread (non utilisé par le workflow)
+    return AtoutsWorkflow(checkpointer=checkpointer)
+
+
+def _build_value_chain(checkpointer: BaseCheckpointSaver):
+    return ValueChainWorkflow(checkpointer=checkpointer)
+
+
+def _build_prerequis_evaluation(checkpointer: BaseCheckpointSaver):
+    return PrerequisEvaluationWorkflow(checkpointer=checkpointer)
+
+
+WORKFLOW_FACTORIES: Dict[str, Callable[[BaseCheckpointSaver], Any]] = {
+    NEED_ANALYSIS: _build_need_analysis,
+    EXECUTIVE_SUMMARY: _build_executive_summary,
+    RAPPEL_MISSION: _build_rappel_mission,
+    ATOUTS: _build_atouts,
+    VALUE_CHAIN: _build_value_chain,
+    PREREQUIS_EVALUATION: _build_prerequis_evaluation,
+}
+
+
+class WorkflowHandle:
+    """Workflow d'un thread, avec le dernier statut et état connus"""
+
+    def __init__(
+        self,
+        thread_id: str,
+        workflow_type: str,
+        workflow: Any,
+        params: Optional[Dict[str, Any]] = None,
+        status: str = "created",
+        state: Optional[Dict[str, Any]] = None
+    ):
+        self.thread_id = thread_id
+        self.workflow_type = workflow_type
+        self.workflow = workflow
+        self.params = params or {}
+        self.status = status
+        self.state = state
+
+
+class WorkflowRegistry:
+    """
+    Retrouve à la demande le workflow d'un thread à partir du thread_id.
+
+    Un seul workflow compilé par type et par processus, construit au premier
+    usage ; le statut et l'état des threads sont toujours relus depuis la base.
+    """
+
+    def __init__(self, checkpointer: BaseCheckpointSaver):
+        self.checkpointer = checkpointer
+        self._workflows: Dict[str, Any] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _get_workflow(self, workflow_type: str):
+        """Retourne le workflow compilé partagé de ce type (construit une seule fois)"""
+        workflow = self._workflows.get(workflow_type)
+        if workflow is not None:
+            return workflow
+
+        with self._lock:
+            # Un autre thread a pu le construire pendant l'attente du verrou
+            workflow = self._workflows.get(workflow_type)
+            if workflow is None:
+                start = time.perf_counter()
+                workflow = WORKFLOW_FACTORIES[workflow_type](self.checkpointer)
+                self._build_seconds[workflow_type] = round(time.perf_counter() - start, 3)
+                self._workflows[workflow_type] = workflow
+                logger.info(
+                    f"🧩 Workflow {workflow_type} compilé en {self._build_seconds[workflow_type]}s "
+                    f"(partagé par tous les threads de ce worker)"
+                )
+        return workflow
+
+    def warm_up(self) -> None:
+        """Compile tous les types de workflow (le premier run n'a plus à payer la construction)"""
+        for workflow_type in WORKFLOW_FACTORIES:
+            try:
+                self._get_workflow(workflow_type)
+            except Exception as e:
+                logger.warning(f"⚠️ Précompilation du workflow {workflow_type} impossible: {e}")
+
+    def _has_checkpoint(self, thread_id: str) -> bool:
+        config = {"configurable": {"thread_id": thread_id}}
+        return self.checkpointer.get_tuple(config) is not None
+
+    def get(self, thread_id: str, workflow_type: str) -> Optional[WorkflowHandle]:
+        """
+        Récupère le workflow d'un thread existant.
+
+        Un thread absent du registre mais présent dans le checkpointer (créé avant
+        l'introduction du registre) est enregistré avec le type demandé.
+
+        Returns:
+            Le handle du workflow, ou None si le thread n'existe pas pour ce type
+        """
+        with get_db_context() as db:
+            entry = WorkflowThreadRepository.get_by_thread(db, thread_id)
+            if entry is not None:
+                if entry.workflow_type != workflow_type:
+                    return None
+                params = entry.params or {}
+                status = entry.status
+                state = entry.state
+            elif self._has_checkpoint(thread_id):
+                params, status, state = {}, "paused", None
+                WorkflowThreadRepository.create_or_update(db, thread_id, workflow_type, params, status)
+                logger.info(f"🔁 Thread {thread_id} ({workflow_type}) restauré depuis le checkpointer")
+            else:
+                return None
+
+        workflow = self._get_workflow(workflow_type)
+        return WorkflowHandle(thread_id, workflow_type, workflow, params, status, state)
+
+    def get_or_create(
+        self,
+        thread_id: str,
+        workflow_type: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> WorkflowHandle:
+        """Récupère le workflow d'un thread, ou l'enregistre s'il n'existe pas encore"""
+        handle = self.get(thread_id, workflow_type)
+        if handle is not None:
+            return handle
+
+        params = jsonable_encoder(params or {})
+        with get_db_context() as db:
+            WorkflowThreadRepository.create_or_update(db, thread_id, workflow_type, params)
+
+        workflow = self._get_workflow(workflow_type)
+        return WorkflowHandle(thread_id, workflow_type, workflow, params)
+
+    def save(self, handle: WorkflowHandle) -> None:
+        """Persiste le statut et le dernier état du thread"""
+        with get_db_context() as db:
+            WorkflowThreadRepository.update_status(
+                db,
+                handle.thread_id,
+                handle.status,
+                jsonable_encoder(handle.state) if handle.state is not None else None
+            )
+
+    def delete(self, thread_id: str) -> bool:
+        """Supprime le thread du registre (le workflow compilé reste partagé)"""
+        with get_db_context() as db:
+            return WorkflowThreadRepository.delete(db, thread_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Workflows compilés dans ce worker et durée de leur construction (secondes)"""
+        with self._lock:
+            return {"compiled": dict(self._build_seconds)}
@@ -507,6 +507,32 @@ def upload_files_to_api(files: List[Any]) -> Dict[str, Any]:
         st.error(f"❌ Erreur lors de l'upload: {str(e)}")
         return {"workshop": [], "transcript": [], "file_paths": []}
 
+def wait_for_run(run_id: str, timeout: float = 900, poll_interval: float = 2) -> Dict[str, Any]:
+    """
+    Attend la fin d'un run lancé en arrière-plan par l'API.
+    À appeler depuis un thread séparé (bloquant).
+    
+    Returns:
+        Le résultat du run terminé ({"run_id", "status": "completed", "result", "error"})
+    
+    Raises:
+        RuntimeError: Si le run échoue ou est annulé
+        TimeoutError: Si le run n'est pas terminé après `timeout` secondes
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{API_URL}/runs/{run_id}", timeout=10)
+        response.raise_for_status()
+        run = response.json()
+        if run["status"] == "completed":
+            response = requests.get(f"{API_URL}/runs/{run_id}/result", timeout=10)
+            response.raise_for_status()
+            return response.json()
+        if run["status"] in ("failed", "cancelled"):
+            raise RuntimeError(run.get("error") or f"Run {run['status']}")
+        time.sleep(poll_interval)
+    raise TimeoutError(f"Run {run_id} non terminé après {timeout:.0f}s")
+
 def start_workflow_api_call(workshop_data: List[Any], transcript_data: List[Any], company_name: str, company_url: str, company_description: str, validated_company_info: Optional[Dict[str, Any]], interviewer_names: List[str], additional_context: str, result_queue: queue.Queue, num_needs: int = 10, num_quotes_per_need: int = 4):
     """
     Fait l'appel API dans un thread séparé.
@@ -559,16 +585,96 @@ def start_workflow_api_call(workshop_data: List[Any], transcript_data: List[Any]
                 "num_needs": num_needs,
                 "num_quotes_per_need": num_quotes_per_need
             },
-            timeout=900  # 5 minutes pour le traitement initial
+            timeout=60
         )
         response.raise_for_status()
         
+        # Le workflow tourne en arrière-plan côté API : attendre la fin du run
         result = response.json()
-        result_queue.put((True, thread_id, result["status"], None))
+        run = wait_for_run(result["run_id"], timeout=900)
+        result_queue.put((True, thread_id, run["result"]["status"], None))
     
     except Exception as e:
         result_queue.put((False, None, None, str(e)))
 
+def follow_workflow_events(thread_id: str, placeholder, idle_timeout: float = 30) -> Optional[str]:
+    """
+    Suit le flux SSE de progression d'un thread et affiche les nœuds exécutés
+    dans `placeholder`, jusqu'au prochain interrupt ou à la fin du run.
+    Remplace le polling `time.sleep(3); st.rerun()` : l'appelant ne relance le
+    script qu'une fois l'étape terminée.
+    
+    Returns:
+        "interrupt" | "run_end", ou None si aucun événement pendant `idle_timeout`
+        secondes (l'appelant re-vérifie alors le statut)
+    """
+    if not thread_id:
+        return None
+    
+    cursor_key = f"events_cursor_{thread_id}"
+    cursor = st.session_state.get(cursor_key, 0)
+    progress_lines: List[str] = []
+    running_nodes: Dict[str, str] = {}
+    
+    def render():
+        lines = progress_lines + [f"⚙️ {label} en cours..." for label in running_nodes.values()]
+        if lines:
+            placeholder.markdown("\n\n".join(lines[-12:]))
+    
+    try:
+        with requests.get(
+            f"{API_URL}/threads/{thread_id}/events",
+            params={"after": cursor},
+            stream=True,
+            timeout=(5, idle_timeout + 15)
+        ) as response:
+            response.raise_for_status()
+            event_type, data = None, {}
+            last_event_at = time.time()
+            for line in response.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line.startswith(":"):
+                    # Keep-alive : abandonner si aucun run ne publie sur ce thread
+                    if time.time() - last_event_at > idle_timeout:
+                        return None
+                elif line.startswith("id:"):
+                    cursor = int(line[3:].strip())
+                elif line.startswith("event:"):
+                    event_type = line[6:].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[5:].strip())
+                elif line == "" and event_type:
+                    last_event_at = time.time()
+                    st.session_state[cursor_key] = cursor
+                    node = data.get("node", "")
+                    key = f"{node}:{data.get('step')}"
+                    if event_type == "node_start":
+                        running_nodes[key] = node
+                    elif event_type in ("node_end", "node_error"):
+                        running_nodes.pop(key, None)
+                        tokens = data.get("input_tokens", 0) + data.get("output_tokens", 0)
+                        icon = "❌" if event_type == "node_error" else "✅"
+                        details = f"{data.get('duration_ms', 0) / 1000:.1f}s"
+                        if tokens:
+                            details += f" · {tokens:,} tokens"
+                        progress_lines.append(f"{icon} {node} ({details})")
+                    elif event_type == "partial_item":
+                        # Besoin / cas d'usage généré en streaming : affiché dès sa réception
+                        item = data.get("item") or {}
+                        label = "Besoin" if data.get("kind") == "need" else "Cas d'usage"
+                        title = item.get("theme") or item.get("titre") or ""
+                        progress_lines.append(f"🧩 {label} {data.get('index', 0) + 1} : {title}")
+                    elif event_type in ("interrupt", "run_end"):
+                        return event_type
+                    render()
+                    event_type, data = None, {}
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ [APP] Flux de progression interrompu: {str(e)}")
+        # Flux indisponible : revenir au rafraîchissement périodique
+        time.sleep(3)
+    return None
+
 def display_rotating_messages(company_name: str = None):
     """
     Affiche des messages rotatifs pour indiquer la progression.
@@ -699,9 +805,11 @@ def send_validation_feedback_api_call(validated_needs: List[Dict], rejected_need
                 "user_feedback": user_feedback,
                 "user_action": user_action
             },
-            timeout=600  # 10 minutes pour la validation et la reprise du workflow
+            timeout=60
         )
         response.raise_for_status()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
         result_queue.put((True, None))
     
     except Exception as e:
@@ -718,9 +826,11 @@ def send_pre_use_case_context_api_call(additional_context: str, famille: str, th
                 "use_case_additional_context": additional_context or "",
                 "use_case_famille": famille or ""
             },
-            timeout=600
+            timeout=60
         )
         response.raise_for_status()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
         result_queue.put((True, None))
     
     except Exception as e:
@@ -744,11 +854,12 @@ def send_use_case_validation_feedback_api_call(validated_use_cases: List[Dict],
                 "user_feedback": user_feedback,
                 "use_case_user_action": use_case_user_action
             },
-            timeout=600  # 10 minutes pour la validation finale
+            timeout=60
         )
         response.raise_for_status()
-        response_data = response.json()
-        result_queue.put((True, response_data))
+        # La reprise tourne en arrière-plan côté API : la réponse complète est le résultat du run
+        run = wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
+        result_queue.put((True, run["result"]))
     
     except Exception as e:
         result_queue.put((False, str(e)))
@@ -1880,8 +1991,8 @@ def display_workflow_progress():
         - 🔍 Analyse des besoins
         """)
         
-        # Auto-refresh toutes les 3 secondes
-        time.sleep(3)
+        # Suivre la progression en direct (flux SSE) jusqu'au prochain interrupt ou à la fin du run
+        follow_workflow_events(st.session_state.thread_id, st.empty())
         st.rerun()
     
     elif status == "waiting_validation":
@@ -2788,7 +2899,8 @@ def display_upload_documents_section():
                                         json={
                                             "file_path": file_path,
                                             "interviewer_names": None,  # Utiliser les valeurs par défaut
-                                            "known_speakers": known_speakers
+                                            "known_speakers": known_speakers,
+                                            "project_id": st.session_state.get("current_project_id")
                                         }
                                     )
                                     response.raise_for_status()
@@ -3541,8 +3653,8 @@ def display_executive_workflow_progress():
         - 💡 Génération des recommandations
         """)
         
-        # Auto-refresh toutes les 3 secondes
-        time.sleep(3)
+        # Suivre la progression en direct (flux SSE) jusqu'au prochain interrupt ou à la fin du run
+        follow_workflow_events(st.session_state.executive_thread_id, st.empty())
         st.rerun()
     
     elif status == "waiting_validation_challenges":
@@ -4477,9 +4589,11 @@ def send_pre_recommendations_context_api_call(additional_context: str, thread_id
             json={
                 "recommendations_feedback": additional_context or ""
             },
-            timeout=600  # 10 minutes
+            timeout=60
         )
         response.raise_for_status()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
         result_queue.put((True, None))
     except Exception as e:
         result_queue.put((False, str(e)))
@@ -4573,10 +4687,12 @@ def send_executive_validation_api_call(thread_id: str, validation_type: str, val
                 "validation_type": validation_type,
                 "validation_result": validation_result
             },
-            timeout=600  # 10 minutes pour la validation et la reprise du workflow
+            timeout=60
         )
         response.raise_for_status()
-        result = response.json()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        run = wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
+        result = run["result"] or {}
         # Mettre à jour le statut du workflow
         workflow_status = result.get("workflow_status", "running")
         st.session_state.executive_workflow_status = workflow_status
@@ -4723,10 +4839,12 @@ def send_atouts_validation_api_call(thread_id: str, validation_result: Dict[str,
         response = requests.post(
             f"{API_URL}/atouts-entreprise/threads/{thread_id}/validate",
             json=validation_result,
-            timeout=600
+            timeout=60
         )
         response.raise_for_status()
-        result = response.json()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        run = wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
+        result = run["result"] or {}
         workflow_status = result.get("workflow_status", "running")
         st.session_state.atouts_workflow_status = workflow_status
         result_queue.put((True, None))
@@ -4834,8 +4952,8 @@ def display_atouts_workflow_progress():
         - ✨ Génération des atouts
         """)
         
-        # Auto-refresh toutes les 3 secondes
-        time.sleep(3)
+        # Suivre la progression en direct (flux SSE) jusqu'au prochain interrupt ou à la fin du run
+        follow_workflow_events(st.session_state.atouts_thread_id, st.empty())
         st.rerun()
     
     elif status == "waiting_atouts_validation":
@@ -5197,10 +5315,12 @@ def send_value_chain_validation_api_call(thread_id: str, validation_result: Dict
         response = requests.post(
             f"{API_URL}/value-chain/threads/{thread_id}/validate",
             json=validation_result,
-            timeout=600
+            timeout=60
         )
         response.raise_for_status()
-        result = response.json()
+        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+        run = wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
+        result = run["result"] or {}
         workflow_status = result.get("workflow_status", "running")
         st.session_state.value_chain_workflow_status = workflow_status
         result_queue.put((True, None))
@@ -6010,8 +6130,8 @@ def display_value_chain_workflow_progress():
         - ⚠️ Extraction des points de friction
         """)
         
-        # Auto-refresh toutes les 3 secondes
-        time.sleep(3)
+        # Suivre la progression en direct (flux SSE) jusqu'au prochain interrupt ou à la fin du run
+        follow_workflow_events(st.session_state.value_chain_thread_id, st.empty())
         st.rerun()
     
     elif status == "waiting_validation":
@@ -6537,8 +6657,8 @@ def display_prerequis_workflow_progress():
         - 📋 Synthèse globale
         """)
         
-        # Auto-refresh toutes les 3 secondes
-        time.sleep(3)
+        # Suivre la progression en direct (flux SSE) jusqu'au prochain interrupt ou à la fin du run
+        follow_workflow_events(st.session_state.prerequis_thread_id, st.empty())
         st.rerun()
     
     elif status == "completed":
@@ -6859,11 +6979,13 @@ def display_prerequis_validation_interface():
                                 "regeneration_comment": regeneration_comment,
                                 "modified_evaluations": modified_evaluations_to_send if modified_evaluations_to_send else None
                             },
-                            timeout=600
+                            timeout=60
                         )
                         response.raise_for_status()
                         
-                        result = response.json()
+                        # La reprise tourne en arrière-plan côté API : attendre la fin du run
+                        run = wait_for_run(response.json()["run_id"], timeout=600)  # 10 minutes
+                        result = run["result"] or {}
                         
                         # Vérifier si on est encore en attente de validation (nouvelle boucle)
                         if result.get("validation_pending", False):
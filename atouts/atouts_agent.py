@@ -2,18 +2,23 @@
 Agent pour extraire les atouts de l'entreprise pour l'intégration de l'IA
 """
 import logging
-from typing import List, Dict, Any
-import openai
+from typing import List, Dict, Any, Optional
 import os
 from dotenv import load_dotenv
+from utils.llm_gateway import get_llm_client
+from utils.chunking import map_reduce, merge_unique
+from utils.regeneration import format_items
+from utils.citation_alignment import align_references, is_citation_id_mode_enabled, number_interventions
 
-from models.atouts_models import CitationsAtoutsResponse, AtoutsResponse
+from models.atouts_models import CitationAtout, CitationsAtoutsResponse, CitationsAtoutsRefResponse, AtoutsResponse
+from prompts.citation_reference_prompts import CITATION_REFERENCE_INSTRUCTIONS
 from prompts.atouts_agent_prompts import (
     ATOUTS_CITATIONS_SYSTEM_PROMPT,
     ATOUTS_CITATIONS_PROMPT,
     ATOUTS_SYNTHESIS_SYSTEM_PROMPT,
     ATOUTS_SYNTHESIS_PROMPT,
-    ATOUTS_REGENERATION_PROMPT
+    ATOUTS_REGENERATION_PROMPT,
+    ATOUTS_DELTA_REGENERATION_PROMPT
 )
 
 # Charger les variables d'environnement
@@ -27,10 +32,7 @@ class AtoutsAgent:
     
     def __init__(self, api_key: str = None):
         """Initialise l'agent avec la clé API OpenAI"""
-        if api_key:
-            openai.api_key = api_key
-        else:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = get_llm_client(api_key, agent="atouts")
         
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
@@ -48,14 +50,30 @@ class AtoutsAgent:
             logger.warning("Aucune intervention intéressante fournie")
             return CitationsAtoutsResponse(citations=[])
         
+        # Transcripts longs : fenêtres glissantes traitées en parallèle, citations fusionnées
+        citations = map_reduce(
+            interesting_interventions,
+            lambda window: self._extract_citations_window(window.items).citations,
+            lambda results: merge_unique(results, key=lambda c: c.citation or None)
+        )
+        logger.info(f"Extrait {len(citations)} citations d'atouts")
+        return CitationsAtoutsResponse(citations=citations)
+    
+    def _extract_citations_window(self, interventions: List[Dict[str, Any]]) -> CitationsAtoutsResponse:
+        """Extrait les citations d'atouts d'une fenêtre d'interventions"""
+        # Mode identifiant : interventions numérotées [i], citations reconstituées localement
+        id_mode = is_citation_id_mode_enabled()
+        
         # Préparer le texte pour l'analyse
-        transcript_text = self._format_interventions(interesting_interventions)
+        transcript_text = self._format_interventions(interventions, numbered=id_mode)
         
         # Appeler le LLM pour extraire les citations
         prompt = ATOUTS_CITATIONS_PROMPT.format(transcript_text=transcript_text)
+        if id_mode:
+            prompt += CITATION_REFERENCE_INSTRUCTIONS
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=ATOUTS_CITATIONS_SYSTEM_PROMPT,
                 input=[
@@ -69,12 +87,17 @@ class AtoutsAgent:
                         ]
                     }
                 ],
-                text_format=CitationsAtoutsResponse
+                text_format=CitationsAtoutsRefResponse if id_mode else CitationsAtoutsResponse
             )
             
-            citations_response = response.output_parsed
-            logger.info(f"Extrait {len(citations_response.citations)} citations d'atouts")
-            return citations_response
+            if id_mode:
+                aligned = align_references(response.output_parsed.citations, interventions)
+                return CitationsAtoutsResponse(citations=[
+                    CitationAtout(citation=c["citation"], type_atout=c["type_atout"], contexte=c["contexte"])
+                    for c in aligned
+                ])
+            
+            return response.output_parsed
             
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction des citations d'atouts: {e}")
@@ -116,7 +139,7 @@ class AtoutsAgent:
         print(prompt)
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=ATOUTS_SYNTHESIS_SYSTEM_PROMPT,
                 input=[
@@ -148,7 +171,9 @@ class AtoutsAgent:
         validated_atouts: List[Dict[str, Any]],
         rejected_atouts: List[Dict[str, Any]],
         user_feedback: str,
-        additional_context: str = ""
+        additional_context: str = "",
+        evidence_digest: Optional[str] = None,
+        num_atouts: int = 3
     ) -> AtoutsResponse:
         """
         Régénère de nouveaux atouts en évitant les doublons avec ceux déjà validés/rejetés
@@ -160,10 +185,25 @@ class AtoutsAgent:
             rejected_atouts: Atouts déjà rejetés par l'utilisateur
             user_feedback: Feedback de l'utilisateur
             additional_context: Contexte additionnel
+            evidence_digest: Condensé des citations du run ; si fourni, seuls ce condensé, les atouts
+                validés / rejetés et le feedback sont envoyés (mode delta)
+            num_atouts: Nombre d'atouts à remplacer (mode delta)
             
         Returns:
             AtoutsResponse avec de nouveaux atouts différents
         """
+        if evidence_digest is not None:
+            prompt = ATOUTS_DELTA_REGENERATION_PROMPT.format(
+                validated_atouts=format_items(validated_atouts),
+                rejected_atouts=format_items(rejected_atouts),
+                user_feedback=user_feedback if user_feedback else "Aucun feedback spécifique",
+                evidence_digest=evidence_digest,
+                num_atouts=num_atouts
+            )
+            if additional_context:
+                prompt += f"\n\nContexte additionnel :\n{additional_context}"
+            return self._call_regeneration(prompt)
+        
         # Formater les citations
         citations_text = self._format_citations(citations)
         
@@ -189,10 +229,14 @@ class AtoutsAgent:
         if additional_context:
             prompt += f"\n\nContexte additionnel :\n{additional_context}"
         
+        return self._call_regeneration(prompt)
+    
+    def _call_regeneration(self, prompt: str) -> AtoutsResponse:
+        """Appelle le LLM avec un prompt de régénération d'atouts"""
         print(prompt)
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=ATOUTS_SYNTHESIS_SYSTEM_PROMPT,
                 input=[
@@ -217,8 +261,14 @@ class AtoutsAgent:
             logger.error(f"Erreur lors de la régénération des atouts: {e}")
             return AtoutsResponse(atouts=[])
     
-    def _format_interventions(self, interventions: List[Dict[str, Any]]) -> str:
-        """Formate les interventions pour l'analyse LLM avec métadonnées enrichies (role et level)"""
+    def _format_interventions(self, interventions: List[Dict[str, Any]], numbered: bool = False) -> str:
+        """
+        Formate les interventions pour l'analyse LLM avec métadonnées enrichies (role et level)
+        
+        Args:
+            interventions: Interventions à formater
+            numbered: Préfixer chaque intervention par son numéro [i] (mode identifiant)
+        """
         formatted = []
         
         for intervention in interventions:
@@ -239,6 +289,9 @@ class AtoutsAgent:
             else:
                 formatted.append(text)
         
+        if numbered:
+            formatted = number_interventions(formatted)
+        
         return "\n\n".join(formatted)
     
     def _format_citations(self, citations: CitationsAtoutsResponse) -> str:
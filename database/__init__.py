@@ -10,6 +10,7 @@ from database.db import (
     init_db,
     drop_all_tables,
     execute_sql_file,
+    get_pool_stats,
     DATABASE_URL,
 )
 from database.models import (
@@ -30,6 +31,7 @@ __all__ = [
     "init_db",
     "drop_all_tables",
     "execute_sql_file",
+    "get_pool_stats",
     "DATABASE_URL",
     "Base",
     "User",
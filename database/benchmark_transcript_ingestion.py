@@ -0,0 +1,99 @@
+"""
+Benchmark d'ingestion des transcripts : create_batch (ORM) vs bulk_insert (execute_values)
+
+Usage:
+    python database/benchmark_transcript_ingestion.py
+    python database/benchmark_transcript_ingestion.py --sizes 1000 10000 100000 --skip-orm-above 10000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.db import get_db_context, DATABASE_URL
+from database.repository import ProjectRepository, DocumentRepository, TranscriptRepository
+from database.schemas import ProjectCreate, DocumentCreate, TranscriptBase, TranscriptBatchCreate
+
+
+def _synthetic_transcripts(count: int):
+    """Génère des interventions synthétiques (alternance interviewer / interviewé)"""
+    speakers = [("Interviewer", "interviewer"), ("Jean Dupont", "interviewé")]
+    for i in range(count):
+        name, speaker_type = speakers[i % 2]
+        yield TranscriptBase(
+            speaker=name,
+            timestamp=f"{i // 3600:02d}:{(i // 60) % 60:02d}:{i % 60:02d}",
+            text=f"Intervention {i} : nous traitons les commandes fournisseurs manuellement dans Excel.",
+            speaker_type=speaker_type,
+        )
+
+
+def _create_document(db, project_id: int, label: str) -> int:
+    document = DocumentRepository.create(db, DocumentCreate(
+        project_id=project_id,
+        file_name=f"benchmark_{label}.json",
+        file_type="transcript",
+    ))
+    return document.id
+
+
+def run_benchmark(sizes, skip_orm_above: int):
+    """Mesure le débit (lignes/s) des deux chemins d'ingestion"""
+    print("=" * 60)
+    print("Benchmark d'ingestion des transcripts")
+    print("=" * 60)
+    print(f"URL: {DATABASE_URL.split('@')[0]}@***")
+
+    with get_db_context() as db:
+        project = ProjectRepository.create(db, ProjectCreate(company_name="__benchmark_ingestion__"))
+        project_id = project.id
+
+    try:
+        print(f"\n{'Lignes':>10} | {'Méthode':<12} | {'Durée (s)':>10} | {'Lignes/s':>12}")
+        print("-" * 54)
+        for size in sizes:
+            # Chemin ORM historique (un refresh par ligne)
+            if size <= skip_orm_above:
+                with get_db_context() as db:
+                    document_id = _create_document(db, project_id, f"orm_{size}")
+                    batch = TranscriptBatchCreate(
+                        document_id=document_id,
+                        transcripts=list(_synthetic_transcripts(size)),
+                    )
+                    start = time.perf_counter()
+                    TranscriptRepository.create_batch(db, batch)
+                    elapsed = time.perf_counter() - start
+                print(f"{size:>10} | {'create_batch':<12} | {elapsed:>10.2f} | {size / elapsed:>12.0f}")
+            else:
+                print(f"{size:>10} | {'create_batch':<12} | {'ignoré':>10} | {'-':>12}")
+
+            # Chemin bulk (execute_values + RETURNING id)
+            with get_db_context() as db:
+                document_id = _create_document(db, project_id, f"bulk_{size}")
+                start = time.perf_counter()
+                ids = TranscriptRepository.bulk_insert(db, document_id, _synthetic_transcripts(size))
+                elapsed = time.perf_counter() - start
+            assert len(ids) == size, f"{len(ids)} IDs retournés pour {size} lignes"
+            print(f"{size:>10} | {'bulk_insert':<12} | {elapsed:>10.2f} | {size / elapsed:>12.0f}")
+    finally:
+        # Nettoyage (cascade sur documents et transcripts)
+        with get_db_context() as db:
+            ProjectRepository.delete(db, project_id)
+
+    print("\n✅ Benchmark terminé")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark d'ingestion des transcripts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--skip-orm-above",
+        type=int,
+        default=10000,
+        help="Ne pas mesurer create_batch au-delà de ce nombre de lignes (trop lent)",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.skip_orm_above)
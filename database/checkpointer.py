@@ -0,0 +1,603 @@
+"""
+Checkpointer LangGraph persistant dans PostgreSQL.
+
+Remplace MemorySaver pour que les workflows en pause (human-in-the-loop) ne vivent
+plus en RAM : chaque checkpoint est écrit dans la base et relu à la demande.
+
+- Les valeurs des canaux sont stockées une fois par version (langgraph_checkpoint_blobs),
+  un checkpoint ne réécrit donc que les canaux modifiés.
+- Les blobs volumineux sont compressés (zlib).
+- Seuls les N derniers checkpoints de chaque thread sont conservés et les threads
+  inactifs depuis plus de CHECKPOINT_TTL_HOURS sont supprimés (reclaim_expired).
+- Un run annulé peut être défait (rollback_point) : les checkpoints et écritures
+  qu'il a produits sont supprimés et le thread reprend depuis son checkpoint de départ.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from sqlalchemy import delete, exists, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+from database.db import engine as default_engine
+from database.models import (
+    LangGraphCheckpoint,
+    LangGraphCheckpointBlob,
+    LangGraphCheckpointWrite,
+)
+
+logger = logging.getLogger(__name__)
+
+# Backend du checkpointer : postgres (défaut) ou memory (développement)
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "postgres").lower()
+# Nombre de checkpoints conservés par thread (0 = tout conserver)
+CHECKPOINT_KEEP_PER_THREAD = int(os.getenv("CHECKPOINT_KEEP_PER_THREAD", "3"))
+# Durée de vie d'un thread inactif (heures)
+CHECKPOINT_TTL_HOURS = float(os.getenv("CHECKPOINT_TTL_HOURS", "168"))
+# Taille à partir de laquelle un blob est compressé (octets)
+CHECKPOINT_COMPRESS_MIN_BYTES = int(os.getenv("CHECKPOINT_COMPRESS_MIN_BYTES", "1024"))
+
+_COMPRESSED_SUFFIX = "+zlib"
+
+_checkpoints = LangGraphCheckpoint.__table__
+_blobs = LangGraphCheckpointBlob.__table__
+_writes = LangGraphCheckpointWrite.__table__
+
+
+class PostgresCheckpointer(BaseCheckpointSaver[str]):
+    """Checkpointer LangGraph stocké dans les tables langgraph_checkpoint*"""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        keep_per_thread: int = CHECKPOINT_KEEP_PER_THREAD,
+        ttl_hours: float = CHECKPOINT_TTL_HOURS,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.engine = engine or default_engine
+        self.keep_per_thread = keep_per_thread
+        self.ttl_hours = ttl_hours
+        # Checkpoint de départ des runs en cours, par thread (protégé de l'élagage)
+        self._pinned: Dict[str, str] = {}
+
+    # ==================== SÉRIALISATION ====================
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        """Sérialise une valeur et la compresse si elle est volumineuse"""
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= CHECKPOINT_COMPRESS_MIN_BYTES:
+            return type_ + _COMPRESSED_SUFFIX, zlib.compress(data)
+        return type_, data
+
+    def _loads(self, type_: str, data: Any) -> Any:
+        """Désérialise une valeur (décompresse si nécessaire)"""
+        data = bytes(data) if data is not None else b""
+        if type_.endswith(_COMPRESSED_SUFFIX):
+            type_ = type_[: -len(_COMPRESSED_SUFFIX)]
+            data = zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    # ==================== LECTURE ====================
+
+    def _load_blobs(
+        self, conn, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        """Charge uniquement les versions de canaux référencées par le checkpoint"""
+        if not versions:
+            return {}
+        pairs = [(channel, str(version)) for channel, version in versions.items()]
+        rows = conn.execute(
+            select(_blobs.c.channel, _blobs.c.type, _blobs.c.blob).where(
+                _blobs.c.thread_id == thread_id,
+                _blobs.c.checkpoint_ns == checkpoint_ns,
+                tuple_(_blobs.c.channel, _blobs.c.version).in_(pairs),
+            )
+        )
+        return {
+            row.channel: self._loads(row.type, row.blob)
+            for row in rows
+            if row.type != "empty"
+        }
+
+    def _load_writes(
+        self, conn, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> List[Tuple[str, str, Any]]:
+        rows = conn.execute(
+            select(_writes.c.task_id, _writes.c.channel, _writes.c.type, _writes.c.blob)
+            .where(
+                _writes.c.thread_id == thread_id,
+                _writes.c.checkpoint_ns == checkpoint_ns,
+                _writes.c.checkpoint_id == checkpoint_id,
+            )
+            .order_by(_writes.c.task_id, _writes.c.idx)
+        )
+        return [(row.task_id, row.channel, self._loads(row.type, row.blob)) for row in rows]
+
+    def _to_tuple(self, conn, row, metadata: Optional[CheckpointMetadata] = None) -> CheckpointTuple:
+        checkpoint: Checkpoint = self._loads(row.type, row.checkpoint)
+        if metadata is None:
+            metadata = self._loads(row.metadata_type, row.metadata)
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    conn, row.thread_id, row.checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=metadata,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=self._load_writes(conn, row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Récupère un checkpoint (le dernier du thread si aucun checkpoint_id n'est fourni)"""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        query = select(_checkpoints).where(
+            _checkpoints.c.thread_id == thread_id,
+            _checkpoints.c.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(_checkpoints.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(_checkpoints.c.checkpoint_id.desc()).limit(1)
+
+        with self.engine.connect() as conn:
+            row = conn.execute(query).first()
+            if row is None:
+                return None
+            return self._to_tuple(conn, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Liste les checkpoints du plus récent au plus ancien (chargés au fil de l'itération)"""
+        query = select(_checkpoints)
+        if config:
+            query = query.where(_checkpoints.c.thread_id == config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                query = query.where(_checkpoints.c.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(_checkpoints.c.checkpoint_id == checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            query = query.where(_checkpoints.c.checkpoint_id < before_checkpoint_id)
+        query = query.order_by(_checkpoints.c.checkpoint_id.desc())
+        if limit is not None and not filter:
+            query = query.limit(limit)
+
+        with self.engine.connect() as conn:
+            rows = conn.execution_options(stream_results=True, yield_per=20).execute(query)
+            for row in rows:
+                metadata = self._loads(row.metadata_type, row.metadata)
+                # Filtre sur les métadonnées (même sémantique que MemorySaver)
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+                if limit is not None:
+                    if limit <= 0:
+                        break
+                    limit -= 1
+                yield self._to_tuple(conn, row, metadata)
+
+    # ==================== ÉCRITURE ====================
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Sauvegarde un checkpoint (seuls les canaux modifiés sont écrits)"""
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        blob_rows = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                type_, blob = self._dumps(values[channel])
+            else:
+                type_, blob = "empty", None
+            blob_rows.append({
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "channel": channel,
+                "version": str(version),
+                "type": type_,
+                "blob": blob,
+            })
+
+        checkpoint_type, checkpoint_blob = self._dumps(c)
+        metadata_type, metadata_blob = self._dumps(get_checkpoint_metadata(config, metadata))
+        checkpoint_row = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": checkpoint_type,
+            "checkpoint": checkpoint_blob,
+            "metadata_type": metadata_type,
+            "metadata": metadata_blob,
+            "channel_versions": {k: str(v) for k, v in checkpoint["channel_versions"].items()},
+        }
+
+        with self.engine.begin() as conn:
+            if blob_rows:
+                conn.execute(insert(_blobs).on_conflict_do_nothing(), blob_rows)
+            stmt = insert(_checkpoints).values(**checkpoint_row)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["thread_id", "checkpoint_ns", "checkpoint_id"],
+                set_={
+                    "type": stmt.excluded.type,
+                    "checkpoint": stmt.excluded.checkpoint,
+                    "metadata_type": stmt.excluded.metadata_type,
+                    "metadata": stmt.excluded["metadata"],
+                    "channel_versions": stmt.excluded.channel_versions,
+                },
+            ))
+            if self.keep_per_thread > 0:
+                self._prune_thread(conn, thread_id, checkpoint_ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Sauvegarde les écritures en attente d'une tâche"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self._dumps(value)
+            rows.append({
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "type": type_,
+                "blob": blob,
+                "task_path": task_path,
+            })
+        if not rows:
+            return
+
+        stmt = insert(_writes)
+        if all(channel in WRITES_IDX_MAP for channel, _ in writes):
+            # Écritures spéciales (erreurs, interrupts) : la dernière valeur l'emporte
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"],
+                set_={
+                    "channel": stmt.excluded.channel,
+                    "type": stmt.excluded.type,
+                    "blob": stmt.excluded.blob,
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing()
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        next_v = current_v + 1
+        next_h = random.random()
+        return f"{next_v:032}.{next_h:016}"
+
+    # ==================== NETTOYAGE ====================
+
+    def _prune_thread(self, conn, thread_id: str, checkpoint_ns: str) -> None:
+        """Supprime les checkpoints au-delà des N plus récents, leurs écritures et les blobs orphelins"""
+        kept = (
+            select(_checkpoints.c.checkpoint_id)
+            .where(
+                _checkpoints.c.thread_id == thread_id,
+                _checkpoints.c.checkpoint_ns == checkpoint_ns,
+            )
+            .order_by(_checkpoints.c.checkpoint_id.desc())
+            .limit(self.keep_per_thread)
+            .scalar_subquery()
+        )
+        conditions = [
+            _checkpoints.c.thread_id == thread_id,
+            _checkpoints.c.checkpoint_ns == checkpoint_ns,
+            _checkpoints.c.checkpoint_id.not_in(kept),
+        ]
+        pinned = self._pinned.get(thread_id)
+        if pinned and checkpoint_ns == "":
+            conditions.append(_checkpoints.c.checkpoint_id != pinned)
+        deleted = conn.execute(delete(_checkpoints).where(*conditions)).rowcount
+        if deleted:
+            self._delete_orphans(conn, thread_id, checkpoint_ns)
+
+    def _delete_orphans(self, conn, thread_id: str, checkpoint_ns: Optional[str] = None) -> None:
+        """Supprime les écritures et blobs qui ne sont plus référencés par aucun checkpoint du thread"""
+        write_conditions = [_writes.c.thread_id == thread_id]
+        blob_conditions = [_blobs.c.thread_id == thread_id]
+        if checkpoint_ns is not None:
+            write_conditions.append(_writes.c.checkpoint_ns == checkpoint_ns)
+            blob_conditions.append(_blobs.c.checkpoint_ns == checkpoint_ns)
+
+        conn.execute(
+            delete(_writes).where(
+                *write_conditions,
+                ~exists().where(
+                    _checkpoints.c.thread_id == _writes.c.thread_id,
+                    _checkpoints.c.checkpoint_ns == _writes.c.checkpoint_ns,
+                    _checkpoints.c.checkpoint_id == _writes.c.checkpoint_id,
+                ),
+            )
+        )
+        conn.execute(
+            delete(_blobs).where(
+                *blob_conditions,
+                ~exists().where(
+                    _checkpoints.c.thread_id == _blobs.c.thread_id,
+                    _checkpoints.c.checkpoint_ns == _blobs.c.checkpoint_ns,
+                    _checkpoints.c.channel_versions[_blobs.c.channel].astext == _blobs.c.version,
+                ),
+            )
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Supprime tous les checkpoints, blobs et écritures d'un thread"""
+        with self.engine.begin() as conn:
+            for table in (_writes, _blobs, _checkpoints):
+                conn.execute(delete(table).where(table.c.thread_id == thread_id))
+
+    def reclaim_expired(self, ttl_hours: Optional[float] = None) -> int:
+        """
+        Supprime les threads dont le dernier checkpoint est plus ancien que le TTL.
+
+        Args:
+            ttl_hours: Durée de vie en heures (défaut: CHECKPOINT_TTL_HOURS)
+
+        Returns:
+            Nombre de threads supprimés
+        """
+        ttl_hours = self.ttl_hours if ttl_hours is None else ttl_hours
+        if ttl_hours <= 0:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+
+        with self.engine.begin() as conn:
+            expired = [
+                row.thread_id
+                for row in conn.execute(
+                    select(_checkpoints.c.thread_id)
+                    .group_by(_checkpoints.c.thread_id)
+                    .having(func.max(_checkpoints.c.created_at) < cutoff)
+                )
+            ]
+            if expired:
+                for table in (_writes, _blobs, _checkpoints):
+                    conn.execute(delete(table).where(table.c.thread_id.in_(expired)))
+
+        if expired:
+            logger.info(f"🧹 {len(expired)} thread(s) expiré(s) supprimé(s) du checkpointer")
+        return len(expired)
+
+    # ==================== ANNULATION D'UN RUN ====================
+
+    @contextmanager
+    def rollback_point(self, thread_id: str) -> Iterator[Callable[[], None]]:
+        """
+        Point de retour d'un run : le dernier checkpoint du thread est protégé de l'élagage
+        pendant le bloc. La fonction fournie supprime ce que le run a écrit depuis
+        (checkpoints plus récents, écritures ajoutées au checkpoint de départ).
+        """
+        with self.engine.connect() as conn:
+            checkpoint_id = conn.execute(
+                select(func.max(_checkpoints.c.checkpoint_id)).where(
+                    _checkpoints.c.thread_id == thread_id,
+                    _checkpoints.c.checkpoint_ns == "",
+                )
+            ).scalar()
+            write_keys = {
+                (row.task_id, row.idx)
+                for row in conn.execute(
+                    select(_writes.c.task_id, _writes.c.idx).where(
+                        _writes.c.thread_id == thread_id,
+                        _writes.c.checkpoint_ns == "",
+                        _writes.c.checkpoint_id == checkpoint_id,
+                    )
+                )
+            } if checkpoint_id else set()
+
+        if checkpoint_id:
+            self._pinned[thread_id] = checkpoint_id
+        try:
+            yield lambda: self._rollback(thread_id, checkpoint_id, write_keys)
+        finally:
+            if checkpoint_id and self._pinned.get(thread_id) == checkpoint_id:
+                del self._pinned[thread_id]
+
+    def _rollback(self, thread_id: str, checkpoint_id: Optional[str], write_keys: Set[Tuple[str, int]]) -> None:
+        """Ramène le thread à `checkpoint_id` (aucun checkpoint : le thread est vidé)"""
+        if checkpoint_id is None:
+            self.delete_thread(thread_id)
+            return
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                delete(_checkpoints).where(
+                    _checkpoints.c.thread_id == thread_id,
+                    _checkpoints.c.checkpoint_id > checkpoint_id,
+                )
+            )
+            # Écritures ajoutées au checkpoint de départ (reprise, résultats des tâches)
+            added_writes = delete(_writes).where(
+                _writes.c.thread_id == thread_id,
+                _writes.c.checkpoint_ns == "",
+                _writes.c.checkpoint_id == checkpoint_id,
+            )
+            if write_keys:
+                added_writes = added_writes.where(
+                    tuple_(_writes.c.task_id, _writes.c.idx).not_in(list(write_keys))
+                )
+            conn.execute(added_writes)
+            self._delete_orphans(conn, thread_id)
+        logger.info(f"⏪ Thread {thread_id} ramené au checkpoint {checkpoint_id}")
+
+    # ==================== VERSIONS ASYNCHRONES ====================
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_checkpointer: Optional[BaseCheckpointSaver] = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer() -> BaseCheckpointSaver:
+    """
+    Retourne le checkpointer partagé du processus (créé au premier appel).
+
+    CHECKPOINTER_BACKEND=memory permet de revenir à MemorySaver (développement sans BDD).
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        with _checkpointer_lock:
+            if _checkpointer is None:
+                if CHECKPOINTER_BACKEND == "memory":
+                    _checkpointer = MemorySaver()
+                else:
+                    _checkpointer = PostgresCheckpointer()
+    return _checkpointer
+
+
+def _memory_rollback_point(checkpointer: MemorySaver, thread_id: str) -> Callable[[], None]:
+    """Équivalent de PostgresCheckpointer.rollback_point pour MemorySaver (développement)"""
+    checkpoints = checkpointer.storage.get(thread_id, {}).get("", {})
+    checkpoint_id = max(checkpoints) if checkpoints else None
+    write_keys = set(checkpointer.writes.get((thread_id, "", checkpoint_id), {})) if checkpoint_id else set()
+
+    def rollback() -> None:
+        if checkpoint_id is None:
+            checkpointer.delete_thread(thread_id)
+            return
+        for checkpoint_ns, stored in checkpointer.storage.get(thread_id, {}).items():
+            for newer_id in [cid for cid in stored if cid > checkpoint_id]:
+                del stored[newer_id]
+                checkpointer.writes.pop((thread_id, checkpoint_ns, newer_id), None)
+        pending = checkpointer.writes.get((thread_id, "", checkpoint_id), {})
+        for key in [key for key in pending if key not in write_keys]:
+            del pending[key]
+
+    return rollback
+
+
+@contextmanager
+def rollback_point(checkpointer: BaseCheckpointSaver, thread_id: str) -> Iterator[Callable[[], None]]:
+    """
+    Point de retour d'un run sur le checkpointer partagé, quel que soit le backend.
+    La fonction fournie défait les checkpoints écrits depuis l'entrée dans le bloc.
+    """
+    if isinstance(checkpointer, PostgresCheckpointer):
+        with checkpointer.rollback_point(thread_id) as rollback:
+            yield rollback
+    elif isinstance(checkpointer, MemorySaver):
+        yield _memory_rollback_point(checkpointer, thread_id)
+    else:
+        yield lambda: logger.warning(f"⚠️ Rollback non supporté par {type(checkpointer).__name__} (thread {thread_id})")
+
@@ -2,6 +2,7 @@
 Service centralisé pour parser et sauvegarder les documents dans la base de données
 """
 
+import itertools
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -17,13 +18,13 @@ from database.repository import (
 )
 from database.schemas import (
     DocumentCreate,
-    TranscriptBatchCreate,
     TranscriptBase,
     WorkshopCreate,
     WordExtractionCreate,
 )
 from process_transcript.pdf_parser import PDFParser
 from process_transcript.json_parser import JSONParser
+from process_transcript.parse_cache import parse_cache
 from process_atelier.workshop_agent import WorkshopAgent
 from executive_summary.word_report_extractor import WordReportExtractor
 
@@ -79,20 +80,30 @@ class DocumentParserService:
             raise FileNotFoundError(f"Le fichier n'existe pas: {file_path}")
         
         file_extension = path.suffix.lower()
-        interventions = []
         
-        # Parser selon le type de fichier
+        # Parser selon le type de fichier. Le fichier a en général déjà été parsé par
+        # /transcripts/classify-speakers : réutiliser le cache de parsing (clé = contenu).
+        # Sinon parsing en streaming : les interventions sont lues au fil de l'insertion
+        # en base (mémoire bornée pour les très gros exports)
         if file_extension == ".pdf":
-            logger.info("Parsing PDF")
-            interventions = self.pdf_parser.parse_transcript(file_path)
+            parser, stream = self.pdf_parser, self.pdf_parser.iter_interventions
         elif file_extension == ".json":
-            logger.info("Parsing JSON")
-            interventions = self.json_parser.parse_transcript(file_path)
+            parser, stream = self.json_parser, self.json_parser.iter_transcript
         else:
             raise ValueError(f"Format de fichier non supporté pour transcript: {file_extension}")
         
-        if not interventions:
+        cached_interventions = parse_cache.lookup(file_path, parser)
+        if cached_interventions is not None:
+            interventions = iter(cached_interventions)
+        else:
+            logger.info(f"Parsing {file_extension[1:].upper()}")
+            interventions = stream(file_path)
+        
+        # Lire la première intervention avant toute écriture : un fichier vide est rejeté d'emblée
+        first_intervention = next(interventions, None)
+        if first_intervention is None:
             raise ValueError(f"Aucune intervention trouvée dans le fichier: {file_path}")
+        interventions = itertools.chain([first_intervention], interventions)
         
         # Créer un mapping nom validé -> speaker validé
         validated_speakers_map = {s["name"]: s for s in validated_speakers}
@@ -178,75 +189,81 @@ class DocumentParserService:
             
             # Filtrer les interventions : ne garder que celles avec un speaker validé
             # ET créer les transcripts avec speaker_id
-            transcript_bases = []
             speakers_found = set()
             speakers_not_found = set()
-            
-            # Log des speakers uniques dans les interventions
             unique_speakers_in_interventions = set()
-            for intervention in interventions:
-                speaker_name_raw = intervention.get("speaker")
-                if speaker_name_raw:
-                    unique_speakers_in_interventions.add(speaker_name_raw.strip())
-            logger.info(f"📋 [INTERVENTIONS] Speakers uniques dans les interventions (bruts): {sorted(unique_speakers_in_interventions)}")
+            parsed_count = 0
             
-            for intervention in interventions:
-                speaker_name_raw = intervention.get("speaker")  # Nom original du JSON/PDF
-                if not speaker_name_raw:
-                    continue
-                
-                # Normaliser le nom du speaker (strip pour éviter les problèmes d'espaces)
-                speaker_name = speaker_name_raw.strip()
-                
-                # Déterminer le nom validé à utiliser pour le matching
-                validated_name_to_use = None
-                match_type = None
-                
-                # 1. D'abord essayer de matcher par nom exact (nom validé normalisé)
-                if speaker_name in validated_names:
-                    validated_name_to_use = speaker_name
-                    match_type = "direct"
-                    logger.debug(f"✅ [MATCH] Match direct: '{speaker_name}' -> '{validated_name_to_use}'")
-                # 2. Sinon utiliser le mapping original_name -> validated_name si le speaker a été renommé
-                elif speaker_name in original_to_validated_map:
-                    validated_name_to_use = original_to_validated_map[speaker_name]
-                    match_type = "mapping"
-                    logger.info(f"✅ [MATCH] Match via mapping: '{speaker_name}' -> '{validated_name_to_use}'")
-                else:
-                    speakers_not_found.add(speaker_name)
-                    logger.debug(f"❌ [MATCH] Speaker non trouvé: '{speaker_name}' (raw: '{speaker_name_raw}')")
-                
-                # Si le speaker est validé (directement ou via mapping), associer speaker_id
-                if validated_name_to_use:
-                    # Normaliser validated_name_to_use pour s'assurer qu'il correspond à la clé dans speaker_id_map
-                    validated_name_to_use_normalized = validated_name_to_use.strip() if validated_name_to_use else ""
+            def transcript_rows():
+                nonlocal parsed_count
+                for intervention in interventions:
+                    parsed_count += 1
+                    speaker_name_raw = intervention.get("speaker")  # Nom original du JSON/PDF
+                    if not speaker_name_raw:
+                        continue
                     
-                    # Vérifier que le nom validé est bien dans validated_names (pour sécurité)
-                    if validated_name_to_use_normalized in validated_names:
-                        speakers_found.add(speaker_name)
-                        speaker_id = speaker_id_map.get(validated_name_to_use_normalized)
-                        speaker_type = speaker_type_map.get(validated_name_to_use_normalized)
-                        
-                        if speaker_id is None:
-                            logger.warning(f"⚠️ [MATCH] speaker_id est None pour '{validated_name_to_use_normalized}' (speaker_name: '{speaker_name}', match_type: {match_type})")
-                            logger.warning(f"⚠️ [MATCH] Clés disponibles dans speaker_id_map: {list(speaker_id_map.keys())}")
-                        else:
-                            logger.debug(f"✅ [MATCH] Speaker trouvé: '{speaker_name}' -> '{validated_name_to_use_normalized}' (ID: {speaker_id}, type: {match_type})")
+                    # Normaliser le nom du speaker (strip pour éviter les problèmes d'espaces)
+                    speaker_name = speaker_name_raw.strip()
+                    unique_speakers_in_interventions.add(speaker_name)
+                    
+                    # Déterminer le nom validé à utiliser pour le matching
+                    validated_name_to_use = None
+                    match_type = None
+                    
+                    # 1. D'abord essayer de matcher par nom exact (nom validé normalisé)
+                    if speaker_name in validated_names:
+                        validated_name_to_use = speaker_name
+                        match_type = "direct"
+                        logger.debug(f"✅ [MATCH] Match direct: '{speaker_name}' -> '{validated_name_to_use}'")
+                    # 2. Sinon utiliser le mapping original_name -> validated_name si le speaker a été renommé
+                    elif speaker_name in original_to_validated_map:
+                        validated_name_to_use = original_to_validated_map[speaker_name]
+                        match_type = "mapping"
+                        if speaker_name not in speakers_found:
+                            logger.info(f"✅ [MATCH] Match via mapping: '{speaker_name}' -> '{validated_name_to_use}'")
+                    else:
+                        speakers_not_found.add(speaker_name)
+                        logger.debug(f"❌ [MATCH] Speaker non trouvé: '{speaker_name}' (raw: '{speaker_name_raw}')")
+                    
+                    # Si le speaker est validé (directement ou via mapping), associer speaker_id
+                    if validated_name_to_use:
+                        # Normaliser validated_name_to_use pour s'assurer qu'il correspond à la clé dans speaker_id_map
+                        validated_name_to_use_normalized = validated_name_to_use.strip() if validated_name_to_use else ""
                         
-                        transcript_bases.append(
-                            TranscriptBase(
+                        # Vérifier que le nom validé est bien dans validated_names (pour sécurité)
+                        if validated_name_to_use_normalized in validated_names:
+                            speakers_found.add(speaker_name)
+                            speaker_id = speaker_id_map.get(validated_name_to_use_normalized)
+                            speaker_type = speaker_type_map.get(validated_name_to_use_normalized)
+                            
+                            if speaker_id is None:
+                                logger.warning(f"⚠️ [MATCH] speaker_id est None pour '{validated_name_to_use_normalized}' (speaker_name: '{speaker_name}', match_type: {match_type})")
+                                logger.warning(f"⚠️ [MATCH] Clés disponibles dans speaker_id_map: {list(speaker_id_map.keys())}")
+                            else:
+                                logger.debug(f"✅ [MATCH] Speaker trouvé: '{speaker_name}' -> '{validated_name_to_use_normalized}' (ID: {speaker_id}, type: {match_type})")
+                            
+                            yield TranscriptBase(
                                 speaker=speaker_name_raw,  # Garder le nom original du JSON/PDF pour traçabilité
                                 speaker_id=speaker_id,
                                 timestamp=intervention.get("timestamp"),
                                 text=intervention.get("text", ""),
                                 speaker_type=speaker_type,  # Rempli depuis speakers
                             )
-                        )
-                    else:
-                        logger.warning(f"⚠️ [MATCH] validated_name_to_use '{validated_name_to_use_normalized}' pas trouvé dans validated_names")
-                        logger.warning(f"⚠️ [MATCH] validated_names disponibles: {sorted(validated_names)}")
-                # Sinon, on ne l'insère pas (selon les spécifications)
+                        else:
+                            logger.warning(f"⚠️ [MATCH] validated_name_to_use '{validated_name_to_use_normalized}' pas trouvé dans validated_names")
+                            logger.warning(f"⚠️ [MATCH] validated_names disponibles: {sorted(validated_names)}")
+                    # Sinon, on ne l'insère pas (selon les spécifications)
             
+            # Insertion en masse par pages, au fil du parsing (pas d'hydratation ORM ni de refresh par ligne)
+            try:
+                transcript_ids = TranscriptRepository.bulk_insert(db, document.id, transcript_rows(), commit=False)
+            except Exception:
+                # Fichier illisible en cours de lecture : annuler les pages insérées et le document
+                db.rollback()
+                DocumentRepository.delete(db, document.id)
+                raise
+            
+            logger.info(f"📋 [INTERVENTIONS] Speakers uniques dans les interventions (bruts): {sorted(unique_speakers_in_interventions)}")
             logger.info(f"📊 [RÉSUMÉ] Résumé matching: {len(speakers_found)} speakers trouvés, {len(speakers_not_found)} speakers non trouvés")
             logger.info(f"📊 [RÉSUMÉ] Speakers trouvés: {sorted(speakers_found)}")
             if speakers_not_found:
@@ -254,17 +271,11 @@ class DocumentParserService:
                 logger.warning(f"⚠️ [RÉSUMÉ] Noms validés disponibles: {sorted(validated_names)}")
                 logger.warning(f"⚠️ [RÉSUMÉ] Mapping original->validated: {original_to_validated_map}")
             
-            if not transcript_bases:
+            if not transcript_ids:
                 raise ValueError("Aucune intervention avec speaker validé trouvée dans le fichier")
+            db.commit()
             
-            batch = TranscriptBatchCreate(
-                document_id=document.id,
-                transcripts=transcript_bases,
-            )
-            
-            TranscriptRepository.create_batch(db, batch)
-            
-            logger.info(f"✅ {len(transcript_bases)} interventions sauvegardées (sur {len(interventions)} parsées) pour le document {document.id}")
+            logger.info(f"✅ {len(transcript_ids)} interventions sauvegardées (sur {parsed_count} parsées) pour le document {document.id}")
             logger.info(f"✅ {len(speaker_id_map)} speakers créés/récupérés dans la table speakers")
             return document.id
     
@@ -0,0 +1,74 @@
+"""add_langgraph_checkpoint_tables
+
+Revision ID: 8b3e1c2d4f6a
+Revises: 62fa4576e00c
+Create Date: 2026-10-17 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e1c2d4f6a'
+down_revision: Union[str, Sequence[str], None] = '62fa4576e00c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée les tables du checkpointer LangGraph persistant."""
+    # Table: langgraph_checkpoints (checkpoint sans les valeurs des canaux)
+    op.create_table(
+        'langgraph_checkpoints',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), server_default='', nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('parent_checkpoint_id', sa.String(length=64), nullable=True),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('checkpoint', sa.LargeBinary(), nullable=False),
+        sa.Column('metadata_type', sa.String(length=50), nullable=False),
+        sa.Column('metadata', sa.LargeBinary(), nullable=False),
+        sa.Column('channel_versions', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id')
+    )
+    # Index sur created_at pour l'expiration (TTL)
+    op.create_index('idx_langgraph_checkpoints_created_at', 'langgraph_checkpoints', ['created_at'], unique=False)
+
+    # Table: langgraph_checkpoint_blobs (une ligne par version de canal)
+    op.create_table(
+        'langgraph_checkpoint_blobs',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), server_default='', nullable=False),
+        sa.Column('channel', sa.String(length=255), nullable=False),
+        sa.Column('version', sa.String(length=64), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('blob', sa.LargeBinary(), nullable=True),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'channel', 'version')
+    )
+
+    # Table: langgraph_checkpoint_writes (écritures en attente des tâches)
+    op.create_table(
+        'langgraph_checkpoint_writes',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), server_default='', nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.String(length=255), nullable=False),
+        sa.Column('idx', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=255), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('blob', sa.LargeBinary(), nullable=False),
+        sa.Column('task_path', sa.Text(), server_default='', nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime les tables du checkpointer LangGraph."""
+    op.drop_table('langgraph_checkpoint_writes')
+    op.drop_table('langgraph_checkpoint_blobs')
+    op.drop_index('idx_langgraph_checkpoints_created_at', table_name='langgraph_checkpoints')
+    op.drop_table('langgraph_checkpoints')
@@ -0,0 +1,43 @@
+"""add_llm_response_cache_table
+
+Revision ID: a3c5e8f1b7d2
+Revises: f2a8b6c4e1d9
+Create Date: 2026-10-17 16:48:12.204317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e8f1b7d2'
+down_revision: Union[str, Sequence[str], None] = 'f2a8b6c4e1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée la table du cache des réponses LLM."""
+    op.create_table(
+        'llm_response_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('agent', sa.String(length=100), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('method', sa.String(length=20), nullable=False),
+        sa.Column('response', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_accessed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('idx_llm_response_cache_last_accessed_at', 'llm_response_cache', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime la table du cache des réponses LLM."""
+    op.drop_index('idx_llm_response_cache_last_accessed_at', table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
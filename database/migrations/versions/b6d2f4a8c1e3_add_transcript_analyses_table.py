@@ -0,0 +1,42 @@
+"""add_transcript_analyses_table
+
+Revision ID: b6d2f4a8c1e3
+Revises: a3c5e8f1b7d2
+Create Date: 2026-10-17 17:35:40.518826
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f4a8c1e3'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e8f1b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée la table des analyses mémorisées par document transcript."""
+    op.create_table(
+        'transcript_analyses',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('document_id', sa.BigInteger(), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id', 'stage', name='uq_transcript_analyses_document_stage')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime la table des analyses mémorisées."""
+    op.drop_table('transcript_analyses')
@@ -0,0 +1,38 @@
+"""add_workflow_threads_table
+
+Revision ID: c4d9e7a1b2f3
+Revises: 8b3e1c2d4f6a
+Create Date: 2026-10-17 11:05:27.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9e7a1b2f3'
+down_revision: Union[str, Sequence[str], None] = '8b3e1c2d4f6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée le registre des threads de workflow."""
+    op.create_table(
+        'workflow_threads',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('workflow_type', sa.String(length=50), nullable=False),
+        sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('status', sa.String(length=50), server_default='created', nullable=False),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime le registre des threads de workflow."""
+    op.drop_table('workflow_threads')
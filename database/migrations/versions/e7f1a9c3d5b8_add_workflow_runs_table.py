@@ -0,0 +1,42 @@
+"""add_workflow_runs_table
+
+Revision ID: e7f1a9c3d5b8
+Revises: c4d9e7a1b2f3
+Create Date: 2026-10-17 13:41:08.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f1a9c3d5b8'
+down_revision: Union[str, Sequence[str], None] = 'c4d9e7a1b2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée la table des exécutions de workflow en arrière-plan."""
+    op.create_table(
+        'workflow_runs',
+        sa.Column('run_id', sa.String(length=64), nullable=False),
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('run_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=50), server_default='pending', nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('run_id')
+    )
+    op.create_index('idx_workflow_runs_thread_id', 'workflow_runs', ['thread_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime la table des exécutions de workflow."""
+    op.drop_index('idx_workflow_runs_thread_id', table_name='workflow_runs')
+    op.drop_table('workflow_runs')
@@ -0,0 +1,39 @@
+"""add_workflow_events_table
+
+Revision ID: f2a8b6c4e1d9
+Revises: e7f1a9c3d5b8
+Create Date: 2026-10-17 15:22:51.930114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8b6c4e1d9'
+down_revision: Union[str, Sequence[str], None] = 'e7f1a9c3d5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Crée la table des événements de progression des workflows."""
+    op.create_table(
+        'workflow_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('run_id', sa.String(length=64), nullable=True),
+        sa.Column('event', sa.String(length=50), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_workflow_events_thread_id', 'workflow_events', ['thread_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Supprime la table des événements de progression."""
+    op.drop_index('idx_workflow_events_thread_id', table_name='workflow_events')
+    op.drop_table('workflow_events')
@@ -4,7 +4,7 @@ Modèles SQLAlchemy ORM pour la base de données PostgreSQL
 
 from sqlalchemy import (
     Column, BigInteger, String, Text, Integer, DateTime, 
-    ForeignKey, UniqueConstraint, Index
+    ForeignKey, UniqueConstraint, Index, LargeBinary
 )
 from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
@@ -125,6 +125,29 @@ class Transcript(Base):
         return f"<Transcript(id={self.id}, speaker={self.speaker}, speaker_id={self.speaker_id}, text_length={len(self.text) if self.text else 0})>"
 
 
+class TranscriptAnalysis(Base):
+    """Modèle pour les résultats LLM mémorisés par document transcript (parties intéressantes, analyse sémantique)"""
+    __tablename__ = "transcript_analyses"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    document_id = Column(BigInteger, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    stage = Column(String(50), nullable=False)  # interesting_parts, semantic
+    content_hash = Column(String(64), nullable=False)  # SHA-256 des interventions analysées
+    prompt_version = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    result = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Contrainte unique : un résultat par document et par étape
+    __table_args__ = (
+        UniqueConstraint("document_id", "stage", name="uq_transcript_analyses_document_stage"),
+    )
+    
+    def __repr__(self):
+        return f"<TranscriptAnalysis(id={self.id}, document_id={self.document_id}, stage={self.stage})>"
+
+
 class WorkflowState(Base):
     """Modèle pour les checkpoints LangGraph"""
     __tablename__ = "workflow_states"
@@ -186,6 +209,145 @@ class WordExtraction(Base):
         return f"<WordExtraction(id={self.id}, extraction_type={self.extraction_type}, document_id={self.document_id})>"
 
 
+class LangGraphCheckpoint(Base):
+    """Modèle pour les checkpoints LangGraph persistés (sans les valeurs des canaux)"""
+    __tablename__ = "langgraph_checkpoints"
+    
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    parent_checkpoint_id = Column(String(64), nullable=True)
+    type = Column(String(50), nullable=False)  # Type de sérialisation du checkpoint
+    checkpoint = Column(LargeBinary, nullable=False)
+    metadata_type = Column(String(50), nullable=False)
+    checkpoint_metadata = Column("metadata", LargeBinary, nullable=False)
+    channel_versions = Column(JSONB, nullable=False)  # Versions référencées (pour le nettoyage des blobs)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("idx_langgraph_checkpoints_created_at", "created_at"),
+    )
+    
+    def __repr__(self):
+        return f"<LangGraphCheckpoint(thread_id={self.thread_id}, checkpoint_id={self.checkpoint_id})>"
+
+
+class LangGraphCheckpointBlob(Base):
+    """Modèle pour les valeurs des canaux LangGraph (une ligne par version de canal)"""
+    __tablename__ = "langgraph_checkpoint_blobs"
+    
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    channel = Column(String(255), primary_key=True)
+    version = Column(String(64), primary_key=True)
+    type = Column(String(50), nullable=False)  # Type de sérialisation ('empty' si canal vide)
+    blob = Column(LargeBinary, nullable=True)
+    
+    def __repr__(self):
+        return f"<LangGraphCheckpointBlob(thread_id={self.thread_id}, channel={self.channel}, version={self.version})>"
+
+
+class LangGraphCheckpointWrite(Base):
+    """Modèle pour les écritures en attente des tâches LangGraph"""
+    __tablename__ = "langgraph_checkpoint_writes"
+    
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    task_id = Column(String(255), primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    channel = Column(String(255), nullable=False)
+    type = Column(String(50), nullable=False)
+    blob = Column(LargeBinary, nullable=False)
+    task_path = Column(Text, nullable=False, default="")
+    
+    def __repr__(self):
+        return f"<LangGraphCheckpointWrite(thread_id={self.thread_id}, checkpoint_id={self.checkpoint_id}, task_id={self.task_id})>"
+
+
+class WorkflowThread(Base):
+    """Modèle pour le registre des threads de workflow (type + paramètres de construction)"""
+    __tablename__ = "workflow_threads"
+    
+    thread_id = Column(String(255), primary_key=True)
+    workflow_type = Column(String(50), nullable=False)  # need_analysis, executive_summary, rappel_mission, atouts, value_chain, prerequis_evaluation
+    params = Column(JSONB, nullable=False, default=dict)  # Paramètres du constructeur du workflow
+    status = Column(String(50), default="created", nullable=False)
+    state = Column(JSONB, nullable=True)  # Dernier résultat retourné par l'API
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<WorkflowThread(thread_id={self.thread_id}, workflow_type={self.workflow_type}, status={self.status})>"
+
+
+class WorkflowRun(Base):
+    """Modèle pour les exécutions de workflow en arrière-plan"""
+    __tablename__ = "workflow_runs"
+    
+    run_id = Column(String(64), primary_key=True)
+    thread_id = Column(String(255), nullable=False)
+    run_type = Column(String(50), nullable=False)  # need_analysis, atouts, value_chain, prerequis_evaluation, executive_summary_continue...
+    status = Column(String(50), default="pending", nullable=False)  # pending, running, cancelling, completed, failed, cancelled
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Index
+    __table_args__ = (
+        Index("idx_workflow_runs_thread_id", "thread_id"),
+    )
+    
+    def __repr__(self):
+        return f"<WorkflowRun(run_id={self.run_id}, thread_id={self.thread_id}, run_type={self.run_type}, status={self.status})>"
+
+
+class WorkflowEvent(Base):
+    """Modèle pour les événements de progression des workflows (flux SSE)"""
+    __tablename__ = "workflow_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    thread_id = Column(String(255), nullable=False)
+    run_id = Column(String(64), nullable=True)
+    event = Column(String(50), nullable=False)  # run_start, node_start, node_end, node_error, interrupt, run_end
+    data = Column(JSONB, nullable=False, default=dict)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Index
+    __table_args__ = (
+        Index("idx_workflow_events_thread_id", "thread_id", "id"),
+    )
+    
+    def __repr__(self):
+        return f"<WorkflowEvent(id={self.id}, thread_id={self.thread_id}, event={self.event})>"
+
+
+class LLMResponseCache(Base):
+    """Modèle pour le cache des réponses LLM (clé = hash du modèle, des instructions, de l'entrée et du schéma)"""
+    __tablename__ = "llm_response_cache"
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 hexadécimal
+    agent = Column(String(100), nullable=False)
+    model = Column(String(100), nullable=False)
+    method = Column(String(20), nullable=False)  # create, parse
+    response = Column(JSONB, nullable=False)  # Réponse OpenAI sérialisée (model_dump)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Index
+    __table_args__ = (
+        Index("idx_llm_response_cache_last_accessed_at", "last_accessed_at"),
+    )
+    
+    def __repr__(self):
+        return f"<LLMResponseCache(cache_key={self.cache_key}, agent={self.agent}, model={self.model})>"
+
+
 class AgentResult(Base):
     """Modèle pour les résultats structurés des agents"""
     __tablename__ = "agent_results"
@@ -3,15 +3,23 @@ Repository pattern pour les opérations CRUD sur la base de données
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, and_, or_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from psycopg2.extras import execute_values
+from typing import List, Optional, Dict, Any, Iterable, Union
+from datetime import datetime, timedelta, timezone
 from database.models import (
     Project,
     Document,
     Transcript,
+    TranscriptAnalysis,
     Workshop,
     WordExtraction,
     WorkflowState,
+    WorkflowThread,
+    WorkflowRun,
+    WorkflowEvent,
+    LLMResponseCache,
     AgentResult,
     Speaker,
 )
@@ -20,6 +28,7 @@ from database.schemas import (
     ProjectUpdate,
     DocumentCreate,
     DocumentUpdate,
+    TranscriptBase,
     TranscriptCreate,
     TranscriptBatchCreate,
     WorkshopCreate,
@@ -155,6 +164,19 @@ class DocumentRepository:
 class TranscriptRepository:
     """Repository pour les opérations sur les transcripts"""
     
+    # Clés disponibles pour get_enriched_by_documents
+    ENRICHED_COLUMNS = (
+        "intervention_id",
+        "speaker",
+        "speaker_id",
+        "timestamp",
+        "text",
+        "speaker_type",
+        "speaker_role",
+        "speaker_level",
+        "speaker_name",
+    )
+    
     @staticmethod
     def get_by_id(db: Session, transcript_id: int) -> Optional[Transcript]:
         """Récupère un transcript par son ID"""
@@ -181,6 +203,7 @@ class TranscriptRepository:
         
         Returns:
             Liste de dicts avec toutes les infos enrichies :
+            - intervention_id: ID stable de l'intervention (transcripts.id)
             - speaker: Nom parsé original
             - speaker_id: ID du speaker validé
             - speaker_type: Type (interviewer/interviewé) depuis speakers ou transcripts
@@ -190,16 +213,67 @@ class TranscriptRepository:
             - timestamp: Timestamp de l'intervention
             - text: Texte de l'intervention
         """
-        from database.models import Speaker
+        grouped = TranscriptRepository.get_enriched_by_documents(
+            db, [document_id], filter_interviewers=filter_interviewers
+        )
+        return grouped.get(document_id, [])
+    
+    @staticmethod
+    def get_enriched_by_documents(
+        db: Session,
+        document_ids: Iterable[int],
+        filter_interviewers: bool = False,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 1000,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Récupère les transcripts enrichis de plusieurs documents en une seule requête.
+        
+        Seules les colonnes demandées sont sélectionnées (pas d'objets ORM Transcript/Speaker)
+        et les lignes sont lues par paquets de `batch_size` (yield_per).
+        
+        Args:
+            db: Session de base de données
+            document_ids: IDs des documents
+            filter_interviewers: Si True, exclut les interventions des interviewers
+            columns: Clés à retourner parmi ENRICHED_COLUMNS (défaut: toutes)
+            batch_size: Taille des paquets de lecture
+        
+        Returns:
+            Dict document_id -> liste de dicts enrichis (mêmes clés que get_enriched_by_document),
+            dans l'ordre d'insertion des interventions. Chaque document demandé est présent.
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        grouped: Dict[int, List[Dict[str, Any]]] = {doc_id: [] for doc_id in document_ids}
+        if not document_ids:
+            return grouped
+        
+        keys = list(columns) if columns is not None else list(TranscriptRepository.ENRICHED_COLUMNS)
+        unknown = set(keys) - set(TranscriptRepository.ENRICHED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Colonnes inconnues: {sorted(unknown)}")
+        
+        # Infos depuis speakers si speaker_id existe, sinon depuis transcripts
+        has_speaker = Speaker.id.isnot(None)
+        expressions = {
+            "intervention_id": Transcript.id,
+            "speaker": Transcript.speaker,
+            "speaker_id": Transcript.speaker_id,
+            "timestamp": Transcript.timestamp,
+            "text": Transcript.text,
+            "speaker_type": case((has_speaker, Speaker.speaker_type), else_=Transcript.speaker_type),
+            "speaker_role": Speaker.role,
+            "speaker_level": Speaker.level,
+            "speaker_name": case((has_speaker, Speaker.name), else_=Transcript.speaker),
+        }
         
-        # Jointure LEFT JOIN entre Transcript et Speaker
         query = db.query(
-            Transcript,
-            Speaker
+            Transcript.document_id,
+            *[expressions[key].label(key) for key in keys]
         ).outerjoin(
             Speaker, Transcript.speaker_id == Speaker.id
         ).filter(
-            Transcript.document_id == document_id
+            Transcript.document_id.in_(document_ids)
         )
         
         # Filtrer les interviewers si demandé
@@ -219,24 +293,12 @@ class TranscriptRepository:
                 )
             )
         
-        results = query.all()
+        query = query.order_by(Transcript.document_id, Transcript.id).yield_per(batch_size)
         
-        enriched = []
-        for transcript, speaker in results:
-            # Utiliser les infos depuis speakers si disponible, sinon depuis transcripts
-            enriched.append({
-                "speaker": transcript.speaker,  # Nom parsé original
-                "speaker_id": transcript.speaker_id,
-                "timestamp": transcript.timestamp,
-                "text": transcript.text,
-                # Infos depuis speakers (si speaker_id existe)
-                "speaker_type": speaker.speaker_type if speaker else transcript.speaker_type,
-                "speaker_role": speaker.role if speaker else None,
-                "speaker_level": speaker.level if speaker else None,
-                "speaker_name": speaker.name if speaker else transcript.speaker,  # Nom validé
-            })
+        for row in query:
+            grouped[row[0]].append(dict(zip(keys, row[1:])))
         
-        return enriched
+        return grouped
     
     @staticmethod
     def search_fulltext(
@@ -281,6 +343,7 @@ class TranscriptRepository:
         """Crée un nouveau transcript"""
         db_transcript = Transcript(**transcript.model_dump())
         db.add(db_transcript)
+        TranscriptAnalysisRepository.invalidate_documents(db, [transcript.document_id], commit=False)
         db.commit()
         db.refresh(db_transcript)
         return db_transcript
@@ -293,19 +356,169 @@ class TranscriptRepository:
             for t in batch.transcripts
         ]
         db.add_all(db_transcripts)
+        TranscriptAnalysisRepository.invalidate_documents(db, [batch.document_id], commit=False)
         db.commit()
         for t in db_transcripts:
             db.refresh(t)
         return db_transcripts
-    
+
+    @staticmethod
+    def bulk_insert(
+        db: Session,
+        document_id: int,
+        transcripts: Iterable[Union[TranscriptBase, Dict[str, Any]]],
+        page_size: int = 1000,
+        commit: bool = True,
+    ) -> List[int]:
+        """
+        Insère des transcripts en masse via execute_values (INSERT multi-lignes + RETURNING id).
+
+        Contrairement à create_batch, aucun objet ORM n'est hydraté : une seule requête
+        par page de `page_size` lignes, sans refresh ligne par ligne. Le trigger
+        update_transcript_search_vector_trigger (BEFORE INSERT) reste déclenché pour
+        chaque ligne, donc search_vector est alimenté comme avec l'ORM.
+
+        Args:
+            db: Session SQLAlchemy (la transaction de la session est utilisée)
+            document_id: ID du document
+            transcripts: Itérable de TranscriptBase ou de dicts (speaker, speaker_id,
+                timestamp, text, speaker_type) - peut être un générateur
+            page_size: Nombre de lignes par requête INSERT
+            commit: Commit la session à la fin
+
+        Returns:
+            Liste des IDs créés, dans l'ordre d'insertion
+        """
+        def _rows():
+            for t in transcripts:
+                if isinstance(t, TranscriptBase):
+                    t = t.model_dump()
+                yield (
+                    document_id,
+                    t.get("speaker"),
+                    t.get("speaker_id"),
+                    t.get("timestamp"),
+                    t.get("text") or "",
+                    t.get("speaker_type"),
+                )
+
+        raw_connection = db.connection().connection
+        cursor = raw_connection.cursor()
+        try:
+            returned = execute_values(
+                cursor,
+                """
+                INSERT INTO transcripts (document_id, speaker, speaker_id, timestamp, text, speaker_type)
+                VALUES %s
+                RETURNING id
+                """,
+                _rows(),
+                page_size=page_size,
+                fetch=True,
+            )
+        finally:
+            cursor.close()
+
+        TranscriptAnalysisRepository.invalidate_documents(db, [document_id], commit=False)
+        if commit:
+            db.commit()
+        return [row[0] for row in returned]
+
     @staticmethod
     def delete_by_document(db: Session, document_id: int) -> int:
         """Supprime tous les transcripts d'un document"""
         count = db.query(Transcript).filter(Transcript.document_id == document_id).delete()
+        TranscriptAnalysisRepository.invalidate_documents(db, [document_id], commit=False)
         db.commit()
         return count
 
 
+# ============================================================================
+# Repository pour TranscriptAnalysis
+# ============================================================================
+
+class TranscriptAnalysisRepository:
+    """Repository pour les résultats LLM mémorisés par document transcript"""
+    
+    @staticmethod
+    def get(
+        db: Session,
+        document_id: int,
+        stage: str,
+        content_hash: str,
+        prompt_version: str,
+        model: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Récupère le résultat mémorisé d'une étape s'il correspond exactement
+        aux interventions, à la version des prompts et au modèle.
+        """
+        analysis = db.query(TranscriptAnalysis).filter(
+            TranscriptAnalysis.document_id == document_id,
+            TranscriptAnalysis.stage == stage,
+            TranscriptAnalysis.content_hash == content_hash,
+            TranscriptAnalysis.prompt_version == prompt_version,
+            TranscriptAnalysis.model == model
+        ).first()
+        return analysis.result if analysis else None
+    
+    @staticmethod
+    def save(
+        db: Session,
+        document_id: int,
+        stage: str,
+        content_hash: str,
+        prompt_version: str,
+        model: str,
+        result: Dict[str, Any]
+    ) -> None:
+        """Enregistre (ou remplace) le résultat d'une étape pour un document"""
+        values = {
+            "document_id": document_id,
+            "stage": stage,
+            "content_hash": content_hash,
+            "prompt_version": prompt_version,
+            "model": model,
+            "result": result,
+        }
+        stmt = pg_insert(TranscriptAnalysis).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_transcript_analyses_document_stage",
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "prompt_version": stmt.excluded.prompt_version,
+                "model": stmt.excluded.model,
+                "result": stmt.excluded.result,
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(stmt)
+        db.commit()
+    
+    @staticmethod
+    def invalidate_documents(db: Session, document_ids: List[int], commit: bool = True) -> int:
+        """Supprime les résultats mémorisés de documents dont les transcripts ont changé"""
+        deleted = db.query(TranscriptAnalysis).filter(
+            TranscriptAnalysis.document_id.in_(document_ids)
+        ).delete(synchronize_session=False)
+        if commit:
+            db.commit()
+        return deleted
+    
+    @staticmethod
+    def invalidate_speaker(db: Session, speaker_id: int, commit: bool = True) -> int:
+        """Supprime les résultats mémorisés des documents où intervient un speaker"""
+        document_ids = db.query(Transcript.document_id).filter(
+            Transcript.speaker_id == speaker_id
+        ).distinct()
+        deleted = db.query(TranscriptAnalysis).filter(
+            TranscriptAnalysis.document_id.in_(document_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        if commit:
+            db.commit()
+        return deleted
+
+
 # ============================================================================
 # Repository pour Speaker
 # ============================================================================
@@ -326,6 +539,19 @@ class SpeakerRepository:
             Speaker.project_id == project_id
         ).first()
     
+    @staticmethod
+    def get_by_names(db: Session, names: List[str], project_id: Optional[int] = None) -> List[Speaker]:
+        """
+        Récupère en une requête les speakers du projet et les interviewers globaux
+        correspondant à une liste de noms.
+        """
+        if not names:
+            return []
+        scope = and_(Speaker.project_id.is_(None), Speaker.speaker_type == 'interviewer')
+        if project_id is not None:
+            scope = or_(Speaker.project_id == project_id, scope)
+        return db.query(Speaker).filter(Speaker.name.in_(names), scope).all()
+    
     @staticmethod
     def get_or_create_speaker(
         db: Session,
@@ -362,6 +588,7 @@ class SpeakerRepository:
                 speaker.speaker_type = speaker_type
             db.commit()
             db.refresh(speaker)
+            SpeakerRepository._remember(speaker)
             return speaker
         
         # Créer un nouveau speaker
@@ -376,8 +603,17 @@ class SpeakerRepository:
         db.add(db_speaker)
         db.commit()
         db.refresh(db_speaker)
+        SpeakerRepository._remember(db_speaker)
         return db_speaker
     
+    @staticmethod
+    def _remember(speaker: Speaker) -> None:
+        """Met à jour le registre des speakers en mémoire après une écriture en base"""
+        from database.speaker_registry import speaker_registry
+        speaker_registry.remember(
+            speaker.name, speaker.role, speaker.level, speaker.speaker_type, speaker.project_id
+        )
+    
     @staticmethod
     def get_by_project(db: Session, project_id: int) -> List[Speaker]:
         """Récupère tous les speakers d'un projet"""
@@ -419,12 +655,18 @@ class SpeakerRepository:
         if not db_speaker:
             return None
         
+        from database.speaker_registry import speaker_registry
+        speaker_registry.forget(db_speaker.name, db_speaker.project_id)
+        
         update_data = speaker_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_speaker, field, value)
         
+        # Nom, rôle, niveau ou type modifié : les analyses des transcripts de ce speaker sont périmées
+        TranscriptAnalysisRepository.invalidate_speaker(db, speaker_id, commit=False)
         db.commit()
         db.refresh(db_speaker)
+        SpeakerRepository._remember(db_speaker)
         return db_speaker
     
     @staticmethod
@@ -434,6 +676,10 @@ class SpeakerRepository:
         if not db_speaker:
             return False
         
+        from database.speaker_registry import speaker_registry
+        speaker_registry.forget(db_speaker.name, db_speaker.project_id)
+        
+        TranscriptAnalysisRepository.invalidate_speaker(db, speaker_id, commit=False)
         db.delete(db_speaker)
         db.commit()
         return True
@@ -539,6 +785,301 @@ class WorkflowStateRepository:
         return True
 
 
+# ============================================================================
+# Repository pour WorkflowThread
+# ============================================================================
+
+class WorkflowThreadRepository:
+    """Repository pour le registre des threads de workflow"""
+    
+    @staticmethod
+    def get_by_thread(db: Session, thread_id: str) -> Optional[WorkflowThread]:
+        """Récupère l'entrée du registre d'un thread"""
+        return db.query(WorkflowThread).filter(WorkflowThread.thread_id == thread_id).first()
+    
+    @staticmethod
+    def create_or_update(
+        db: Session,
+        thread_id: str,
+        workflow_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        status: str = "created"
+    ) -> WorkflowThread:
+        """
+        Enregistre un thread (upsert atomique : plusieurs workers peuvent
+        démarrer le même thread sans conflit)
+        """
+        stmt = pg_insert(WorkflowThread).values(
+            thread_id=thread_id,
+            workflow_type=workflow_type,
+            params=params or {},
+            status=status,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WorkflowThread.thread_id],
+            set_={
+                "workflow_type": stmt.excluded.workflow_type,
+                "params": stmt.excluded.params,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+        return WorkflowThreadRepository.get_by_thread(db, thread_id)
+    
+    @staticmethod
+    def update_status(
+        db: Session,
+        thread_id: str,
+        status: str,
+        state: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Met à jour le statut et le dernier état d'un thread"""
+        updated = db.query(WorkflowThread).filter(
+            WorkflowThread.thread_id == thread_id
+        ).update(
+            {"status": status, "state": state, "updated_at": func.now()},
+            synchronize_session=False
+        )
+        db.commit()
+        return updated > 0
+    
+    @staticmethod
+    def delete(db: Session, thread_id: str) -> bool:
+        """Supprime un thread du registre"""
+        deleted = db.query(WorkflowThread).filter(
+            WorkflowThread.thread_id == thread_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted > 0
+
+
+# ============================================================================
+# Repository pour WorkflowRun
+# ============================================================================
+
+class WorkflowRunRepository:
+    """Repository pour les exécutions de workflow en arrière-plan"""
+    
+    @staticmethod
+    def get_by_id(db: Session, run_id: str) -> Optional[WorkflowRun]:
+        """Récupère une exécution par son ID"""
+        return db.query(WorkflowRun).filter(WorkflowRun.run_id == run_id).first()
+    
+    @staticmethod
+    def get_by_thread(db: Session, thread_id: str) -> List[WorkflowRun]:
+        """Récupère les exécutions d'un thread (plus récentes en premier)"""
+        return db.query(WorkflowRun).filter(
+            WorkflowRun.thread_id == thread_id
+        ).order_by(WorkflowRun.created_at.desc()).all()
+    
+    @staticmethod
+    def create(db: Session, run_id: str, thread_id: str, run_type: str) -> WorkflowRun:
+        """Enregistre une nouvelle exécution en attente"""
+        db_run = WorkflowRun(run_id=run_id, thread_id=thread_id, run_type=run_type, status="pending")
+        db.add(db_run)
+        db.commit()
+        db.refresh(db_run)
+        return db_run
+    
+    @staticmethod
+    def update_status(
+        db: Session,
+        run_id: str,
+        status: str,
+        from_statuses: Optional[List[str]] = None,
+        **fields: Any
+    ) -> bool:
+        """
+        Met à jour le statut d'une exécution (et started_at, finished_at, result, error)
+        
+        Args:
+            from_statuses: Si fourni, la mise à jour n'a lieu que si le statut courant
+                en fait partie (transition atomique entre workers)
+        
+        Returns:
+            True si une ligne a été mise à jour
+        """
+        query = db.query(WorkflowRun).filter(WorkflowRun.run_id == run_id)
+        if from_statuses:
+            query = query.filter(WorkflowRun.status.in_(from_statuses))
+        updated = query.update({"status": status, **fields}, synchronize_session=False)
+        db.commit()
+        return updated > 0
+
+
+# ============================================================================
+# Repository pour WorkflowEvent
+# ============================================================================
+
+class WorkflowEventRepository:
+    """Repository pour les événements de progression des workflows"""
+    
+    @staticmethod
+    def create(
+        db: Session,
+        thread_id: str,
+        event: str,
+        data: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None
+    ) -> int:
+        """Enregistre un événement et retourne son ID (curseur du flux SSE)"""
+        db_event = WorkflowEvent(thread_id=thread_id, run_id=run_id, event=event, data=data or {})
+        db.add(db_event)
+        db.commit()
+        return db_event.id
+    
+    @staticmethod
+    def get_after(
+        db: Session,
+        thread_id: str,
+        after_id: int = 0,
+        limit: int = 500
+    ) -> List[WorkflowEvent]:
+        """Récupère les événements d'un thread postérieurs à un ID, dans l'ordre"""
+        return db.query(WorkflowEvent).filter(
+            WorkflowEvent.thread_id == thread_id,
+            WorkflowEvent.id > after_id
+        ).order_by(WorkflowEvent.id).limit(limit).all()
+    
+    @staticmethod
+    def get_by_event(
+        db: Session,
+        thread_id: str,
+        event: str,
+        run_id: Optional[str] = None
+    ) -> List[WorkflowEvent]:
+        """Récupère les événements d'un type donné pour un thread (optionnellement un run), dans l'ordre"""
+        query = db.query(WorkflowEvent).filter(
+            WorkflowEvent.thread_id == thread_id,
+            WorkflowEvent.event == event
+        )
+        if run_id is not None:
+            query = query.filter(WorkflowEvent.run_id == run_id)
+        return query.order_by(WorkflowEvent.id).all()
+    
+    @staticmethod
+    def delete_by_thread(db: Session, thread_id: str) -> int:
+        """Supprime les événements d'un thread"""
+        deleted = db.query(WorkflowEvent).filter(
+            WorkflowEvent.thread_id == thread_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    
+    @staticmethod
+    def delete_older_than(db: Session, hours: float) -> int:
+        """Supprime les événements plus anciens que `hours` heures"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        deleted = db.query(WorkflowEvent).filter(
+            WorkflowEvent.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+# ============================================================================
+# Repository pour LLMResponseCache
+# ============================================================================
+
+class LLMResponseCacheRepository:
+    """Repository pour le cache des réponses LLM"""
+    
+    @staticmethod
+    def get(db: Session, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère une réponse en cache non expirée et met à jour sa date d'accès (LRU).
+        
+        Returns:
+            La réponse sérialisée, ou None si absente ou expirée
+        """
+        now = datetime.now(timezone.utc)
+        entry = db.query(LLMResponseCache).filter(
+            LLMResponseCache.cache_key == cache_key,
+            or_(LLMResponseCache.expires_at.is_(None), LLMResponseCache.expires_at > now)
+        ).first()
+        if entry is None:
+            return None
+        db.query(LLMResponseCache).filter(LLMResponseCache.cache_key == cache_key).update(
+            {
+                LLMResponseCache.hit_count: LLMResponseCache.hit_count + 1,
+                LLMResponseCache.last_accessed_at: now,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        return entry.response
+    
+    @staticmethod
+    def put(
+        db: Session,
+        cache_key: str,
+        agent: str,
+        model: str,
+        method: str,
+        response: Dict[str, Any],
+        size_bytes: int,
+        ttl_hours: Optional[float] = None
+    ) -> None:
+        """Enregistre (ou remplace) une réponse en cache"""
+        now = datetime.now(timezone.utc)
+        values = {
+            "cache_key": cache_key,
+            "agent": agent,
+            "model": model,
+            "method": method,
+            "response": response,
+            "size_bytes": size_bytes,
+            "last_accessed_at": now,
+            "expires_at": now + timedelta(hours=ttl_hours) if ttl_hours else None,
+        }
+        stmt = pg_insert(LLMResponseCache).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMResponseCache.cache_key],
+            set_={key: stmt.excluded[key] for key in values if key != "cache_key"}
+        )
+        db.execute(stmt)
+        db.commit()
+    
+    @staticmethod
+    def delete_expired(db: Session) -> int:
+        """Supprime les réponses expirées"""
+        deleted = db.query(LLMResponseCache).filter(
+            LLMResponseCache.expires_at <= datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    
+    @staticmethod
+    def evict_lru(db: Session, max_bytes: int) -> int:
+        """
+        Supprime les réponses les moins récemment utilisées au-delà de `max_bytes`
+        (taille cumulée des réponses, des plus récentes aux plus anciennes).
+        """
+        cumulative = db.query(
+            LLMResponseCache.cache_key,
+            func.sum(LLMResponseCache.size_bytes).over(
+                order_by=(LLMResponseCache.last_accessed_at.desc(), LLMResponseCache.cache_key)
+            ).label("cumulative_bytes")
+        ).subquery()
+        overflow = db.query(cumulative.c.cache_key).filter(cumulative.c.cumulative_bytes > max_bytes)
+        deleted = db.query(LLMResponseCache).filter(
+            LLMResponseCache.cache_key.in_(overflow.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    
+    @staticmethod
+    def get_stats(db: Session) -> Dict[str, Any]:
+        """Nombre d'entrées, taille totale et nombre de hits du cache"""
+        entries, size_bytes, hits = db.query(
+            func.count(LLMResponseCache.cache_key),
+            func.coalesce(func.sum(LLMResponseCache.size_bytes), 0),
+            func.coalesce(func.sum(LLMResponseCache.hit_count), 0)
+        ).one()
+        return {"entries": entries, "size_bytes": int(size_bytes), "hits": int(hits)}
+
+
 # ============================================================================
 # Repository pour AgentResult
 # ============================================================================
@@ -132,6 +132,25 @@ CREATE INDEX IF NOT EXISTS idx_transcripts_speaker_type ON transcripts(speaker_t
 -- Index GIN sur search_vector pour recherche full-text (CRITIQUE)
 CREATE INDEX IF NOT EXISTS idx_transcripts_search_vector ON transcripts USING GIN(search_vector);
 
+-- ============================================================================
+-- TABLE: transcript_analyses
+-- Résultats LLM mémorisés par document transcript (parties intéressantes,
+-- analyse sémantique), valides tant que le hash des interventions analysées,
+-- la version des prompts et le modèle sont inchangés
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS transcript_analyses (
+    id BIGSERIAL PRIMARY KEY,
+    document_id BIGINT NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    stage VARCHAR(50) NOT NULL, -- interesting_parts, semantic
+    content_hash VARCHAR(64) NOT NULL,
+    prompt_version VARCHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    result JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    CONSTRAINT uq_transcript_analyses_document_stage UNIQUE (document_id, stage)
+);
+
 -- ============================================================================
 -- TABLE: workflow_states
 -- Checkpoints LangGraph pour partage entre workflows
@@ -161,6 +180,117 @@ CREATE INDEX IF NOT EXISTS idx_workflow_states_state_data ON workflow_states USI
 -- Index composite pour requêtes fréquentes
 CREATE INDEX IF NOT EXISTS idx_workflow_states_project_workflow ON workflow_states(project_id, workflow_type);
 
+-- ============================================================================
+-- TABLES: langgraph_checkpoints / langgraph_checkpoint_blobs / langgraph_checkpoint_writes
+-- Checkpointer LangGraph persistant (interrupts human-in-the-loop)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS langgraph_checkpoints (
+    thread_id VARCHAR(255) NOT NULL,
+    checkpoint_ns VARCHAR(255) NOT NULL DEFAULT '',
+    checkpoint_id VARCHAR(64) NOT NULL,
+    parent_checkpoint_id VARCHAR(64),
+    type VARCHAR(50) NOT NULL,
+    checkpoint BYTEA NOT NULL,
+    metadata_type VARCHAR(50) NOT NULL,
+    metadata BYTEA NOT NULL,
+    channel_versions JSONB NOT NULL, -- Versions des canaux référencées (nettoyage des blobs)
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+-- Index sur created_at pour l'expiration (TTL)
+CREATE INDEX IF NOT EXISTS idx_langgraph_checkpoints_created_at ON langgraph_checkpoints(created_at);
+
+CREATE TABLE IF NOT EXISTS langgraph_checkpoint_blobs (
+    thread_id VARCHAR(255) NOT NULL,
+    checkpoint_ns VARCHAR(255) NOT NULL DEFAULT '',
+    channel VARCHAR(255) NOT NULL,
+    version VARCHAR(64) NOT NULL,
+    type VARCHAR(50) NOT NULL, -- 'empty' si le canal est vide
+    blob BYTEA,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+
+CREATE TABLE IF NOT EXISTS langgraph_checkpoint_writes (
+    thread_id VARCHAR(255) NOT NULL,
+    checkpoint_ns VARCHAR(255) NOT NULL DEFAULT '',
+    checkpoint_id VARCHAR(64) NOT NULL,
+    task_id VARCHAR(255) NOT NULL,
+    idx INTEGER NOT NULL,
+    channel VARCHAR(255) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    blob BYTEA NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+
+-- ============================================================================
+-- TABLE: workflow_threads
+-- Registre des threads de workflow : permet à n'importe quel worker de l'API
+-- de reconstruire un workflow à partir du thread_id
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS workflow_threads (
+    thread_id VARCHAR(255) PRIMARY KEY,
+    workflow_type VARCHAR(50) NOT NULL, -- need_analysis, executive_summary, rappel_mission, atouts, value_chain, prerequis_evaluation
+    params JSONB NOT NULL DEFAULT '{}'::jsonb, -- Paramètres du constructeur du workflow
+    status VARCHAR(50) DEFAULT 'created' NOT NULL,
+    state JSONB, -- Dernier résultat retourné par l'API
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- ============================================================================
+-- TABLE: workflow_runs
+-- Exécutions de workflow en arrière-plan (statut, résultat, annulation)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS workflow_runs (
+    run_id VARCHAR(64) PRIMARY KEY,
+    thread_id VARCHAR(255) NOT NULL,
+    run_type VARCHAR(50) NOT NULL,
+    status VARCHAR(50) DEFAULT 'pending' NOT NULL, -- pending, running, cancelling, completed, failed, cancelled
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_runs_thread_id ON workflow_runs(thread_id);
+
+-- ============================================================================
+-- TABLE: workflow_events
+-- Événements de progression des workflows (diffusés en SSE par thread)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS workflow_events (
+    id BIGSERIAL PRIMARY KEY,
+    thread_id VARCHAR(255) NOT NULL,
+    run_id VARCHAR(64),
+    event VARCHAR(50) NOT NULL, -- run_start, node_start, node_end, node_error, interrupt, run_end
+    data JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_events_thread_id ON workflow_events(thread_id, id);
+
+-- ============================================================================
+-- TABLE: llm_response_cache
+-- Cache des réponses LLM adressé par contenu (éviction LRU bornée en taille + TTL)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key VARCHAR(64) PRIMARY KEY, -- SHA-256 (modèle, instructions, entrée, schéma)
+    agent VARCHAR(100) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    method VARCHAR(20) NOT NULL, -- create, parse
+    response JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    hit_count INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    last_accessed_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    expires_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_accessed_at ON llm_response_cache(last_accessed_at);
+
 -- ============================================================================
 -- TABLE: agent_results
 -- Résultats structurés des agents (needs, use_cases, atouts, etc.)
@@ -224,6 +354,16 @@ CREATE TRIGGER update_workshops_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_workflow_threads_updated_at
+    BEFORE UPDATE ON workflow_threads
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_transcript_analyses_updated_at
+    BEFORE UPDATE ON transcript_analyses
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
 -- ============================================================================
 -- TRIGGERS: Recherche full-text sur transcripts
 -- ============================================================================
@@ -0,0 +1,169 @@
+"""
+Registre des speakers : table `speakers` + cache LRU en mémoire du processus.
+
+Remplace le cache fichier `outputs/speaker_classification_cache.json` du
+classificateur, qui était relu et réécrit en entier à chaque mise à jour, sans
+verrou, par plusieurs workers et requêtes API en parallèle. La table `speakers`
+reste la source de vérité (écrite lors de la validation des speakers) ; le LRU
+évite de l'interroger à chaque upload et garde aussi les classifications LLM
+pas encore validées, uniquement dans le projet où elles ont été faites. Hors
+projet, seuls les interviewers globaux sont résolus (même périmètre que la
+base). Tous les noms absents du LRU sont résolus en une seule requête, seuls
+les noms encore inconnus partent au LLM.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from database.db import get_db_context
+from database.repository import SpeakerRepository
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de speakers gardés en mémoire (les moins récemment utilisés sont retirés)
+SPEAKER_REGISTRY_MAX_ENTRIES = int(os.getenv("SPEAKER_REGISTRY_MAX_ENTRIES", "2048"))
+
+# Clé du LRU : (project_id, nom) ; project_id None pour les interviewers globaux
+RegistryKey = Tuple[Optional[int], str]
+
+
+class SpeakerRegistry:
+    """Résolution des speakers connus (rôle, niveau, type), sûre entre threads"""
+
+    def __init__(self, max_entries: int = SPEAKER_REGISTRY_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[RegistryKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    def _get(self, key: RegistryKey) -> Optional[Dict[str, Any]]:
+        """Lecture LRU (verrou tenu)"""
+        info = self._entries.get(key)
+        if info is not None:
+            self._entries.move_to_end(key)
+        return info
+
+    def _put(self, key: RegistryKey, info: Dict[str, Any]) -> None:
+        """Écriture LRU (verrou tenu)"""
+        self._entries[key] = info
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, name: str, project_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Speaker du projet, sinon interviewer global (verrou tenu)"""
+        info = self._get((project_id, name)) if project_id is not None else None
+        if info is None:
+            info = self._get((None, name))
+            if info is not None and info["speaker_type"] != "interviewer":
+                info = None
+        return info
+
+    def resolve_many(
+        self,
+        names: Iterable[str],
+        project_id: Optional[int] = None
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Résout des speakers par nom : LRU d'abord, puis une seule requête en base pour le reste.
+
+        Args:
+            names: Noms des speakers à résoudre
+            project_id: Projet courant (None : seuls les interviewers globaux sont cherchés en base)
+
+        Returns:
+            (speakers résolus nom -> {name, role, level, speaker_type}, noms non résolus dans l'ordre d'entrée)
+        """
+        names = list(dict.fromkeys(name for name in names if name))
+        resolved: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for name in names:
+                info = self._lookup(name, project_id)
+                if info is not None:
+                    resolved[name] = dict(info)
+                else:
+                    missing.append(name)
+            self._stats["memory_hits"] += len(resolved)
+
+        if missing:
+            try:
+                with get_db_context() as db:
+                    speakers = SpeakerRepository.get_by_names(db, missing, project_id)
+                    rows = [
+                        (speaker.project_id, self._to_info(speaker.name, speaker.role, speaker.level, speaker.speaker_type))
+                        for speaker in speakers
+                    ]
+            except Exception as e:
+                logger.warning(f"⚠️ [SPEAKER_REGISTRY] Lecture des speakers en base impossible: {e}")
+                rows = []
+
+            with self._lock:
+                # Un speaker du projet prime sur un interviewer global du même nom
+                for speaker_project_id, info in sorted(rows, key=lambda row: row[0] is not None):
+                    self._put((speaker_project_id, info["name"]), info)
+                    resolved[info["name"]] = dict(info)
+                db_hits = sum(1 for name in missing if name in resolved)
+                self._stats["db_hits"] += db_hits
+                self._stats["misses"] += len(missing) - db_hits
+
+        unresolved = [name for name in names if name not in resolved]
+        logger.info(
+            f"🗂️ [SPEAKER_REGISTRY] {len(resolved)}/{len(names)} speakers résolus "
+            f"({len(unresolved)} à classifier)"
+        )
+        return resolved, unresolved
+
+    @staticmethod
+    def _to_info(name: str, role: Optional[str], level: Optional[str], speaker_type: str) -> Dict[str, Any]:
+        return {"name": name, "role": role or "", "level": level, "speaker_type": speaker_type}
+
+    def remember(
+        self,
+        name: str,
+        role: Optional[str],
+        level: Optional[str],
+        speaker_type: str,
+        project_id: Optional[int] = None
+    ) -> None:
+        """Enregistre un speaker dans le LRU (classification LLM ou écriture en base)"""
+        if not name:
+            return
+        with self._lock:
+            self._put((project_id, name), self._to_info(name, role, level, speaker_type))
+
+    def remember_classification(
+        self,
+        name: str,
+        role: Optional[str],
+        level: Optional[str],
+        project_id: Optional[int]
+    ) -> None:
+        """
+        Garde la classification LLM (non validée) d'un interviewé pour les prochains uploads du projet.
+        Sans projet, rien n'est gardé : la supposition ne doit pas valoir pour les autres projets.
+        """
+        if project_id is None:
+            return
+        self.remember(name, role, level, "interviewé", project_id)
+
+    def forget(self, name: str, project_id: Optional[int] = None) -> None:
+        """Retire un speaker du LRU (renommé ou supprimé en base)"""
+        with self._lock:
+            self._entries.pop((project_id, name), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+# Registre partagé par le processus
+speaker_registry = SpeakerRegistry()
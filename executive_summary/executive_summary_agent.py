@@ -4,7 +4,8 @@ Agent principal pour l'Executive Summary : identification des enjeux, évaluatio
 
 import logging
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
+from utils.regeneration import format_items
 import os
 from dotenv import load_dotenv
 from models.executive_summary_models import (
@@ -19,7 +20,9 @@ from prompts.executive_summary_prompts import (
     REGENERATE_CHALLENGES_PROMPT,
     EVALUATE_MATURITY_PROMPT,
     GENERATE_RECOMMENDATIONS_PROMPT,
-    REGENERATE_RECOMMENDATIONS_PROMPT
+    REGENERATE_RECOMMENDATIONS_PROMPT,
+    REGENERATE_CHALLENGES_DELTA_PROMPT,
+    REGENERATE_RECOMMENDATIONS_DELTA_PROMPT
 )
 
 load_dotenv()
@@ -41,7 +44,7 @@ class ExecutiveSummaryAgent:
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="executive_summary")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
     def identify_challenges(
@@ -52,7 +55,9 @@ class ExecutiveSummaryAgent:
         interviewer_note: str = "",
         rejected_challenges: Optional[List[Dict[str, Any]]] = None,
         validated_challenges: Optional[List[Dict[str, Any]]] = None,
-        challenges_feedback: str = ""
+        challenges_feedback: str = "",
+        evidence_digest: Optional[str] = None,
+        num_challenges: int = 3
     ) -> Dict[str, Any]:
         """
         Identifie des enjeux stratégiques de l'IA.
@@ -65,6 +70,9 @@ class ExecutiveSummaryAgent:
             rejected_challenges: Enjeux précédemment rejetés (pour régénération)
             validated_challenges: Enjeux validés à conserver (pour régénération)
             challenges_feedback: Feedback utilisateur (pour régénération)
+            evidence_digest: Condensé des citations du run ; si fourni, une régénération n'envoie que ce
+                condensé, les enjeux validés / rejetés et le feedback (mode delta)
+            num_challenges: Nombre d'enjeux à remplacer (mode delta)
             
         Returns:
             Dict avec 'challenges' (liste d'enjeux)
@@ -81,7 +89,18 @@ class ExecutiveSummaryAgent:
             # Choisir le prompt selon le contexte (régénération ou première génération)
             # Si on a des enjeux validés ou rejetés, c'est une régénération
             prompt_start = time.time()
-            if validated_challenges or rejected_challenges:
+            if (validated_challenges or rejected_challenges) and evidence_digest is not None:
+                # Mode régénération incrémentale - condensé des preuves + enjeux non retenus uniquement
+                prompt = REGENERATE_CHALLENGES_DELTA_PROMPT.format(
+                    validated_challenges=format_items(validated_challenges),
+                    rejected_challenges=format_items(rejected_challenges),
+                    challenges_feedback=challenges_feedback or "Aucun commentaire",
+                    interviewer_note=interviewer_note or "Aucune note de l'interviewer",
+                    evidence_digest=evidence_digest,
+                    final_needs=needs_str,
+                    num_challenges=num_challenges
+                )
+            elif validated_challenges or rejected_challenges:
                 # Mode régénération - passer TOUS les enjeux précédents
                 all_previous = []
                 if validated_challenges:
@@ -234,7 +253,9 @@ class ExecutiveSummaryAgent:
         final_use_cases: List[Dict[str, Any]],
         rejected_recommendations: Optional[List[Dict[str, Any]]] = None,
         validated_recommendations: Optional[List[Dict[str, Any]]] = None,
-        recommendations_feedback: str = ""
+        recommendations_feedback: str = "",
+        evidence_digest: Optional[str] = None,
+        num_recommendations: int = 3
     ) -> Dict[str, Any]:
         """
         Génère des recommandations personnalisées.
@@ -246,6 +267,9 @@ class ExecutiveSummaryAgent:
             rejected_recommendations: Recommandations précédemment rejetées (pour régénération) - format dict avec titre/description
             validated_recommendations: Recommandations validées à conserver (pour régénération) - format dict avec titre/description
             recommendations_feedback: Feedback utilisateur (pour première génération et régénération)
+            evidence_digest: Condensé des besoins / cas d'usage du run ; si fourni, une régénération
+                n'envoie que ce condensé, les recommandations validées / rejetées et le feedback (mode delta)
+            num_recommendations: Nombre de recommandations à remplacer (mode delta)
             
         Returns:
             Dict avec 'recommendations' (liste de dict avec id, titre, description)
@@ -258,7 +282,17 @@ class ExecutiveSummaryAgent:
             
             # Choisir le prompt selon le contexte (régénération ou première génération)
             # Si on a des recommandations validées ou rejetées, c'est une régénération
-            if validated_recommendations or rejected_recommendations:
+            if (validated_recommendations or rejected_recommendations) and evidence_digest is not None:
+                # Mode régénération incrémentale - condensé + recommandations non retenues uniquement
+                prompt = REGENERATE_RECOMMENDATIONS_DELTA_PROMPT.format(
+                    validated_recommendations=format_items(validated_recommendations, empty="Aucune"),
+                    rejected_recommendations=format_items(rejected_recommendations, empty="Aucune"),
+                    recommendations_feedback=recommendations_feedback or "Aucun commentaire",
+                    maturite_ia=maturite_str,
+                    evidence_digest=evidence_digest,
+                    num_recommendations=num_recommendations
+                )
+            elif validated_recommendations or rejected_recommendations:
                 # Mode régénération - passer TOUTES les recommandations précédentes
                 all_previous = []
                 if validated_recommendations:
@@ -10,6 +10,7 @@ from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 import sys
 sys.path.append('/home/addeche/aiko/aikoGPT')
 import config as project_config
@@ -20,6 +21,14 @@ from executive_summary.transcript_maturite_agent import TranscriptMaturiteAgent
 from executive_summary.workshop_maturite_agent import WorkshopMaturiteAgent
 from executive_summary.executive_summary_agent import ExecutiveSummaryAgent
 from utils.token_tracker import TokenTracker
+from utils.regeneration import (
+    build_digest,
+    citation_entries,
+    count_replacements,
+    is_delta_regeneration_enabled
+)
+from utils.speculation import speculative_executor
+from utils.progress_events import is_run_cancelled
 
 
 class ExecutiveSummaryState(TypedDict):
@@ -43,6 +52,7 @@ class ExecutiveSummaryState(TypedDict):
     validated_challenges: List[Dict]
     rejected_challenges: List[Dict]
     challenges_feedback: str
+    challenges_evidence_digest: str  # Condensé des citations pour les régénérations (mode delta)
     # Action demandée par l'utilisateur (pour les boutons)
     challenges_user_action: str  # "continue_challenges" ou "continue_to_maturity"
     # Résultats Maturité
@@ -53,6 +63,7 @@ class ExecutiveSummaryState(TypedDict):
     validated_recommendations: List[Dict]
     rejected_recommendations: List[Dict]
     recommendations_feedback: str
+    recommendations_evidence_digest: str  # Condensé besoins / cas d'usage pour les régénérations (mode delta)
     # Action demandée par l'utilisateur (pour les boutons)
     recommendations_user_action: str  # "continue_recommendations" ou "continue_to_finalize"
     # Validation
@@ -64,16 +75,18 @@ class ExecutiveSummaryState(TypedDict):
 class ExecutiveSummaryWorkflow:
     """Workflow LangGraph pour l'Executive Summary"""
     
-    def __init__(self, api_key: str, dev_mode: bool = False):
+    def __init__(self, api_key: str, dev_mode: bool = False, checkpointer: Optional[BaseCheckpointSaver] = None):
         """
         Initialise le workflow.
         
         Args:
             api_key: Clé API OpenAI
             dev_mode: Mode développement
+            checkpointer: Checkpointer partagé (ex: PostgresCheckpointer), MemorySaver si None
         """
         self.api_key = api_key
         self.dev_mode = dev_mode
+        self.checkpointer = checkpointer or MemorySaver()
         
         model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         self.llm = ChatOpenAI(
@@ -166,7 +179,7 @@ class ExecutiveSummaryWorkflow:
         
         # Configuration avec checkpointer et interrupts
         compile_kwargs = {
-            "checkpointer": MemorySaver(),
+            "checkpointer": self.checkpointer,
             "interrupt_before": ["human_validation_enjeux", "pre_recommendations_interrupt", "human_validation_recommendations"]
         }
         
@@ -239,6 +252,10 @@ class ExecutiveSummaryWorkflow:
             for node_name, node_state in chunk.items():
                 print(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                print(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # IMPORTANT : Récupérer l'état complet depuis le checkpointer après l'interrupt
         # car le dernier chunk (__interrupt__) ne contient pas l'état complet
@@ -455,6 +472,26 @@ class ExecutiveSummaryWorkflow:
             validated = state.get("validated_challenges", [])
             feedback = state.get("challenges_feedback", "")
             
+            # Régénération incrémentale : condensé des citations construit une seule fois par run
+            evidence_digest = None
+            num_challenges = 3
+            if (rejected or validated) and is_delta_regeneration_enabled():
+                if not state.get("challenges_evidence_digest"):
+                    workshop_entries = [
+                        (1.0, f"{info.get('atelier', '')} - {info.get('use_case', '')}: {info.get('objectif', '')}")
+                        for info in state.get("workshop_enjeux_citations", [])
+                    ]
+                    state["challenges_evidence_digest"] = build_digest([
+                        ("ENTRETIENS", citation_entries(state.get("transcript_enjeux_citations", []))),
+                        ("ATELIERS", workshop_entries)
+                    ])
+                evidence_digest = state["challenges_evidence_digest"]
+                num_challenges = count_replacements(
+                    state.get("identified_challenges", []), validated,
+                    key=lambda challenge: challenge.get("titre", ""), default=3
+                )
+                print(f"♻️ [REGENERATION] Mode delta : {num_challenges} enjeu(x) à remplacer")
+            
             result = self.executive_agent.identify_challenges(
                 transcript_content=transcript_content,
                 workshop_content=workshop_content,
@@ -462,10 +499,21 @@ class ExecutiveSummaryWorkflow:
                 interviewer_note=interviewer_note,
                 rejected_challenges=rejected if rejected else None,
                 validated_challenges=validated if validated else None,
-                challenges_feedback=feedback
+                challenges_feedback=feedback,
+                evidence_digest=evidence_digest,
+                num_challenges=num_challenges
             )
             
             state["identified_challenges"] = result.get("challenges", [])
+            
+            # 🔮 La maturité ne dépend pas de la validation des enjeux : la précalculer pendant l'interrupt
+            maturity_inputs = self._maturity_inputs(state)
+            speculative_executor.submit(
+                "evaluate_maturity",
+                maturity_inputs,
+                lambda: self.executive_agent.evaluate_maturity(**maturity_inputs)
+            )
+            
             end_time = time.time()
             duration = end_time - start_time
             print(f"✅ {len(state['identified_challenges'])} enjeux identifiés")
@@ -561,20 +609,15 @@ class ExecutiveSummaryWorkflow:
         """Évalue la maturité IA"""
         print(f"\n📊 [EXECUTIVE] evaluate_maturity_node - DÉBUT")
         try:
-            transcript_content = self._format_maturite_citations(state.get("transcript_maturite_citations", []))
-            workshop_content = self._format_workshop_maturite(state.get("workshop_maturite_citations", []))
-            final_needs = state.get("extracted_needs", [])
-            final_use_cases = state.get("extracted_use_cases", [])
+            maturity_inputs = self._maturity_inputs(state)
             
             print(f"📊 [EXECUTIVE] Données pour évaluation maturité:")
-            print(f"   - Cas d'usage: {len(final_use_cases)}")
+            print(f"   - Cas d'usage: {len(maturity_inputs['final_use_cases'])}")
             
-            result = self.executive_agent.evaluate_maturity(
-                transcript_content=transcript_content,
-                workshop_content=workshop_content,
-                final_needs=final_needs,
-                final_use_cases=final_use_cases
-            )
+            # Résultat précalculé pendant la validation des enjeux, si les entrées n'ont pas changé
+            result = speculative_executor.take("evaluate_maturity", maturity_inputs)
+            if result is None:
+                result = self.executive_agent.evaluate_maturity(**maturity_inputs)
             
             state["maturity_score"] = result.get("echelle", 3)
             state["maturity_summary"] = result.get("phrase_resumant", "")
@@ -589,6 +632,15 @@ class ExecutiveSummaryWorkflow:
             state["messages"] = state.get("messages", []) + [HumanMessage(content=f"Erreur maturité: {str(e)}")]
             return state
     
+    def _maturity_inputs(self, state: ExecutiveSummaryState) -> Dict[str, Any]:
+        """Entrées de l'évaluation de maturité (aussi utilisées comme clé du précalcul spéculatif)"""
+        return {
+            "transcript_content": self._format_maturite_citations(state.get("transcript_maturite_citations", [])),
+            "workshop_content": self._format_workshop_maturite(state.get("workshop_maturite_citations", [])),
+            "final_needs": state.get("extracted_needs", []),
+            "final_use_cases": state.get("extracted_use_cases", []),
+        }
+    
     def _generate_recommendations_node(self, state: ExecutiveSummaryState) -> ExecutiveSummaryState:
         """Génère les 4 recommandations"""
         print(f"\n💡 [EXECUTIVE] generate_recommendations_node - DÉBUT")
@@ -627,13 +679,31 @@ class ExecutiveSummaryWorkflow:
                         rec_str = str(rec)
                         print(f"   {i}. {rec_str[:100]}..." if len(rec_str) > 100 else f"   {i}. {rec_str}")
             
+            # Régénération incrémentale : condensé besoins / cas d'usage construit une seule fois par run
+            evidence_digest = None
+            num_recommendations = 3
+            if (rejected or validated) and is_delta_regeneration_enabled():
+                if not state.get("recommendations_evidence_digest"):
+                    state["recommendations_evidence_digest"] = build_digest([
+                        ("BESOINS", [(2.0, need.get("theme") or need.get("titre", "")) for need in final_needs if isinstance(need, dict)]),
+                        ("CAS D'USAGE", [(1.0, uc.get("titre", "")) for uc in final_use_cases if isinstance(uc, dict)])
+                    ])
+                evidence_digest = state["recommendations_evidence_digest"]
+                num_recommendations = count_replacements(
+                    state.get("recommendations", []), validated,
+                    key=lambda rec: rec.get("titre", ""), default=3
+                )
+                print(f"♻️ [REGENERATION] Mode delta : {num_recommendations} recommandation(s) à remplacer")
+            
             result = self.executive_agent.generate_recommendations(
                 maturite_ia=maturite_ia,
                 final_needs=final_needs,
                 final_use_cases=final_use_cases,
                 rejected_recommendations=rejected if rejected else None,
                 validated_recommendations=validated if validated else None,
-                recommendations_feedback=feedback
+                recommendations_feedback=feedback,
+                evidence_digest=evidence_digest,
+                num_recommendations=num_recommendations
             )
             
             state["recommendations"] = result.get("recommendations", [])
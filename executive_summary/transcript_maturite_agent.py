@@ -5,13 +5,17 @@ Agent spécialisé pour extraire les citations liées à la maturité IA depuis
 import logging
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from openai import OpenAI
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
+from utils.llm_gateway import get_llm_client
+from utils.chunking import Window, map_reduce, merge_unique
+from utils.citation_alignment import align_references, is_citation_id_mode_enabled
 import os
 from dotenv import load_dotenv
-from process_transcript.transcript_agent import TranscriptAgent
-from models.executive_summary_models import CitationsMaturiteResponse
+from process_transcript.transcript_agent import TranscriptAgent, STAGE_LOAD
+from models.executive_summary_models import CitationsMaturiteResponse, CitationsMaturiteRefResponse
 from prompts.executive_summary_prompts import EXTRACT_MATURITE_CITATIONS_PROMPT
+from prompts.citation_reference_prompts import CITATION_REFERENCE_INSTRUCTIONS
 
 load_dotenv()
 
@@ -33,7 +37,7 @@ class TranscriptMaturiteAgent:
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="transcript_maturite")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         
         # Réutiliser TranscriptAgent pour le parsing de base
@@ -59,7 +63,7 @@ class TranscriptMaturiteAgent:
         max_workers = min(len(document_ids), 10)  # Maximum 10 threads en parallèle
         logger.info(f"🚀 Parallélisation avec {max_workers} workers pour {len(document_ids)} transcripts (maturité)")
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with FanOutExecutor(max_workers=max_workers) as executor:
             # Soumettre tous les documents pour traitement parallèle
             future_to_doc = {
                 executor.submit(self._process_single_document, document_id): document_id
@@ -93,10 +97,12 @@ class TranscriptMaturiteAgent:
         try:
             logger.info(f"Traitement transcript pour maturité: document_id={document_id}")
             
-            # Utiliser TranscriptAgent pour charger depuis la BDD et filtrer (SANS analyse sémantique)
+            # Utiliser TranscriptAgent pour charger depuis la BDD (SANS filtrage ni analyse sémantique LLM :
+            # seules les interventions de parsing sont utilisées)
             result = self.transcript_agent.process_from_db(
                 document_id=document_id,
-                filter_interviewers=True
+                filter_interviewers=True,
+                stages=(STAGE_LOAD,)
             )
             
             # Extraire les interventions depuis le résultat
@@ -113,11 +119,16 @@ class TranscriptMaturiteAgent:
                 logger.warning(f"Aucune intervention trouvée pour document_id={document_id}")
                 return []
             
-            # Préparer le texte pour l'extraction
-            transcript_text = self._prepare_transcript_text(interventions)
+            # Extraire les citations avec LLM, par fenêtres glissantes pour les transcripts longs
+            def extract_window(window: Window) -> List[Dict[str, Any]]:
+                transcript_text = self._prepare_transcript_text(window.items)
+                return self._extract_citations_with_llm(transcript_text, window.items)
             
-            # Extraire les citations avec LLM
-            citations = self._extract_citations_with_llm(transcript_text, interventions)
+            citations = map_reduce(
+                interventions,
+                extract_window,
+                lambda results: merge_unique(results, key=lambda c: c.get("citation") or None)
+            )
             
             return citations
             
@@ -148,6 +159,10 @@ class TranscriptMaturiteAgent:
         for attempt in range(max_retries):
             try:
                 prompt = EXTRACT_MATURITE_CITATIONS_PROMPT.format(transcript_text=transcript_text)
+                id_mode = is_citation_id_mode_enabled()
+                if id_mode:
+                    # Mode identifiant : le modèle référence les interventions [i], citations reconstituées localement
+                    prompt += CITATION_REFERENCE_INSTRUCTIONS
                 
                 response = self.client.responses.parse(
                     model=self.model,
@@ -158,9 +173,12 @@ class TranscriptMaturiteAgent:
                             "content": prompt
                         }
                     ],
-                    text_format=CitationsMaturiteResponse
+                    text_format=CitationsMaturiteRefResponse if id_mode else CitationsMaturiteResponse
                 )
                 
+                if id_mode:
+                    return align_references(response.output_parsed.citations, interventions)
+                
                 parsed_response = response.output_parsed.model_dump()
                 citations = parsed_response.get("citations", [])
                 
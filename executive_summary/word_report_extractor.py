@@ -6,7 +6,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from docx import Document
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 import os
 from dotenv import load_dotenv
 import json
@@ -33,7 +33,7 @@ class WordReportExtractor:
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="word_report_extractor")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
     def extract_from_word(self, word_path: str, force_llm: bool = False) -> Dict[str, List[Dict[str, Any]]]:
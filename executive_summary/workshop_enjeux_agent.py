@@ -5,7 +5,7 @@ Agent spécialisé pour extraire les informations liées aux enjeux stratégique
 import logging
 from typing import List, Dict, Any
 from pathlib import Path
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 import os
 from dotenv import load_dotenv
 from process_atelier.workshop_agent import WorkshopAgent
@@ -31,7 +31,7 @@ class WorkshopEnjeuxAgent:
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="workshop_enjeux")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         
         # Réutiliser WorkshopAgent pour le parsing de base
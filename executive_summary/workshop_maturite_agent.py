@@ -5,10 +5,11 @@ Agent spécialisé pour extraire les informations liées à la maturité IA depu
 import logging
 from typing import List, Dict, Any
 from pathlib import Path
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 import os
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
 from process_atelier.workshop_agent import WorkshopAgent
 from prompts.executive_summary_prompts import EXTRACT_WORKSHOP_MATURITE_PROMPT, EXECUTIVE_SUMMARY_SYSTEM_PROMPT
 from models.executive_summary_models import WorkshopMaturiteResponse
@@ -32,7 +33,7 @@ class WorkshopMaturiteAgent:
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="workshop_maturite")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         
         # Réutiliser WorkshopAgent pour le parsing de base
@@ -72,7 +73,7 @@ class WorkshopMaturiteAgent:
                 # 🚀 PARALLÉLISATION : Traiter tous les ateliers en même temps
                 if len(workshops_dict) > 1:
                     logger.info(f"Traitement parallèle de {len(workshops_dict)} ateliers")
-                    with ThreadPoolExecutor(max_workers=len(workshops_dict)) as executor:
+                    with FanOutExecutor(max_workers=len(workshops_dict)) as executor:
                         future_to_workshop = {}
                         for workshop_data in workshops_dict:
                             future = executor.submit(self._extract_informations_with_llm, workshop_data)
@@ -5,6 +5,8 @@ Modèles Pydantic pour l'agent d'extraction des atouts de l'entreprise
 from pydantic import BaseModel, Field
 from typing import List
 
+from models.transcript_models import InterventionReference
+
 
 class Atout(BaseModel):
     """Modèle pour un atout de l'entreprise"""
@@ -29,3 +31,14 @@ class CitationsAtoutsResponse(BaseModel):
     """Modèle pour les citations d'atouts extraites"""
     citations: List[CitationAtout] = Field(description="Liste des citations révélant les atouts de l'entreprise", default_factory=list)
 
+
+
+class CitationAtoutRef(InterventionReference):
+    """Modèle pour une citation d'atout référencée par intervention (mode identifiant)"""
+    type_atout: str = Field(description="Type d'atout: 'expertise_metier', 'infrastructure_technique', 'capital_humain', 'culture_innovation', 'agilite_organisation'")
+    contexte: str = Field(description="Explication de pourquoi cette intervention révèle un atout pour l'intégration de l'IA")
+
+
+class CitationsAtoutsRefResponse(BaseModel):
+    """Modèle pour les citations d'atouts référencées par intervention"""
+    citations: List[CitationAtoutRef] = Field(description="Liste des interventions (et extraits) révélant les atouts de l'entreprise", default_factory=list)
@@ -5,6 +5,8 @@ Modèles Pydantic pour les agents Executive Summary
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from models.transcript_models import InterventionReference
+
 
 class Challenge(BaseModel):
     """Modèle pour un enjeu stratégique"""
@@ -85,6 +87,15 @@ class CitationsEnjeuxResponse(BaseModel):
     citations: List[CitationEnjeux] = Field(description="Liste des citations liées aux enjeux stratégiques", default_factory=list)
 
 
+class CitationEnjeuxRef(InterventionReference):
+    """Modèle pour une citation d'enjeux référencée par intervention (mode identifiant)"""
+
+
+class CitationsEnjeuxRefResponse(BaseModel):
+    """Modèle pour les citations d'enjeux référencées par intervention"""
+    citations: List[CitationEnjeuxRef] = Field(description="Liste des interventions (et extraits) liées aux enjeux stratégiques", default_factory=list)
+
+
 class CitationMaturite(BaseModel):
     """Modèle pour une citation liée à la maturité IA"""
     citation: str = Field(description="Citation textuelle")
@@ -97,6 +108,16 @@ class CitationsMaturiteResponse(BaseModel):
     citations: List[CitationMaturite] = Field(description="Liste des citations liées à la maturité IA", default_factory=list)
 
 
+class CitationMaturiteRef(InterventionReference):
+    """Modèle pour une citation de maturité référencée par intervention (mode identifiant)"""
+    type_info: str = Field(description="Type d'information: 'outils_digitaux', 'processus_automatises', 'gestion_donnees', 'culture_numérique'")
+
+
+class CitationsMaturiteRefResponse(BaseModel):
+    """Modèle pour les citations de maturité référencées par intervention"""
+    citations: List[CitationMaturiteRef] = Field(description="Liste des interventions (et extraits) liées à la maturité IA", default_factory=list)
+
+
 class WorkshopMaturiteInfo(BaseModel):
     """Modèle pour une information de maturité extraite depuis un atelier"""
     atelier: str = Field(description="Thème de l'atelier")
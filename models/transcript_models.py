@@ -52,3 +52,18 @@ class SemanticAnalysisResponse(BaseModel):
         default_factory=list
     )
 
+
+
+class InterventionReference(BaseModel):
+    """Référence à une intervention numérotée [i] du transcript (mode identifiant : la citation est reconstituée localement)"""
+    intervention_index: int = Field(
+        description="Numéro [i] de l'intervention citée, tel qu'affiché devant l'intervention dans le transcript"
+    )
+    start: Optional[int] = Field(
+        default=None,
+        description="Position (en caractères) du début de l'extrait dans le texte de l'intervention, ou null pour l'intervention entière"
+    )
+    end: Optional[int] = Field(
+        default=None,
+        description="Position (en caractères, exclue) de la fin de l'extrait, ou null pour aller jusqu'à la fin de l'intervention"
+    )
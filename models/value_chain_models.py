@@ -5,6 +5,8 @@ Modèles Pydantic pour l'agent d'extraction de la chaîne de valeur
 from pydantic import BaseModel, Field
 from typing import List
 
+from models.transcript_models import InterventionReference
+
 
 class Function(BaseModel):
     """Modèle pour une fonction (métier ou support)"""
@@ -29,6 +31,18 @@ class FrictionPoint(BaseModel):
     description: str = Field(description="Explication du point de friction lié à la gestion des données")
 
 
+class FrictionPointRef(InterventionReference):
+    """Modèle pour un point de friction dont la citation est référencée par intervention (mode identifiant)"""
+    id: str = Field(description="ID unique du point de friction (ex: F1, F2, ...)")
+    function_nom: str = Field(description="Nom de la fonction concernée par ce point de friction (ex: 'Production', 'R&D')")
+    description: str = Field(description="Explication du point de friction lié à la gestion des données")
+
+
+class FrictionPointsRefResponse(BaseModel):
+    """Modèle pour les points de friction référencés par intervention"""
+    friction_points: List[FrictionPointRef] = Field(description="Liste des points de friction liés à la gestion des données, groupés par fonction")
+
+
 class FunctionsResponse(BaseModel):
     """Modèle pour la réponse d'extraction des fonctions"""
     functions: List[Function] = Field(description="Liste des fonctions identifiées (métier et support)")
@@ -4,12 +4,13 @@ Agent d'analyse des besoins métier
 
 import json
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 from prompts.need_analysis_agent_prompts import (
     NEED_ANALYSIS_SYSTEM_PROMPT,
     NEED_ANALYSIS_USER_PROMPT,
     HUMAN_VALIDATION_PROMPT,
-    NEED_REGENERATION_PROMPT
+    NEED_REGENERATION_PROMPT,
+    NEED_DELTA_REGENERATION_PROMPT
 )
 from models.need_analysis_models import NeedAnalysisResponse
 import os
@@ -19,6 +20,10 @@ from dotenv import load_dotenv
 import sys
 sys.path.append('/home/addeche/aiko/aikoGPT')
 from utils.token_tracker import TokenTracker
+from utils.prompt_packing import compact_dumps, pack_evidence
+from utils.regeneration import format_items
+from utils.structured_stream import is_streaming_enabled, parse_with_item_stream
+from utils.progress_events import report_partial_item
 
 class NeedAnalysisAgent:
     """
@@ -34,7 +39,7 @@ class NeedAnalysisAgent:
             api_key: Clé API OpenAI
             tracker: TokenTracker optionnel pour le suivi des tokens et coûts
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="need_analysis")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')  # Modèle configurable via .env
         self.tracker = tracker  # Tracker pour le suivi des tokens
         
@@ -51,7 +56,8 @@ class NeedAnalysisAgent:
         validated_needs: Optional[List[Dict]] = None,
         additional_context: str = "",
         num_needs: int = 10,
-        num_quotes_per_need: int = 4
+        num_quotes_per_need: int = 4,
+        evidence_digest: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyse les besoins métier à partir des données d'entrée.
@@ -69,6 +75,8 @@ class NeedAnalysisAgent:
             additional_context: Contexte additionnel fourni par l'utilisateur
             num_needs: Nombre de besoins à générer (par défaut: 10)
             num_quotes_per_need: Nombre de citations par besoin (par défaut: 4)
+            evidence_digest: Condensé des preuves du run ; si fourni, une régénération n'envoie
+                que ce condensé, les besoins non retenus et le feedback (mode delta)
             
         Returns:
             Dict contenant les besoins identifiés et le résumé
@@ -93,10 +101,6 @@ class NeedAnalysisAgent:
             transcript_safe = safe_serialize(transcript_data)
             web_search_safe = safe_serialize(web_search_data)
             
-            workshop_str = json.dumps(workshop_safe, ensure_ascii=False, indent=2)
-            transcript_str = json.dumps(transcript_safe, ensure_ascii=False, indent=2)
-            web_search_str = json.dumps(web_search_safe, ensure_ascii=False, indent=2)
-            
             # Choix du prompt selon l'itération
             # On est en mode régénération si on a des previous_needs ET (des rejected_needs OU du user_feedback)
             is_regeneration = previous_needs and (rejected_needs or user_feedback)
@@ -107,39 +111,71 @@ class NeedAnalysisAgent:
                 num_quotes_per_need=num_quotes_per_need
             )
             
-            if not is_regeneration:
-                # Première itération - génération initiale
-                user_prompt = NEED_ANALYSIS_USER_PROMPT.format(
-                    workshop_data=workshop_str,
-                    transcript_data=transcript_str,
-                    web_search_data=web_search_str,
-                    additional_context=additional_context if additional_context else "Aucune information supplémentaire fournie.",
-                    num_needs=num_needs,
-                    num_quotes_per_need=num_quotes_per_need
-                )
-            else:
-                # Itération suivante - régénération avec feedback
-                previous_needs_str = json.dumps(safe_serialize(previous_needs), ensure_ascii=False, indent=2)
-                rejected_needs_str = json.dumps(safe_serialize(rejected_needs or []), ensure_ascii=False, indent=2)
-                validated_needs_str = json.dumps(safe_serialize(validated_needs or []), ensure_ascii=False, indent=2)
-                rejected_needs_count = len(rejected_needs or [])
+            if is_regeneration and evidence_digest is not None:
+                # Régénération incrémentale : condensé des preuves + besoins non retenus uniquement
+                validated_themes = {need.get("theme") for need in safe_serialize(validated_needs or [])}
+                not_retained = []
+                for need in safe_serialize(list(previous_needs) + list(rejected_needs or [])):
+                    if need.get("theme") not in validated_themes and need not in not_retained:
+                        not_retained.append(need)
                 
-                user_prompt = NEED_REGENERATION_PROMPT.format(
-                    validated_needs=validated_needs_str,
-                    previous_needs=previous_needs_str,
-                    rejected_needs=rejected_needs_str,
+                user_prompt = NEED_DELTA_REGENERATION_PROMPT.format(
+                    validated_needs=format_items(safe_serialize(validated_needs or [])),
+                    rejected_needs=format_items(not_retained),
                     user_feedback=user_feedback if user_feedback else "Aucun commentaire spécifique",
-                    workshop_data=workshop_str,
-                    transcript_data=transcript_str,
-                    web_search_data=web_search_str,
                     additional_context=additional_context if additional_context else "Aucune information supplémentaire fournie.",
+                    evidence_digest=evidence_digest,
                     num_needs=num_needs,
                     num_quotes_per_need=num_quotes_per_need
                 )
+            else:
+                # Sérialisation compacte bornée en tokens (priorité aux citations direction / métier)
+                packed = pack_evidence(workshop_safe, transcript_safe, web_search_safe)
+                workshop_str = packed.workshop_str
+                transcript_str = packed.transcript_str
+                web_search_str = packed.web_search_str
+                if self.tracker:
+                    self.tracker.track_prompt_savings(
+                        "need_analysis",
+                        f"analyze_needs_iteration_{iteration}",
+                        packed.original_tokens,
+                        packed.packed_tokens,
+                        packed.dropped_items
+                    )
+                
+                if not is_regeneration:
+                    # Première itération - génération initiale
+                    user_prompt = NEED_ANALYSIS_USER_PROMPT.format(
+                        workshop_data=workshop_str,
+                        transcript_data=transcript_str,
+                        web_search_data=web_search_str,
+                        additional_context=additional_context if additional_context else "Aucune information supplémentaire fournie.",
+                        num_needs=num_needs,
+                        num_quotes_per_need=num_quotes_per_need
+                    )
+                else:
+                    # Itération suivante - régénération avec feedback
+                    previous_needs_str = compact_dumps(safe_serialize(previous_needs))
+                    rejected_needs_str = compact_dumps(safe_serialize(rejected_needs or []))
+                    validated_needs_str = compact_dumps(safe_serialize(validated_needs or []))
+                    rejected_needs_count = len(rejected_needs or [])
+                    
+                    user_prompt = NEED_REGENERATION_PROMPT.format(
+                        validated_needs=validated_needs_str,
+                        previous_needs=previous_needs_str,
+                        rejected_needs=rejected_needs_str,
+                        user_feedback=user_feedback if user_feedback else "Aucun commentaire spécifique",
+                        workshop_data=workshop_str,
+                        transcript_data=transcript_str,
+                        web_search_data=web_search_str,
+                        additional_context=additional_context if additional_context else "Aucune information supplémentaire fournie.",
+                        num_needs=num_needs,
+                        num_quotes_per_need=num_quotes_per_need
+                    )
             # Appel à l'API OpenAI Responses avec structured output
             print(user_prompt)
             # Utilisation du paramètre 'instructions' pour le system prompt
-            response = self.client.responses.parse(
+            request = dict(
                 model=self.model,
                 instructions=system_prompt,
                 input=[
@@ -150,6 +186,16 @@ class NeedAnalysisAgent:
                 ],
                 text_format=NeedAnalysisResponse
             )
+            if is_streaming_enabled():
+                # Streaming : chaque besoin est publié sur le flux du run dès que son objet JSON est complet
+                response = parse_with_item_stream(
+                    self.client,
+                    "identified_needs",
+                    lambda index, item: report_partial_item("need", index, item),
+                    **request
+                )
+            else:
+                response = self.client.responses.parse(**request)
             
             # Tracking des tokens et coûts
             if self.tracker:
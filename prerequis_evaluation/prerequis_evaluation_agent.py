@@ -3,9 +3,10 @@ Agent pour évaluer les 5 prérequis de transformation IA réussie
 """
 import logging
 from typing import List, Dict, Any
-import openai
 import os
 from dotenv import load_dotenv
+from utils.llm_gateway import get_llm_client
+from utils.chunking import Window, map_reduce
 
 from models.prerequis_evaluation_models import (
     PrerequisEvaluation,
@@ -38,10 +39,7 @@ class PrerequisEvaluationAgent:
     
     def __init__(self, api_key: str = None):
         """Initialise l'agent avec la clé API OpenAI"""
-        if api_key:
-            openai.api_key = api_key
-        else:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = get_llm_client(api_key, agent="prerequis_evaluation")
         
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
@@ -90,7 +88,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
                 input=[
@@ -171,7 +169,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
                 input=[
@@ -252,7 +250,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
                 input=[
@@ -318,59 +316,29 @@ class PrerequisEvaluationAgent:
                 )
             )
         
-        # Formater les interventions
-        interventions_text = self._format_interventions(interventions)
         company_info_text = self._format_company_info(company_info)
         
         # Formater les commentaires
         comment_general_text = f"\nCONTEXTE GÉNÉRAL :\n{comment_general}\n" if comment_general else ""
         comment_specific_text = f"\nINSTRUCTION SPÉCIFIQUE POUR CE PRÉREQUIS :\n{comment_specific}\n" if comment_specific else ""
         
-        # Appeler le LLM
-        prompt = PREREQUIS_4_PROMPT.format(
-            comment_general=comment_general_text,
-            comment_specific=comment_specific_text,
-            document_id=document_id,
-            interventions=interventions_text,
-            company_info=company_info_text
-        )
-        
-        try:
-            response = openai.responses.parse(
-                model=self.model,
-                instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                text_format=PrerequisDocumentEvaluationResponse
-            )
-            
-            evaluation_response = response.output_parsed
-            # S'assurer que les IDs sont corrects
-            evaluation_response.evaluation.prerequis_id = 4
-            evaluation_response.evaluation.document_id = document_id
-            
-            logger.info(f"Évaluation prérequis 4 document {document_id} terminée : note {evaluation_response.evaluation.note}/5")
-            return evaluation_response
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'évaluation du prérequis 4 pour document {document_id}: {e}")
-            return PrerequisDocumentEvaluationResponse(
-                evaluation=PrerequisDocumentEvaluation(
-                    prerequis_id=4,
-                    document_id=document_id,
-                    evaluation_text=f"Erreur lors de l'évaluation : {str(e)}",
-                    note=0.0
-                )
+        def evaluate_window(window: Window):
+            # Appeler le LLM sur une fenêtre d'interventions
+            prompt = PREREQUIS_4_PROMPT.format(
+                comment_general=comment_general_text,
+                comment_specific=comment_specific_text,
+                document_id=document_id,
+                interventions=self._format_interventions(window.items),
+                company_info=company_info_text
             )
+            return self._evaluate_document_window(4, document_id, prompt, window)
+        
+        # Transcripts longs : fenêtres glissantes évaluées en parallèle puis fusionnées
+        return map_reduce(
+            interventions,
+            evaluate_window,
+            lambda results: self._merge_document_evaluations(4, document_id, results)
+        )
     
     def synthesize_prerequis_4(
         self,
@@ -409,7 +377,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_SYNTHESIS_SYSTEM_PROMPT,
                 input=[
@@ -475,59 +443,29 @@ class PrerequisEvaluationAgent:
                 )
             )
         
-        # Formater les interventions
-        interventions_text = self._format_interventions(interventions)
         company_info_text = self._format_company_info(company_info)
         
         # Formater les commentaires
         comment_general_text = f"\nCONTEXTE GÉNÉRAL :\n{comment_general}\n" if comment_general else ""
         comment_specific_text = f"\nINSTRUCTION SPÉCIFIQUE POUR CE PRÉREQUIS :\n{comment_specific}\n" if comment_specific else ""
         
-        # Appeler le LLM
-        prompt = PREREQUIS_5_PROMPT.format(
-            comment_general=comment_general_text,
-            comment_specific=comment_specific_text,
-            document_id=document_id,
-            interventions=interventions_text,
-            company_info=company_info_text
-        )
-        
-        try:
-            response = openai.responses.parse(
-                model=self.model,
-                instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                text_format=PrerequisDocumentEvaluationResponse
-            )
-            
-            evaluation_response = response.output_parsed
-            # S'assurer que les IDs sont corrects
-            evaluation_response.evaluation.prerequis_id = 5
-            evaluation_response.evaluation.document_id = document_id
-            
-            logger.info(f"Évaluation prérequis 5 document {document_id} terminée : note {evaluation_response.evaluation.note}/5")
-            return evaluation_response
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'évaluation du prérequis 5 pour document {document_id}: {e}")
-            return PrerequisDocumentEvaluationResponse(
-                evaluation=PrerequisDocumentEvaluation(
-                    prerequis_id=5,
-                    document_id=document_id,
-                    evaluation_text=f"Erreur lors de l'évaluation : {str(e)}",
-                    note=0.0
-                )
+        def evaluate_window(window: Window):
+            # Appeler le LLM sur une fenêtre d'interventions
+            prompt = PREREQUIS_5_PROMPT.format(
+                comment_general=comment_general_text,
+                comment_specific=comment_specific_text,
+                document_id=document_id,
+                interventions=self._format_interventions(window.items),
+                company_info=company_info_text
             )
+            return self._evaluate_document_window(5, document_id, prompt, window)
+        
+        # Transcripts longs : fenêtres glissantes évaluées en parallèle puis fusionnées
+        return map_reduce(
+            interventions,
+            evaluate_window,
+            lambda results: self._merge_document_evaluations(5, document_id, results)
+        )
     
     def synthesize_prerequis_5(
         self,
@@ -566,7 +504,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_SYNTHESIS_SYSTEM_PROMPT,
                 input=[
@@ -637,7 +575,7 @@ class PrerequisEvaluationAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=PREREQUIS_SYNTHESIS_SYSTEM_PROMPT,
                 input=[
@@ -664,6 +602,126 @@ class PrerequisEvaluationAgent:
                 synthese_text=f"Erreur lors de la synthèse globale : {str(e)}"
             )
     
+    def _evaluate_document_window(
+        self,
+        prerequis_id: int,
+        document_id: int,
+        prompt: str,
+        window: Window
+    ) -> tuple:
+        """
+        Évalue une fenêtre d'interventions d'un document.
+        
+        Returns:
+            (évaluation, ou l'exception si l'appel LLM a échoué ; nombre d'interventions de la fenêtre)
+        """
+        try:
+            return self._evaluate_document_prompt(prerequis_id, document_id, prompt), len(window.items)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'évaluation du prérequis {prerequis_id} pour document {document_id}: {e}")
+            return e, len(window.items)
+    
+    def _evaluate_document_prompt(
+        self,
+        prerequis_id: int,
+        document_id: int,
+        prompt: str
+    ) -> PrerequisDocumentEvaluationResponse:
+        """
+        Évalue un prérequis par document (4 ou 5) à partir d'un prompt déjà formaté
+        
+        Raises:
+            Exception: Si l'appel LLM échoue
+        """
+        response = self.client.responses.parse(
+            model=self.model,
+            instructions=PREREQUIS_EVALUATION_SYSTEM_PROMPT,
+            input=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": prompt
+                        }
+                    ]
+                }
+            ],
+            text_format=PrerequisDocumentEvaluationResponse
+        )
+        
+        evaluation_response = response.output_parsed
+        # S'assurer que les IDs sont corrects
+        evaluation_response.evaluation.prerequis_id = prerequis_id
+        evaluation_response.evaluation.document_id = document_id
+        
+        logger.info(f"Évaluation prérequis {prerequis_id} document {document_id} terminée : note {evaluation_response.evaluation.note}/5")
+        return evaluation_response
+    
+    @staticmethod
+    def _error_document_evaluation(
+        prerequis_id: int,
+        document_id: int,
+        error: Exception
+    ) -> PrerequisDocumentEvaluationResponse:
+        """Évaluation d'erreur (note 0) quand aucune fenêtre du document n'a pu être évaluée"""
+        return PrerequisDocumentEvaluationResponse(
+            evaluation=PrerequisDocumentEvaluation(
+                prerequis_id=prerequis_id,
+                document_id=document_id,
+                evaluation_text=f"Erreur lors de l'évaluation : {str(error)}",
+                note=0.0
+            )
+        )
+    
+    def _merge_document_evaluations(
+        self,
+        prerequis_id: int,
+        document_id: int,
+        results: List[tuple]
+    ) -> PrerequisDocumentEvaluationResponse:
+        """
+        Fusionne les évaluations des fenêtres d'un document.
+        
+        Note = moyenne des notes pondérée par le nombre d'interventions de chaque
+        fenêtre ; les textes d'évaluation sont concaténés par partie. Les fenêtres
+        dont l'appel LLM a échoué sont exclues de la note et du texte ; l'évaluation
+        d'erreur n'est retournée que si toutes ont échoué.
+        
+        Args:
+            results: Liste de (PrerequisDocumentEvaluationResponse ou exception, nombre d'interventions)
+        """
+        evaluated = [
+            (i, response, weight)
+            for i, (response, weight) in enumerate(results, 1)
+            if not isinstance(response, Exception)
+        ]
+        if not evaluated:
+            return self._error_document_evaluation(prerequis_id, document_id, results[0][0])
+        if len(evaluated) < len(results):
+            logger.warning(
+                f"⚠️ Prérequis {prerequis_id} document {document_id} : "
+                f"{len(results) - len(evaluated)}/{len(results)} parties non évaluées, exclues de la note"
+            )
+        if len(results) == 1:
+            return evaluated[0][1]
+        
+        total_weight = sum(weight for _, _, weight in evaluated) or 1
+        note = sum(response.evaluation.note * weight for _, response, weight in evaluated) / total_weight
+        evaluation_text = "\n\n".join(
+            f"Partie {i}/{len(results)} : {response.evaluation.evaluation_text}"
+            for i, response, _ in evaluated
+        )
+        logger.info(f"Évaluation prérequis {prerequis_id} document {document_id} fusionnée ({len(evaluated)}/{len(results)} parties) : note {note:.1f}/5")
+        return PrerequisDocumentEvaluationResponse(
+            evaluation=PrerequisDocumentEvaluation(
+                prerequis_id=prerequis_id,
+                document_id=document_id,
+                evaluation_text=evaluation_text,
+                note=round(note, 1)
+            )
+        )
+    
     def _format_interventions(self, interventions: List[Dict[str, Any]]) -> str:
         """Formate les interventions pour l'analyse LLM"""
         formatted = []
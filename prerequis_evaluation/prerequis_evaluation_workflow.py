@@ -6,13 +6,15 @@ from typing import TypedDict, Dict, Any, Optional, List
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
 
 from prerequis_evaluation.prerequis_evaluation_agent import PrerequisEvaluationAgent
 from models.prerequis_evaluation_models import (
     PrerequisEvaluation,
     PrerequisDocumentEvaluation
 )
+from utils.progress_events import is_run_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -171,100 +173,30 @@ class PrerequisEvaluationWorkflow:
             }
         
         try:
-            from database.db import get_db_context
-            from database.repository import TranscriptRepository
+            # Une seule requête pour tous les documents
+            interventions_by_doc = self._load_interventions_by_document(transcript_document_ids)
             
             all_interventions = []
             interventions_direction = []
             interventions_metier = []
             
-            def load_document_interventions(document_id: int) -> tuple:
-                """Charge les interventions d'un document"""
-                try:
-                    with get_db_context() as db:
-                        logger.info(f"Chargement du document {document_id}")
-                        
-                        # Récupérer les interventions enrichies
-                        enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                            db, document_id, filter_interviewers=True
-                        )
-                        
-                        logger.info(f"✓ Document {document_id}: {len(enriched_interventions)} interventions enrichies")
-                        
-                        # Formater les interventions
-                        formatted_interventions = []
-                        for interv in enriched_interventions:
-                            formatted_interv = {
-                                "text": interv.get("text"),
-                                "speaker_level": interv.get("speaker_level"),
-                                "speaker_role": interv.get("speaker_role"),
-                                "speaker_type": interv.get("speaker_type"),
-                            }
-                            formatted_interventions.append(formatted_interv)
-                        
-                        return formatted_interventions
-                        
-                except Exception as e:
-                    logger.error(f"❌ Erreur lors du chargement du document {document_id}: {e}")
-                    return []
-            
-            # PARALLÉLISATION : Charger tous les documents en parallèle
-            if len(transcript_document_ids) > 1:
-                logger.info(f"🚀 Chargement parallèle de {len(transcript_document_ids)} documents")
-                max_workers = min(len(transcript_document_ids), 10)
-                
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_doc = {
-                        executor.submit(load_document_interventions, doc_id): doc_id
-                        for doc_id in transcript_document_ids
-                    }
-                    
-                    for future in as_completed(future_to_doc):
-                        doc_id = future_to_doc[future]
-                        try:
-                            interventions = future.result()
-                            all_interventions.extend(interventions)
-                            logger.info(f"✓ Document {doc_id} terminé: {len(interventions)} interventions")
-                        except Exception as e:
-                            logger.error(f"❌ Erreur document {doc_id}: {e}")
-            else:
-                # Traitement séquentiel si un seul document
-                for doc_id in transcript_document_ids:
-                    interventions = load_document_interventions(doc_id)
-                    all_interventions.extend(interventions)
-            
-            # Filtrer par speaker_level et compter les documents uniques
+            # Filtrer par speaker_level et compter les documents qui ont au moins une intervention de chaque type
             docs_with_direction = set()
             docs_with_metier = set()
             
-            # Créer un mapping document_id -> interventions pour compter les documents
-            doc_interventions_map = {}
-            for doc_id in transcript_document_ids:
-                doc_interventions_map[doc_id] = []
-            
-            # Parcourir toutes les interventions et les trier
-            for interv in all_interventions:
-                speaker_level = interv.get("speaker_level", "")
-                if speaker_level == "direction":
-                    interventions_direction.append(interv)
-                    # Trouver le document d'origine (on doit le faire différemment)
-                    # Pour l'instant, on va juste compter les types
-                elif speaker_level == "métier":
-                    interventions_metier.append(interv)
-            
-            # Compter les documents qui ont au moins une intervention de chaque type
-            # On va recharger juste pour compter (mais c'est plus simple que de tracker pendant le chargement)
             for doc_id in transcript_document_ids:
-                with get_db_context() as db:
-                    enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                        db, doc_id, filter_interviewers=True
-                    )
-                    for interv in enriched_interventions:
-                        speaker_level = interv.get("speaker_level", "")
-                        if speaker_level == "direction":
-                            docs_with_direction.add(doc_id)
-                        elif speaker_level == "métier":
-                            docs_with_metier.add(doc_id)
+                interventions = interventions_by_doc.get(doc_id, [])
+                logger.info(f"✓ Document {doc_id}: {len(interventions)} interventions enrichies")
+                all_interventions.extend(interventions)
+                
+                for interv in interventions:
+                    speaker_level = interv.get("speaker_level", "")
+                    if speaker_level == "direction":
+                        interventions_direction.append(interv)
+                        docs_with_direction.add(doc_id)
+                    elif speaker_level == "métier":
+                        interventions_metier.append(interv)
+                        docs_with_metier.add(doc_id)
             
             logger.info(f"Total: {len(all_interventions)} interventions depuis {len(transcript_document_ids)} transcript(s)")
             logger.info(f"Direction: {len(interventions_direction)} interventions depuis {len(docs_with_direction)} transcript(s) avec direction")
@@ -286,6 +218,20 @@ class PrerequisEvaluationWorkflow:
                 "all_interventions": []
             }
     
+    @staticmethod
+    def _load_interventions_by_document(document_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Charge les interventions enrichies (hors interviewers) de plusieurs documents en une seule requête"""
+        from database.db import get_db_context
+        from database.repository import TranscriptRepository
+        
+        with get_db_context() as db:
+            return TranscriptRepository.get_enriched_by_documents(
+                db,
+                document_ids,
+                filter_interviewers=True,
+                columns=["text", "speaker_level", "speaker_role", "speaker_type"],
+            )
+    
     def _evaluate_prerequis_1_node(self, state: PrerequisEvaluationState) -> PrerequisEvaluationState:
         """Évalue le prérequis 1 : Vision claire des leaders"""
         interventions_direction = state.get("interventions_direction", [])
@@ -402,41 +348,26 @@ class PrerequisEvaluationWorkflow:
             return {"evaluations_prerequis_4_by_doc": []}
         
         try:
-            # Grouper les interventions par document
-            from database.db import get_db_context
-            from database.repository import TranscriptRepository
+            # Grouper les interventions par document (une seule requête)
+            interventions_by_doc = self._load_interventions_by_document(transcript_document_ids)
             
             evaluations_by_doc = []
             
             def evaluate_document(document_id: int) -> Optional[PrerequisDocumentEvaluation]:
                 """Évalue un document pour le prérequis 4"""
                 try:
-                    with get_db_context() as db:
-                        # Récupérer les interventions de ce document
-                        enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                            db, document_id, filter_interviewers=True
-                        )
-                        
-                        formatted_interventions = []
-                        for interv in enriched_interventions:
-                            formatted_interv = {
-                                "text": interv.get("text"),
-                                "speaker_level": interv.get("speaker_level"),
-                                "speaker_role": interv.get("speaker_role"),
-                                "speaker_type": interv.get("speaker_type"),
-                            }
-                            formatted_interventions.append(formatted_interv)
-                        
-                        # Évaluer ce document
-                        evaluation_response = self.agent.evaluate_prerequis_4_document(
-                            document_id,
-                            formatted_interventions,
-                            company_info,
-                            comment_general=comments.get("comment_general", ""),
-                            comment_specific=comments.get("comment_4", "")
-                        )
-                        
-                        return evaluation_response.evaluation
+                    formatted_interventions = interventions_by_doc.get(document_id, [])
+                    
+                    # Évaluer ce document
+                    evaluation_response = self.agent.evaluate_prerequis_4_document(
+                        document_id,
+                        formatted_interventions,
+                        company_info,
+                        comment_general=comments.get("comment_general", ""),
+                        comment_specific=comments.get("comment_4", "")
+                    )
+                    
+                    return evaluation_response.evaluation
                         
                 except Exception as e:
                     logger.error(f"❌ Erreur lors de l'évaluation du document {document_id}: {e}")
@@ -447,7 +378,7 @@ class PrerequisEvaluationWorkflow:
                 logger.info(f"🚀 Évaluation parallèle prerequis 4 sur {len(transcript_document_ids)} documents")
                 max_workers = min(len(transcript_document_ids), 10)
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                with FanOutExecutor(max_workers=max_workers) as executor:
                     future_to_doc = {
                         executor.submit(evaluate_document, doc_id): doc_id
                         for doc_id in transcript_document_ids
@@ -510,40 +441,26 @@ class PrerequisEvaluationWorkflow:
             return {"evaluations_prerequis_5_by_doc": []}
         
         try:
+            # Grouper les interventions par document (une seule requête)
+            interventions_by_doc = self._load_interventions_by_document(transcript_document_ids)
+            
             evaluations_by_doc = []
             
             def evaluate_document(document_id: int) -> Optional[PrerequisDocumentEvaluation]:
                 """Évalue un document pour le prérequis 5"""
                 try:
-                    from database.db import get_db_context
-                    from database.repository import TranscriptRepository
+                    formatted_interventions = interventions_by_doc.get(document_id, [])
                     
-                    with get_db_context() as db:
-                        # Récupérer les interventions de ce document
-                        enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                            db, document_id, filter_interviewers=True
-                        )
-                        
-                        formatted_interventions = []
-                        for interv in enriched_interventions:
-                            formatted_interv = {
-                                "text": interv.get("text"),
-                                "speaker_level": interv.get("speaker_level"),
-                                "speaker_role": interv.get("speaker_role"),
-                                "speaker_type": interv.get("speaker_type"),
-                            }
-                            formatted_interventions.append(formatted_interv)
-                        
-                        # Évaluer ce document
-                        evaluation_response = self.agent.evaluate_prerequis_5_document(
-                            document_id,
-                            formatted_interventions,
-                            company_info,
-                            comment_general=comments.get("comment_general", ""),
-                            comment_specific=comments.get("comment_5", "")
-                        )
-                        
-                        return evaluation_response.evaluation
+                    # Évaluer ce document
+                    evaluation_response = self.agent.evaluate_prerequis_5_document(
+                        document_id,
+                        formatted_interventions,
+                        company_info,
+                        comment_general=comments.get("comment_general", ""),
+                        comment_specific=comments.get("comment_5", "")
+                    )
+                    
+                    return evaluation_response.evaluation
                         
                 except Exception as e:
                     logger.error(f"❌ Erreur lors de l'évaluation du document {document_id}: {e}")
@@ -554,7 +471,7 @@ class PrerequisEvaluationWorkflow:
                 logger.info(f"🚀 Évaluation parallèle prerequis 5 sur {len(transcript_document_ids)} documents")
                 max_workers = min(len(transcript_document_ids), 10)
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                with FanOutExecutor(max_workers=max_workers) as executor:
                     future_to_doc = {
                         executor.submit(evaluate_document, doc_id): doc_id
                         for doc_id in transcript_document_ids
@@ -844,43 +761,27 @@ class PrerequisEvaluationWorkflow:
             # Prérequis 4
             if 4 in prerequis_to_regenerate:
                 transcript_document_ids = state.get("transcript_document_ids", [])
+                interventions_by_doc = self._load_interventions_by_document(transcript_document_ids)
                 evaluations_by_doc = []
                 
                 def evaluate_document(document_id: int):
                     try:
-                        from database.db import get_db_context
-                        from database.repository import TranscriptRepository
-                        
-                        with get_db_context() as db:
-                            enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                                db, document_id, filter_interviewers=True
-                            )
-                            
-                            formatted_interventions = []
-                            for interv in enriched_interventions:
-                                formatted_interv = {
-                                    "text": interv.get("text"),
-                                    "speaker_level": interv.get("speaker_level"),
-                                    "speaker_role": interv.get("speaker_role"),
-                                    "speaker_type": interv.get("speaker_type"),
-                                }
-                                formatted_interventions.append(formatted_interv)
-                            
-                            evaluation_response = self.agent.evaluate_prerequis_4_document(
-                                document_id,
-                                formatted_interventions,
-                                company_info,
-                                comment_general=combined_comments.get("comment_general", ""),
-                                comment_specific=combined_comments.get("comment_4", "")
-                            )
-                            return evaluation_response.evaluation
+                        formatted_interventions = interventions_by_doc.get(document_id, [])
+                        evaluation_response = self.agent.evaluate_prerequis_4_document(
+                            document_id,
+                            formatted_interventions,
+                            company_info,
+                            comment_general=combined_comments.get("comment_general", ""),
+                            comment_specific=combined_comments.get("comment_4", "")
+                        )
+                        return evaluation_response.evaluation
                     except Exception as e:
                         logger.error(f"❌ Erreur lors de l'évaluation du document {document_id}: {e}")
                         return None
                 
                 # Paralléliser si plusieurs documents
                 if len(transcript_document_ids) > 1:
-                    with ThreadPoolExecutor(max_workers=min(len(transcript_document_ids), 10)) as executor:
+                    with FanOutExecutor(max_workers=min(len(transcript_document_ids), 10)) as executor:
                         future_to_doc = {
                             executor.submit(evaluate_document, doc_id): doc_id
                             for doc_id in transcript_document_ids
@@ -913,43 +814,27 @@ class PrerequisEvaluationWorkflow:
             # Prérequis 5
             if 5 in prerequis_to_regenerate:
                 transcript_document_ids = state.get("transcript_document_ids", [])
+                interventions_by_doc = self._load_interventions_by_document(transcript_document_ids)
                 evaluations_by_doc = []
                 
                 def evaluate_document(document_id: int):
                     try:
-                        from database.db import get_db_context
-                        from database.repository import TranscriptRepository
-                        
-                        with get_db_context() as db:
-                            enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                                db, document_id, filter_interviewers=True
-                            )
-                            
-                            formatted_interventions = []
-                            for interv in enriched_interventions:
-                                formatted_interv = {
-                                    "text": interv.get("text"),
-                                    "speaker_level": interv.get("speaker_level"),
-                                    "speaker_role": interv.get("speaker_role"),
-                                    "speaker_type": interv.get("speaker_type"),
-                                }
-                                formatted_interventions.append(formatted_interv)
-                            
-                            evaluation_response = self.agent.evaluate_prerequis_5_document(
-                                document_id,
-                                formatted_interventions,
-                                company_info,
-                                comment_general=combined_comments.get("comment_general", ""),
-                                comment_specific=combined_comments.get("comment_5", "")
-                            )
-                            return evaluation_response.evaluation
+                        formatted_interventions = interventions_by_doc.get(document_id, [])
+                        evaluation_response = self.agent.evaluate_prerequis_5_document(
+                            document_id,
+                            formatted_interventions,
+                            company_info,
+                            comment_general=combined_comments.get("comment_general", ""),
+                            comment_specific=combined_comments.get("comment_5", "")
+                        )
+                        return evaluation_response.evaluation
                     except Exception as e:
                         logger.error(f"❌ Erreur lors de l'évaluation du document {document_id}: {e}")
                         return None
                 
                 # Paralléliser si plusieurs documents
                 if len(transcript_document_ids) > 1:
-                    with ThreadPoolExecutor(max_workers=min(len(transcript_document_ids), 10)) as executor:
+                    with FanOutExecutor(max_workers=min(len(transcript_document_ids), 10)) as executor:
                         future_to_doc = {
                             executor.submit(evaluate_document, doc_id): doc_id
                             for doc_id in transcript_document_ids
@@ -1090,6 +975,10 @@ class PrerequisEvaluationWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état complet depuis le checkpointer
         snapshot = self.graph.get_state(config)
@@ -1170,6 +1059,10 @@ class PrerequisEvaluationWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état final
         snapshot = self.graph.get_state(config)
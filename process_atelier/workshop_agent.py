@@ -8,9 +8,10 @@ import logging
 from typing import Dict, List, Any
 from pathlib import Path
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
 from prompts.workshop_agent_prompts import (
     WORKSHOP_ANALYSIS_PROMPT,
     USE_CASE_CONSOLIDATION_PROMPT
@@ -55,7 +56,7 @@ class WorkshopAgent:
         api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY doit être définie dans les variables d'environnement ou passée en paramètre")
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="workshop")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         
     def parse_excel(self, file_path: str) -> pd.DataFrame:
@@ -311,7 +312,7 @@ class WorkshopAgent:
         workshop_results = []
         
         # 🚀 PARALLÉLISATION : Traiter tous les ateliers en même temps
-        with ThreadPoolExecutor(max_workers=len(workshops)) as executor:
+        with FanOutExecutor(max_workers=len(workshops)) as executor:
             # Soumettre tous les ateliers pour traitement parallèle
             future_to_atelier = {}
             for idx, (atelier_name, workshop_df) in enumerate(workshops.items(), 1):
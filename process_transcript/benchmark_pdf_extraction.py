@@ -0,0 +1,127 @@
+"""
+Benchmark d'extraction des PDF de transcripts : séquentielle vs parallèle (pool de processus)
+
+Usage:
+    python process_transcript/benchmark_pdf_extraction.py
+    python process_transcript/benchmark_pdf_extraction.py --pages 50 150 300
+    python process_transcript/benchmark_pdf_extraction.py --pdf inputs/reunion_teams.pdf
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from process_transcript.pdf_parser import PDFParser, PDF_EXTRACTION_WORKERS
+
+_LINES_PER_PAGE = 40
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _synthetic_lines(page_count: int):
+    """Lignes au format d'un export Teams (« Nom - HH:MM » puis le texte)"""
+    speakers = ["Adrien Fabry", "Jean Dupont", "Marie Martin"]
+    for i in range(page_count * _LINES_PER_PAGE // 2):
+        yield f"{speakers[i % 3]} - {i // 60 % 24:02d}:{i % 60:02d}"
+        yield f"Intervention {i} : nous traitons les commandes fournisseurs manuellement dans Excel."
+
+
+def write_synthetic_pdf(path: Path, page_count: int) -> None:
+    """Écrit un PDF texte minimal de `page_count` pages (sans dépendance de génération PDF)"""
+    lines = list(_synthetic_lines(page_count))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Arbre des pages, rempli une fois les ids des pages connus
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in range(page_count):
+        page_lines = lines[page * _LINES_PER_PAGE:(page + 1) * _LINES_PER_PAGE]
+        content = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {page_count} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(bytes(output))
+
+
+def _measure(parser: PDFParser, pdf_path: str, parallel: bool):
+    """Durée totale et délai jusqu'à la première page transmise"""
+    start = time.perf_counter()
+    first_page = None
+    pages = 0
+    for _ in parser.iter_page_texts(pdf_path, parallel=parallel):
+        if first_page is None:
+            first_page = time.perf_counter() - start
+        pages += 1
+    return time.perf_counter() - start, first_page or 0.0, pages
+
+
+def run_benchmark(pdf_paths):
+    """Compare le débit (pages/s) des extractions séquentielle et parallèle"""
+    print("=" * 72)
+    print("Benchmark d'extraction PDF")
+    print("=" * 72)
+    print(f"Processus d'extraction: {PDF_EXTRACTION_WORKERS}")
+
+    parser = PDFParser()
+    # Démarrage du pool hors mesure (coût payé une seule fois par worker API)
+    _measure(parser, pdf_paths[0], parallel=True)
+
+    print(f"\n{'Pages':>6} | {'Mode':<10} | {'Durée (s)':>10} | {'1re page (s)':>12} | {'Pages/s':>9}")
+    print("-" * 60)
+    for pdf_path in pdf_paths:
+        serial_text = parser.extract_text_from_pdf(pdf_path, parallel=False)
+        parallel_text = parser.extract_text_from_pdf(pdf_path, parallel=True)
+        assert serial_text == parallel_text, f"Texte différent entre les deux modes pour {pdf_path}"
+
+        for label, parallel in (("séquentiel", False), ("parallèle", True)):
+            elapsed, first_page, pages = _measure(parser, pdf_path, parallel)
+            print(f"{pages:>6} | {label:<10} | {elapsed:>10.2f} | {first_page:>12.2f} | {pages / elapsed:>9.1f}")
+
+        start = time.perf_counter()
+        interventions = parser.parse_transcript(pdf_path)
+        print(f"{'':>6} | {'parse':<10} | {time.perf_counter() - start:>10.2f} | {'':>12} | {len(interventions)} interventions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark d'extraction des PDF de transcripts")
+    parser.add_argument("--pdf", nargs="+", help="PDF réels à mesurer (sinon PDF synthétiques)")
+    parser.add_argument("--pages", nargs="+", type=int, default=[50, 150, 300],
+                        help="Nombre de pages des PDF synthétiques")
+    args = parser.parse_args()
+
+    if args.pdf:
+        run_benchmark(args.pdf)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_paths = []
+        for page_count in args.pages:
+            path = Path(tmp_dir) / f"benchmark_{page_count}.pdf"
+            write_synthetic_pdf(path, page_count)
+            pdf_paths.append(str(path))
+        run_benchmark(pdf_paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Micro-benchmark du parsing des lignes de transcripts : moteur historique (une regex
+par format et par ligne, concaténation de chaînes) vs moteur à alternation précompilée
+
+Vérifie aussi que les deux moteurs produisent exactement les mêmes interventions.
+
+Usage:
+    python process_transcript/benchmark_transcript_parsing.py
+    python process_transcript/benchmark_transcript_parsing.py --lines 50000 --repeat 5
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from process_transcript.pdf_parser import PDFParser
+
+_LEGACY_SPEAKER_PATTERNS = [
+    r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*-\s*\d{1,2}:\d{2}$',
+    r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*:\s*(.*)',
+    r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*-\s*(.*)',
+    r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*\(\d{1,2}:\d{2}\)\s*:\s*(.*)',
+]
+_LEGACY_TIMESTAMP_PATTERNS = [
+    r'(\d{1,2}:\d{2}(?::\d{2})?)',
+    r'(\d{1,2}h\d{2})',
+]
+
+
+def legacy_parse_lines(parser: PDFParser, lines):
+    """Moteur de parsing historique de PDFParser.parse_transcript (référence)"""
+    def extract_timestamp(line):
+        for pattern in _LEGACY_TIMESTAMP_PATTERNS:
+            match = re.search(pattern, line)
+            if match:
+                return match.group(1)
+        return None
+
+    interventions = []
+    current_speaker = None
+    current_text = ""
+    current_timestamp = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        speaker_match = None
+        matched_pattern_index = -1
+        for j, pattern in enumerate(_LEGACY_SPEAKER_PATTERNS):
+            match = re.match(pattern, line)
+            if match:
+                speaker_match = match
+                matched_pattern_index = j
+                break
+
+        if speaker_match:
+            speaker = speaker_match.group(1).strip()
+            if parser._is_valid_speaker(speaker):
+                if current_speaker and current_text.strip():
+                    interventions.append({
+                        "speaker": current_speaker,
+                        "timestamp": current_timestamp,
+                        "text": current_text.strip()
+                    })
+                current_speaker = speaker
+                current_timestamp = extract_timestamp(line)
+                if matched_pattern_index == 0:
+                    current_text = ""
+                    if i + 1 < len(lines):
+                        current_text = lines[i + 1].strip()
+                        i += 2
+                    else:
+                        i += 1
+                else:
+                    current_text = speaker_match.group(2).strip() if len(speaker_match.groups()) > 1 else ""
+                    i += 1
+            else:
+                if current_speaker:
+                    current_text += " " + line
+                i += 1
+        else:
+            if current_speaker:
+                current_text += " " + line
+            i += 1
+
+    if current_speaker and current_text.strip():
+        interventions.append({
+            "speaker": current_speaker,
+            "timestamp": current_timestamp,
+            "text": current_text.strip()
+        })
+    return interventions
+
+
+def synthetic_lines(count: int):
+    """
+    Lignes nettoyées d'un transcript synthétique mélangeant les quatre formats de speaker,
+    des lignes de continuation, de longs monologues et des faux speakers.
+    """
+    speakers = ["Adrien Fabry", "Jean Dupont", "Marie-Claire d'Artois", "Directeur"]
+    sentence = "nous traitons les commandes fournisseurs manuellement dans Excel, à 10h30 chaque jour"
+    lines = []
+    turn = 0
+    while len(lines) < count:
+        speaker = speakers[turn % len(speakers)]
+        minute = f"{turn // 60 % 24:02d}:{turn % 60:02d}"
+        form = turn % 4
+        if form == 0:
+            lines.append(f"{speaker} - {minute}")
+            lines.append(f"Intervention {turn} : {sentence}.")
+        elif form == 1:
+            lines.append(f"{speaker}: {sentence} ({minute}).")
+        elif form == 2:
+            lines.append(f"{speaker} - {sentence}.")
+        else:
+            lines.append(f"{speaker} ({minute}): {sentence}.")
+        # Monologue long tous les 50 tours (concaténation quadratique du moteur historique)
+        continuation = 400 if turn % 50 == 0 else turn % 3
+        for k in range(continuation):
+            lines.append(f"suite {k} du propos {turn}, {sentence}")
+        if turn % 7 == 0:
+            lines.append("Ceci est une phrase beaucoup trop longue pour un nom: avec un deux-points")
+        turn += 1
+    return lines[:count]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description="Micro-benchmark du parsing des lignes de transcripts")
+    parser_args.add_argument("--lines", type=int, default=50000, help="Nombre de lignes synthétiques")
+    parser_args.add_argument("--repeat", type=int, default=3, help="Nombre de mesures (meilleure gardée)")
+    args = parser_args.parse_args()
+
+    parser = PDFParser()
+    lines = synthetic_lines(args.lines)
+
+    legacy = legacy_parse_lines(parser, lines)
+    current = list(parser.iter_interventions_from_lines(lines))
+    assert legacy == current, "Les deux moteurs ne produisent pas les mêmes interventions"
+
+    print("=" * 60)
+    print("Micro-benchmark du parsing des transcripts")
+    print("=" * 60)
+    print(f"{len(lines)} lignes, {len(current)} interventions (sorties identiques)")
+
+    legacy_time = _best_of(lambda: legacy_parse_lines(parser, lines), args.repeat)
+    current_time = _best_of(lambda: list(parser.iter_interventions_from_lines(lines)), args.repeat)
+
+    print(f"\n{'Moteur':<14} | {'Durée (s)':>10} | {'Lignes/s':>12}")
+    print("-" * 42)
+    print(f"{'historique':<14} | {legacy_time:>10.3f} | {len(lines) / legacy_time:>12.0f}")
+    print(f"{'alternation':<14} | {current_time:>10.3f} | {len(lines) / current_time:>12.0f}")
+    print(f"\nAccélération: x{legacy_time / current_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 Agent pour identifier les parties intéressantes des transcriptions
 """
 import logging
-from typing import List, Dict, Any
-import openai
+import hashlib
+from typing import List, Dict, Any, Tuple
 import os
 from dotenv import load_dotenv
+from utils.llm_gateway import get_llm_client
+from utils.chunking import Window, map_reduce, merge_indices
 from .pdf_parser import PDFParser
 from prompts.transcript_agent_prompts import (
     INTERESTING_PARTS_FILTER_PROMPT,
@@ -20,14 +22,17 @@ logger = logging.getLogger(__name__)
 class InterestingPartsAgent:
     """Agent pour filtrer les parties intéressantes des transcriptions avec LLM"""
     
+    # Version des prompts (invalide les résultats mémorisés quand les prompts changent)
+    PROMPT_VERSION = hashlib.sha256(
+        (INTERESTING_PARTS_SYSTEM_PROMPT + INTERESTING_PARTS_FILTER_PROMPT).encode("utf-8")
+    ).hexdigest()[:16]
+    
     def __init__(self, api_key: str = None):
         self.pdf_parser = PDFParser()
         
         # Configuration OpenAI
-        if api_key:
-            openai.api_key = api_key
-        else:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = get_llm_client(api_key, agent="interesting_parts")
+        self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
     def process_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -61,11 +66,8 @@ class InterestingPartsAgent:
         if not interventions:
             return []
         
-        # Préparer le texte pour l'analyse LLM
-        text_for_analysis = self._prepare_text_for_llm_analysis(interventions)
-        
         # Utiliser le LLM pour identifier les parties intéressantes
-        interesting_indices = self._llm_filter_interventions(text_for_analysis, len(interventions))
+        interesting_indices, _ = self._select_interesting_indices(interventions)
         
         # Retourner les interventions sélectionnées
         interesting = [interventions[i] for i in interesting_indices if i < len(interventions)]
@@ -73,6 +75,32 @@ class InterestingPartsAgent:
         logger.info(f"LLM a sélectionné {len(interesting)} interventions intéressantes sur {len(interventions)}")
         return interesting
     
+    def _select_interesting_indices(self, interventions: List[Dict[str, Any]]) -> Tuple[List[int], bool]:
+        """
+        Indices des interventions intéressantes selon le LLM.
+        
+        Une fenêtre en erreur LLM retient toutes ses interventions ; les autres
+        fenêtres gardent leur sélection.
+        
+        Returns:
+            (indices, complete) : complete=False si au moins une fenêtre est en erreur
+        """
+        def select_window(window: Window) -> Tuple[List[int], bool]:
+            # Indices locaux à la fenêtre -> indices dans le transcript complet
+            text_for_analysis = self._prepare_text_for_llm_analysis(window.items)
+            try:
+                local_indices = self._llm_filter_interventions(text_for_analysis, len(window.items), raise_on_error=True)
+            except Exception:
+                # Fallback limité à la fenêtre en échec : toutes ses interventions
+                return [window.to_global(i) for i in range(len(window.items))], False
+            return [window.to_global(i) for i in local_indices], True
+        
+        def merge(results: List[Tuple[List[int], bool]]) -> Tuple[List[int], bool]:
+            return merge_indices(indices for indices, _ in results), all(complete for _, complete in results)
+        
+        # Transcripts longs : fenêtres glissantes traitées en parallèle
+        return map_reduce(interventions, select_window, merge)
+    
     def _prepare_text_for_llm_analysis(self, interventions: List[Dict[str, Any]]) -> str:
         """Prépare le texte pour l'analyse LLM"""
         text_parts = []
@@ -90,15 +118,14 @@ class InterestingPartsAgent:
         
         return "\n".join(text_parts)
     
-    def _llm_filter_interventions(self, text: str, total_interventions: int) -> List[int]:
+    def _llm_filter_interventions(self, text: str, total_interventions: int, raise_on_error: bool = False) -> List[int]:
         """Utilise un LLM pour identifier les interventions intéressantes"""
         prompt = INTERESTING_PARTS_FILTER_PROMPT.format(transcript_text=text)
         
         try:
-            model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
             # Utilisation du paramètre 'instructions' pour le system prompt
-            response = openai.responses.create(
-                model=model,
+            response = self.client.responses.create(
+                model=self.model,
                 instructions=INTERESTING_PARTS_SYSTEM_PROMPT,
                 input=[
                     {
@@ -127,6 +154,8 @@ class InterestingPartsAgent:
             
         except Exception as e:
             logger.error(f"Erreur lors du filtrage LLM: {e}")
+            if raise_on_error:
+                raise
             # Fallback: retourner toutes les interventions si erreur
             return list(range(total_interventions))
     
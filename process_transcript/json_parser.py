@@ -2,14 +2,96 @@
 Parser JSON pour extraire le contenu des transcriptions
 """
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Taille des blocs lus par le lecteur incrémental (caractères)
+_READ_CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(json_path: str, chunk_size: int = _READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Lit un tableau JSON élément par élément, par blocs de `chunk_size` caractères,
+    sans charger le fichier entier ni la liste complète en mémoire.
+    
+    Raises:
+        ValueError: Si le fichier ne contient pas un tableau JSON valide
+    """
+    decoder = json.JSONDecoder()
+    with open(json_path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        position = 0
+        
+        def skip_whitespace(pos: int) -> int:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            return pos
+        
+        # Ouverture du tableau (BOM éventuel ignoré)
+        position = skip_whitespace(1 if buffer.startswith("\ufeff") else 0)
+        if position >= len(buffer) or buffer[position] != "[":
+            raise ValueError(f"Le fichier JSON {json_path} ne contient pas un tableau")
+        position += 1
+        expect_separator = False
+        after_separator = False
+        
+        while True:
+            position = skip_whitespace(position)
+            if position >= len(buffer):
+                if eof:
+                    raise ValueError(f"Tableau JSON non terminé dans {json_path}")
+                # Bloc suivant : on ne garde que la partie non consommée
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            
+            char = buffer[position]
+            if char == "]" and (expect_separator or not after_separator):
+                return
+            if expect_separator:
+                if char != ",":
+                    raise ValueError(f"Séparateur ',' attendu à la position {position} dans {json_path}")
+                position += 1
+                expect_separator = False
+                after_separator = True
+                continue
+            
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Élément coupé par la fin du bloc : lire la suite et réessayer
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            # Un nombre coupé en fin de bloc se décode sans erreur (« 4. » → 4) : l'élément n'est
+            # accepté que suivi de ',' ou ']' (sinon la suite est lue et l'élément redécodé)
+            if not eof and buffer[skip_whitespace(end):skip_whitespace(end) + 1] not in (",", "]"):
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            
+            yield item
+            position = end
+            expect_separator = True
+
 class JSONParser:
     """Parser pour extraire le contenu des fichiers JSON de transcriptions"""
     
+    # À incrémenter si la sortie du parsing change (invalide le cache de parsing)
+    PARSER_VERSION = "1"
+    
     def __init__(self):
         pass
     
@@ -29,23 +111,22 @@ class JSONParser:
             - timestamp: timestamp de début de l'intervention
             - text: texte de l'intervention (fusion des phrases consécutives)
         """
+        interventions = list(self.iter_transcript(json_path))
+        logger.info(f"Nombre d'interventions après fusion: {len(interventions)}")
+        return interventions
+    
+    def iter_transcript(self, json_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Mode streaming de parse_transcript : le tableau JSON est lu incrémentalement
+        et chaque intervention fusionnée est émise dès que le speaker change.
+        La mémoire reste bornée à une intervention, quelle que soit la taille de l'export.
+        """
         logger.info(f"Début du parsing du JSON: {json_path}")
-        
-        # Charger le fichier JSON
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            yield from self._iter_merged_interventions(iter_json_array(json_path))
         except Exception as e:
             logger.error(f"Erreur lors de la lecture du fichier JSON {json_path}: {e}")
             raise
-        
-        logger.info(f"Nombre d'entrées dans le JSON: {len(raw_data)}")
-        
-        # Fusionner les interventions consécutives du même speaker
-        interventions = self._merge_consecutive_interventions(raw_data)
-        
-        logger.info(f"Nombre d'interventions après fusion: {len(interventions)}")
-        return interventions
     
     def _merge_consecutive_interventions(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -57,59 +138,73 @@ class JSONParser:
         Returns:
             Liste d'interventions fusionnées
         """
-        if not raw_data:
-            return []
-        
-        interventions = []
+        return list(self._iter_merged_interventions(raw_data or []))
+    
+    def _iter_merged_interventions(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Fusionne à la volée les entrées consécutives de même speaker_name / speaker_id"""
         current_speaker_name = None
         current_speaker_id = None
-        current_text = ""
+        # Phrases de l'intervention courante, jointes à l'émission
+        current_parts: List[str] = []
         current_timestamp = None
+        entry_count = 0
         
-        for entry in raw_data:
+        for entry in entries:
+            entry_count += 1
             # Extraire les informations de l'entrée
             speaker_name = entry.get("speaker_name")
             speaker_id = entry.get("speaker_id")
             sentence = entry.get("sentence", "").strip()
             start_time = entry.get("startTime")
             
-            # Déterminer l'identifiant du speaker (priorité au speaker_name, sinon speaker_id)
-            speaker_identifier = speaker_name if speaker_name else f"Speaker {speaker_id}"
-            
             # Si c'est le même speaker, fusionner
             if (speaker_name == current_speaker_name and 
                 speaker_id == current_speaker_id):
                 # Ajouter la phrase au texte courant
                 if sentence:
-                    current_text += " " + sentence
+                    current_parts.append(sentence)
             else:
-                # Sauvegarder l'intervention précédente si elle existe
-                if current_text.strip():
-                    interventions.append({
-                        "speaker": current_speaker_name if current_speaker_name else f"Speaker {current_speaker_id}",
-                        "speaker_name": current_speaker_name,
-                        "speaker_id": current_speaker_id,
-                        "timestamp": current_timestamp,
-                        "text": current_text.strip()
-                    })
+                # Émettre l'intervention précédente si elle existe
+                intervention = self._build_intervention(
+                    current_speaker_name, current_speaker_id, current_timestamp, current_parts
+                )
+                if intervention:
+                    yield intervention
                 
                 # Commencer une nouvelle intervention
                 current_speaker_name = speaker_name
                 current_speaker_id = speaker_id
-                current_text = sentence
+                current_parts = [sentence]
                 current_timestamp = start_time
         
-        # Ajouter la dernière intervention
-        if current_text.strip():
-            interventions.append({
-                "speaker": current_speaker_name if current_speaker_name else f"Speaker {current_speaker_id}",
-                "speaker_name": current_speaker_name,
-                "speaker_id": current_speaker_id,
-                "timestamp": current_timestamp,
-                "text": current_text.strip()
-            })
+        # Émettre la dernière intervention
+        intervention = self._build_intervention(
+            current_speaker_name, current_speaker_id, current_timestamp, current_parts
+        )
+        if intervention:
+            yield intervention
         
-        return interventions
+        logger.info(f"Nombre d'entrées dans le JSON: {entry_count}")
+    
+    @staticmethod
+    def _build_intervention(
+        speaker_name: Optional[str],
+        speaker_id: Any,
+        timestamp: Any,
+        parts: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Assemble une intervention fusionnée (None si son texte est vide)"""
+        text = " ".join(parts).strip()
+        if not text:
+            return None
+        return {
+            # Identifiant du speaker : priorité au speaker_name, sinon speaker_id
+            "speaker": speaker_name if speaker_name else f"Speaker {speaker_id}",
+            "speaker_name": speaker_name,
+            "speaker_id": speaker_id,
+            "timestamp": timestamp,
+            "text": text
+        }
     
     def get_speakers(self, interventions: List[Dict[str, Any]]) -> List[str]:
         """Retourne la liste des speakers uniques"""
@@ -0,0 +1,179 @@
+"""
+Cache des résultats de parsing des transcripts, indexé par contenu.
+
+Le flux d'upload parse le même fichier au moins deux fois :
+`/transcripts/classify-speakers` pour trouver les speakers, puis
+`/documents/parse-transcript` pour enregistrer les interventions (pour un PDF,
+toute l'extraction pdfplumber est refaite). Les interventions parsées sont
+gardées sous la clé SHA-256 du fichier + parser + version du parser : un
+nouveau parsing des mêmes octets (y compris un ré-upload sous un autre nom
+uuid dans /tmp/aiko_uploads) est servi par le cache. Pour les uploads adressés
+par contenu (utils/upload_store.py), le SHA-256 est lu dans le chemin.
+
+Les entrées sont des fichiers JSON compacts compressés (zlib) dans un dossier
+partagé par les workers uvicorn, écrits de façon atomique. Au-delà de
+PARSE_CACHE_MAX_BYTES, les entrées les moins récemment utilisées sont supprimées.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.upload_store import content_sha256
+
+logger = logging.getLogger(__name__)
+
+# Cache des résultats de parsing (0 = désactivé)
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") != "0"
+# Dossier des entrées (partagé par les workers d'une même machine)
+PARSE_CACHE_DIR = Path(os.getenv("PARSE_CACHE_DIR", "/tmp/aiko_parse_cache"))
+# Taille maximale du cache sur disque (octets compressés)
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+_HASH_CHUNK_SIZE = 1 << 20
+_ENTRY_SUFFIX = ".json.z"
+
+
+def file_sha256(file_path: str) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (lu par blocs)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(file_path: str) -> str:
+    """SHA-256 du fichier : lu dans le chemin d'un upload adressé par contenu, sinon calculé"""
+    return content_sha256(file_path) or file_sha256(file_path)
+
+
+def parser_key(parser: Any) -> str:
+    """Identifiant du parser dans la clé du cache : nom de classe + PARSER_VERSION"""
+    return f"{type(parser).__name__.lower()}-v{getattr(parser, 'PARSER_VERSION', '0')}"
+
+
+class ParseCache:
+    """Cache disque des interventions parsées, borné en taille (LRU par date d'accès)"""
+
+    def __init__(self, directory: Path = PARSE_CACHE_DIR, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _entry_path(self, digest: str, key: str) -> Path:
+        return self.directory / f"{digest}-{key}{_ENTRY_SUFFIX}"
+
+    def _count(self, stat: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] += value
+
+    def get(self, digest: str, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Interventions en cache pour ce contenu et ce parser, ou None"""
+        path = self._entry_path(digest, key)
+        try:
+            payload = path.read_bytes()
+            interventions = json.loads(zlib.decompress(payload).decode("utf-8"))
+            # Date d'accès utilisée pour l'éviction LRU
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ [PARSE_CACHE] Entrée illisible ignorée ({path.name}): {e}")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return interventions
+
+    def put(self, digest: str, key: str, interventions: List[Dict[str, Any]]) -> None:
+        """Enregistre les interventions (écriture atomique), puis applique la limite de taille"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            payload = zlib.compress(
+                json.dumps(interventions, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+            )
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._entry_path(digest, key))
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+        except Exception as e:
+            logger.warning(f"⚠️ [PARSE_CACHE] Écriture impossible: {e}")
+            return
+        self._count("writes")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = []
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Supprimée par un autre worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self._count("evictions")
+
+    def lookup(self, file_path: str, parser: Any) -> Optional[List[Dict[str, Any]]]:
+        """Interventions en cache pour ce fichier et ce parser (None si absent ou désactivé)"""
+        if not PARSE_CACHE_ENABLED:
+            return None
+        interventions = self.get(content_digest(file_path), parser_key(parser))
+        if interventions is not None:
+            logger.info(f"♻️ [PARSE_CACHE] {Path(file_path).name}: {len(interventions)} interventions depuis le cache")
+        return interventions
+
+    def get_or_parse(
+        self,
+        file_path: str,
+        parser: Any,
+        parse: Optional[Callable[[str], List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retourne les interventions du fichier depuis le cache, sinon parse et met en cache.
+
+        Args:
+            file_path: Chemin du fichier
+            parser: Parser utilisé (sa classe et PARSER_VERSION font partie de la clé)
+            parse: Fonction de parsing (par défaut parser.parse_transcript)
+        """
+        parse = parse or parser.parse_transcript
+        if not PARSE_CACHE_ENABLED:
+            return parse(file_path)
+
+        digest = content_digest(file_path)
+        key = parser_key(parser)
+        interventions = self.get(digest, key)
+        if interventions is not None:
+            logger.info(f"♻️ [PARSE_CACHE] {Path(file_path).name}: {len(interventions)} interventions depuis le cache")
+            return interventions
+
+        interventions = parse(file_path)
+        self.put(digest, key, interventions)
+        return interventions
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+
+# Cache partagé par le processus (les entrées sur disque sont partagées entre workers)
+parse_cache = ParseCache()
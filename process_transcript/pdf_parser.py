@@ -3,140 +3,243 @@ Parser PDF pour extraire le contenu des transcriptions
 """
 import pdfplumber
 import re
-from typing import List, Dict, Any
+import os
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Extraction parallèle : nombre de processus (0 ou 1 = extraction séquentielle)
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Nombre de pages à partir duquel l'extraction est répartie entre les processus
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Pool de processus partagé (créé au premier PDF volumineux, en mode spawn : sûr depuis un serveur multi-thread)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _reset_process_pool() -> None:
+    """Abandonne un pool cassé (processus tué) : le prochain appel en recrée un"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extrait le texte des pages [start, end) (exécuté dans un processus du pool)"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:end]]
+
+
+# Nom de speaker : 1 à n mots (lettres, tirets, apostrophes)
+_NAME = r"[A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*"
+
+# Une seule alternation précompilée classe chaque ligne ; l'ordre des alternatives
+# est l'ordre de priorité des formats (la première qui correspond l'emporte)
+_SPEAKER_LINE_RE = re.compile(
+    # Format "Nom - HH:MM" (format principal observé) : texte sur la ligne suivante
+    rf"(?P<name0>{_NAME})\s*-\s*(?P<ts0>\d{{1,2}}:\d{{2}})$"
+    # Format "Nom: texte"
+    rf"|(?P<name1>{_NAME})\s*:\s*(?P<text1>.*)"
+    # Format "Nom - texte"
+    rf"|(?P<name2>{_NAME})\s*-\s*(?P<text2>.*)"
+    # Format avec timestamp: "Nom (HH:MM): texte"
+    rf"|(?P<name3>{_NAME})\s*\((?P<ts3>\d{{1,2}}:\d{{2}})\)\s*:\s*(?P<text3>.*)"
+)
+_TIMESTAMP_RES = (
+    re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)'),  # Format HH:MM ou HH:MM:SS
+    re.compile(r'(\d{1,2}h\d{2})'),  # Format HHhMM
+)
+
+
 class PDFParser:
     """Parser pour extraire le contenu des PDF de transcriptions"""
     
+    # À incrémenter si la sortie du parsing change (invalide le cache de parsing)
+    PARSER_VERSION = "2"
+    
     def __init__(self):
-        # Patterns améliorés pour détecter les vrais speakers
-        self.speaker_patterns = [
-            # Format "Nom - HH:MM" (format principal observé) - pattern permissif
-            r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*-\s*\d{1,2}:\d{2}$',
-            # Format "Nom: texte" - nom en début de ligne suivi de :
-            r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*:\s*(.*)',
-            # Format "Nom - texte" - nom suivi de tiret
-            r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*-\s*(.*)',
-            # Format avec timestamp: "Nom (HH:MM): texte"
-            r'^([A-Za-zÀ-ÿ\-\']+(?:\s+[A-Za-zÀ-ÿ\-\']+)*)\s*\(\d{1,2}:\d{2}\)\s*:\s*(.*)',
-        ]
-        
-        # Pas de patterns d'exclusion - trop contextuels
-        
-        self.timestamp_patterns = [
-            r'(\d{1,2}:\d{2}(?::\d{2})?)',  # Format HH:MM ou HH:MM:SS
-            r'(\d{1,2}h\d{2})',  # Format HHhMM
-        ]
+        # Patterns des speakers et timestamps (compilés au niveau du module)
+        self.speaker_pattern = _SPEAKER_LINE_RE
+        self.timestamp_patterns = _TIMESTAMP_RES
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: str, parallel: Optional[bool] = None) -> str:
         """Extrait tout le texte d'un PDF"""
         try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text
+            return "".join(
+                page_text + "\n"
+                for page_text in self.iter_page_texts(pdf_path, parallel=parallel)
+                if page_text
+            )
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du PDF {pdf_path}: {e}")
             raise
     
+    def iter_page_texts(self, pdf_path: str, parallel: Optional[bool] = None) -> Iterator[str]:
+        """
+        Retourne le texte des pages dans l'ordre, au fil de l'extraction.
+        
+        Au-delà de PDF_PARALLEL_MIN_PAGES pages, les pages sont réparties par plages
+        entre les processus du pool : chaque plage est transmise dès qu'elle et les
+        précédentes sont extraites, sans attendre la fin du document.
+        
+        Args:
+            pdf_path: Chemin du PDF
+            parallel: Force (True) ou désactive (False) l'extraction parallèle ;
+                None = selon le nombre de pages
+        """
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+            if parallel is None:
+                parallel = page_count >= PDF_PARALLEL_MIN_PAGES
+            if not parallel or PDF_EXTRACTION_WORKERS < 2 or page_count < 2:
+                for page in pdf.pages:
+                    yield page.extract_text() or ""
+                return
+        
+        # Plages plus petites que pages / workers : les premières arrivent plus tôt
+        chunk_size = max(1, math.ceil(page_count / (PDF_EXTRACTION_WORKERS * 2)))
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        logger.info(f"Extraction parallèle: {page_count} pages, {len(ranges)} plages, {PDF_EXTRACTION_WORKERS} processus")
+        
+        try:
+            pool = _get_process_pool()
+            futures = [pool.submit(_extract_page_range, pdf_path, start, end) for start, end in ranges]
+        except Exception as e:
+            logger.warning(f"Pool d'extraction indisponible ({e}), extraction séquentielle")
+            _reset_process_pool()
+            yield from self.iter_page_texts(pdf_path, parallel=False)
+            return
+        
+        emitted = 0
+        try:
+            for (start, _), future in zip(ranges, futures):
+                try:
+                    page_texts = future.result()
+                except Exception as e:
+                    # Processus perdu ou page illisible : extraire cette plage ici
+                    logger.warning(f"Plage de pages {start}+ en échec dans le pool ({e}), extraction locale")
+                    _reset_process_pool()
+                    page_texts = _extract_page_range(pdf_path, start, start + chunk_size)
+                for page_text in page_texts:
+                    emitted += 1
+                    yield page_text
+        finally:
+            if emitted < page_count:
+                for future in futures:
+                    future.cancel()
+    
     def parse_transcript(self, pdf_path: str) -> List[Dict[str, Any]]:
         """
         Parse un PDF de transcription et retourne une liste de dicts
         avec speaker, timestamp et text
         """
         logger.info(f"Début du parsing du PDF: {pdf_path}")
-        
-        # Extraire le texte brut
-        raw_text = self.extract_text_from_pdf(pdf_path)
-        logger.info(f"Texte extrait: {len(raw_text)} caractères")
-        
-        # Diviser en lignes et nettoyer
-        lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
-        logger.info(f"Nombre de lignes: {len(lines)}")
-        
-        # Parser les interventions
-        interventions = []
+        interventions = list(self.iter_interventions(pdf_path))
+        logger.info(f"Nombre d'interventions extraites: {len(interventions)}")
+        return interventions
+    
+    def iter_interventions(self, pdf_path: str) -> Iterator[Dict[str, Any]]:
+        """Retourne les interventions d'un PDF au fur et à mesure qu'elles sont complètes"""
+        return self.iter_interventions_from_lines(self._iter_lines(pdf_path))
+    
+    def iter_interventions_from_lines(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Moteur de parsing : une passe sur les lignes (nettoyées, non vides), une seule
+        regex par ligne. Chaque intervention est émise dès que la suivante commence.
+        """
+        match_speaker = _SPEAKER_LINE_RE.match
         current_speaker = None
-        current_text = ""
         current_timestamp = None
+        # Morceaux de texte de l'intervention courante, joints à l'émission
+        current_parts: List[str] = []
+        # Format "Nom - HH:MM" : la ligne suivante est le texte de l'intervention
+        expect_text_line = False
         
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
-            # Pas de vérification de faux speaker - trop contextuel
-            
-            # Chercher un pattern speaker
-            speaker_match = None
-            matched_pattern_index = -1
-            for j, pattern in enumerate(self.speaker_patterns):
-                match = re.match(pattern, line)
-                if match:
-                    speaker_match = match
-                    matched_pattern_index = j
-                    break
+        for line in lines:
+            if expect_text_line:
+                current_parts = [line]
+                expect_text_line = False
+                continue
             
-            if speaker_match:
-                # Valider le speaker extrait
-                speaker = speaker_match.group(1).strip()
+            match = match_speaker(line)
+            if match:
+                groups = match.groupdict()
+                if groups["name0"] is not None:
+                    speaker, text, timestamp = groups["name0"], None, groups["ts0"]
+                elif groups["name1"] is not None:
+                    speaker, text, timestamp = groups["name1"], groups["text1"], None
+                elif groups["name2"] is not None:
+                    speaker, text, timestamp = groups["name2"], groups["text2"], None
+                else:
+                    speaker, text, timestamp = groups["name3"], groups["text3"], groups["ts3"]
+                speaker = speaker.strip()
+                
                 if self._is_valid_speaker(speaker):
-                    # Sauvegarder l'intervention précédente si elle existe
-                    if current_speaker and current_text.strip():
-                        interventions.append({
-                            "speaker": current_speaker,
-                            "timestamp": current_timestamp,
-                            "text": current_text.strip()
-                        })
+                    # Émettre l'intervention précédente si elle existe
+                    if current_speaker:
+                        intervention = self._build_intervention(current_speaker, current_timestamp, current_parts)
+                        if intervention:
+                            yield intervention
                     
                     # Nouvelle intervention
                     current_speaker = speaker
-                    current_timestamp = self._extract_timestamp_from_line(line)
-                    
-                    # Si c'est le pattern "Nom - HH:MM" (index 0), le texte est sur la ligne suivante
-                    if matched_pattern_index == 0:
-                        # Format "Nom - HH:MM", texte sur la ligne suivante
-                        current_text = ""
-                        if i + 1 < len(lines):
-                            current_text = lines[i + 1].strip()
-                            i += 2  # Passer la ligne du speaker et la ligne du texte
-                        else:
-                            i += 1
+                    current_timestamp = timestamp if timestamp is not None else self._extract_timestamp_from_line(text)
+                    if text is None:
+                        current_parts = []
+                        expect_text_line = True
                     else:
-                        # Format "Nom: texte" ou "Nom - texte", tout sur la même ligne
-                        current_text = speaker_match.group(2).strip() if len(speaker_match.groups()) > 1 else ""
-                        i += 1
-                else:
-                    # Continuer le texte si le speaker n'est pas valide
-                    if current_speaker:
-                        current_text += " " + line
-                    i += 1
-            else:
-                # Continuer le texte de l'intervention actuelle
-                if current_speaker:
-                    current_text += " " + line
-                i += 1
-        
-        # Ajouter la dernière intervention
-        if current_speaker and current_text.strip():
-            interventions.append({
-                "speaker": current_speaker,
-                "timestamp": current_timestamp,
-                "text": current_text.strip()
-            })
+                        current_parts = [text.strip()]
+                    continue
+            
+            # Continuer le texte de l'intervention actuelle (speaker invalide ou ligne de texte)
+            if current_speaker:
+                current_parts.append(line)
         
-        logger.info(f"Nombre d'interventions extraites: {len(interventions)}")
-        return interventions
+        # Émettre la dernière intervention
+        if current_speaker:
+            intervention = self._build_intervention(current_speaker, current_timestamp, current_parts)
+            if intervention:
+                yield intervention
+    
+    @staticmethod
+    def _build_intervention(speaker: str, timestamp: Optional[str], parts: List[str]) -> Optional[Dict[str, Any]]:
+        """Assemble une intervention (None si son texte est vide)"""
+        text = " ".join(parts).strip()
+        if not text:
+            return None
+        return {"speaker": speaker, "timestamp": timestamp, "text": text}
+    
+    def _iter_lines(self, pdf_path: str) -> Iterator[str]:
+        """Lignes non vides du PDF, nettoyées, page par page"""
+        for page_text in self.iter_page_texts(pdf_path):
+            for line in page_text.split('\n'):
+                line = line.strip()
+                if line:
+                    yield line
     
     def _extract_timestamp_from_line(self, line: str) -> str:
         """Extrait un timestamp d'une ligne"""
-        for pattern in self.timestamp_patterns:
-            match = re.search(pattern, line)
+        for pattern in _TIMESTAMP_RES:
+            match = pattern.search(line)
             if match:
                 return match.group(1)
         return None
@@ -2,8 +2,9 @@
 Agent de filtrage sémantique utilisant GPT-5-nano
 """
 import logging
+import hashlib
 from typing import List, Dict, Any
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 import os
 from dotenv import load_dotenv
 from .interesting_parts_agent import InterestingPartsAgent
@@ -21,6 +22,12 @@ logger = logging.getLogger(__name__)
 class SemanticFilterAgent:
     """Agent de filtrage sémantique avec GPT-5-nano"""
     
+    # Version des prompts et du schéma (invalide les résultats mémorisés quand ils changent)
+    PROMPT_VERSION = hashlib.sha256(
+        (SEMANTIC_ANALYSIS_SYSTEM_PROMPT_V2 + SEMANTIC_ANALYSIS_PROMPT_V2
+         + str(SemanticAnalysisResponse.model_json_schema())).encode("utf-8")
+    ).hexdigest()[:16]
+    
     def __init__(self, api_key: str = None):
         self.interesting_parts_agent = InterestingPartsAgent()
         
@@ -29,7 +36,7 @@ class SemanticFilterAgent:
         if not api_key:
             logger.warning("Clé API OpenAI non configurée")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="semantic_filter")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
     def analyze_transcript(self, pdf_path: str) -> Dict[str, Any]:
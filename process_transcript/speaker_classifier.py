@@ -3,7 +3,7 @@ Classificateur de speakers pour identifier interviewer/interviewé et direction/
 """
 import logging
 from typing import List, Dict, Any, Set, Optional
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 import os
 import json
 from pathlib import Path
@@ -32,14 +32,14 @@ class SpeakerClassifier:
         Args:
             api_key: Clé API OpenAI (optionnelle)
             interviewer_names: Liste des noms d'interviewers (optionnelle, par défaut utilise les noms par défaut)
-            cache_file: Chemin vers le fichier de cache persistant (optionnel, par défaut outputs/speaker_classification_cache.json)
+            cache_file: Obsolète, ignoré (remplacé par le registre des speakers)
         """
         # Configuration OpenAI
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             logger.warning("Clé API OpenAI non configurée")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="speaker_classifier")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         
         # Liste des interviewers par défaut
@@ -48,15 +48,10 @@ class SpeakerClassifier:
         
         self.interviewer_names = interviewer_names
         
-        # Cache en mémoire pour la session (évite les appels LLM répétés dans la même session)
-        self._classification_cache: Dict[str, str] = {}
-        
-        # Cache persistant entre les réunions - CHARGEMENT LAZY
-        if cache_file is None:
-            cache_file = "outputs/speaker_classification_cache.json"
-        self.cache_file = Path(cache_file)
-        self._persistent_cache: Optional[Dict[str, str]] = None  # Chargé de manière lazy
-        self._persistent_cache_loaded = False  # Flag pour savoir si le cache a été chargé
+        # Les classifications sont partagées via le registre des speakers (table speakers + LRU) ;
+        # cache_file n'est conservé que pour la compatibilité des appels existants
+        if cache_file is not None:
+            logger.info("cache_file ignoré : les classifications passent par le registre des speakers")
         
     
     def classify_speakers(
@@ -70,7 +65,8 @@ class SpeakerClassifier:
         Cette méthode est conservée pour la compatibilité avec process_single_file().
         
         Classe les speakers et enrichit les interventions avec speaker_type et speaker_level.
-        Utilise la DB si document_id ou project_id est fourni pour éviter les appels LLM redondants.
+        Les speakers connus (registre : mémoire puis table speakers) ne sont pas reclassifiés ;
+        les autres sont classifiés ensemble en un seul appel LLM.
         
         Args:
             interventions: Liste des interventions parsées
@@ -96,91 +92,45 @@ class SpeakerClassifier:
         interviewer_names_set = self._identify_interviewers(interventions)
         logger.info(f"Interviewers identifiés: {interviewer_names_set}")
         
-        # Étape 2: Charger les speakers depuis la DB si document_id ou project_id fourni
-        speakers_from_db = {}  # Mapping nom -> {level, speaker_type}
+        # Étape 2: Résoudre les speakers connus (registre : LRU puis une requête en base)
+        from database.speaker_registry import speaker_registry
         
-        if document_id or project_id:
+        if document_id and not project_id:
             try:
                 from database.db import get_db_context
-                from database.repository import SpeakerRepository, DocumentRepository
+                from database.repository import DocumentRepository
                 
                 with get_db_context() as db:
-                    # Si document_id fourni, récupérer project_id depuis le document
-                    if document_id and not project_id:
-                        document = DocumentRepository.get_by_id(db, document_id)
-                        if document:
-                            project_id = document.project_id
-                    
-                    if project_id:
-                        # Charger tous les speakers du projet
-                        project_speakers = SpeakerRepository.get_by_project(db, project_id)
-                        for speaker in project_speakers:
-                            speakers_from_db[speaker.name] = {
-                                "level": speaker.level or "inconnu",
-                                "speaker_type": speaker.speaker_type
-                            }
-                        
-                        # Charger aussi les interviewers globaux
-                        global_interviewers = SpeakerRepository.get_interviewers(db)
-                        for speaker in global_interviewers:
-                            speakers_from_db[speaker.name] = {
-                                "level": None,
-                                "speaker_type": "interviewer"
-                            }
-                        
-                        logger.info(f"✓ {len(speakers_from_db)} speakers chargés depuis la DB")
+                    document = DocumentRepository.get_by_id(db, document_id)
+                    if document:
+                        project_id = document.project_id
             except Exception as e:
-                logger.warning(f"Erreur lors du chargement des speakers depuis la DB: {e}, utilisation du cache/LLM")
+                logger.warning(f"Erreur lors de la lecture du document {document_id}: {e}")
         
-        # Étape 3: Identifier les speakers interviewés uniques pour classification direction/métier
-        interviewee_speakers = set()
-        for intervention in interventions:
-            speaker = intervention.get("speaker", "")
-            if speaker and speaker not in interviewer_names_set:
-                interviewee_speakers.add(speaker)
+        all_speakers = [interv.get("speaker", "") for interv in interventions if interv.get("speaker")]
+        speakers_from_db, unresolved = speaker_registry.resolve_many(all_speakers, project_id)
         
-        logger.info(f"Speakers interviewés à classifier: {len(interviewee_speakers)}")
+        # Étape 3: Identifier les speakers interviewés restant à classifier (direction/métier)
+        unresolved_interviewees = [speaker for speaker in unresolved if speaker not in interviewer_names_set]
+        logger.info(f"Speakers interviewés à classifier: {len(unresolved_interviewees)}")
         
-        # Étape 4: Classifier chaque speaker interviewé (utiliser DB si disponible, sinon cache/LLM)
+        # Étape 4: Classifier les speakers inconnus en un seul appel LLM
         speaker_levels = {}
-        new_classifications = {}  # Pour sauvegarder les nouvelles classifications
-        
-        # Charger le cache persistant de manière lazy si nécessaire
-        if not self._persistent_cache_loaded:
-            self._persistent_cache = self._load_persistent_cache()
-            self._persistent_cache_loaded = True
-        
-        for speaker in interviewee_speakers:
-            # Priorité 1: Utiliser les données de la DB si disponibles
-            if speaker in speakers_from_db:
-                db_info = speakers_from_db[speaker]
-                speaker_levels[speaker] = db_info["level"] if db_info["level"] else "inconnu"
-                logger.info(f"✓ {speaker}: {speaker_levels[speaker]} (depuis DB)")
-            # Priorité 2: Vérifier le cache en mémoire (session courante)
-            elif speaker in self._classification_cache:
-                speaker_levels[speaker] = self._classification_cache[speaker]
-                logger.info(f"✓ {speaker}: {speaker_levels[speaker]} (depuis cache session)")
-            # Priorité 3: Vérifier le cache persistant (réunions précédentes)
-            elif self._persistent_cache and speaker in self._persistent_cache:
-                speaker_levels[speaker] = self._persistent_cache[speaker]
-                self._classification_cache[speaker] = speaker_levels[speaker]  # Mettre aussi dans le cache session
-                logger.info(f"✓ {speaker}: {speaker_levels[speaker]} (depuis cache persistant)")
-            # Priorité 4: Appel LLM (seulement si pas trouvé ailleurs)
-            else:
-                # Collecter TOUTES les interventions de ce speaker pour le contexte
-                speaker_interventions = [
-                    interv for interv in interventions 
-                    if interv.get("speaker") == speaker
-                ]
-                level = self._classify_interviewee_level(speaker, speaker_interventions)
-                speaker_levels[speaker] = level
-                self._classification_cache[speaker] = level  # Cache session
-                new_classifications[speaker] = level  # Pour sauvegarder dans le cache persistant
-                logger.info(f"✓ {speaker}: {level} (nouvelle classification LLM)")
-        
-        # Sauvegarder les nouvelles classifications dans le cache persistant
-        if new_classifications:
-            self._save_to_persistent_cache(new_classifications)
+        if unresolved_interviewees:
+            classified = self.extract_roles_for_json_speakers(
+                json_speakers=unresolved_interviewees,
+                interventions=interventions,
+                interviewer_names_set=interviewer_names_set
+            )
+            for speaker_data in classified:
+                if speaker_data.get("is_interviewer"):
+                    continue
+                level = speaker_data.get("level") or "inconnu"
+                speaker_levels[speaker_data["name"]] = level
+                speaker_registry.remember_classification(
+                    speaker_data["name"], speaker_data.get("role"), level, project_id
+                )
+                logger.info(f"✓ {speaker_data['name']}: {level} (nouvelle classification LLM)")
         
         # Étape 5: Enrichir les interventions
         enriched_interventions = []
@@ -234,139 +184,6 @@ class SpeakerClassifier:
         
         return interviewer_names_found
     
-    def _classify_interviewee_level(self, speaker_name: str, context: List[Dict[str, Any]]) -> str:
-        """
-        Utilise un LLM pour extraire le poste d'un speaker depuis TOUTES ses interventions
-        et classifier son niveau hiérarchique (direction/métier)
-        
-        Args:
-            speaker_name: Nom du speaker
-            context: Liste de TOUTES les interventions de ce speaker
-            
-        Returns:
-            "direction", "métier" ou "inconnu"
-        """
-        if not context:
-            return "inconnu"
-        
-        # Préparer TOUTES les interventions (pas seulement 5) pour trouver les présentations
-        # Les présentations sont souvent au début, mais pas toujours
-        all_interventions_text = "\n".join([
-            f"- {interv.get('text', '')}"
-            for interv in context
-        ])
-        
-        prompt = f"""Tu dois identifier le poste/titre d'une personne à partir de ses interventions dans une réunion de conseil.
-
-Nom de la personne: {speaker_name}
-
-Interventions de cette personne:
-{all_interventions_text}
-
-INSTRUCTIONS IMPORTANTES :
-1. Cherche spécifiquement les phrases où la personne se présente ou mentionne son poste (ex: "je me présente [nom], DG de...", "je suis directeur de...", "mon rôle est...", "je travaille en tant que...")
-2. Si tu trouves un poste/titre clair (DG, Directeur, CEO, PDG, CTO, responsable, manager, collaborateur, etc.), détermine s'il s'agit d'un poste de direction (stratégique, management, C-level) ou de métier (opérationnel)
-3. Si aucune information claire sur le poste n'est trouvée dans les interventions, réponds "inconnu" - NE PAS INVENTER un poste
-4. Ne pas se baser uniquement sur le style de parole ou le contenu des interventions, mais sur les informations explicites de poste/titre
-
-Réponds UNIQUEMENT par "direction", "métier" ou "inconnu".
-- "direction" : si le poste est stratégique/management (DG, Directeur général, CEO, PDG, CTO, Directeur de [fonction], etc.)
-- "métier" : si le poste est opérationnel (collaborateur, responsable opérationnel, etc.)
-- "inconnu" : si aucun poste clair n'est mentionné dans les interventions"""
-
-        try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ]
-            )
-            
-            result = response.output_text.strip().lower()
-            
-            # Valider la réponse
-            if "direction" in result:
-                return "direction"
-            elif "métier" in result or "metier" in result:
-                return "métier"
-            elif "inconnu" in result:
-                return "inconnu"
-            else:
-                logger.warning(f"Réponse LLM inattendue pour {speaker_name}: {result}, utilisation de 'inconnu' par défaut")
-                return "inconnu"
-                
-        except Exception as e:
-            logger.error(f"Erreur lors de la classification LLM pour {speaker_name}: {e}")
-            return "inconnu"  # Valeur par défaut en cas d'erreur
-    
-    def _load_persistent_cache(self) -> Dict[str, str]:
-        """
-        Charge le cache persistant depuis le fichier JSON.
-        CHARGEMENT LAZY : appelé seulement quand nécessaire, pas dans __init__.
-        
-        Returns:
-            Dictionnaire speaker_name -> level
-        """
-        if not self.cache_file.exists():
-            logger.info(f"Cache persistant non trouvé: {self.cache_file}, création d'un nouveau cache")
-            return {}
-        
-        try:
-            # Lecture synchrone simple - maintenant appelée seulement quand nécessaire
-            # (pas dans __init__ donc pas de blocking call au démarrage)
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-            
-            logger.info(f"Cache persistant chargé: {len(cache)} speakers")
-            return cache
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement du cache persistant: {e}")
-            return {}
-    
-    def _save_to_persistent_cache(self, new_classifications: Dict[str, str]):
-        """
-        Sauvegarde les nouvelles classifications dans le cache persistant
-        
-        Args:
-            new_classifications: Dictionnaire speaker_name -> level à sauvegarder
-        """
-        if not new_classifications:
-            return
-        
-        try:
-            # Créer le répertoire s'il n'existe pas
-            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Charger le cache existant depuis le fichier (pour éviter les problèmes de concurrence)
-            current_cache = self._load_persistent_cache()
-            
-            # Mettre à jour avec les nouvelles classifications
-            current_cache.update(new_classifications)
-            
-            # Sauvegarder
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(current_cache, f, ensure_ascii=False, indent=2)
-            
-            # Mettre à jour aussi le cache en mémoire (charger si nécessaire)
-            if not self._persistent_cache_loaded:
-                self._persistent_cache = current_cache
-                self._persistent_cache_loaded = True
-            else:
-                self._persistent_cache.update(new_classifications)
-            
-            logger.info(f"Cache persistant mis à jour: {len(new_classifications)} nouvelles classifications sauvegardées")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du cache persistant: {e}")
-    
     def identify_and_extract_speakers_with_roles(
         self, 
         all_speakers: List[str], 
@@ -1,10 +1,14 @@
 """
 Agent principal pour le traitement des transcriptions (PDF ou JSON)
 """
+import os
+import json
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
 from .pdf_parser import PDFParser
 from .json_parser import JSONParser
 from .interesting_parts_agent import InterestingPartsAgent
@@ -13,6 +17,53 @@ from .speaker_classifier import SpeakerClassifier
 
 logger = logging.getLogger(__name__)
 
+# Étapes de process_from_db
+STAGE_LOAD = "load"                            # Chargement des interventions enrichies (sans LLM)
+STAGE_INTERESTING_PARTS = "interesting_parts"  # + filtrage LLM des parties intéressantes
+STAGE_SEMANTIC = "semantic"                    # + analyse sémantique LLM (nécessite le filtrage)
+ALL_STAGES = (STAGE_LOAD, STAGE_INTERESTING_PARTS, STAGE_SEMANTIC)
+
+# Mémorisation en base des étapes LLM par document (table transcript_analyses)
+TRANSCRIPT_ANALYSIS_MEMO_ENABLED = os.getenv("TRANSCRIPT_ANALYSIS_MEMO_ENABLED", "1") == "1"
+
+
+class TranscriptResult(dict):
+    """
+    Résultat de process_from_db.
+    
+    Les étapes demandées sont calculées immédiatement ; les autres le sont au
+    premier accès à leur clé (`result["semantic_analysis"]`, `result.get(...)`).
+    Sérialisé comme un dict ordinaire (état LangGraph, JSON).
+    """
+    
+    # Clé du résultat -> étape qui la produit
+    LAZY_KEYS = {
+        "interesting_parts": STAGE_INTERESTING_PARTS,
+        "semantic_analysis": STAGE_SEMANTIC,
+        "summary": STAGE_SEMANTIC,
+    }
+    
+    def __init__(self, data: Dict[str, Any], compute_stage=None):
+        super().__init__(data)
+        self._compute_stage = compute_stage
+    
+    def __missing__(self, key):
+        stage = self.LAZY_KEYS.get(key)
+        if stage is None or self._compute_stage is None or self.get_status() != "success":
+            raise KeyError(key)
+        self._compute_stage(self, stage)
+        return dict.__getitem__(self, key)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def get_status(self) -> Optional[str]:
+        return dict.get(self, "status")
+
+
 class TranscriptAgent:
     """Agent principal pour traiter les transcriptions (PDF ou JSON)"""
     
@@ -29,11 +80,55 @@ class TranscriptAgent:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     
+    # Colonnes chargées depuis la BDD pour l'analyse des transcripts
+    DB_COLUMNS = ("intervention_id", "speaker", "speaker_name", "timestamp", "text", "speaker_type", "speaker_level")
+    
+    @classmethod
+    def load_interventions_from_db(
+        cls,
+        document_ids: List[int],
+        filter_interviewers: bool = True
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Charge et formate les interventions de plusieurs documents en une seule requête.
+        
+        Args:
+            document_ids: IDs des documents dans la table documents
+            filter_interviewers: Si True, exclut les interventions des interviewers
+            
+        Returns:
+            Dict document_id -> interventions formatées pour les agents
+        """
+        from database.db import get_db_context
+        from database.repository import TranscriptRepository
+        
+        with get_db_context() as db:
+            enriched_by_doc = TranscriptRepository.get_enriched_by_documents(
+                db, document_ids, filter_interviewers=filter_interviewers, columns=cls.DB_COLUMNS
+            )
+        
+        return {
+            document_id: [
+                {
+                    "intervention_id": interv.get("intervention_id"),  # ID stable (citations référencées)
+                    "speaker": interv.get("speaker_name") or interv.get("speaker"),  # Utiliser nom validé si disponible
+                    "timestamp": interv.get("timestamp"),
+                    "text": interv.get("text"),
+                    "speaker_type": interv.get("speaker_type"),
+                    "speaker_level": interv.get("speaker_level"),  # Déjà présent depuis speakers
+                }
+                for interv in enriched
+            ]
+            for document_id, enriched in enriched_by_doc.items()
+        }
+    
     def process_from_db(
         self,
         document_id: int,
         validated_speakers: Optional[List[Dict[str, str]]] = None,
-        filter_interviewers: bool = True
+        filter_interviewers: bool = True,
+        interventions: Optional[List[Dict[str, Any]]] = None,
+        stages: Iterable[str] = ALL_STAGES
     ) -> Dict[str, Any]:
         """
         Traite un transcript depuis la base de données.
@@ -46,44 +141,35 @@ class TranscriptAgent:
             validated_speakers: Liste optionnelle des speakers validés par l'utilisateur
                               Format: [{"name": "...", "role": "..."}, ...]
             filter_interviewers: Si True, exclut les interventions des interviewers (défaut: True)
+            interventions: Interventions déjà chargées via load_interventions_from_db
+                          (évite une requête par document)
+            stages: Étapes à exécuter immédiatement (STAGE_LOAD, STAGE_INTERESTING_PARTS,
+                    STAGE_SEMANTIC). Les étapes LLM non demandées ne sont exécutées
+                    qu'au premier accès à leur résultat.
             
         Returns:
-            Dictionnaire contenant les résultats de l'analyse
+            TranscriptResult contenant les résultats de l'analyse
         """
-        logger.info(f"=== Début du traitement depuis la BDD pour document_id={document_id} ===")
+        stages = set(stages)
+        logger.info(f"=== Début du traitement depuis la BDD pour document_id={document_id} (étapes: {sorted(stages)}) ===")
         
         try:
-            from database.db import get_db_context
-            from database.repository import TranscriptRepository
+            # Charger les interventions enrichies depuis la BDD (si non pré-chargées)
+            if interventions is None:
+                interventions = self.load_interventions_from_db(
+                    [document_id], filter_interviewers=filter_interviewers
+                )[document_id]
             
-            # Charger les interventions enrichies depuis la BDD
-            with get_db_context() as db:
-                enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                    db, document_id, filter_interviewers=filter_interviewers
-                )
-            
-            if not enriched_interventions:
+            if not interventions:
                 logger.warning(f"Aucune intervention trouvée pour document_id={document_id}")
-                return {
+                return TranscriptResult({
                     "document_id": document_id,
                     "status": "error",
                     "error": "Aucune intervention trouvée"
-                }
-            
-            logger.info(f"✓ {len(enriched_interventions)} interventions enrichies chargées depuis la BDD")
+                })
             
-            # Adapter le format pour compatibilité avec les agents
-            # Convertir speaker_level en speaker_level (même nom, mais s'assurer qu'il est présent)
-            formatted_interventions = []
-            for interv in enriched_interventions:
-                formatted_interv = {
-                    "speaker": interv.get("speaker_name") or interv.get("speaker"),  # Utiliser nom validé si disponible
-                    "timestamp": interv.get("timestamp"),
-                    "text": interv.get("text"),
-                    "speaker_type": interv.get("speaker_type"),
-                    "speaker_level": interv.get("speaker_level"),  # Déjà présent depuis speakers
-                }
-                formatted_interventions.append(formatted_interv)
+            logger.info(f"✓ {len(interventions)} interventions enrichies chargées depuis la BDD")
+            formatted_interventions = list(interventions)
             
             # Filtrer UNIQUEMENT les speakers validés par l'utilisateur (si fourni)
             if validated_speakers:
@@ -99,18 +185,6 @@ class TranscriptAgent:
             
             # Plus besoin de classify_speakers() - les données sont déjà enrichies !
             
-            # Étape 2: Filtrage des parties intéressantes
-            logger.info("Étape 2: Filtrage des parties intéressantes")
-            interesting_interventions = self.interesting_parts_agent._filter_interesting_parts(formatted_interventions)
-            logger.info(f"✓ {len(interesting_interventions)} interventions intéressantes identifiées")
-            
-            # Étape 3: Analyse sémantique
-            logger.info("Étape 3: Analyse sémantique avec GPT-5-nano")
-            semantic_analysis = self.semantic_filter_agent._perform_semantic_analysis(
-                self.semantic_filter_agent._prepare_text_for_analysis(interesting_interventions)
-            )
-            logger.info("✓ Analyse sémantique terminée")
-            
             # Extraire les speakers uniques
             speakers = list(set(
                 interv.get("speaker") 
@@ -118,8 +192,7 @@ class TranscriptAgent:
                 if interv.get("speaker")
             ))
             
-            # Résultat final
-            result = {
+            result = TranscriptResult({
                 "document_id": document_id,
                 "status": "success",
                 "parsing": {
@@ -127,24 +200,124 @@ class TranscriptAgent:
                     "speakers": speakers,
                     "interventions": formatted_interventions  # Déjà enrichies !
                 },
-                "interesting_parts": {
-                    "count": len(interesting_interventions),
-                    "interventions": interesting_interventions
-                },
-                "semantic_analysis": semantic_analysis,
-                "summary": self.semantic_filter_agent.get_summary({"semantic_analysis": semantic_analysis})
-            }
+            }, compute_stage=self._compute_stage)
+            
+            # Étapes LLM demandées (l'analyse sémantique inclut le filtrage)
+            if STAGE_SEMANTIC in stages:
+                self._compute_stage(result, STAGE_SEMANTIC)
+            elif STAGE_INTERESTING_PARTS in stages:
+                self._compute_stage(result, STAGE_INTERESTING_PARTS)
             
             logger.info(f"=== Traitement terminé avec succès ===")
             return result
             
         except Exception as e:
             logger.error(f"Erreur lors du traitement depuis la BDD document_id={document_id}: {e}")
-            return {
+            return TranscriptResult({
                 "document_id": document_id,
                 "status": "error",
                 "error": str(e)
+            })
+    
+    @staticmethod
+    def _content_hash(interventions: List[Dict[str, Any]]) -> str:
+        """Hash des interventions analysées (texte, speakers validés, type et niveau)"""
+        # L'ID de l'intervention n'est pas du contenu : un même transcript réimporté garde ses résultats
+        content = [
+            {key: value for key, value in interv.items() if key != "intervention_id"} if isinstance(interv, dict) else interv
+            for interv in interventions
+        ]
+        serialized = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _load_memo(document_id: int, stage: str, content_hash: str, prompt_version: str, model: str) -> Optional[Dict[str, Any]]:
+        """Résultat mémorisé d'une étape, s'il est encore valide"""
+        if not TRANSCRIPT_ANALYSIS_MEMO_ENABLED:
+            return None
+        from database.db import get_db_context
+        from database.repository import TranscriptAnalysisRepository
+        
+        try:
+            with get_db_context() as db:
+                return TranscriptAnalysisRepository.get(db, document_id, stage, content_hash, prompt_version, model)
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture de l'analyse mémorisée impossible (document_id={document_id}, {stage}): {e}")
+            return None
+    
+    @staticmethod
+    def _save_memo(document_id: int, stage: str, content_hash: str, prompt_version: str, model: str, data: Dict[str, Any]) -> None:
+        if not TRANSCRIPT_ANALYSIS_MEMO_ENABLED:
+            return
+        from database.db import get_db_context
+        from database.repository import TranscriptAnalysisRepository
+        
+        try:
+            with get_db_context() as db:
+                TranscriptAnalysisRepository.save(db, document_id, stage, content_hash, prompt_version, model, data)
+        except Exception as e:
+            logger.warning(f"⚠️ Sauvegarde de l'analyse impossible (document_id={document_id}, {stage}): {e}")
+    
+    def _compute_stage(self, result: TranscriptResult, stage: str) -> None:
+        """
+        Exécute une étape LLM sur un résultat de process_from_db (et ses prérequis).
+        
+        Le résultat de chaque étape est mémorisé en base par document ; il est
+        réutilisé tant que les interventions analysées, la version des prompts
+        et le modèle sont inchangés.
+        """
+        document_id = result["document_id"]
+        
+        if stage == STAGE_INTERESTING_PARTS and "interesting_parts" not in result.keys():
+            # Étape 2: Filtrage des parties intéressantes
+            interventions = result["parsing"]["interventions"]
+            agent = self.interesting_parts_agent
+            content_hash = self._content_hash(interventions)
+            memo = self._load_memo(document_id, STAGE_INTERESTING_PARTS, content_hash, agent.PROMPT_VERSION, agent.model)
+            
+            if memo is not None:
+                indices = memo["indices"]
+                logger.info(f"♻️ Étape 2: parties intéressantes réutilisées (document_id={document_id})")
+            else:
+                logger.info("Étape 2: Filtrage des parties intéressantes")
+                indices, complete = agent._select_interesting_indices(interventions) if interventions else ([], True)
+                # Une fenêtre en erreur (toutes ses interventions retenues) : résultat non mémorisé
+                if complete:
+                    self._save_memo(
+                        document_id, STAGE_INTERESTING_PARTS, content_hash, agent.PROMPT_VERSION, agent.model,
+                        {"indices": indices}
+                    )
+            
+            interesting_interventions = [interventions[i] for i in indices if i < len(interventions)]
+            logger.info(f"✓ {len(interesting_interventions)} interventions intéressantes identifiées")
+            result["interesting_parts"] = {
+                "count": len(interesting_interventions),
+                "interventions": interesting_interventions
             }
+        elif stage == STAGE_SEMANTIC and "semantic_analysis" not in result.keys():
+            interesting_interventions = result["interesting_parts"]["interventions"]
+            agent = self.semantic_filter_agent
+            content_hash = self._content_hash(interesting_interventions)
+            semantic_analysis = self._load_memo(document_id, STAGE_SEMANTIC, content_hash, agent.PROMPT_VERSION, agent.model)
+            
+            if semantic_analysis is not None:
+                logger.info(f"♻️ Étape 3: analyse sémantique réutilisée (document_id={document_id})")
+            else:
+                # Étape 3: Analyse sémantique
+                logger.info("Étape 3: Analyse sémantique avec GPT-5-nano")
+                semantic_analysis = agent._perform_semantic_analysis(
+                    agent._prepare_text_for_analysis(interesting_interventions)
+                )
+                logger.info("✓ Analyse sémantique terminée")
+                # Une analyse en erreur (structure vide + "erreur") n'est pas mémorisée
+                if "erreur" not in semantic_analysis:
+                    self._save_memo(
+                        document_id, STAGE_SEMANTIC, content_hash, agent.PROMPT_VERSION, agent.model,
+                        semantic_analysis
+                    )
+            
+            result["semantic_analysis"] = semantic_analysis
+            result["summary"] = agent.get_summary({"semantic_analysis": semantic_analysis})
     
     def process_single_file(self, file_path: str, validated_speakers: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
         """
@@ -347,7 +520,7 @@ class TranscriptAgent:
         # Avec beaucoup de fichiers, on limite à un nombre raisonnable de threads
         max_workers = min(len(file_paths), 10)  # Maximum 10 threads en parallèle
         logger.info(f"Parallélisation avec {max_workers} workers pour {len(file_paths)} fichiers")
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with FanOutExecutor(max_workers=max_workers) as executor:
             # Soumettre tous les fichiers pour traitement parallèle
             future_to_file = {}
             for file_path in file_paths:
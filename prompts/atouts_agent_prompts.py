@@ -165,6 +165,26 @@ Assure-toi que chaque atout :
 - Est rédigé comme une synthèse stratégique macro
 """
 
+# Régénération incrémentale : condensé des citations + atouts non retenus uniquement
+ATOUTS_DELTA_REGENERATION_PROMPT = """
+Itération de validation : remplace les atouts non retenus par l'utilisateur.
+
+Atouts validés (NE PAS REPROPOSER) :
+{validated_atouts}
+
+Atouts rejetés ou non retenus (NE PAS REPROPOSER) :
+{rejected_atouts}
+
+Feedback de l'utilisateur :
+{user_feedback}
+
+Condensé des citations et de l'entreprise ([type d'atout] citation) :
+{evidence_digest}
+
+Génère {num_atouts} NOUVEAUX atouts macro-stratégiques, DIFFÉRENTS des atouts validés et rejetés, en tenant compte du feedback.
+Même style que précédemment : conditionnel, vocabulaire stratégique et consultatif, titre percutant (max 15 mots), description de 3-5 lignes montrant comment l'atout faciliterait l'adoption de l'IA à l'échelle de l'entreprise, IDs uniques (1, 2, 3, …).
+"""
+
 # Note : ATOUTS_WEB_INFO_PROMPT supprimé car non utilisé
 # Les atouts sont extraits uniquement depuis les transcriptions d'interviews,
 # pas depuis des informations web génériques
@@ -0,0 +1,14 @@
+"""
+Prompts communs au mode identifiant des extractions de citations
+(le modèle référence les interventions numérotées au lieu de recopier les citations)
+"""
+
+# Consigne ajoutée à la fin des prompts d'extraction de citations en mode identifiant
+CITATION_REFERENCE_INSTRUCTIONS = """
+
+MODE RÉFÉRENCE (IMPORTANT) :
+Chaque intervention du transcript est précédée de son numéro [i].
+- NE RECOPIE PAS le texte des citations : pour chaque citation, indique seulement `intervention_index` (le numéro [i] de l'intervention).
+- Si seule une partie de l'intervention est pertinente, indique `start` et `end` : positions en caractères (début inclus, fin exclue) de l'extrait dans le texte de l'intervention (sans le préfixe [i] ni les métadonnées). Sinon, mets `start` et `end` à null.
+- Le texte exact de la citation et le speaker seront reconstitués automatiquement à partir du transcript.
+"""
@@ -533,6 +533,59 @@ distinctes, alignées avec le feedback utilisateur,
 et adaptées à la maturité Data & IA de l’entreprise.
 """
 
+# Régénération incrémentale des enjeux : condensé des preuves + enjeux non retenus uniquement
+REGENERATE_CHALLENGES_DELTA_PROMPT = """
+Itération de validation : remplace les enjeux stratégiques Data & IA non retenus par l’utilisateur.
+
+ENJEUX VALIDÉS (À CONSERVER — NE PAS RÉGÉNÉRER NI REFORMULER) :
+{validated_challenges}
+
+ENJEUX REJETÉS OU NON RETENUS (THÈMES À ÉCARTER) :
+{rejected_challenges}
+
+COMMENTAIRES DE L’UTILISATEUR :
+{challenges_feedback}
+
+NOTE DE L’INTERVIEWER :
+{interviewer_note}
+
+CONDENSÉ DES PREUVES (entretiens et ateliers) :
+{evidence_digest}
+
+BESOINS IDENTIFIÉS (titres EXACTS uniquement) :
+{final_needs}
+
+INSTRUCTIONS :
+1. Génère {num_challenges} NOUVEAUX enjeux, sauf si l’utilisateur demande un autre nombre, sur des axes stratégiques différents des enjeux validés et rejetés
+2. Niveau COMEX : macro, business, transverse, horizon 3 à 5 ans, sans vocabulaire technique ni outil
+3. Format identique : ID (E1, E2, …), TITRE (max 10 mots), DESCRIPTION (3 à 5 lignes : nature stratégique, impact, valeur ou risque), BESOINS_LIÉS (titres EXACTS de la liste ci-dessus, sans en inventer)
+"""
+
+# Régénération incrémentale des recommandations : condensé + recommandations non retenues uniquement
+REGENERATE_RECOMMENDATIONS_DELTA_PROMPT = """
+Itération de validation : remplace les recommandations stratégiques Data & IA non retenues par l’utilisateur.
+
+RECOMMANDATIONS VALIDÉES (À CONSERVER — NE PAS RÉGÉNÉRER NI REFORMULER) :
+{validated_recommendations}
+
+RECOMMANDATIONS REJETÉES OU NON RETENUES (AXES À ÉCARTER) :
+{rejected_recommendations}
+
+COMMENTAIRES ET ATTENTES DE L’UTILISATEUR (PRIORITAIRES) :
+{recommendations_feedback}
+
+MATURITÉ Data & IA ÉVALUÉE :
+{maturite_ia}
+
+CONDENSÉ DU CONTEXTE (besoins et cas d’usage, contexte uniquement) :
+{evidence_digest}
+
+INSTRUCTIONS :
+1. Génère {num_recommendations} NOUVELLES recommandations, sauf si l’utilisateur impose un autre nombre, chacune sur un axe stratégique unique et non encore couvert
+2. Niveau MACRO (vision, gouvernance, pilotage de la valeur, trajectoire 12 à 36 mois) ; ni outils, ni solutions techniques, ni quick wins
+3. Format identique : id (R1, R2, …), titre (max 10 mots, non opérationnel), description (2 à 4 phrases : intention, impact, prise en compte du feedback, alignement avec la maturité)
+"""
+
 EXTRACT_ENJEUX_CITATIONS_PROMPT = """
 Extrait les citations pertinentes pour identifier les enjeux stratégiques de la Data & l'IA dans cette transcription.
 
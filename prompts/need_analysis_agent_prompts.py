@@ -231,3 +231,30 @@ STRATÉGIE DE DIVERSIFICATION :
 OBJECTIF : Génère {num_needs} nouveaux besoins avec des THÈMES VRAIMENT DIFFÉRENTS de tous les besoins déjà validés ET de tous les besoins déjà proposés, avec {num_quotes_per_need} citations CONCRÈTES issues des WORKSHOPS et TRANSCRIPTS uniquement (sauf indication contraire dans les informations supplémentaires). VÉRIFIE que chaque thème est UNIQUE et DISTINCT de TOUS les besoins déjà validés (qui ne doivent JAMAIS être reproposés) et de TOUS les besoins déjà proposés (validés ou rejetés). Les citations doivent être du texte pur, sans indication de source.
 """
 
+
+# Régénération incrémentale : condensé des preuves + éléments rejetés uniquement
+NEED_DELTA_REGENERATION_PROMPT = """
+Itération de validation : remplace les besoins non retenus par l'utilisateur.
+
+BESOINS VALIDÉS (À NE JAMAIS REPROPOSER, MÊME REFORMULÉS) :
+{validated_needs}
+
+BESOINS REJETÉS OU NON RETENUS (À NE PAS REPROPOSER) :
+{rejected_needs}
+
+COMMENTAIRES DE L'UTILISATEUR :
+{user_feedback}
+
+INFORMATIONS SUPPLÉMENTAIRES FOURNIES PAR L'UTILISATEUR :
+{additional_context}
+
+CONDENSÉ DES PREUVES (recherche web, ateliers et entretiens ; "remonté Nx" = iteration_count, [type|niveau du speaker]) :
+{evidence_digest}
+
+INSTRUCTIONS :
+1. Génère {num_needs} nouveaux besoins, sauf si un nombre différent est demandé dans les informations supplémentaires
+2. Chaque thème est UNIQUE et couvre un domaine métier DIFFÉRENT des besoins validés et rejetés
+3. Tiens compte des commentaires de l'utilisateur et des raisons implicites des rejets
+4. Chaque besoin contient {num_quotes_per_need} citations CONCRÈTES tirées des ateliers et entretiens du condensé, recopiées telles quelles (texte pur, sans source ni préfixe entre crochets)
+5. PRIORISE les besoins remontés plusieurs fois en atelier et ceux exprimés par la direction (ou par la direction ET le métier)
+"""
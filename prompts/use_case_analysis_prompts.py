@@ -178,3 +178,36 @@ INSTRUCTIONS POUR LA NOUVELLE ITÉRATION :
 Génère de nouveaux cas d'usage en respectant la structure attendue. VÉRIFIE que tous les titres/thèmes sont UNIQUES et différents des cas d'usage précédents.
 """
 
+
+# Régénération incrémentale : condensé des preuves + éléments rejetés uniquement
+USE_CASE_DELTA_REGENERATION_PROMPT = """
+Itération de validation : remplace les cas d'usage non retenus par l'utilisateur.
+
+CAS D'USAGE VALIDÉS (À NE PAS REPROPOSER) :
+{validated_use_cases}
+
+CAS D'USAGE REJETÉS OU NON RETENUS (À NE PAS REPROPOSER) :
+{rejected_use_cases}
+
+COMMENTAIRES DE L'UTILISATEUR :
+{user_feedback}
+
+BESOINS VALIDÉS :
+{validated_needs}
+
+INFORMATIONS SUPPLÉMENTAIRES FOURNIES PAR L'UTILISATEUR :
+{additional_context}
+
+FAMILLE DES CAS D'USAGE (si spécifiée) :
+{famille}
+
+CONDENSÉ DES PREUVES (recherche web, ateliers et entretiens ; "remonté Nx" = iteration_count, [type|niveau du speaker]) :
+{evidence_digest}
+
+INSTRUCTIONS :
+1. Génère {num_use_cases} nouveaux cas d'usage, sauf si un nombre différent est demandé dans les informations supplémentaires
+2. Titres UNIQUES, différents des cas d'usage validés et rejetés ; tiens compte des commentaires et des raisons implicites des rejets
+3. Rattache chaque cas d'usage aux besoins validés non encore couverts, en priorisant les besoins remontés plusieurs fois et ceux exprimés par la direction
+4. Intègre dans chaque description une explication vulgarisée des technologies IA utilisées
+5. Famille : applique les instructions du champ "FAMILLE" si fourni, sinon laisse "famille" à None
+"""
@@ -2,14 +2,14 @@
 Agent d'analyse et identification des cas d'usage IA
 """
 
-import json
 import logging
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 from prompts.use_case_analysis_prompts import (
     USE_CASE_ANALYSIS_SYSTEM_PROMPT,
     USE_CASE_ANALYSIS_USER_PROMPT,
-    USE_CASE_REGENERATION_PROMPT
+    USE_CASE_REGENERATION_PROMPT,
+    USE_CASE_DELTA_REGENERATION_PROMPT
 )
 from models.use_case_analysis_models import UseCaseAnalysisResponse
 
@@ -17,6 +17,10 @@ from models.use_case_analysis_models import UseCaseAnalysisResponse
 import sys
 sys.path.append('/home/addeche/aiko/aikoGPT')
 from utils.token_tracker import TokenTracker
+from utils.prompt_packing import compact_dumps, pack_evidence
+from utils.regeneration import format_items
+from utils.structured_stream import is_streaming_enabled, parse_with_item_stream
+from utils.progress_events import report_partial_item
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -37,7 +41,7 @@ class UseCaseAnalysisAgent:
             tracker: TokenTracker optionnel pour le suivi des tokens et coûts
         """
         import os
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_llm_client(api_key, agent="use_case_analysis")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
         self.tracker = tracker  # Tracker pour le suivi des tokens
         logger.info(f"UseCaseAnalysisAgent initialisé avec le modèle {self.model}")
@@ -52,7 +56,10 @@ class UseCaseAnalysisAgent:
         rejected_use_cases: Optional[List[Dict]] = None,
         user_feedback: str = "",
         additional_context: str = "",
-        famille: str = ""
+        famille: str = "",
+        evidence_digest: Optional[str] = None,
+        validated_use_cases: Optional[List[Dict]] = None,
+        num_use_cases: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Analyse les besoins validés et identifie les cas d'usage IA pertinents.
@@ -67,6 +74,10 @@ class UseCaseAnalysisAgent:
             user_feedback: Commentaires de l'utilisateur
             additional_context: Contexte additionnel fourni par l'utilisateur pour guider la génération
             famille: Famille des cas d'usage (optionnel) - peut contenir des instructions complètes ou des noms de familles
+            evidence_digest: Condensé des preuves du run ; si fourni, une régénération n'envoie que ce
+                condensé, les cas d'usage validés / non retenus et le feedback (mode delta)
+            validated_use_cases: Cas d'usage déjà validés (mode delta)
+            num_use_cases: Nombre de cas d'usage à remplacer (mode delta)
             
         Returns:
             Dict contenant les cas d'usage identifiés (use_cases)
@@ -92,16 +103,30 @@ class UseCaseAnalysisAgent:
             
             # Conversion sécurisée des données pour la sérialisation JSON
             validated_needs_safe = self._safe_serialize(validated_needs)
-            validated_needs_str = json.dumps(validated_needs_safe, ensure_ascii=False, indent=2)
+            validated_needs_str = compact_dumps(validated_needs_safe)
             
             # Sérialiser les données de contexte (workshop, transcript, web_search)
             workshop_data_safe = self._safe_serialize(workshop_data or {})
             transcript_data_safe = self._safe_serialize(transcript_data or [])
             web_search_data_safe = self._safe_serialize(web_search_data or {})
             
-            workshop_str = json.dumps(workshop_data_safe, ensure_ascii=False, indent=2)
-            transcript_str = json.dumps(transcript_data_safe, ensure_ascii=False, indent=2)
-            web_search_str = json.dumps(web_search_data_safe, ensure_ascii=False, indent=2)
+            # Sérialisation compacte bornée en tokens (priorité aux citations direction / métier)
+            packed = pack_evidence(workshop_data_safe, transcript_data_safe, web_search_data_safe)
+            workshop_str = packed.workshop_str
+            transcript_str = packed.transcript_str
+            web_search_str = packed.web_search_str
+            # (en régénération delta, ces données complètes ne sont pas envoyées)
+            if evidence_digest is None:
+                if self.tracker:
+                    self.tracker.track_prompt_savings(
+                        "use_case_analysis",
+                        "analyze_use_cases",
+                        packed.original_tokens,
+                        packed.packed_tokens,
+                        packed.dropped_items
+                    )
+                else:
+                    logger.info(f"💰 Prompt compact : {packed.original_tokens:,} → {packed.packed_tokens:,} tokens estimés ({packed.dropped_items} éléments retirés)")
             
             # LOG DÉTAILLÉ : Afficher un résumé complet de toutes les données reçues
             print(f"\n📤 [DEBUG USE CASE] RÉSUMÉ COMPLET DES DONNÉES REÇUES PAR L'AGENT:")
@@ -210,6 +235,26 @@ class UseCaseAnalysisAgent:
                     famille=famille if famille else "Non spécifiée"
                 )
                 print(user_prompt)
+            elif evidence_digest is not None:
+                logger.info("Régénération incrémentale (delta) avec feedback")
+                
+                # Cas d'usage proposés et non validés + rejetés explicitement
+                validated_ids = {uc.get("id", "") for uc in self._safe_serialize(validated_use_cases or [])}
+                not_retained = []
+                for uc in self._safe_serialize(list(previous_use_cases) + list(rejected_use_cases or [])):
+                    if uc.get("id", "") not in validated_ids and uc not in not_retained:
+                        not_retained.append(uc)
+                
+                user_prompt = USE_CASE_DELTA_REGENERATION_PROMPT.format(
+                    validated_use_cases=format_items(self._safe_serialize(validated_use_cases or [])),
+                    rejected_use_cases=format_items(not_retained, description_keys=("description",)),
+                    user_feedback=user_feedback if user_feedback else "Aucun commentaire spécifique",
+                    validated_needs=format_items(validated_needs_safe, description_keys=("description",)),
+                    additional_context=additional_context if additional_context else "Aucune information supplémentaire fournie.",
+                    famille=famille if famille else "Non spécifiée",
+                    evidence_digest=evidence_digest,
+                    num_use_cases=num_use_cases or len(not_retained) or 5
+                )
             else:
                 logger.info(f"Régénération avec feedback")
                 
@@ -219,17 +264,9 @@ class UseCaseAnalysisAgent:
                 rejected_count = len(rejected_use_cases or [])
                 logger.info(f"Cas d'usage rejetés : {rejected_count}")
                 
-                previous_use_cases_str = json.dumps(
-                    self._safe_serialize(previous_use_cases), 
-                    ensure_ascii=False, 
-                    indent=2
-                )
+                previous_use_cases_str = compact_dumps(self._safe_serialize(previous_use_cases))
                 
-                rejected_use_cases_str = json.dumps(
-                    self._safe_serialize(rejected_use_cases or []),
-                    ensure_ascii=False,
-                    indent=2
-                )
+                rejected_use_cases_str = compact_dumps(self._safe_serialize(rejected_use_cases or []))
                 
                 user_prompt = USE_CASE_REGENERATION_PROMPT.format(
                     previous_use_cases=previous_use_cases_str,
@@ -248,7 +285,7 @@ class UseCaseAnalysisAgent:
             
             # Appel à l'API OpenAI Responses avec structured output
             # Utilisation du paramètre 'instructions' pour le system prompt
-            response = self.client.responses.parse(
+            request = dict(
                 model=self.model,
                 instructions=USE_CASE_ANALYSIS_SYSTEM_PROMPT,
                 input=[
@@ -259,6 +296,16 @@ class UseCaseAnalysisAgent:
                 ],
                 text_format=UseCaseAnalysisResponse
             )
+            if is_streaming_enabled():
+                # Streaming : chaque cas d'usage est publié sur le flux du run dès que son objet JSON est complet
+                response = parse_with_item_stream(
+                    self.client,
+                    "use_cases",
+                    lambda index, item: report_partial_item("use_case", index, item),
+                    **request
+                )
+            else:
+                response = self.client.responses.parse(**request)
             
             logger.info("Réponse structurée reçue de l'API")
             
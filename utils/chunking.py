@@ -0,0 +1,143 @@
+"""
+Découpage en fenêtres glissantes et map-reduce des transcripts longs.
+
+Plusieurs agents envoient un transcript entier dans un seul prompt ; sur un
+entretien de deux heures, l'appel dépasse la fenêtre de contexte ou devient
+très lent. Les interventions sont ici découpées en fenêtres bornées en tokens
+qui se chevauchent légèrement (une idée à cheval sur deux fenêtres reste
+visible en entier dans l'une d'elles). Chaque fenêtre est traitée en
+parallèle (map), puis les résultats sont fusionnés (reduce). Une fenêtre
+connaît la position de ses interventions dans le transcript complet, pour
+ramener les indices locaux aux indices globaux.
+"""
+
+import os
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from utils.concurrency_governor import FanOutExecutor
+from utils.prompt_packing import estimate_tokens
+
+# Taille maximale (estimée) des interventions d'une fenêtre, et chevauchement entre fenêtres
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "12000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "500"))
+# Fenêtres d'un même document traitées en parallèle
+CHUNK_MAX_PARALLEL = int(os.getenv("CHUNK_MAX_PARALLEL", "8"))
+
+# Préfixe ajouté par intervention dans les prompts ([index], métadonnées, speaker)
+_INTERVENTION_OVERHEAD_TOKENS = 12
+
+
+def intervention_tokens(intervention: Dict[str, Any]) -> int:
+    """Estimation des tokens d'une intervention une fois formatée dans un prompt"""
+    text = intervention.get("text") or ""
+    speaker = intervention.get("speaker") or ""
+    return estimate_tokens(speaker + text) + _INTERVENTION_OVERHEAD_TOKENS
+
+
+class Window:
+    """Fenêtre d'interventions [start, end) du transcript complet"""
+
+    def __init__(self, index: int, start: int, end: int, items: List[Any]):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.items = items
+
+    def to_global(self, local_index: int) -> int:
+        """Indice local (dans la fenêtre) -> indice dans le transcript complet"""
+        return self.start + local_index
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self):
+        return f"<Window(index={self.index}, start={self.start}, end={self.end})>"
+
+
+def split_windows(
+    items: List[Any],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+    measure: Callable[[Any], int] = intervention_tokens
+) -> List[Window]:
+    """
+    Découpe une liste d'interventions en fenêtres contiguës bornées en tokens.
+
+    Une fenêtre contient au moins une intervention (une intervention plus
+    longue que `max_tokens` forme sa propre fenêtre). Chaque fenêtre reprend
+    les dernières interventions de la précédente, jusqu'à `overlap_tokens`.
+    """
+    costs = [measure(item) for item in items]
+    windows: List[Window] = []
+    start = 0
+    while start < len(items):
+        end = start
+        total = 0
+        while end < len(items) and (end == start or total + costs[end] <= max_tokens):
+            total += costs[end]
+            end += 1
+        windows.append(Window(len(windows), start, end, items[start:end]))
+        if end >= len(items):
+            break
+
+        # Chevauchement : la fenêtre suivante reprend la fin de celle-ci (en avançant toujours)
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + costs[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            overlap += costs[next_start]
+        start = next_start
+    return windows
+
+
+def map_reduce(
+    items: List[Any],
+    map_fn: Callable[[Window], Any],
+    reduce_fn: Callable[[List[Any]], Any],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+    measure: Callable[[Any], int] = intervention_tokens
+) -> Any:
+    """
+    Applique `map_fn` à chaque fenêtre (en parallèle s'il y en a plusieurs)
+    puis fusionne les résultats, dans l'ordre des fenêtres, avec `reduce_fn`.
+
+    Un transcript qui tient dans une fenêtre donne exactement un appel.
+    """
+    windows = split_windows(items, max_tokens=max_tokens, overlap_tokens=overlap_tokens, measure=measure)
+    if len(windows) <= 1:
+        return reduce_fn([map_fn(window) for window in windows])
+
+    with FanOutExecutor(max_workers=min(len(windows), CHUNK_MAX_PARALLEL)) as executor:
+        results = list(executor.map(map_fn, windows))
+    return reduce_fn(results)
+
+
+# ============================================================================
+# Fonctions de reduce courantes
+# ============================================================================
+
+def merge_indices(results: Iterable[Iterable[int]]) -> List[int]:
+    """Union triée des indices globaux retournés par chaque fenêtre"""
+    return sorted({index for indices in results for index in indices})
+
+
+def merge_unique(
+    results: Iterable[Iterable[Any]],
+    key: Callable[[Any], Optional[Hashable]]
+) -> List[Any]:
+    """
+    Concatène les listes des fenêtres en supprimant les doublons dus au
+    chevauchement (premier élément gardé pour une même clé ; clé None = toujours gardé).
+    """
+    seen = set()
+    merged = []
+    for items in results:
+        for item in items:
+            item_key = key(item)
+            if item_key is not None:
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+            merged.append(item)
+    return merged
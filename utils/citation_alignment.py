@@ -0,0 +1,118 @@
+"""
+Alignement local des citations référencées par identifiant d'intervention.
+
+Les extractions de citations (enjeux, maturité, atouts, points de friction)
+demandaient au modèle de recopier chaque citation mot pour mot : ces tokens de
+sortie dominent la latence de génération, et le modèle produit parfois des
+variantes de la citation (reformulée, tronquée) qui ne se retrouvent plus dans
+le transcript. En mode identifiant, le prompt numérote les interventions
+(`[i]`) et le modèle ne retourne que l'indice de l'intervention, avec
+éventuellement une plage de caractères. La citation exacte est reconstituée
+ici à partir du texte de l'intervention, avec ses métadonnées (speaker,
+niveau, type, timestamp, id stable en base).
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Mode identifiant pour les extractions de citations (0 = citations recopiées par le modèle, comme avant)
+CITATION_ID_MODE = os.getenv("CITATION_ID_MODE", "0") == "1"
+
+# Une plage plus courte est considérée comme une erreur du modèle (intervention entière retournée)
+_MIN_SPAN_CHARS = 20
+
+
+def is_citation_id_mode_enabled() -> bool:
+    """Mode identifiant activé pour les extractions de citations"""
+    return CITATION_ID_MODE
+
+
+def number_interventions(formatted: List[str]) -> List[str]:
+    """Préfixe chaque intervention formatée par son indice `[i]` (référencé par le modèle)"""
+    return [f"[{index}] {line}" for index, line in enumerate(formatted)]
+
+
+def _snap_span(text: str, start: Optional[int], end: Optional[int]) -> str:
+    """
+    Extrait la plage [start, end) du texte, élargie aux limites de mots.
+    Sans plage, ou si elle est invalide / trop courte, retourne l'intervention entière.
+    """
+    if start is None and end is None:
+        return text.strip()
+
+    start = 0 if start is None else max(start, 0)
+    end = len(text) if end is None else min(end, len(text))
+    if end - start < _MIN_SPAN_CHARS:
+        return text.strip()
+
+    # Ne pas couper un mot : reculer le début / avancer la fin jusqu'à un espace
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return text[start:end].strip()
+
+
+def align_reference(
+    interventions: List[Dict[str, Any]],
+    intervention_index: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Reconstitue une citation depuis une référence retournée par le modèle.
+
+    Args:
+        interventions: Interventions présentées au modèle (dans l'ordre des indices `[i]`)
+        intervention_index: Indice `[i]` de l'intervention citée
+        start: Début optionnel de la plage de caractères dans le texte de l'intervention
+        end: Fin optionnelle (exclue) de la plage
+
+    Returns:
+        Dict avec citation, speaker, speaker_type, speaker_level, timestamp, intervention_id
+        et intervention_index, ou None si l'indice n'existe pas
+    """
+    if not isinstance(intervention_index, int) or not 0 <= intervention_index < len(interventions):
+        logger.warning(f"⚠️ Référence d'intervention invalide ignorée: {intervention_index}")
+        return None
+
+    intervention = interventions[intervention_index]
+    citation = _snap_span(intervention.get("text") or "", start, end)
+    if not citation:
+        return None
+
+    return {
+        "citation": citation,
+        "speaker": intervention.get("speaker_name") or intervention.get("speaker") or "",
+        "speaker_type": intervention.get("speaker_type") or "",
+        "speaker_level": intervention.get("speaker_level") or "",
+        "timestamp": intervention.get("timestamp"),
+        "intervention_id": intervention.get("intervention_id"),
+        "intervention_index": intervention_index,
+    }
+
+
+def align_references(
+    references: List[Any],
+    interventions: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Reconstitue une liste de citations référencées (modèles Pydantic ou dicts avec
+    intervention_index / start / end). Les autres champs de la référence (type_info,
+    contexte...) sont conservés ; les références invalides sont ignorées.
+    """
+    aligned = []
+    for reference in references:
+        data = reference.model_dump() if hasattr(reference, "model_dump") else dict(reference)
+        expanded = align_reference(
+            interventions,
+            data.pop("intervention_index", None),
+            data.pop("start", None),
+            data.pop("end", None)
+        )
+        if expanded is not None:
+            aligned.append({**data, **expanded})
+    return aligned
@@ -0,0 +1,198 @@
+"""
+Gouverneur de concurrence des appels LLM, commun à tout le processus.
+
+Les fan-outs sont imbriqués (branches parallèles du graphe, pools de threads
+par document, plusieurs requêtes API simultanées) : sans coordination, une
+minute chargée peut lancer des centaines d'appels OpenAI en même temps.
+
+Chaque appel de la passerelle LLM prend un créneau ici. Le nombre de créneaux
+s'adapte en AIMD :
+- augmentation additive (+1 par "fenêtre" d'appels réussis),
+- diminution multiplicative sur 429 / surcharge, et plus douce quand la
+  latence dérive nettement au-dessus de sa moyenne.
+
+Les créneaux libérés vont d'abord aux appels interactifs (requête API
+synchrone, relance après validation), puis aux traitements en arrière-plan.
+"""
+
+import os
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict
+
+# Bornes et limite initiale du nombre d'appels LLM simultanés
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "2"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "64"))
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "16"))
+# Facteur de diminution sur 429 / surcharge, et sur dérive de latence
+LLM_CONCURRENCY_BACKOFF = float(os.getenv("LLM_CONCURRENCY_BACKOFF", "0.5"))
+LLM_CONCURRENCY_LATENCY_BACKOFF = float(os.getenv("LLM_CONCURRENCY_LATENCY_BACKOFF", "0.9"))
+# Latence jugée anormale au-delà de N fois la moyenne glissante
+LLM_CONCURRENCY_LATENCY_FACTOR = float(os.getenv("LLM_CONCURRENCY_LATENCY_FACTOR", "3"))
+# Délai minimal entre deux diminutions (une rafale de 429 ne compte qu'une fois)
+LLM_CONCURRENCY_DECREASE_COOLDOWN = float(os.getenv("LLM_CONCURRENCY_DECREASE_COOLDOWN", "2"))
+
+# Priorités (plus petit = servi en premier)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+# Priorité des appels LLM du contexte courant (propagée aux threads de FanOutExecutor)
+_current_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Définit la priorité des appels LLM lancés dans ce contexte"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+class ConcurrencyGovernor:
+    """Sémaphore à priorités dont la limite s'ajuste en AIMD"""
+
+    def __init__(
+        self,
+        initial: int = LLM_CONCURRENCY_INITIAL,
+        minimum: int = LLM_CONCURRENCY_MIN,
+        maximum: int = LLM_CONCURRENCY_MAX
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self._waiters: list = []  # heap de (priorité, ordre d'arrivée, événement)
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._latency_avg = None
+        self._last_decrease = 0.0
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "overloads": 0, "latency_decreases": 0}
+
+    def _grant_waiters(self) -> None:
+        """Réveille les premiers en file tant qu'il reste des créneaux (verrou tenu)"""
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, event = heapq.heappop(self._waiters)
+            self.in_flight += 1
+            event.set()
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """
+        Attend un créneau d'appel.
+
+        Returns:
+            Temps d'attente en secondes
+        """
+        with self._lock:
+            self.stats["acquired"] += 1
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return 0.0
+            event = threading.Event()
+            heapq.heappush(self._waiters, (priority, next(self._order), event))
+
+        start = time.monotonic()
+        event.wait()
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats["waited_seconds"] += waited
+        return waited
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._grant_waiters()
+
+    @contextmanager
+    def slot(self, priority: int = None):
+        """Créneau d'appel pour la durée du bloc"""
+        self.acquire(current_priority() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _decrease(self, factor: float) -> bool:
+        now = time.monotonic()
+        if now - self._last_decrease < LLM_CONCURRENCY_DECREASE_COOLDOWN:
+            return False
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * factor)
+        return True
+
+    def on_success(self, latency: float) -> None:
+        """Appel réussi : augmentation additive, ou diminution si la latence dérive"""
+        with self._lock:
+            if self._latency_avg is not None and latency > LLM_CONCURRENCY_LATENCY_FACTOR * self._latency_avg:
+                if self._decrease(LLM_CONCURRENCY_LATENCY_BACKOFF):
+                    self.stats["latency_decreases"] += 1
+            else:
+                # +1 créneau après `limit` succès
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+                self._grant_waiters()
+            self._latency_avg = latency if self._latency_avg is None else 0.9 * self._latency_avg + 0.1 * latency
+
+    def on_overload(self) -> None:
+        """429 ou surcharge du fournisseur : diminution multiplicative"""
+        with self._lock:
+            if self._decrease(LLM_CONCURRENCY_BACKOFF):
+                self.stats["overloads"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waiting = {name: 0 for name in _PRIORITY_NAMES.values()}
+            for priority, _, _ in self._waiters:
+                name = _PRIORITY_NAMES.get(priority, str(priority))
+                waiting[name] = waiting.get(name, 0) + 1
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": waiting,
+                "latency_avg_seconds": round(self._latency_avg, 3) if self._latency_avg is not None else None,
+                **self.stats,
+                "waited_seconds": round(self.stats["waited_seconds"], 3),
+            }
+
+
+llm_governor = ConcurrencyGovernor()
+
+
+class FanOutExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor pour les fan-outs d'appels LLM.
+
+    Les tâches s'exécutent dans une copie du contexte de l'appelant : la
+    priorité et le recorder de progression du run suivent les threads. Le
+    nombre de workers est plafonné au maximum du gouverneur, qui régule
+    ensuite les appels réellement simultanés.
+    """
+
+    def __init__(self, max_workers: int = None, thread_name_prefix: str = "llm-fan-out"):
+        max_workers = max(1, min(max_workers or LLM_CONCURRENCY_MAX, LLM_CONCURRENCY_MAX))
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+def _reset_after_fork() -> None:
+    global llm_governor
+    llm_governor = ConcurrencyGovernor()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,142 @@
+"""
+Cache des réponses LLM adressé par contenu (opt-in).
+
+Relancer un workflow sur le même projet renvoie des prompts identiques octet
+pour octet (filtrage des transcripts inchangés, consolidation par atelier...).
+La clé de cache est le SHA-256 du modèle, des instructions, de l'entrée, des
+autres paramètres de l'appel et du hash du schéma de sortie structurée. Les
+réponses sont stockées dans PostgreSQL (table `llm_response_cache`), avec TTL
+et éviction LRU bornée en taille ; les résultats de `responses.parse` sont
+reconstruits dans leur modèle Pydantic.
+
+Le cache ne doit jamais faire échouer un appel : toute erreur de lecture ou
+d'écriture est journalisée et l'appel part vers l'API.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from openai.types.responses import ParsedResponse, Response
+
+from database.db import get_db_context
+from database.repository import LLMResponseCacheRepository
+
+logger = logging.getLogger(__name__)
+
+# Cache désactivé par défaut
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "0") == "1"
+# Agents dont les réponses sont mises en cache ("*" = tous) et agents exclus
+LLM_CACHE_AGENTS = {a.strip() for a in os.getenv("LLM_CACHE_AGENTS", "*").split(",") if a.strip()}
+LLM_CACHE_DISABLED_AGENTS = {a.strip() for a in os.getenv("LLM_CACHE_DISABLED_AGENTS", "web_search").split(",") if a.strip()}
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "512"))
+# Éviction (expirés + LRU) toutes les N écritures
+LLM_CACHE_EVICT_EVERY = int(os.getenv("LLM_CACHE_EVICT_EVERY", "100"))
+
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def is_cache_enabled(agent: Optional[str]) -> bool:
+    """Indique si les réponses de cet agent passent par le cache"""
+    if not LLM_CACHE_ENABLED or not agent or agent in LLM_CACHE_DISABLED_AGENTS:
+        return False
+    return "*" in LLM_CACHE_AGENTS or agent in LLM_CACHE_AGENTS
+
+
+def _schema_hash(text_format: Any) -> str:
+    schema = text_format.model_json_schema() if hasattr(text_format, "model_json_schema") else repr(text_format)
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(method: str, kwargs: Dict[str, Any]) -> str:
+    """SHA-256 de l'appel : modèle, instructions, entrée, paramètres et schéma de sortie"""
+    payload = {key: value for key, value in kwargs.items() if key != "text_format"}
+    if "text_format" in kwargs:
+        payload["text_format"] = {
+            "name": getattr(kwargs["text_format"], "__name__", None),
+            "schema": _schema_hash(kwargs["text_format"]),
+        }
+    payload["method"] = method
+    serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _without_usage(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Une réponse servie depuis le cache ne consomme aucun token"""
+    usage = data.get("usage")
+    if usage:
+        data = {**data, "usage": {
+            **usage,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "input_tokens_details": {**(usage.get("input_tokens_details") or {}), "cached_tokens": 0},
+            "output_tokens_details": {**(usage.get("output_tokens_details") or {}), "reasoning_tokens": 0},
+        }}
+    return data
+
+
+def get_cached_response(cache_key: str, method: str, text_format: Any = None) -> Optional[Any]:
+    """
+    Récupère une réponse en cache.
+
+    Returns:
+        Un `Response` (create) ou `ParsedResponse[text_format]` (parse), ou None
+    """
+    try:
+        with get_db_context() as db:
+            data = LLMResponseCacheRepository.get(db, cache_key)
+        if data is None:
+            return None
+        data = _without_usage(data)
+        if method == "parse" and text_format is not None:
+            return ParsedResponse[text_format].model_validate(data)
+        return Response.model_validate(data)
+    except Exception as e:
+        logger.warning(f"⚠️ [LLM cache] Lecture impossible ({cache_key[:12]}): {e}")
+        return None
+
+
+def store_response(cache_key: str, agent: str, model: str, method: str, response: Any) -> None:
+    """Enregistre une réponse, et déclenche périodiquement l'éviction"""
+    global _writes
+    try:
+        data = response.model_dump(mode="json")
+        size_bytes = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        with get_db_context() as db:
+            LLMResponseCacheRepository.put(
+                db, cache_key, agent, model, method, data, size_bytes, ttl_hours=LLM_CACHE_TTL_HOURS
+            )
+        with _writes_lock:
+            _writes += 1
+            evict = _writes % LLM_CACHE_EVICT_EVERY == 0
+        if evict:
+            evict_cache()
+    except Exception as e:
+        logger.warning(f"⚠️ [LLM cache] Écriture impossible ({cache_key[:12]}): {e}")
+
+
+def evict_cache() -> int:
+    """Supprime les réponses expirées puis les moins récemment utilisées au-delà de LLM_CACHE_MAX_MB"""
+    with get_db_context() as db:
+        deleted = LLMResponseCacheRepository.delete_expired(db)
+        deleted += LLMResponseCacheRepository.evict_lru(db, int(LLM_CACHE_MAX_MB * 1024 * 1024))
+    if deleted:
+        logger.info(f"🧹 [LLM cache] {deleted} réponse(s) évincée(s)")
+    return deleted
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Taille et usage du cache"""
+    if not LLM_CACHE_ENABLED:
+        return {"enabled": False}
+    try:
+        with get_db_context() as db:
+            return {"enabled": True, **LLMResponseCacheRepository.get_stats(db)}
+    except Exception as e:
+        return {"enabled": True, "error": str(e)}
@@ -0,0 +1,388 @@
+"""
+Passerelle LLM partagée par tous les agents.
+
+Un seul client OpenAI (et donc un seul pool de connexions HTTP) par clé API et
+par processus. Chaque appel `responses.create` / `responses.parse` :
+- attend de la place dans le token bucket du modèle (requêtes et tokens par minute),
+- prend un créneau du gouverneur de concurrence (`utils/concurrency_governor.py`),
+- est relancé sur 429 / 5xx / erreur réseau avec un backoff exponentiel à jitter
+  (en respectant l'en-tête Retry-After),
+- est mesuré (latence, tokens, erreurs) pour `get_llm_stats()`.
+
+Si le cache est activé pour l'agent appelant (`utils/llm_cache.py`), une
+réponse déjà obtenue pour le même appel est servie sans passer par l'API.
+
+`responses.stream_parse` suit le même chemin en streaming : le texte JSON est
+relayé au fil de la génération (voir `utils/structured_stream.py`).
+
+Les rafales de fan-out sont ainsi mises en file d'attente au lieu d'échouer.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from openai import OpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from utils import concurrency_governor
+from utils.llm_cache import get_cached_response, get_cache_stats, is_cache_enabled, make_cache_key, store_response
+from utils.progress_events import report_token_usage
+from utils.prompt_packing import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Pool HTTP partagé
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "600"))
+# Retries (429, 5xx, erreurs réseau)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+# Limites par modèle, ex: {"gpt-5-nano": {"rpm": 500, "tpm": 2000000}} (0 ou absent = illimité)
+LLM_MODEL_LIMITS: Dict[str, Dict[str, int]] = json.loads(os.getenv("LLM_MODEL_LIMITS", "{}"))
+LLM_DEFAULT_RPM = int(os.getenv("LLM_DEFAULT_RPM", "0"))
+LLM_DEFAULT_TPM = int(os.getenv("LLM_DEFAULT_TPM", "0"))
+
+
+class TokenBucket:
+    """Token bucket thread-safe rechargé en continu (capacité = limite par minute)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float) -> float:
+        """
+        Attend que `amount` soit disponible puis le consomme.
+
+        Returns:
+            Temps d'attente en secondes
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """Corrige la consommation après coup (peut créer une dette)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class _ModelLimiter:
+    """Limites requêtes/minute et tokens/minute d'un modèle"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+
+    def acquire(self, estimated_tokens: int) -> float:
+        waited = 0.0
+        if self.requests:
+            waited += self.requests.acquire(1)
+        if self.tokens:
+            waited += self.tokens.acquire(estimated_tokens)
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        if self.tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+class _LLMMetrics:
+    """Compteurs par modèle : appels, erreurs, retries, attente, latence, tokens"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_model: Dict[str, Dict[str, float]] = {}
+
+    def _model(self, model: str) -> Dict[str, float]:
+        return self._by_model.setdefault(model, {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "cache_hits": 0,
+            "throttled_seconds": 0.0,
+            "latency_total_seconds": 0.0,
+            "latency_max_seconds": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+        })
+
+    def record_call(self, model: str, latency: float, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            stats = self._model(model)
+            stats["calls"] += 1
+            stats["latency_total_seconds"] += latency
+            stats["latency_max_seconds"] = max(stats["latency_max_seconds"], latency)
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+
+    def record(self, model: str, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._model(model)[key] += value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for model, stats in self._by_model.items():
+                result[model] = {
+                    **stats,
+                    "latency_avg_seconds": round(stats["latency_total_seconds"] / stats["calls"], 3) if stats["calls"] else 0.0,
+                }
+            return result
+
+
+llm_metrics = _LLMMetrics()
+
+
+def _usage_tokens(response: Any) -> tuple:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    return getattr(usage, "input_tokens", 0) or 0, getattr(usage, "output_tokens", 0) or 0
+
+
+def _estimate_call_tokens(kwargs: Dict[str, Any]) -> int:
+    """
+    Estimation grossière des tokens d'un appel (entrée + sortie maximale), utilisée pour
+    réserver des tokens avant l'appel (corrigée avec l'usage réel)
+    """
+    text = str(kwargs.get("instructions") or "") + str(kwargs.get("input") or "")
+    return estimate_tokens(text) + int(kwargs.get("max_output_tokens") or 0)
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Délai avant le prochain essai : Retry-After si fourni, sinon backoff exponentiel à jitter"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = response.headers
+        if headers.get("retry-after-ms"):
+            try:
+                return float(headers["retry-after-ms"]) / 1000
+            except ValueError:
+                pass
+        if headers.get("retry-after"):
+            try:
+                return float(headers["retry-after"])
+            except ValueError:
+                pass
+    backoff = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(backoff / 2, backoff)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _is_overload(error: Exception) -> bool:
+    """Erreurs signalant que le fournisseur est saturé (le gouverneur réduit la concurrence)"""
+    if isinstance(error, RateLimitError):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in (503, 529)
+
+
+class _Responses:
+    """Sous-ensemble de `client.responses` routé par la passerelle"""
+
+    def __init__(self, gateway: "LLMGateway", agent: Optional[str] = None):
+        self._gateway = gateway
+        self._agent = agent
+
+    def create(self, **kwargs: Any) -> Any:
+        return self._gateway.call("create", agent=self._agent, **kwargs)
+
+    def parse(self, **kwargs: Any) -> Any:
+        return self._gateway.call("parse", agent=self._agent, **kwargs)
+
+    def stream_parse(self, on_text_delta: Callable[[str], None], **kwargs: Any) -> Any:
+        """Comme `parse`, en streaming : `on_text_delta` reçoit le texte JSON au fil de la génération"""
+        return self._gateway.call("parse", agent=self._agent, on_text_delta=on_text_delta, **kwargs)
+
+
+class LLMClient:
+    """Client d'un agent : passerelle partagée + nom de l'agent (activation du cache)"""
+
+    def __init__(self, gateway: "LLMGateway", agent: Optional[str] = None):
+        self.gateway = gateway
+        self.agent = agent
+        self.responses = _Responses(gateway, agent)
+
+
+class LLMGateway:
+    """Client OpenAI partagé avec throttling, retries et métriques"""
+
+    def __init__(self, api_key: Optional[str]):
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=LLM_TIMEOUT_SECONDS,
+        )
+        # Les retries sont gérés ici (backoff à jitter + métriques), pas par le SDK
+        self.client = OpenAI(api_key=api_key, http_client=self._http_client, max_retries=0)
+        self.responses = _Responses(self)
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limits = LLM_MODEL_LIMITS.get(model, {})
+                limiter = _ModelLimiter(
+                    rpm=int(limits.get("rpm", LLM_DEFAULT_RPM)),
+                    tpm=int(limits.get("tpm", LLM_DEFAULT_TPM)),
+                )
+                self._limiters[model] = limiter
+            return limiter
+
+    def _stream_parse(self, on_text_delta: Callable[[str], None], streamed: Dict[str, bool], **kwargs: Any) -> Any:
+        """`client.responses.stream` : relaie les deltas de texte puis retourne la réponse parsée finale"""
+        with self.client.responses.stream(**kwargs) as stream:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    streamed["started"] = True
+                    on_text_delta(event.delta)
+            return stream.get_final_response()
+
+    def call(
+        self,
+        method: str,
+        agent: Optional[str] = None,
+        on_text_delta: Optional[Callable[[str], None]] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Appelle `client.responses.<method>` avec cache, throttling et retries.
+
+        Avec `on_text_delta` (méthode parse uniquement), l'appel est streamé ; une
+        erreur après le premier delta n'est pas réessayée (le texte a déjà été relayé).
+        Une réponse servie par le cache n'émet aucun delta.
+        """
+        model = kwargs.get("model") or "unknown"
+
+        cache_key = None
+        if is_cache_enabled(agent):
+            cache_key = make_cache_key(method, kwargs)
+            cached = get_cached_response(cache_key, method, kwargs.get("text_format"))
+            if cached is not None:
+                llm_metrics.record(model, "cache_hits")
+                logger.info(f"💾 [LLM] {agent} - réponse servie depuis le cache ({cache_key[:12]})")
+                return cached
+
+        limiter = self._limiter(model)
+        estimated = _estimate_call_tokens(kwargs)
+
+        attempt = 0
+        streamed = {"started": False}
+        while True:
+            waited = limiter.acquire(estimated)
+            if waited:
+                llm_metrics.record(model, "throttled_seconds", waited)
+
+            # Créneau d'appel du gouverneur de concurrence (priorité du contexte courant)
+            governor = concurrency_governor.llm_governor
+            try:
+                with governor.slot():
+                    start = time.perf_counter()
+                    if on_text_delta is not None:
+                        response = self._stream_parse(on_text_delta, streamed, **kwargs)
+                    else:
+                        response = getattr(self.client.responses, method)(**kwargs)
+            except Exception as e:
+                if _is_overload(e):
+                    governor.on_overload()
+                # Les tokens réservés n'ont pas été consommés
+                limiter.settle(estimated, 0)
+                if not _is_retryable(e) or attempt >= LLM_MAX_RETRIES or streamed["started"]:
+                    llm_metrics.record(model, "errors")
+                    raise
+                delay = _retry_delay(e, attempt)
+                attempt += 1
+                llm_metrics.record(model, "retries")
+                logger.warning(
+                    f"⚠️ [LLM] {model} {type(e).__name__} - nouvel essai {attempt}/{LLM_MAX_RETRIES} dans {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            latency = time.perf_counter() - start
+            governor.on_success(latency)
+            input_tokens, output_tokens = _usage_tokens(response)
+            limiter.settle(estimated, input_tokens + output_tokens)
+            llm_metrics.record_call(model, latency, input_tokens, output_tokens)
+            report_token_usage(input_tokens, output_tokens)
+            if cache_key is not None:
+                store_response(cache_key, agent, model, method, response)
+            return response
+
+    def close(self) -> None:
+        self._http_client.close()
+
+
+_gateways: Dict[Optional[str], LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_llm_client(api_key: Optional[str] = None, agent: Optional[str] = None) -> LLMClient:
+    """
+    Retourne un client adossé à la passerelle LLM du processus pour cette clé
+    API (OPENAI_API_KEY par défaut).
+
+    Args:
+        agent: Nom de l'agent appelant (activation du cache par agent)
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            gateway = LLMGateway(api_key)
+            _gateways[api_key] = gateway
+    return LLMClient(gateway, agent)
+
+
+def get_llm_stats() -> Dict[str, Any]:
+    """Métriques des appels LLM du processus, par modèle"""
+    return {
+        "models": llm_metrics.snapshot(),
+        "concurrency": concurrency_governor.llm_governor.get_stats(),
+        "cache": get_cache_stats(),
+    }
+
+
+def _reset_after_fork() -> None:
+    """Un processus forké ne doit pas réutiliser les connexions HTTP du parent"""
+    global _gateways, _gateways_lock, llm_metrics
+    _gateways = {}
+    _gateways_lock = threading.Lock()
+    llm_metrics = _LLMMetrics()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
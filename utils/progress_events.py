@@ -0,0 +1,162 @@
+"""
+Événements de progression des workflows LangGraph.
+
+Un `ProgressRecorder` est un callback LangChain injecté dans toutes les
+exécutions de graphe du contexte courant (voir `progress_recording`). Il émet
+des événements début/fin de nœud avec durée et tokens consommés ; la
+destination des événements (base, logs...) est fournie par l'appelant.
+
+Le même contexte porte la demande d'annulation du run (voir `run_cancellation`) :
+les workflows la consultent entre deux nœuds et s'arrêtent proprement.
+"""
+
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+logger = logging.getLogger(__name__)
+
+# Recorder actif dans le contexte courant (hérité par les nœuds du graphe)
+_current_recorder: ContextVar[Optional["ProgressRecorder"]] = ContextVar("progress_recorder", default=None)
+register_configure_hook(_current_recorder, inheritable=True)
+# Test d'annulation du run en cours (None hors d'un run soumis par l'API)
+_current_cancel_check: ContextVar[Optional[Callable[[], bool]]] = ContextVar("run_cancel_check", default=None)
+
+
+class ProgressRecorder(BaseCallbackHandler):
+    """Publie les événements de progression d'un run de workflow"""
+
+    def __init__(self, publish: Callable[[str, Dict[str, Any]], None]):
+        """
+        Args:
+            publish: Fonction appelée avec (type d'événement, données)
+        """
+        self.publish = publish
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._nodes: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        """Publie un événement (une erreur de publication n'interrompt jamais le workflow)"""
+        try:
+            self.publish(event, data)
+        except Exception as e:
+            logger.warning(f"⚠️ Publication de l'événement {event} impossible: {e}")
+
+    def add_tokens(self, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.input_tokens += input_tokens or 0
+            self.output_tokens += output_tokens or 0
+
+    def tokens(self) -> Dict[str, int]:
+        with self._lock:
+            return {"input_tokens": self.input_tokens, "output_tokens": self.output_tokens}
+
+    # ------------------------------------------------------------------
+    # Callbacks LangChain
+    # ------------------------------------------------------------------
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id=None, tags=None, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+        # Ne garder que le runnable du nœud lui-même (pas ses sous-chaînes)
+        if not node or kwargs.get("name") != node:
+            return
+        tokens = self.tokens()
+        with self._lock:
+            self._nodes[run_id] = {
+                "node": node,
+                "step": metadata.get("langgraph_step"),
+                "start": time.perf_counter(),
+                "tokens": tokens,
+            }
+        self.emit("node_start", {"node": node, "step": metadata.get("langgraph_step")})
+
+    def _finish_node(self, run_id: UUID) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            info = self._nodes.pop(run_id, None)
+        if info is None:
+            return None
+        tokens = self.tokens()
+        return {
+            "node": info["node"],
+            "step": info["step"],
+            "duration_ms": round((time.perf_counter() - info["start"]) * 1000),
+            # Tokens consommés pendant le nœud (approximation si des nœuds tournent en parallèle)
+            "input_tokens": tokens["input_tokens"] - info["tokens"]["input_tokens"],
+            "output_tokens": tokens["output_tokens"] - info["tokens"]["output_tokens"],
+        }
+
+    def on_chain_end(self, outputs, *, run_id: UUID, parent_run_id=None, **kwargs) -> None:
+        data = self._finish_node(run_id)
+        if data is not None:
+            self.emit("node_end", data)
+
+    def on_chain_error(self, error, *, run_id: UUID, parent_run_id=None, **kwargs) -> None:
+        data = self._finish_node(run_id)
+        if data is None:
+            return
+        # Les interrupts LangGraph remontent comme des exceptions : ce ne sont pas des erreurs
+        if type(error).__name__ in ("GraphInterrupt", "NodeInterrupt"):
+            self.emit("node_end", {**data, "interrupted": True})
+        else:
+            self.emit("node_error", {**data, "error": str(error)})
+
+    def on_llm_end(self, response, *, run_id: UUID, parent_run_id=None, **kwargs) -> None:
+        # Modèles LangChain (ChatOpenAI) : usage dans llm_output
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self.add_tokens(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+
+@contextmanager
+def progress_recording(recorder: ProgressRecorder):
+    """Active le recorder pour toutes les exécutions de graphe du contexte courant"""
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def report_token_usage(input_tokens: int, output_tokens: int) -> None:
+    """Attribue des tokens consommés (client OpenAI direct) au run en cours, s'il y en a un"""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.add_tokens(input_tokens, output_tokens)
+
+
+def report_partial_item(kind: str, index: int, item: Dict[str, Any]) -> None:
+    """Publie un élément généré en streaming (besoin, cas d'usage...) sur le run en cours, s'il y en a un"""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.emit("partial_item", {"kind": kind, "index": index, "item": item})
+
+
+@contextmanager
+def run_cancellation(is_cancelled: Callable[[], bool]):
+    """Rend la demande d'annulation du run visible des workflows exécutés dans le contexte courant"""
+    token = _current_cancel_check.set(is_cancelled)
+    try:
+        yield
+    finally:
+        _current_cancel_check.reset(token)
+
+
+def is_run_cancelled() -> bool:
+    """Indique si l'annulation du run en cours a été demandée (False hors d'un run)"""
+    is_cancelled = _current_cancel_check.get()
+    if is_cancelled is None:
+        return False
+    try:
+        return is_cancelled()
+    except Exception as e:
+        logger.warning(f"⚠️ Lecture de la demande d'annulation impossible: {e}")
+        return False
@@ -0,0 +1,227 @@
+"""
+Sérialisation compacte et budget de tokens des données injectées dans les prompts.
+
+Les agents besoins / cas d'usage injectaient workshops, transcripts et recherche
+web via `json.dumps(..., indent=2)` : l'indentation, les valeurs vides et des
+métadonnées inutiles au LLM (chemin du PDF, statut) représentaient une part
+importante des tokens d'entrée. Ici :
+- `compact_dumps` produit un JSON minifié sans valeurs vides (les clés citées
+  par les prompts, ex: speaker_level, iteration_count, sont conservées) ;
+- `pack_evidence` estime les tokens localement et, au-delà du budget, retire
+  d'abord les éléments les moins prioritaires (citations d'un speaker de niveau
+  inconnu, catégories secondaires, cas d'usage d'atelier peu remontés).
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Budget (estimé) des données workshop + transcript + web search d'un prompt (0 = illimité)
+PROMPT_EVIDENCE_MAX_TOKENS = int(os.getenv("PROMPT_EVIDENCE_MAX_TOKENS", "60000"))
+
+# Approximation partagée (passerelle LLM, découpage en fenêtres, condensés de régénération)
+_CHARS_PER_TOKEN = 4
+
+# Métadonnées sans intérêt pour le LLM
+_DROPPED_KEYS = {"pdf_path", "status"}
+
+# Priorité des citations de transcript : niveau du speaker + catégorie
+# (partagée avec les condensés de régénération, cf. utils/regeneration.py)
+SPEAKER_LEVEL_WEIGHTS = {"direction": 3.0, "métier": 2.0}
+DEFAULT_SPEAKER_LEVEL_WEIGHT = 1.0
+DEFAULT_CATEGORY_WEIGHT = 0.5
+CATEGORY_WEIGHTS = {
+    "citations_cles": 1.0,
+    "besoins_exprimes": 1.0,
+    "frustrations_blocages": 0.8,
+    "opportunites_automatisation": 0.6,
+    "opportunites_amelioration": 0.4,
+    "attentes_implicites": 0.4,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation locale des tokens d'un texte"""
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def speaker_level_weight(level: Optional[str]) -> float:
+    """Poids d'une citation selon le niveau du speaker (direction > métier > inconnu)"""
+    return SPEAKER_LEVEL_WEIGHTS.get(level, DEFAULT_SPEAKER_LEVEL_WEIGHT)
+
+
+def category_weight(category: str) -> float:
+    """Poids d'une catégorie de l'analyse sémantique"""
+    return CATEGORY_WEIGHTS.get(category, DEFAULT_CATEGORY_WEIGHT)
+
+
+def workshop_use_case_priority(iteration_count: Optional[int]) -> float:
+    """Priorité d'un cas d'usage d'atelier selon le nombre de fois où il a été remonté"""
+    return 1.0 + min(iteration_count or 1, 5) / 2.5
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def compact(obj: Any) -> Any:
+    """Retire récursivement les valeurs vides et les métadonnées inutiles"""
+    if isinstance(obj, dict):
+        result = {}
+        for key, value in obj.items():
+            if key in _DROPPED_KEYS:
+                continue
+            value = compact(value)
+            if not _is_empty(value):
+                result[key] = value
+        return result
+    if isinstance(obj, list):
+        return [item for item in (compact(item) for item in obj) if not _is_empty(item)]
+    if isinstance(obj, str):
+        return obj.strip()
+    return obj
+
+
+def compact_dumps(obj: Any) -> str:
+    """JSON minifié (sans indentation ni espaces) des données nettoyées"""
+    return json.dumps(compact(obj), ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class PackedEvidence:
+    """Données sérialisées prêtes à injecter dans un prompt, avec le bilan des tokens"""
+
+    def __init__(
+        self,
+        workshop_str: str,
+        transcript_str: str,
+        web_search_str: str,
+        original_tokens: int,
+        packed_tokens: int,
+        dropped_items: int
+    ):
+        self.workshop_str = workshop_str
+        self.transcript_str = transcript_str
+        self.web_search_str = web_search_str
+        self.original_tokens = original_tokens
+        self.packed_tokens = packed_tokens
+        self.dropped_items = dropped_items
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(self.original_tokens - self.packed_tokens, 0)
+
+    def __repr__(self):
+        return (f"<PackedEvidence(original={self.original_tokens}, packed={self.packed_tokens}, "
+                f"dropped={self.dropped_items})>")
+
+
+def _collect_evidence(workshop_data: Any, transcript_data: Any) -> List[Tuple[float, int, list, int]]:
+    """
+    Liste les éléments retirables : (priorité, coût en tokens, liste parente, indice).
+
+    - Transcripts : chaque citation des catégories de `semantic_analysis`
+    - Workshops : chaque cas d'usage, pondéré par son iteration_count
+    """
+    evidence = []
+
+    transcripts = transcript_data if isinstance(transcript_data, list) else []
+    for transcript in transcripts:
+        analysis = transcript.get("semantic_analysis") if isinstance(transcript, dict) else None
+        if not isinstance(analysis, dict):
+            continue
+        for category, items in analysis.items():
+            if not isinstance(items, list):
+                continue
+            weight = category_weight(category)
+            for index, item in enumerate(items):
+                level = item.get("speaker_level") if isinstance(item, dict) else None
+                cost = estimate_tokens(compact_dumps(item))
+                evidence.append((speaker_level_weight(level) + weight, cost, items, index))
+
+    workshops = workshop_data.get("workshops") if isinstance(workshop_data, dict) else None
+    for workshop in workshops if isinstance(workshops, list) else []:
+        use_cases = workshop.get("use_cases") if isinstance(workshop, dict) else None
+        if not isinstance(use_cases, list):
+            continue
+        for index, use_case in enumerate(use_cases):
+            iteration_count = use_case.get("iteration_count") if isinstance(use_case, dict) else None
+            cost = estimate_tokens(compact_dumps(use_case))
+            evidence.append((workshop_use_case_priority(iteration_count), cost, use_cases, index))
+
+    return evidence
+
+
+def pack_evidence(
+    workshop_data: Any,
+    transcript_data: Any,
+    web_search_data: Any,
+    max_tokens: Optional[int] = None
+) -> PackedEvidence:
+    """
+    Sérialise les données workshop / transcript / web search en respectant un budget.
+
+    Les données sont nettoyées (`compact`) puis, si le total estimé dépasse le
+    budget, les citations et cas d'usage de plus faible priorité sont retirés
+    (l'ordre des éléments conservés est inchangé). La recherche web et la
+    structure des données ne sont jamais retirées.
+
+    Args:
+        workshop_data: Données des workshops (déjà sérialisables)
+        transcript_data: Données des transcripts (déjà sérialisables)
+        web_search_data: Données de recherche web (déjà sérialisables)
+        max_tokens: Budget en tokens (PROMPT_EVIDENCE_MAX_TOKENS par défaut, 0 = illimité)
+    """
+    budget = PROMPT_EVIDENCE_MAX_TOKENS if max_tokens is None else max_tokens
+
+    original_tokens = sum(
+        estimate_tokens(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+        for data in (workshop_data, transcript_data, web_search_data)
+    )
+
+    workshop = compact(workshop_data)
+    transcripts = compact(transcript_data)
+    web_search = compact(web_search_data)
+
+    def total_tokens() -> int:
+        return sum(estimate_tokens(compact_dumps(data)) for data in (workshop, transcripts, web_search))
+
+    dropped = 0
+    packed_tokens = total_tokens()
+    if budget and packed_tokens > budget:
+        evidence = _collect_evidence(workshop, transcripts)
+        evidence_cost = sum(cost for _, cost, _, _ in evidence)
+        fixed_cost = max(packed_tokens - evidence_cost, 0)
+
+        # Éléments les plus prioritaires d'abord (à priorité égale, les moins coûteux)
+        kept = set()
+        used = fixed_cost
+        for position, (priority, cost, _, _) in sorted(
+            enumerate(evidence), key=lambda entry: (-entry[1][0], entry[1][1])
+        ):
+            if used + cost <= budget:
+                kept.add(position)
+                used += cost
+
+        removed_by_list: Dict[int, Tuple[list, set]] = {}
+        for position, (_, _, parent, index) in enumerate(evidence):
+            if position not in kept:
+                removed_by_list.setdefault(id(parent), (parent, set()))[1].add(index)
+                dropped += 1
+        for parent, indices in removed_by_list.values():
+            parent[:] = [item for index, item in enumerate(parent) if index not in indices]
+
+        packed_tokens = total_tokens()
+        if packed_tokens > budget:
+            logger.warning(f"⚠️ Données du prompt au-delà du budget même après réduction : {packed_tokens:,} > {budget:,} tokens")
+
+    return PackedEvidence(
+        workshop_str=compact_dumps(workshop),
+        transcript_str=compact_dumps(transcripts),
+        web_search_str=compact_dumps(web_search),
+        original_tokens=original_tokens,
+        packed_tokens=packed_tokens,
+        dropped_items=dropped
+    )
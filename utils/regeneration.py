@@ -0,0 +1,224 @@
+"""
+Régénération incrémentale (delta) des boucles de validation humaine.
+
+À chaque rejet, les prompts de régénération renvoyaient l'intégralité des
+données sources (ateliers, transcripts, recherche web, citations) en plus des
+éléments validés / rejetés. En mode delta, un condensé des preuves est construit
+une seule fois par run (puis gardé dans l'état du workflow) : chaque itération
+n'envoie que ce condensé, les éléments rejetés, le feedback utilisateur et le
+nombre d'éléments à remplacer.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.prompt_packing import (
+    category_weight,
+    compact,
+    compact_dumps,
+    estimate_tokens,
+    speaker_level_weight,
+    workshop_use_case_priority,
+)
+
+# Mode delta pour les régénérations (0 = renvoyer toutes les données sources comme avant)
+DELTA_REGENERATION_ENABLED = os.getenv("DELTA_REGENERATION_ENABLED", "1") != "0"
+# Budget (estimé) du condensé des preuves
+REGENERATION_DIGEST_MAX_TOKENS = int(os.getenv("REGENERATION_DIGEST_MAX_TOKENS", "8000"))
+
+# Longueur max de la description d'un élément validé / rejeté (les lignes de preuves,
+# citables telles quelles par le LLM, ne sont jamais tronquées : le budget retire des lignes entières)
+_ITEM_DESCRIPTION_MAX_CHARS = 160
+# Priorité des informations de recherche web (jamais retirées avant les preuves, comme dans pack_evidence)
+_WEB_SEARCH_PRIORITY = 100.0
+
+# Libellés courts des catégories de l'analyse sémantique (poids : utils/prompt_packing.py)
+_CATEGORY_LABELS = {
+    "besoins_exprimes": "besoin",
+    "citations_cles": "citation",
+    "frustrations_blocages": "frustration",
+    "opportunites_automatisation": "automatisation",
+    "opportunites_amelioration": "amélioration",
+    "attentes_implicites": "attente",
+}
+
+# Une entrée du condensé : (priorité, ligne)
+DigestEntry = Tuple[float, str]
+
+
+def is_delta_regeneration_enabled() -> bool:
+    """Mode delta activé pour les régénérations"""
+    return DELTA_REGENERATION_ENABLED
+
+
+def _clean(text: Any) -> str:
+    """Texte sur une ligne (espaces normalisés)"""
+    return " ".join(str(text or "").split())
+
+
+def _truncate(text: Any, max_chars: int = _ITEM_DESCRIPTION_MAX_CHARS) -> str:
+    text = _clean(text)
+    return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+
+
+def _select(entries: Sequence[DigestEntry], max_tokens: int) -> List[int]:
+    """Indices des entrées gardées dans le budget (priorité décroissante, ordre d'origine conservé)"""
+    costs = [estimate_tokens(line) for _, line in entries]
+    if not max_tokens or sum(costs) <= max_tokens:
+        return list(range(len(entries)))
+
+    kept, used = [], 0
+    for index in sorted(range(len(entries)), key=lambda i: (-entries[i][0], costs[i])):
+        if used + costs[index] <= max_tokens:
+            kept.append(index)
+            used += costs[index]
+    return sorted(kept)
+
+
+# ============================================================================
+# Entrées du condensé par type de données
+# ============================================================================
+
+def workshop_entries(workshop_data: Any) -> List[DigestEntry]:
+    """Cas d'usage des ateliers, pondérés par iteration_count"""
+    entries = []
+    workshops = workshop_data.get("workshops") if isinstance(workshop_data, dict) else None
+    for workshop in workshops if isinstance(workshops, list) else []:
+        if not isinstance(workshop, dict):
+            continue
+        theme = workshop.get("theme", "")
+        for use_case in workshop.get("use_cases") or []:
+            if not isinstance(use_case, dict):
+                continue
+            iteration_count = use_case.get("iteration_count") or 1
+            line = f"[atelier {theme}] {use_case.get('title', '')} : {_clean(use_case.get('objective'))}"
+            if iteration_count > 1:
+                line += f" (remonté {iteration_count}x)"
+            entries.append((workshop_use_case_priority(iteration_count), line))
+    return entries
+
+
+def transcript_entries(transcript_data: Any) -> List[DigestEntry]:
+    """Éléments de l'analyse sémantique des entretiens, pondérés par niveau du speaker et catégorie"""
+    entries = []
+    for transcript in transcript_data if isinstance(transcript_data, list) else []:
+        analysis = transcript.get("semantic_analysis") if isinstance(transcript, dict) else None
+        if not isinstance(analysis, dict):
+            continue
+        for category, items in analysis.items():
+            if category not in _CATEGORY_LABELS or not isinstance(items, list):
+                continue
+            label, weight = _CATEGORY_LABELS[category], category_weight(category)
+            for item in items:
+                if isinstance(item, dict):
+                    level = item.get("speaker_level")
+                    line = f"[{label}|{level or 'inconnu'}] {_clean(item.get('text'))}"
+                    entries.append((speaker_level_weight(level) + weight, line))
+                elif item:
+                    entries.append((speaker_level_weight(None) + weight, f"[{label}] {_clean(item)}"))
+    return entries
+
+
+def web_search_entries(web_search_data: Any) -> List[DigestEntry]:
+    """Informations de la recherche web sur l'entreprise (une ligne par champ renseigné)"""
+    data = compact(web_search_data)
+    if isinstance(data, dict):
+        return [
+            (_WEB_SEARCH_PRIORITY, f"{key} : {_clean(value) if isinstance(value, str) else compact_dumps(value)}")
+            for key, value in data.items()
+        ]
+    return [(_WEB_SEARCH_PRIORITY, compact_dumps(data))] if data else []
+
+
+def citation_entries(citations: Optional[List[Dict[str, Any]]], text_key: str = "citation") -> List[DigestEntry]:
+    """Citations extraites (enjeux, atouts...), pondérées par niveau du speaker"""
+    entries = []
+    for citation in citations or []:
+        if not isinstance(citation, dict) or not citation.get(text_key):
+            continue
+        prefix = citation.get("type_atout") or citation.get("speaker") or ""
+        line = f"[{prefix}] {_clean(citation[text_key])}" if prefix else _clean(citation[text_key])
+        entries.append((speaker_level_weight(citation.get("speaker_level")), line))
+    return entries
+
+
+def build_digest(
+    sections: Sequence[Tuple[str, List[DigestEntry]]],
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Assemble un condensé texte borné en tokens.
+
+    Args:
+        sections: Liste de (titre de section, entrées) ; les entrées de plus faible
+            priorité sont retirées en premier, toutes sections confondues
+        max_tokens: Budget (REGENERATION_DIGEST_MAX_TOKENS par défaut, 0 = illimité)
+    """
+    budget = REGENERATION_DIGEST_MAX_TOKENS if max_tokens is None else max_tokens
+    flat = [(section_index, entry) for section_index, (_, entries) in enumerate(sections) for entry in entries]
+    kept = set(_select([entry for _, entry in flat], budget))
+
+    parts = []
+    for section_index, (title, _) in enumerate(sections):
+        lines = [f"- {entry[1]}" for position, (index, entry) in enumerate(flat)
+                 if index == section_index and position in kept]
+        if lines:
+            parts.append(f"{title} :\n" + "\n".join(lines))
+    return "\n\n".join(parts) if parts else "Aucune donnée source disponible."
+
+
+def build_evidence_digest(
+    workshop_data: Any = None,
+    transcript_data: Any = None,
+    web_search_data: Any = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """Condensé des ateliers, entretiens et de la recherche web (analyse des besoins et des cas d'usage)"""
+    return build_digest(
+        [
+            ("RECHERCHE WEB", web_search_entries(web_search_data)),
+            ("ATELIERS", workshop_entries(workshop_data)),
+            ("ENTRETIENS", transcript_entries(transcript_data)),
+        ],
+        max_tokens=max_tokens
+    )
+
+
+# ============================================================================
+# Éléments validés / rejetés
+# ============================================================================
+
+def format_items(
+    items: Optional[List[Dict[str, Any]]],
+    title_keys: Sequence[str] = ("titre", "theme", "title", "nom"),
+    description_keys: Sequence[str] = (),
+    empty: str = "Aucun"
+) -> str:
+    """Liste compacte « - titre : description courte » des éléments validés ou rejetés"""
+    lines = []
+    for item in items or []:
+        if not isinstance(item, dict):
+            lines.append(f"- {_truncate(item)}")
+            continue
+        title = next((item[key] for key in title_keys if item.get(key)), "")
+        description = next((item[key] for key in description_keys if item.get(key)), "")
+        line = f"- {title}"
+        if description:
+            line += f" : {_truncate(description)}"
+        lines.append(line)
+    return "\n".join(lines) if lines else empty
+
+
+def count_replacements(
+    previous_items: Optional[List[Dict[str, Any]]],
+    validated_items: Optional[List[Dict[str, Any]]],
+    key: Callable[[Dict[str, Any]], Any],
+    default: int
+) -> int:
+    """
+    Nombre d'éléments à remplacer : propositions précédentes non validées.
+    Retourne `default` si toutes ont été validées (l'utilisateur en demande d'autres).
+    """
+    validated_keys = {key(item) for item in validated_items or [] if isinstance(item, dict)}
+    remaining = sum(1 for item in previous_items or [] if isinstance(item, dict) and key(item) not in validated_keys)
+    return remaining or default
@@ -0,0 +1,141 @@
+"""
+Précalcul spéculatif pendant les interrupts de validation humaine.
+
+Les workflows restent inactifs à chaque interrupt pendant que le consultant
+relit les propositions. Un nœud peut profiter de ce temps pour lancer en
+arrière-plan le calcul de l'étape suivante, sous une hypothèse sur ce que
+l'utilisateur va valider (ex: aucun contexte additionnel). Le résultat est
+rangé sous l'empreinte des entrées supposées ; à la reprise, le nœud
+recalcule l'empreinte de ses entrées réelles et réutilise le résultat si
+l'hypothèse tient (sinon le calcul est refait normalement).
+
+Les résultats sont gardés en mémoire du processus (une reprise servie par un
+autre worker recalcule simplement l'étape). Les appels LLM spéculatifs
+passent en priorité « batch » face au gouverneur de concurrence et
+s'exécutent dans une copie du contexte de l'appelant (thread LangGraph
+pour le suivi des tokens, recorder du run).
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.concurrency_governor import PRIORITY_BATCH, llm_priority
+
+logger = logging.getLogger(__name__)
+
+# Précalcul spéculatif pendant les interrupts (0 = désactivé)
+SPECULATION_ENABLED = os.getenv("SPECULATION_ENABLED", "1") != "0"
+# Calculs spéculatifs simultanés par processus
+SPECULATION_MAX_WORKERS = int(os.getenv("SPECULATION_MAX_WORKERS", "2"))
+# Durée de conservation d'un résultat non réclamé
+SPECULATION_TTL_SECONDS = float(os.getenv("SPECULATION_TTL_SECONDS", "3600"))
+# Nombre maximal de résultats conservés (les plus anciens sont retirés)
+SPECULATION_MAX_ENTRIES = int(os.getenv("SPECULATION_MAX_ENTRIES", "64"))
+
+
+def fingerprint(namespace: str, inputs: Any) -> str:
+    """Empreinte des entrées d'un calcul (JSON trié, puis SHA-256)"""
+    serialized = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{namespace}:{serialized}".encode("utf-8")).hexdigest()
+
+
+class SpeculativeExecutor:
+    """Pool borné de calculs spéculatifs, indexés par empreinte de leurs entrées"""
+
+    def __init__(self, max_workers: int = SPECULATION_MAX_WORKERS):
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._entries: Dict[str, Tuple[float, Future]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "hits": 0, "misses": 0, "failed": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="speculation")
+        return self._executor
+
+    def _evict(self, now: float) -> None:
+        """Retire les résultats expirés puis les plus anciens au-delà de la limite (verrou tenu)"""
+        for key, (created_at, future) in list(self._entries.items()):
+            if future.done() and now - created_at > SPECULATION_TTL_SECONDS:
+                del self._entries[key]
+        overflow = len(self._entries) - SPECULATION_MAX_ENTRIES
+        if overflow > 0:
+            for key, _ in sorted(self._entries.items(), key=lambda entry: entry[1][0])[:overflow]:
+                del self._entries[key]
+
+    def submit(self, namespace: str, inputs: Any, fn: Callable[[], Any]) -> bool:
+        """
+        Lance `fn` en arrière-plan pour les entrées supposées `inputs`.
+
+        Returns:
+            True si un calcul a été lancé (False si désactivé ou déjà lancé pour ces entrées)
+        """
+        if not SPECULATION_ENABLED:
+            return False
+
+        key = fingerprint(namespace, inputs)
+
+        def run() -> Any:
+            with llm_priority(PRIORITY_BATCH):
+                return fn()
+
+        with self._lock:
+            now = time.time()
+            self._evict(now)
+            if key in self._entries:
+                return False
+            future = self._get_executor().submit(contextvars.copy_context().run, run)
+            self._entries[key] = (now, future)
+            self._stats["submitted"] += 1
+        logger.info(f"🔮 [SPECULATION] {namespace} lancé en arrière-plan ({key[:12]})")
+        return True
+
+    def take(self, namespace: str, inputs: Any, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Récupère le résultat spéculatif calculé pour exactement ces entrées.
+        Un calcul encore en cours est attendu (il a déjà une avance sur un nouvel appel).
+
+        Returns:
+            Le résultat, ou None si aucun calcul ne correspond ou s'il a échoué
+        """
+        if not SPECULATION_ENABLED:
+            return None
+
+        key = fingerprint(namespace, inputs)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._stats["misses"] += 1
+        if entry is None:
+            logger.info(f"🔮 [SPECULATION] {namespace} : hypothèse non vérifiée, calcul normal")
+            return None
+
+        try:
+            result = entry[1].result(timeout=timeout)
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+            logger.warning(f"⚠️ [SPECULATION] {namespace} : calcul spéculatif inutilisable ({e})")
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+        logger.info(f"🔮 [SPECULATION] {namespace} : résultat précalculé réutilisé ({key[:12]})")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = sum(1 for _, future in self._entries.values() if not future.done())
+            return {**self._stats, "pending": pending, "stored": len(self._entries) - pending}
+
+
+# Exécuteur partagé par les workflows du processus
+speculative_executor = SpeculativeExecutor()
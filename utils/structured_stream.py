@@ -0,0 +1,117 @@
+"""
+Génération structurée en streaming : émission des éléments au fil de l'eau.
+
+Les analyses des besoins et des cas d'usage attendaient la fin de
+`responses.parse` avant d'afficher quoi que ce soit. En mode streaming, le JSON
+de la réponse est lu au fil des deltas : dès qu'un objet du tableau suivi
+(ex: `identified_needs`) est refermé, il est décodé et transmis au callback.
+La réponse finale reste parsée et validée par le modèle Pydantic comme avant.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Streaming des générations de besoins / cas d'usage (0 = appel parse classique)
+LLM_STREAMING_ENABLED = os.getenv("LLM_STREAMING_ENABLED", "1") != "0"
+
+ItemCallback = Callable[[int, Dict[str, Any]], None]
+
+
+def is_streaming_enabled() -> bool:
+    """Streaming activé pour les générations d'éléments"""
+    return LLM_STREAMING_ENABLED
+
+
+class JsonArrayItemStreamer:
+    """
+    Lit un objet JSON reçu par morceaux et émet chaque objet complet du tableau
+    `array_key` (clé de premier niveau) dès sa fermeture.
+    """
+
+    def __init__(self, array_key: str, on_item: ItemCallback):
+        self.array_key = array_key
+        self.on_item = on_item
+        self.count = 0
+        self._key_pattern = re.compile(r'"%s"\s*:\s*$' % re.escape(array_key))
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._array_depth: Optional[int] = None
+        self._array_closed = False
+        self._item_start: Optional[int] = None
+
+    def emit(self, item: Dict[str, Any]) -> None:
+        """Transmet un élément (une erreur du callback n'interrompt jamais la génération)"""
+        try:
+            self.on_item(self.count, item)
+        except Exception as e:
+            logger.warning(f"⚠️ Émission de l'élément {self.count} impossible: {e}")
+        self.count += 1
+
+    def feed(self, chunk: str) -> None:
+        """Ajoute un delta de texte et émet les objets refermés"""
+        self._text += chunk
+        text = self._text
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if (char == "[" and self._array_depth is None and not self._array_closed
+                        and self._depth == 2 and self._key_pattern.search(text, 0, index)):
+                    self._array_depth = self._depth
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._item_start = index
+            elif char in "}]":
+                if (char == "}" and self._item_start is not None
+                        and self._array_depth is not None and self._depth == self._array_depth + 1):
+                    self._decode(text[self._item_start:index + 1])
+                    self._item_start = None
+                elif char == "]" and self._depth == self._array_depth:
+                    self._array_depth = None
+                    self._array_closed = True
+                self._depth -= 1
+        self._position = len(text)
+
+    def _decode(self, raw: str) -> None:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"⚠️ Élément streamé illisible ignoré: {e}")
+            return
+        if isinstance(item, dict):
+            self.emit(item)
+
+
+def parse_with_item_stream(client: Any, items_key: str, on_item: ItemCallback, **kwargs: Any) -> Any:
+    """
+    Appelle `client.responses.stream_parse` en émettant chaque élément du tableau
+    `items_key` dès qu'il est complet, puis retourne la réponse parsée finale.
+
+    Les éléments non émis pendant le streaming (réponse servie par le cache,
+    JSON découpé de façon inattendue) sont émis depuis la réponse finale.
+    """
+    streamer = JsonArrayItemStreamer(items_key, on_item)
+    response = client.responses.stream_parse(on_text_delta=streamer.feed, **kwargs)
+
+    items = getattr(getattr(response, "output_parsed", None), items_key, None) or []
+    for item in items[streamer.count:]:
+        streamer.emit(item.model_dump() if hasattr(item, "model_dump") else item)
+    return response
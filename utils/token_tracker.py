@@ -4,39 +4,104 @@ Système de tracking des tokens d'API OpenAI
 
 import json
 import logging
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from langgraph.config import get_config
+
 logger = logging.getLogger(__name__)
 
+# Nombre maximal d'appels gardés dans calls_detail d'une session (les plus anciens sont retirés)
+TOKEN_TRACKER_MAX_CALLS_DETAIL = int(os.getenv("TOKEN_TRACKER_MAX_CALLS_DETAIL", "1000"))
+# Nombre maximal de sessions (threads LangGraph) suivies par tracker (les moins récentes sont retirées)
+TOKEN_TRACKER_MAX_SESSIONS = int(os.getenv("TOKEN_TRACKER_MAX_SESSIONS", "256"))
+
+
+def _new_session_stats(thread_id: Optional[str] = None) -> Dict[str, Any]:
+    """Statistiques vides d'une session"""
+    return {
+        "session_start": datetime.now().isoformat(),
+        "thread_id": thread_id,
+        "total_calls": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_tokens": 0,
+        "calls_by_agent": {},
+        "calls_detail": [],
+        "prompt_savings": {
+            "prompts": 0,
+            "original_tokens": 0,
+            "packed_tokens": 0,
+            "saved_tokens": 0,
+            "dropped_items": 0
+        }
+    }
+
+
+def _current_thread_id() -> Optional[str]:
+    """thread_id de la config LangGraph du nœud en cours (None hors d'une exécution de graphe)"""
+    try:
+        return get_config().get("configurable", {}).get("thread_id")
+    except RuntimeError:
+        return None
+
 
 class TokenTracker:
     """
     Classe pour tracker les tokens des appels API.
     Compatible avec LangGraph Studio (pas d'opérations bloquantes synchrones).
+    
+    Un tracker est partagé par tous les threads d'un workflow compilé (sûr entre
+    threads) : les statistiques sont tenues par session, une par `thread_id` de
+    la config LangGraph. Hors d'une exécution de graphe (ou sans thread_id
+    explicite), elles vont dans la session par défaut `session_stats`.
     """
     
-    def __init__(self, output_dir: str = "outputs/token_tracking"):
+    def __init__(
+        self,
+        output_dir: str = "outputs/token_tracking",
+        max_calls_detail: int = TOKEN_TRACKER_MAX_CALLS_DETAIL,
+        max_sessions: int = TOKEN_TRACKER_MAX_SESSIONS
+    ):
         """
         Initialise le tracker.
         
         Args:
             output_dir: Répertoire de sauvegarde des rapports
+            max_calls_detail: Nombre maximal d'appels gardés dans calls_detail d'une session
+            max_sessions: Nombre maximal de sessions par thread_id gardées en mémoire
         """
         self.output_dir = Path(output_dir)
+        self.max_calls_detail = max_calls_detail
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         # ⚠️ Ne pas créer le dossier ici pour compatibilité LangGraph Studio
         # Il sera créé lors de la sauvegarde si nécessaire
         
-        self.session_stats = {
-            "session_start": datetime.now().isoformat(),
-            "total_calls": 0,
-            "total_input_tokens": 0,
-            "total_output_tokens": 0,
-            "total_tokens": 0,
-            "calls_by_agent": {},
-            "calls_detail": []
-        }
+        self.session_stats = _new_session_stats()
+    
+    def _session(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Statistiques de la session du thread (thread_id explicite, sinon celui du nœud en cours ; verrou tenu)"""
+        thread_id = thread_id or _current_thread_id()
+        if thread_id is None:
+            return self.session_stats
+        stats = self._sessions.get(thread_id)
+        if stats is None:
+            stats = self._sessions[thread_id] = _new_session_stats(thread_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(thread_id)
+        return stats
+    
+    def end_session(self, thread_id: str) -> None:
+        """Oublie la session d'un thread (après son rapport final)"""
+        with self._lock:
+            self._sessions.pop(thread_id, None)
     
     def track_response(
         self, 
@@ -95,6 +160,50 @@ class TokenTracker:
             logger.error(f"Erreur lors du tracking: {e}", exc_info=True)
             return {}
     
+    def track_prompt_savings(
+        self,
+        agent_name: str,
+        operation: str,
+        original_tokens: int,
+        packed_tokens: int,
+        dropped_items: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Track les tokens économisés par la sérialisation compacte d'un prompt.
+        
+        Args:
+            agent_name: Nom de l'agent (ex: "need_analysis")
+            operation: Type d'opération (ex: "analyze_needs")
+            original_tokens: Tokens estimés avec l'ancienne sérialisation (JSON indenté)
+            packed_tokens: Tokens estimés après sérialisation compacte et budget
+            dropped_items: Éléments retirés pour respecter le budget
+            
+        Returns:
+            Dict avec les statistiques de ce prompt
+        """
+        saved_tokens = max(original_tokens - packed_tokens, 0)
+        with self._lock:
+            savings = self._session()["prompt_savings"]
+            savings["prompts"] += 1
+            savings["original_tokens"] += original_tokens
+            savings["packed_tokens"] += packed_tokens
+            savings["saved_tokens"] += saved_tokens
+            savings["dropped_items"] += dropped_items
+        
+        logger.info(
+            f"💰 [{agent_name}] {operation} - "
+            f"Prompt: {original_tokens:,} → {packed_tokens:,} tokens estimés ({saved_tokens:,} économisés, {dropped_items} éléments retirés)"
+        )
+        
+        return {
+            "agent_name": agent_name,
+            "operation": operation,
+            "original_tokens": original_tokens,
+            "packed_tokens": packed_tokens,
+            "saved_tokens": saved_tokens,
+            "dropped_items": dropped_items
+        }
+    
     def _extract_usage(self, response: Any) -> Optional[Dict[str, int]]:
         """
         Extrait les informations d'usage depuis la réponse API.
@@ -138,60 +247,84 @@ class TokenTracker:
         Args:
             call_record: Enregistrement d'un appel
         """
-        self.session_stats["total_calls"] += 1
-        self.session_stats["total_input_tokens"] += call_record["input_tokens"]
-        self.session_stats["total_output_tokens"] += call_record["output_tokens"]
-        self.session_stats["total_tokens"] += call_record["total_tokens"]
+        with self._lock:
+            self._add_call(self._session(), call_record)
+    
+    def _add_call(self, stats: Dict[str, Any], call_record: Dict[str, Any]):
+        """Ajoute un appel aux statistiques d'une session (verrou tenu)"""
+        stats["total_calls"] += 1
+        stats["total_input_tokens"] += call_record["input_tokens"]
+        stats["total_output_tokens"] += call_record["output_tokens"]
+        stats["total_tokens"] += call_record["total_tokens"]
         
         # Statistiques par agent
         agent_name = call_record["agent_name"]
-        if agent_name not in self.session_stats["calls_by_agent"]:
-            self.session_stats["calls_by_agent"][agent_name] = {
+        if agent_name not in stats["calls_by_agent"]:
+            stats["calls_by_agent"][agent_name] = {
                 "calls": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
                 "total_tokens": 0
             }
         
-        self.session_stats["calls_by_agent"][agent_name]["calls"] += 1
-        self.session_stats["calls_by_agent"][agent_name]["input_tokens"] += call_record["input_tokens"]
-        self.session_stats["calls_by_agent"][agent_name]["output_tokens"] += call_record["output_tokens"]
-        self.session_stats["calls_by_agent"][agent_name]["total_tokens"] += call_record["total_tokens"]
+        stats["calls_by_agent"][agent_name]["calls"] += 1
+        stats["calls_by_agent"][agent_name]["input_tokens"] += call_record["input_tokens"]
+        stats["calls_by_agent"][agent_name]["output_tokens"] += call_record["output_tokens"]
+        stats["calls_by_agent"][agent_name]["total_tokens"] += call_record["total_tokens"]
         
-        # Ajout du détail
-        self.session_stats["calls_detail"].append(call_record)
+        # Ajout du détail (borné)
+        calls_detail = stats["calls_detail"]
+        calls_detail.append(call_record)
+        if len(calls_detail) > self.max_calls_detail:
+            del calls_detail[:len(calls_detail) - self.max_calls_detail]
     
-    def get_session_summary(self) -> Dict[str, Any]:
+    def get_session_summary(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Retourne un résumé de la session en cours.
         
+        Args:
+            thread_id: Thread LangGraph (par défaut celui du nœud en cours)
+        
         Returns:
             Dict avec les statistiques de session
         """
-        return {
-            "session_start": self.session_stats["session_start"],
-            "total_calls": self.session_stats["total_calls"],
-            "total_input_tokens": self.session_stats["total_input_tokens"],
-            "total_output_tokens": self.session_stats["total_output_tokens"],
-            "total_tokens": self.session_stats["total_tokens"],
-            "calls_by_agent": self.session_stats["calls_by_agent"]
-        }
+        with self._lock:
+            stats = self._session(thread_id)
+            return {
+                "session_start": stats["session_start"],
+                "thread_id": stats["thread_id"],
+                "total_calls": stats["total_calls"],
+                "total_input_tokens": stats["total_input_tokens"],
+                "total_output_tokens": stats["total_output_tokens"],
+                "total_tokens": stats["total_tokens"],
+                "calls_by_agent": {name: dict(agent_stats) for name, agent_stats in stats["calls_by_agent"].items()},
+                "prompt_savings": dict(stats["prompt_savings"])
+            }
     
-    def print_summary(self):
+    def print_summary(self, thread_id: Optional[str] = None):
         """
         Affiche un résumé formaté de la session.
+        
+        Args:
+            thread_id: Thread LangGraph (par défaut celui du nœud en cours)
         """
-        summary = self.get_session_summary()
+        summary = self.get_session_summary(thread_id)
         
         print("\n" + "="*70)
         print("📊 RÉSUMÉ DES TOKENS")
         print("="*70)
         print(f"🕐 Session démarrée: {summary['session_start']}")
+        if summary['thread_id']:
+            print(f"🧵 Thread: {summary['thread_id']}")
         print(f"📞 Nombre d'appels API: {summary['total_calls']}")
         print(f"🔤 Tokens totaux: {summary['total_tokens']:,}")
         print(f"   ├─ Input:  {summary['total_input_tokens']:,}")
         print(f"   └─ Output: {summary['total_output_tokens']:,}")
         
+        savings = summary['prompt_savings']
+        if savings['prompts']:
+            print(f"💰 Tokens économisés (prompts compacts): {savings['saved_tokens']:,} sur {savings['original_tokens']:,}")
+        
         if summary['calls_by_agent']:
             print("\n📊 Détails par agent:")
             for agent_name, stats in summary['calls_by_agent'].items():
@@ -203,17 +336,28 @@ class TokenTracker:
         
         print("="*70 + "\n")
     
-    def save_report(self, filename: str = None):
+    def save_report(self, filename: str = None, thread_id: Optional[str] = None):
         """
         Sauvegarde le rapport complet en JSON.
         Crée le dossier de sortie si nécessaire.
         
         Args:
             filename: Nom du fichier (auto-généré si None)
+            thread_id: Thread LangGraph (par défaut celui du nœud en cours)
         """
+        with self._lock:
+            stats = self._session(thread_id)
+            report = {
+                **stats,
+                "calls_by_agent": {name: dict(agent_stats) for name, agent_stats in stats["calls_by_agent"].items()},
+                "calls_detail": list(stats["calls_detail"]),
+                "prompt_savings": dict(stats["prompt_savings"])
+            }
+        
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"token_report_{timestamp}.json"
+            prefix = f"token_report_{report['thread_id']}" if report["thread_id"] else "token_report"
+            filename = f"{prefix}_{timestamp}.json"
         
         # Créer le dossier uniquement lors de la sauvegarde
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -221,7 +365,7 @@ class TokenTracker:
         filepath = self.output_dir / filename
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.session_stats, f, ensure_ascii=False, indent=2)
+            json.dump(report, f, ensure_ascii=False, indent=2)
         
         logger.info(f"📄 Rapport sauvegardé: {filepath}")
         return str(filepath)
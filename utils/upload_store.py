@@ -0,0 +1,149 @@
+"""
+Stockage des fichiers uploadés, adressé par contenu.
+
+Les consultants ré-uploadent souvent les mêmes transcripts et fichiers Excel
+d'un projet à l'autre. Chaque upload est lu par blocs et écrit hors de la
+boucle d'événements, en calculant son SHA-256 au passage, avec une limite de
+taille. Le contenu est stocké une seule fois (`blobs/<sha256>`) ; le chemin
+retourné `<sha256>/<nom du fichier>` est un lien physique vers ce blob, ce qui
+garde le nom et l'extension d'origine pour les parsers. Le SHA-256 se lit
+donc directement dans le chemin : le cache de parsing n'a pas à relire le fichier.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale d'un fichier uploadé (octets)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+# Taille des blocs lus / écrits
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadTooLargeError(ValueError):
+    """Fichier uploadé au-delà de UPLOAD_MAX_BYTES"""
+
+
+@dataclass
+class StoredUpload:
+    """Résultat du stockage d'un fichier uploadé"""
+    file_path: Path
+    file_name: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_path": str(self.file_path),
+            "file_name": self.file_name,
+            "sha256": self.sha256,
+            "size": self.size,
+            "deduplicated": self.deduplicated,
+        }
+
+
+def content_sha256(file_path: str) -> Optional[str]:
+    """SHA-256 d'un fichier stocké par ce module, lu dans son chemin (None pour un autre chemin)"""
+    digest = Path(file_path).parent.name
+    return digest if _SHA256_RE.match(digest) else None
+
+
+def _safe_file_name(file_name: Optional[str]) -> str:
+    """Nom de fichier sans composante de chemin"""
+    name = Path(file_name or "").name
+    return name or "upload"
+
+
+def _commit_blob(upload_dir: Path, tmp_path: Path, digest: str) -> bool:
+    """
+    Range le fichier temporaire sous blobs/<sha256> (ou le supprime si ce contenu est déjà stocké).
+
+    Returns:
+        True si le contenu était déjà stocké
+    """
+    blob_path = upload_dir / "blobs" / digest
+    if blob_path.exists():
+        tmp_path.unlink(missing_ok=True)
+        return True
+    # os.replace est atomique : deux uploads simultanés du même contenu donnent le même blob
+    os.replace(tmp_path, blob_path)
+    return False
+
+
+def _link_named(upload_dir: Path, digest: str, file_name: str) -> Path:
+    """Crée (si besoin) le chemin <sha256>/<nom> pointant sur le blob"""
+    blob_path = upload_dir / "blobs" / digest
+    file_path = upload_dir / digest / file_name
+    if file_path.exists():
+        return file_path
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(blob_path, file_path)
+    except FileExistsError:
+        pass  # Créé entre-temps par un upload concurrent
+    except OSError:
+        # Système de fichiers sans liens physiques : copie
+        shutil.copyfile(blob_path, file_path)
+    return file_path
+
+
+async def store_upload(upload: Any, upload_dir: Path, max_bytes: int = UPLOAD_MAX_BYTES) -> StoredUpload:
+    """
+    Stocke un UploadFile par blocs : écriture et hachage dans un thread, limite de taille.
+
+    Args:
+        upload: UploadFile FastAPI (méthode async read(size) et attribut filename)
+        upload_dir: Dossier racine des uploads
+        max_bytes: Taille maximale acceptée
+
+    Raises:
+        UploadTooLargeError: Si le fichier dépasse max_bytes (rien n'est conservé)
+    """
+    file_name = _safe_file_name(upload.filename)
+    incoming_dir = upload_dir / "incoming"
+    for directory in (incoming_dir, upload_dir / "blobs"):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=incoming_dir)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            def write_chunk(chunk: bytes) -> None:
+                f.write(chunk)
+                digest.update(chunk)
+
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Fichier trop volumineux: {file_name} dépasse {max_bytes} octets"
+                    )
+                await asyncio.to_thread(write_chunk, chunk)
+
+        sha256 = digest.hexdigest()
+        deduplicated = await asyncio.to_thread(_commit_blob, upload_dir, tmp_path, sha256)
+        file_path = await asyncio.to_thread(_link_named, upload_dir, sha256, file_name)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    status = "déjà stocké" if deduplicated else "stocké"
+    logger.info(f"📦 [UPLOAD] {file_name}: {size} octets, {status} ({sha256[:12]})")
+    return StoredUpload(file_path, file_name, sha256, size, deduplicated)
@@ -3,14 +3,15 @@ Agent pour extraire la chaîne de valeur de l'entreprise
 """
 import logging
 from typing import List, Dict, Any
-import openai
-import os
 from dotenv import load_dotenv
+from utils.llm_gateway import get_llm_client
+from utils.citation_alignment import align_references, is_citation_id_mode_enabled, number_interventions
 
 from models.value_chain_models import (
     FunctionsResponse,
     MissionsResponse,
     FrictionPointsResponse,
+    FrictionPointsRefResponse,
     Function,
     Mission,
     FrictionPoint
@@ -23,6 +24,7 @@ from prompts.value_chain_prompts import (
     VALUE_CHAIN_FRICTION_POINTS_SYSTEM_PROMPT,
     VALUE_CHAIN_FRICTION_POINTS_PROMPT
 )
+from prompts.citation_reference_prompts import CITATION_REFERENCE_INSTRUCTIONS
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -35,10 +37,7 @@ class ValueChainAgent:
     
     def __init__(self, api_key: str = None):
         """Initialise l'agent avec la clé API OpenAI"""
-        if api_key:
-            openai.api_key = api_key
-        else:
-            openai.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = get_llm_client(api_key, agent="value_chain")
         
         self.model = 'gpt-4.1-nano-2025-04-14'
     
@@ -72,7 +71,7 @@ class ValueChainAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=VALUE_CHAIN_TEAMS_SYSTEM_PROMPT,
                 input=[
@@ -127,7 +126,7 @@ class ValueChainAgent:
         )
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=VALUE_CHAIN_MISSIONS_SYSTEM_PROMPT,
                 input=[
@@ -195,8 +194,11 @@ class ValueChainAgent:
                 level = interv.get("speaker_level", "N/A")
                 logger.info(f"   {i}. [niveau={level}|rôle={role}] {text_preview}")
         
+        # Mode identifiant : interventions numérotées [i], citations reconstituées localement
+        id_mode = is_citation_id_mode_enabled()
+        
         # Préparer le texte pour l'analyse
-        transcript_text = self._format_interventions(interventions)
+        transcript_text = self._format_interventions(interventions, numbered=id_mode)
         functions_text = self._format_functions(functions)
         
         # Logs sur les données formatées
@@ -209,13 +211,15 @@ class ValueChainAgent:
             transcript_text=transcript_text,
             functions=functions_text
         )
+        if id_mode:
+            prompt += CITATION_REFERENCE_INSTRUCTIONS
         
         logger.info(f"🔍 [FRICTION] Longueur prompt final: {len(prompt)} caractères")
         logger.info(f"🔍 [FRICTION] Modèle utilisé: {self.model}")
         # LOGS DÉTAILLÉS - Fin
         
         try:
-            response = openai.responses.parse(
+            response = self.client.responses.parse(
                 model=self.model,
                 instructions=VALUE_CHAIN_FRICTION_POINTS_SYSTEM_PROMPT,
                 input=[
@@ -229,10 +233,17 @@ class ValueChainAgent:
                         ]
                     }
                 ],
-                text_format=FrictionPointsResponse
+                text_format=FrictionPointsRefResponse if id_mode else FrictionPointsResponse
             )
             
-            friction_points_response = response.output_parsed
+            if id_mode:
+                aligned = align_references(response.output_parsed.friction_points, interventions)
+                friction_points_response = FrictionPointsResponse(friction_points=[
+                    FrictionPoint(id=fp["id"], function_nom=fp["function_nom"], citation=fp["citation"], description=fp["description"])
+                    for fp in aligned
+                ])
+            else:
+                friction_points_response = response.output_parsed
             logger.info(f"Extrait {len(friction_points_response.friction_points)} points de friction")
             
             # Log détaillé des points de friction extraits
@@ -250,8 +261,14 @@ class ValueChainAgent:
             logger.error(f"🔍 [FRICTION] ❌ Exception détaillée: {type(e).__name__}: {str(e)}")
             return FrictionPointsResponse(friction_points=[])
     
-    def _format_interventions(self, interventions: List[Dict[str, Any]]) -> str:
-        """Formate les interventions pour l'analyse LLM avec métadonnées enrichies"""
+    def _format_interventions(self, interventions: List[Dict[str, Any]], numbered: bool = False) -> str:
+        """
+        Formate les interventions pour l'analyse LLM avec métadonnées enrichies
+        
+        Args:
+            interventions: Interventions à formater
+            numbered: Préfixer chaque intervention par son numéro [i] (mode identifiant)
+        """
         formatted = []
         
         for intervention in interventions:
@@ -272,6 +289,9 @@ class ValueChainAgent:
             else:
                 formatted.append(text)
         
+        if numbered:
+            formatted = number_interventions(formatted)
+        
         return "\n\n".join(formatted)
     
     def _format_company_info(self, company_info: Dict[str, Any]) -> str:
@@ -7,7 +7,7 @@ import sys
 import json
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
+from utils.llm_gateway import get_llm_client
 
 # Ajouter le répertoire parent au PYTHONPATH pour les imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -34,7 +34,7 @@ class WebSearchAgent:
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY non trouvée dans les variables d'environnement")
         
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        self.openai_client = get_llm_client(self.openai_api_key, agent="web_search")
         self.model = os.getenv('OPENAI_MODEL', 'gpt-5-nano')
     
     def search_company_info(
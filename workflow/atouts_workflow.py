@@ -8,6 +8,8 @@ from langgraph.checkpoint.memory import MemorySaver
 import logging
 
 from atouts.atouts_agent import AtoutsAgent
+from utils.regeneration import build_digest, citation_entries, count_replacements, is_delta_regeneration_enabled
+from utils.progress_events import is_run_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,8 @@ class AtoutsState(TypedDict, total=False):
     
     # Intermediate results
     citations_atouts: Dict[str, Any]
+    # Condensé des citations (construit une fois par run, pour les régénérations en mode delta)
+    atouts_evidence_digest: str
     
     # Contexte additionnel avant génération
     atouts_additional_context: str
@@ -103,69 +107,83 @@ class AtoutsWorkflow:
             interrupt_before=["validate_atouts"]
         )
     
-    def _extract_citations_from_document(self, doc_id: int, validated_speakers: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    def _extract_citations_from_document(
+        self,
+        doc_id: int,
+        validated_speakers: List[Dict[str, str]],
+        enriched_interventions: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extrait les citations d'atouts depuis un seul document.
         
         Args:
             doc_id: ID du document transcript dans la DB
             validated_speakers: Liste des speakers validés par l'utilisateur (non utilisé, conservé pour compatibilité)
+            enriched_interventions: Interventions enrichies déjà chargées (sinon chargées depuis la DB)
             
         Returns:
             Liste des citations extraites (liste de CitationAtout converties en dict)
         """
         try:
-            from database.db import get_db_context
-            from database.repository import TranscriptRepository
+            logger.info(f"Traitement transcript pour atouts: document_id={doc_id}")
             
-            with get_db_context() as db:
-                logger.info(f"Traitement transcript pour atouts: document_id={doc_id}")
-                
-                # Récupérer directement les interventions enrichies depuis la DB
-                enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                    db, doc_id, filter_interviewers=False
-                )
-                
-                logger.info(f"✓ Document {doc_id}: {len(enriched_interventions)} interventions enrichies")
-                
-                # Formater les interventions (sans timestamp, avec role et level)
-                # On envoie TOUTES les interventions maintenant qu'on traite document par document
-                formatted_interventions = []
-                for interv in enriched_interventions:
-                    speaker_role = interv.get("speaker_role")
-                    speaker_type = interv.get("speaker_type")
-                    
-                    # Si c'est un interviewer sans rôle défini, lui attribuer un rôle par défaut
-                    # (utile si on décide d'inclure les interviewers plus tard)
-                    if speaker_type == "interviewer" and not speaker_role:
-                        speaker_role = "Intervieweur"
-                    
-                    formatted_interv = {
-                        "text": interv.get("text"),
-                        "speaker_level": interv.get("speaker_level"),  # direction/métier/inconnu
-                        "speaker_role": speaker_role,    # Rôle exact (ou "Intervieweur" par défaut)
-                        "speaker_type": speaker_type,    # interviewé/interviewer
-                    }
-                    formatted_interventions.append(formatted_interv)
-                
-                if not formatted_interventions:
-                    logger.warning(f"Aucune intervention à analyser pour document_id={doc_id}")
-                    return []
+            if enriched_interventions is None:
+                enriched_interventions = self._load_enriched_interventions([doc_id])[doc_id]
+            
+            logger.info(f"✓ Document {doc_id}: {len(enriched_interventions)} interventions enrichies")
+            
+            # Formater les interventions (sans timestamp, avec role et level)
+            # On envoie TOUTES les interventions maintenant qu'on traite document par document
+            formatted_interventions = []
+            for interv in enriched_interventions:
+                speaker_role = interv.get("speaker_role")
+                speaker_type = interv.get("speaker_type")
                 
-                # Extraire les citations pour ce document
-                citations_response = self.atouts_agent.extract_citations_from_transcript(
-                    formatted_interventions
-                )
+                # Si c'est un interviewer sans rôle défini, lui attribuer un rôle par défaut
+                # (utile si on décide d'inclure les interviewers plus tard)
+                if speaker_type == "interviewer" and not speaker_role:
+                    speaker_role = "Intervieweur"
                 
-                # Convertir les citations en liste de dicts
-                citations_list = [citation.model_dump() for citation in citations_response.citations]
-                logger.info(f"✅ Document {doc_id} terminé: {len(citations_list)} citations")
-                return citations_list
+                formatted_interv = {
+                    "text": interv.get("text"),
+                    "speaker_level": interv.get("speaker_level"),  # direction/métier/inconnu
+                    "speaker_role": speaker_role,    # Rôle exact (ou "Intervieweur" par défaut)
+                    "speaker_type": speaker_type,    # interviewé/interviewer
+                }
+                formatted_interventions.append(formatted_interv)
+            
+            if not formatted_interventions:
+                logger.warning(f"Aucune intervention à analyser pour document_id={doc_id}")
+                return []
+            
+            # Extraire les citations pour ce document
+            citations_response = self.atouts_agent.extract_citations_from_transcript(
+                formatted_interventions
+            )
+            
+            # Convertir les citations en liste de dicts
+            citations_list = [citation.model_dump() for citation in citations_response.citations]
+            logger.info(f"✅ Document {doc_id} terminé: {len(citations_list)} citations")
+            return citations_list
                 
         except Exception as e:
             logger.error(f"❌ Erreur lors du traitement du document_id {doc_id}: {e}", exc_info=True)
             return []
     
+    @staticmethod
+    def _load_enriched_interventions(document_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Charge les interventions enrichies de tous les documents en une seule requête"""
+        from database.db import get_db_context
+        from database.repository import TranscriptRepository
+        
+        with get_db_context() as db:
+            return TranscriptRepository.get_enriched_by_documents(
+                db,
+                document_ids,
+                filter_interviewers=False,
+                columns=["intervention_id", "text", "speaker_level", "speaker_role", "speaker_type"],
+            )
+    
     def _extract_citations_node(self, state: AtoutsState) -> AtoutsState:
         """Extrait les citations révélant les atouts directement depuis la DB (PARALLÉLISÉ document par document)"""
         transcript_document_ids = state.get("transcript_document_ids", [])
@@ -177,19 +195,28 @@ class AtoutsWorkflow:
             return state
         
         try:
-            from concurrent.futures import ThreadPoolExecutor, as_completed
+            from concurrent.futures import as_completed
+            from utils.concurrency_governor import FanOutExecutor
             from models.atouts_models import CitationsAtoutsResponse
             
             all_citations = []
             
+            # Une seule requête DB pour tous les documents, puis extraction LLM par document
+            interventions_by_doc = self._load_enriched_interventions(transcript_document_ids)
+            
             # 🚀 PARALLÉLISATION : Traiter tous les documents en même temps
             if len(transcript_document_ids) > 1:
                 logger.info(f"🚀 Extraction parallèle de citations depuis {len(transcript_document_ids)} documents")
                 max_workers = min(len(transcript_document_ids), 10)
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                with FanOutExecutor(max_workers=max_workers) as executor:
                     future_to_doc = {
-                        executor.submit(self._extract_citations_from_document, doc_id, validated_speakers): doc_id
+                        executor.submit(
+                            self._extract_citations_from_document,
+                            doc_id,
+                            validated_speakers,
+                            interventions_by_doc.get(doc_id, [])
+                        ): doc_id
                         for doc_id in transcript_document_ids
                     }
                     
@@ -205,7 +232,9 @@ class AtoutsWorkflow:
             else:
                 # Traitement séquentiel si un seul document
                 for doc_id in transcript_document_ids:
-                    citations = self._extract_citations_from_document(doc_id, validated_speakers)
+                    citations = self._extract_citations_from_document(
+                        doc_id, validated_speakers, interventions_by_doc.get(doc_id, [])
+                    )
                     if citations:
                         all_citations.extend(citations)
             
@@ -245,13 +274,30 @@ class AtoutsWorkflow:
                 logger.info(f"📊 Atouts validés à éviter: {len(validated_atouts)}")
                 logger.info(f"📊 Atouts rejetés à éviter: {len(rejected_atouts)}")
                 
+                # ⚡ Mode delta : condensé des citations + atouts non retenus uniquement
+                evidence_digest = None
+                num_atouts = 3
+                if is_delta_regeneration_enabled():
+                    if not state.get("atouts_evidence_digest"):
+                        state["atouts_evidence_digest"] = build_digest([
+                            ("ENTREPRISE", [(10.0, self.atouts_agent._format_company_info(company_info))]),
+                            ("CITATIONS", citation_entries(citations_dict.get("citations", []))),
+                        ])
+                    evidence_digest = state["atouts_evidence_digest"]
+                    num_atouts = count_replacements(
+                        state.get("proposed_atouts", []), validated_atouts,
+                        key=lambda atout: atout.get("titre"), default=num_atouts
+                    )
+                
                 atouts_response = self.atouts_agent.regenerate_atouts(
                     citations_response,
                     company_info,
                     validated_atouts,
                     rejected_atouts,
                     user_feedback,
-                    additional_context
+                    additional_context,
+                    evidence_digest=evidence_digest,
+                    num_atouts=num_atouts
                 )
             else:
                 # Première génération
@@ -476,6 +522,10 @@ class AtoutsWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état complet depuis le checkpointer
         snapshot = self.graph.get_state(config)
@@ -575,6 +625,10 @@ class AtoutsWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état final
         snapshot = self.graph.get_state(config)
@@ -4,14 +4,16 @@ Workflow LangGraph pour l'analyse des besoins
 
 import os
 import json
-from typing import Dict, List, Any, TypedDict, Annotated
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, TypedDict, Annotated, Optional
+from concurrent.futures import as_completed
+from utils.concurrency_governor import FanOutExecutor
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 import streamlit as st
 
 # Import des agents
@@ -20,12 +22,15 @@ sys.path.append('/home/addeche/aiko/aikoGPT')
 import config as project_config
 from need_analysis.need_analysis_agent import NeedAnalysisAgent
 from process_atelier.workshop_agent import WorkshopAgent
-from process_transcript.transcript_agent import TranscriptAgent
+from process_transcript.transcript_agent import TranscriptAgent, STAGE_SEMANTIC
 from web_search.web_search_agent import WebSearchAgent
 from human_in_the_loop.streamlit_validation_interface import StreamlitValidationInterface
 from use_case_analysis.use_case_analysis_agent import UseCaseAnalysisAgent
 from use_case_analysis.streamlit_use_case_validation import StreamlitUseCaseValidation
 from utils.token_tracker import TokenTracker
+from utils.regeneration import build_evidence_digest, count_replacements, is_delta_regeneration_enabled
+from utils.speculation import fingerprint, speculative_executor
+from utils.progress_events import is_run_cancelled
 
 
 class WorkflowState(TypedDict):
@@ -48,6 +53,8 @@ class WorkflowState(TypedDict):
     skip_agents: bool
     # Données agrégées pour l'analyse (seulement transcript_data car il contient une transformation utile)
     transcript_data: List[Dict[str, Any]]
+    # Condensé des preuves (construit une fois par run, pour les régénérations en mode delta)
+    evidence_digest: str
     # Résultats de l'analyse des besoins
     identified_needs: List[Dict[str, Any]]
     # Validation humaine des besoins
@@ -82,13 +89,14 @@ class NeedAnalysisWorkflow:
     Workflow LangGraph pour l'analyse des besoins métier
     """
     
-    def __init__(self, api_key: str, dev_mode: bool = False):
+    def __init__(self, api_key: str, dev_mode: bool = False, checkpointer: Optional[BaseCheckpointSaver] = None):
         """
         Initialise le workflow avec la clé API OpenAI.
         
         Args:
             api_key: Clé API OpenAI
             dev_mode: Mode développement (utilise les données mockées)
+            checkpointer: Checkpointer partagé (ex: PostgresCheckpointer), MemorySaver si None
         """
         self.api_key = api_key
         self.dev_mode = dev_mode
@@ -113,7 +121,7 @@ class NeedAnalysisWorkflow:
         self.use_case_validation_interface = StreamlitUseCaseValidation()
         
         # Configuration du checkpointer pour le debugging
-        self.checkpointer = self._setup_checkpointer()
+        self.checkpointer = self._setup_checkpointer(checkpointer)
         
         # Création du graphe
         self.graph = self._create_graph()
@@ -157,15 +165,16 @@ class NeedAnalysisWorkflow:
         
         print("─"*70 + "\n")
     
-    def _setup_checkpointer(self):
+    def _setup_checkpointer(self, checkpointer: Optional[BaseCheckpointSaver] = None):
         """
-        Configure le checkpointer pour le debugging avec LangGraph Studio.
+        Configure le checkpointer (persistant si fourni par l'API, sinon MemorySaver
+        pour le debugging avec LangGraph Studio).
         
         Returns:
             Checkpointer configuré
         """
-        # Toujours utiliser MemorySaver pour gérer les interrupts
-        return MemorySaver()
+        # Un checkpointer est toujours nécessaire pour gérer les interrupts
+        return checkpointer or MemorySaver()
     
     def _create_graph(self) -> StateGraph:
         """
@@ -241,7 +250,7 @@ class NeedAnalysisWorkflow:
         # Configuration avec checkpointer et interrupts
         # NOUVEAU: Toujours utiliser checkpointer et interrupts (pas seulement en debug)
         compile_kwargs = {
-            "checkpointer": MemorySaver(),  # Toujours actif pour gérer les interrupts
+            "checkpointer": self.checkpointer,  # Toujours actif pour gérer les interrupts
             "interrupt_before": ["human_validation", "pre_use_case_interrupt", "validate_use_cases"]  # Points d'arrêt pour validation humaine
         }
         
@@ -392,10 +401,18 @@ class NeedAnalysisWorkflow:
                 max_workers = min(len(transcript_document_ids), 10)  # Maximum 10 threads en parallèle
                 print(f"🚀 [PARALLÈLE-2/3] Parallélisation avec {max_workers} workers pour {len(transcript_document_ids)} transcripts")
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Charger les interventions de tous les documents en une seule requête
+                interventions_by_doc = self.transcript_agent.load_interventions_from_db(transcript_document_ids)
+                
+                with FanOutExecutor(max_workers=max_workers) as executor:
                     # Soumettre tous les transcripts pour traitement parallèle
                     future_to_doc = {
-                        executor.submit(self.transcript_agent.process_from_db, document_id): document_id
+                        executor.submit(
+                            self.transcript_agent.process_from_db,
+                            document_id,
+                            interventions=interventions_by_doc.get(document_id, []),
+                            stages=(STAGE_SEMANTIC,)  # L'analyse des besoins n'utilise que semantic_analysis
+                        ): document_id
                         for document_id in transcript_document_ids
                     }
                     
@@ -555,8 +572,13 @@ class NeedAnalysisWorkflow:
             # Transcript Agent
             if transcript_document_ids:
                 results = []
+                interventions_by_doc = self.transcript_agent.load_interventions_from_db(transcript_document_ids)
                 for document_id in transcript_document_ids:
-                    result = self.transcript_agent.process_from_db(document_id)
+                    result = self.transcript_agent.process_from_db(
+                        document_id,
+                        interventions=interventions_by_doc.get(document_id, []),
+                        stages=(STAGE_SEMANTIC,)
+                    )
                     results.append(result)
                 state["transcript_results"] = {"results": results}
             else:
@@ -824,6 +846,17 @@ class NeedAnalysisWorkflow:
                 ]
                 print(f"💰 [OPTIMISATION] Validated needs allégés: {len(validated_needs)} besoins sans quotes")
             
+            # ⚡ Régénération delta : condensé des preuves construit une fois par run,
+            # et seulement autant de besoins que de propositions non retenues
+            num_needs = state.get("num_needs", 10)
+            evidence_digest = None
+            if previous_needs and (user_feedback or rejected_needs) and is_delta_regeneration_enabled():
+                evidence_digest = self._get_evidence_digest(state)
+                num_needs = count_replacements(
+                    previous_needs, validated_needs, key=lambda need: need.get("theme"), default=num_needs
+                )
+                print(f"⚡ [DELTA] Régénération de {num_needs} besoins sur le condensé des preuves ({len(evidence_digest)} caractères)")
+            
             analysis_result = self.need_analysis_agent.analyze_needs(
                 workshop_data=state["workshop_results"],  # SIMPLIFICATION: utiliser directement workshop_results
                 transcript_data=state["transcript_data"],
@@ -834,8 +867,9 @@ class NeedAnalysisWorkflow:
                 validated_needs_count=validated_count,
                 validated_needs=validated_needs_light,
                 additional_context=state.get("additional_context", ""),
-                num_needs=state.get("num_needs", 10),
-                num_quotes_per_need=state.get("num_quotes_per_need", 4)
+                num_needs=num_needs,
+                num_quotes_per_need=state.get("num_quotes_per_need", 4),
+                evidence_digest=evidence_digest
             )
             
             if "error" in analysis_result:
@@ -861,6 +895,19 @@ class NeedAnalysisWorkflow:
             state["messages"] = state.get("messages", []) + [HumanMessage(content=f"Erreur analyse besoins: {str(e)}")]
             return state
     
+    def _get_evidence_digest(self, state: WorkflowState) -> str:
+        """
+        Condensé des preuves (ateliers + entretiens + recherche web) pour les régénérations en mode delta.
+        Construit à la première régénération puis gardé dans l'état (checkpointé) pour tout le run.
+        """
+        if not state.get("evidence_digest"):
+            state["evidence_digest"] = build_evidence_digest(
+                state.get("workshop_results", {}),
+                state.get("transcript_data", []),
+                state.get("web_search_results", {})
+            )
+        return state["evidence_digest"]
+    
     def _human_validation_node(self, state: WorkflowState) -> WorkflowState:
         """
         Nœud de validation humaine SIMPLIFIÉ.
@@ -1010,6 +1057,11 @@ class NeedAnalysisWorkflow:
             state["use_case_iteration_count"] = 0
             print(f"🔄 [DEBUG] use_case_iteration_count initialisé à 0")
             
+            # 🔮 Pendant l'interrupt pre_use_case, précalculer les cas d'usage en supposant
+            # qu'aucun contexte additionnel ni famille ne sera saisi
+            if validated_needs and not project_config.is_agent_dev_mode("use_case_analysis"):
+                self._speculate_use_cases(state)
+            
             print(f"✅ [DEBUG] _finalize_results_node - FIN")
             return state
             
@@ -1099,7 +1151,7 @@ class NeedAnalysisWorkflow:
     def run(self, workshop_document_ids: List[int] = None, transcript_document_ids: List[int] = None,
             company_info: Dict[str, Any] = None, 
             workshop_results: Dict[str, Any] = None, transcript_results: List[Dict[str, Any]] = None, web_search_results: Dict[str, Any] = None,
-            interviewer_names: List[str] = None, thread_id: str = None, additional_context: str = "", num_needs: int = 10, num_quotes_per_need: int = 4) -> Dict[str, Any]:
+            thread_id: str = None, additional_context: str = "", num_needs: int = 10, num_quotes_per_need: int = 4) -> Dict[str, Any]:
         """
         Exécute le workflow complet.
         NOUVELLE ARCHITECTURE: Exécution MANUELLE des nœuds jusqu'à human_validation.
@@ -1125,11 +1177,6 @@ class NeedAnalysisWorkflow:
         print(f"📊 [DEBUG] Résultats pré-calculés: workshop={bool(workshop_results)}, transcript={bool(transcript_results)}, web_search={bool(web_search_results)}")
         print(f"🔑 [DEBUG] Thread ID fourni: {thread_id}")
         
-        # Configurer les interviewer_names si fournis
-        if interviewer_names:
-            print(f"👥 [DEBUG] Configuration des interviewers: {interviewer_names}")
-            self.transcript_agent.speaker_classifier.set_interviewer_names(interviewer_names)
-        
         try:
             # État initial avec les fichiers d'entrée ET les résultats pré-calculés
             state = WorkflowState(
@@ -1259,6 +1306,10 @@ class NeedAnalysisWorkflow:
                 for node_name, node_state in chunk.items():
                     print(f"  • Nœud '{node_name}' exécuté")
                     final_state = node_state
+                # Annulation demandée via l'API : arrêt entre deux nœuds
+                if is_run_cancelled():
+                    print(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                    break
             
             # Le workflow s'est arrêté à human_validation
             print(f"⏸️ [DEBUG] Workflow arrêté avant human_validation - en attente de validation")
@@ -1542,14 +1593,34 @@ class NeedAnalysisWorkflow:
                   f"{len(transcript_data)} transcripts, web_search présent={bool(web_search_results)}")
             
             # 💰 OPTIMISATION: Filtrer les quotes des validated_needs pour économiser les tokens
-            validated_needs_light = [
-                {"id": need.get("id"), "theme": need.get("theme"), "description": need.get("description", "")}
-                for need in validated_needs
-            ]
+            validated_needs_light = self._light_needs(validated_needs)
             print(f"💰 [OPTIMISATION] Validated needs allégés: {len(validated_needs)} besoins sans quotes")
             
+            # 🔮 Première génération : réutiliser le précalcul spéculatif si l'hypothèse tient
+            if not previous_use_cases and not user_feedback:
+                speculative_result = speculative_executor.take(
+                    "analyze_use_cases",
+                    self._use_case_speculation_inputs(state, validated_needs_light, additional_context, famille)
+                )
+                if speculative_result is not None and "error" not in speculative_result:
+                    state["proposed_use_cases"] = speculative_result.get("use_cases", [])
+                    print("✅ [DEBUG] _analyze_use_cases_node - FIN (précalculé)")
+                    print(f"📊 Cas d'usage proposés: {len(state['proposed_use_cases'])}")
+                    return state
+            
             # Appeler l'agent d'analyse des use cases avec les données de contexte
             print(f"🤖 [DEBUG] Appel à l'agent d'analyse des use cases")
+            # ⚡ Régénération delta : condensé des preuves + cas d'usage non retenus uniquement
+            evidence_digest = None
+            num_use_cases = None
+            if previous_use_cases and is_delta_regeneration_enabled():
+                evidence_digest = self._get_evidence_digest(state)
+                num_use_cases = count_replacements(
+                    previous_use_cases, state.get("validated_use_cases", []),
+                    key=lambda uc: uc.get("id", ""), default=len(previous_use_cases)
+                )
+                print(f"⚡ [DELTA] Régénération de {num_use_cases} cas d'usage sur le condensé des preuves")
+            
             result = self.use_case_analysis_agent.analyze_use_cases(
                 validated_needs=validated_needs_light,
                 workshop_data=workshop_results,
@@ -1559,7 +1630,10 @@ class NeedAnalysisWorkflow:
                 rejected_use_cases=rejected_use_cases if rejected_use_cases else None,
                 user_feedback=user_feedback,
                 additional_context=additional_context,
-                famille=famille
+                famille=famille,
+                evidence_digest=evidence_digest,
+                validated_use_cases=state.get("validated_use_cases", []),
+                num_use_cases=num_use_cases
             )
             
             if "error" in result:
@@ -1597,6 +1671,54 @@ class NeedAnalysisWorkflow:
             state["messages"] = state.get("messages", []) + [HumanMessage(content=f"Erreur analyse use cases: {str(e)}")]
             return state
     
+    @staticmethod
+    def _light_needs(validated_needs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Besoins validés sans leurs quotes (entrée de l'analyse des cas d'usage)"""
+        return [
+            {"id": need.get("id"), "theme": need.get("theme"), "description": need.get("description", "")}
+            for need in validated_needs
+        ]
+    
+    @staticmethod
+    def _use_case_speculation_inputs(
+        state: WorkflowState,
+        validated_needs_light: List[Dict[str, Any]],
+        additional_context: str,
+        famille: str
+    ) -> Dict[str, Any]:
+        """Entrées d'une première génération de cas d'usage (clé du précalcul spéculatif)"""
+        return {
+            "validated_needs": validated_needs_light,
+            "additional_context": additional_context or "",
+            "famille": famille or "",
+            # Les données sources identifient le run (sans les inclure telles quelles dans la clé)
+            "evidence": fingerprint("evidence", [
+                state.get("workshop_results", {}),
+                state.get("transcript_data", []),
+                state.get("web_search_results", {}),
+            ]),
+        }
+    
+    def _speculate_use_cases(self, state: WorkflowState) -> None:
+        """Lance en arrière-plan la première génération de cas d'usage (sans contexte additionnel)"""
+        validated_needs_light = self._light_needs(state.get("final_needs", []))
+        workshop_results = state.get("workshop_results", {})
+        transcript_data = state.get("transcript_data", [])
+        web_search_results = state.get("web_search_results", {})
+        
+        speculative_executor.submit(
+            "analyze_use_cases",
+            self._use_case_speculation_inputs(state, validated_needs_light, "", ""),
+            lambda: self.use_case_analysis_agent.analyze_use_cases(
+                validated_needs=validated_needs_light,
+                workshop_data=workshop_results,
+                transcript_data=transcript_data,
+                web_search_data=web_search_results,
+                additional_context="",
+                famille=""
+            )
+        )
+    
     def _validate_use_cases_node(self, state: WorkflowState) -> WorkflowState:
         """
         Nœud de validation humaine des cas d'usage SIMPLIFIÉ.
@@ -1847,6 +1969,10 @@ class NeedAnalysisWorkflow:
                 for node_name, node_state in chunk.items():
                     print(f"  • Nœud '{node_name}' exécuté")
                     final_state = node_state
+                # Annulation demandée via l'API : arrêt entre deux nœuds
+                if is_run_cancelled():
+                    print(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                    break
             
             # Récupérer l'état final depuis le checkpointer
             snapshot = self.graph.get_state(config)
@@ -1994,6 +2120,10 @@ class NeedAnalysisWorkflow:
                 for node_name, node_state in chunk.items():
                     print(f"  • Nœud '{node_name}' exécuté")
                     final_state = node_state
+                # Annulation demandée via l'API : arrêt entre deux nœuds
+                if is_run_cancelled():
+                    print(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                    break
             
             # Récupérer l'état final depuis le checkpointer
             snapshot = self.graph.get_state(config)
@@ -2098,6 +2228,10 @@ class NeedAnalysisWorkflow:
                 for node_name, node_state in chunk.items():
                     print(f"  • Nœud '{node_name}' exécuté")
                     final_state = node_state
+                # Annulation demandée via l'API : arrêt entre deux nœuds
+                if is_run_cancelled():
+                    print(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                    break
             
             # Récupérer l'état final depuis le checkpointer
             snapshot = self.graph.get_state(config)
@@ -2118,10 +2252,11 @@ class NeedAnalysisWorkflow:
                 print("\n" + "="*70)
                 print("📊 RAPPORT FINAL DES COÛTS")
                 print("="*70)
-                self.tracker.print_summary()
+                self.tracker.print_summary(thread_id=thread_id)
                 
-                # Sauvegarde du rapport de tracking
-                report_path = self.tracker.save_report()
+                # Sauvegarde du rapport de tracking (tokens de ce thread uniquement)
+                report_path = self.tracker.save_report(thread_id=thread_id)
+                self.tracker.end_session(thread_id)
                 print(f"📄 Rapport de coûts sauvegardé: {report_path}\n")
                 
                 return {
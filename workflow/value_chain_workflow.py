@@ -10,6 +10,7 @@ import json
 
 from value_chain.value_chain_agent import ValueChainAgent
 from models.value_chain_models import Function, Mission, FrictionPoint
+from utils.progress_events import is_run_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -167,64 +168,21 @@ class ValueChainWorkflow:
         try:
             from database.db import get_db_context
             from database.repository import TranscriptRepository
-            from concurrent.futures import ThreadPoolExecutor, as_completed
             
-            all_interventions = []
+            # Une seule requête pour tous les documents (sans timestamp, avec role et level)
+            with get_db_context() as db:
+                interventions_by_doc = TranscriptRepository.get_enriched_by_documents(
+                    db,
+                    transcript_document_ids,
+                    filter_interviewers=True,
+                    columns=["intervention_id", "text", "speaker_level", "speaker_role", "speaker_type"],
+                )
             
-            def load_document_interventions(document_id: int) -> List[Dict[str, Any]]:
-                """Charge les interventions d'un document (fonction pour parallélisation)"""
-                try:
-                    with get_db_context() as db:
-                        logger.info(f"Chargement du document {document_id}")
-                        
-                        # Récupérer directement les interventions enrichies depuis la DB
-                        enriched_interventions = TranscriptRepository.get_enriched_by_document(
-                            db, document_id, filter_interviewers=True
-                        )
-                        
-                        logger.info(f"✓ Document {document_id}: {len(enriched_interventions)} interventions enrichies")
-                        
-                        # Formater les interventions (sans timestamp, avec role et level)
-                        formatted_interventions = []
-                        for interv in enriched_interventions:
-                            formatted_interv = {
-                                "text": interv.get("text"),
-                                "speaker_level": interv.get("speaker_level"),
-                                "speaker_role": interv.get("speaker_role"),
-                                "speaker_type": interv.get("speaker_type"),
-                            }
-                            formatted_interventions.append(formatted_interv)
-                        
-                        return formatted_interventions
-                        
-                except Exception as e:
-                    logger.error(f"❌ Erreur lors du chargement du document {document_id}: {e}")
-                    return []
-            
-            # PARALLÉLISATION : Charger tous les documents en parallèle
-            if len(transcript_document_ids) > 1:
-                logger.info(f"🚀 Chargement parallèle de {len(transcript_document_ids)} documents")
-                max_workers = min(len(transcript_document_ids), 10)
-                
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_doc = {
-                        executor.submit(load_document_interventions, doc_id): doc_id
-                        for doc_id in transcript_document_ids
-                    }
-                    
-                    for future in as_completed(future_to_doc):
-                        doc_id = future_to_doc[future]
-                        try:
-                            interventions = future.result()
-                            all_interventions.extend(interventions)
-                            logger.info(f"✓ Document {doc_id} terminé: {len(interventions)} interventions")
-                        except Exception as e:
-                            logger.error(f"❌ Erreur document {doc_id}: {e}")
-            else:
-                # Traitement séquentiel si un seul document
-                for doc_id in transcript_document_ids:
-                    interventions = load_document_interventions(doc_id)
-                    all_interventions.extend(interventions)
+            all_interventions = []
+            for doc_id in transcript_document_ids:
+                interventions = interventions_by_doc.get(doc_id, [])
+                all_interventions.extend(interventions)
+                logger.info(f"✓ Document {doc_id}: {len(interventions)} interventions enrichies")
             
             state["all_interventions"] = all_interventions
             logger.info(f"Total: {len(all_interventions)} interventions chargées")
@@ -800,6 +758,10 @@ class ValueChainWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état complet depuis le checkpointer
         snapshot = self.graph.get_state(config)
@@ -913,6 +875,10 @@ class ValueChainWorkflow:
             for node_name, node_state in chunk.items():
                 logger.info(f"  • Nœud '{node_name}' exécuté")
                 final_state = node_state
+            # Annulation demandée via l'API : arrêt entre deux nœuds
+            if is_run_cancelled():
+                logger.info(f"🛑 Run annulé, arrêt après le nœud {list(chunk.keys())}")
+                break
         
         # Récupérer l'état final
         snapshot = self.graph.get_state(config)